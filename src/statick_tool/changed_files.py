@@ -0,0 +1,280 @@
+"""Files and lines changed since a git reference.
+
+Scanning only the files changed on a branch is much faster than scanning whole packages.
+Changes are taken from git, comparing the working tree, including untracked files, with
+the point where the current branch left the reference. Each git repository is only
+asked once, so workspaces made up of several repositories work too.
+"""
+
+import copy
+import logging
+import os
+import re
+import subprocess
+from threading import Lock
+from typing import Any, Optional
+
+from statick_tool.issue import Issue
+from statick_tool.package import Package
+
+# Lines changed in each file, or None if every line of the file is new.
+Changes = dict[str, Optional[set[int]]]
+
+
+class ChangedFiles:
+    """Files and lines changed since a git reference."""
+
+    HUNK_RE = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+    def __init__(self, ref: str, lines_only: bool = False) -> None:
+        """Initialize the changes.
+
+        Args:
+            ref: Git reference to compare with, such as a branch name or commit.
+            lines_only: Only keep issues on changed lines, rather than all issues in
+                changed files.
+        """
+        self.ref = ref
+        self.lines_only = lines_only
+        self.lock = Lock()
+        self.repos: dict[str, Optional[Changes]] = {}
+
+    def run_git(self, path: str, args: list[str]) -> str:
+        """Run a git command.
+
+        Args:
+            path: Directory to run the command in.
+            args: Arguments to git.
+
+        Returns:
+            Output of the command.
+        """
+        return subprocess.check_output(
+            ["git", "-C", path, "-c", "core.quotePath=false"] + args,
+            stderr=subprocess.STDOUT,
+            universal_newlines=True,
+        )
+
+    def get_changes(self, path: str) -> Optional[Changes]:
+        """Get the changes of the git repository a directory is in.
+
+        Args:
+            path: Directory in a git repository.
+
+        Returns:
+            Lines changed in each file of the repository, or None if the changes can
+            not be found.
+        """
+        try:
+            top = self.run_git(path, ["rev-parse", "--show-toplevel"]).strip()
+        except (subprocess.CalledProcessError, OSError) as ex:
+            logging.warning("Unable to find git repository of %s: %s", path, ex)
+            return None
+
+        with self.lock:
+            if top in self.repos:
+                return self.repos[top]
+            try:
+                diff = self.run_git(
+                    top,
+                    [
+                        "diff",
+                        "--merge-base",
+                        "--no-color",
+                        "--no-ext-diff",
+                        "--diff-filter=d",
+                        "-U0",
+                        self.ref,
+                    ],
+                )
+                untracked = self.run_git(
+                    top, ["ls-files", "--others", "--exclude-standard", "-z"]
+                )
+            except (subprocess.CalledProcessError, OSError) as ex:
+                logging.warning(
+                    "Unable to find changes since %s in %s: %s", self.ref, top, ex
+                )
+                self.repos[top] = None
+                return None
+
+            changes = self.parse_diff(top, diff)
+            for name in untracked.split("\0"):
+                if name:
+                    changes[os.path.realpath(os.path.join(top, name))] = None
+            logging.info(
+                "%d files changed since %s in %s.", len(changes), self.ref, top
+            )
+            self.repos[top] = changes
+            return changes
+
+    @classmethod
+    def parse_diff(cls, top: str, diff: str) -> Changes:
+        """Parse the lines added or changed in each file from a diff without context.
+
+        Args:
+            top: Top directory of the git repository.
+            diff: Output of git diff.
+
+        Returns:
+            Lines changed in each file.
+        """
+        changes: Changes = {}
+        lines: Optional[set[int]] = None
+        for line in diff.splitlines():
+            if line.startswith("+++ "):
+                name = line[4:]
+                if name.startswith("b/"):
+                    name = name[2:]
+                lines = set()
+                changes[os.path.realpath(os.path.join(top, name))] = lines
+                continue
+            match = cls.HUNK_RE.match(line)
+            if match and lines is not None:
+                start = int(match.group(1))
+                count = int(match.group(2)) if match.group(2) is not None else 1
+                lines.update(range(start, start + count))
+        return changes
+
+    def filter_package(self, package: Package) -> Package:
+        """Get a copy of a package with only the changed files.
+
+        Lists of files found by discovery plugins, and the sources of make targets, only
+        keep files that changed. Other values are left as they are.
+
+        Args:
+            package: Package with the files found by discovery.
+
+        Returns:
+            Package with only the changed files, or the package itself if its changes
+            can not be found.
+        """
+        changes = self.get_changes(package.path)
+        if changes is None:
+            return package
+
+        changed = copy.copy(package)
+        for key, value in package.items():
+            if isinstance(value, list):
+                changed[key] = [
+                    self.filter_item(item, changes)
+                    for item in value
+                    if not self.is_unchanged(item, changes)
+                ]
+        return changed
+
+    @staticmethod
+    def is_unchanged(item: Any, changes: Changes) -> bool:
+        """Check if a value found by discovery is a file that did not change.
+
+        Args:
+            item: Value found by discovery.
+            changes: Lines changed in each file.
+
+        Returns:
+            True if the value is the absolute path of a file that did not change, False
+            otherwise.
+        """
+        return (
+            isinstance(item, str)
+            and os.path.isabs(item)
+            and os.path.realpath(item) not in changes
+        )
+
+    @classmethod
+    def filter_item(cls, item: Any, changes: Changes) -> Any:
+        """Keep only the changed sources of a make target.
+
+        Args:
+            item: Value found by discovery.
+            changes: Lines changed in each file.
+
+        Returns:
+            Copy of the make target with only its changed sources, or the value itself
+            if it is not a make target.
+        """
+        if isinstance(item, dict) and isinstance(item.get("src"), list):
+            item = dict(item)
+            item["src"] = [
+                src for src in item["src"] if not cls.is_unchanged(src, changes)
+            ]
+        return item
+
+    def filter_issues(
+        self, package: Package, issues: dict[str, list[Issue]]
+    ) -> dict[str, list[Issue]]:
+        """Keep only the issues in changed files, or on changed lines.
+
+        Args:
+            package: Package the issues were found in.
+            issues: Issues found by each tool.
+
+        Returns:
+            Issues in changed files, or all issues if the changes of the package can not
+            be found.
+        """
+        changes = self.get_changes(package.path)
+        if changes is None:
+            return issues
+        return {
+            tool: [
+                issue
+                for issue in tool_issues
+                if self.is_changed(package, issue, changes)
+            ]
+            for tool, tool_issues in issues.items()
+        }
+
+    def is_changed(self, package: Package, issue: Issue, changes: Changes) -> bool:
+        """Check if an issue is in a changed file, or on a changed line.
+
+        Args:
+            package: Package the issue was found in.
+            issue: Issue to check.
+            changes: Lines changed in each file.
+
+        Returns:
+            True if the issue should be kept, False otherwise.
+        """
+        filename = issue.filename
+        if not os.path.isabs(filename):
+            filename = os.path.join(package.path, filename)
+        filename = os.path.realpath(filename)
+        if filename not in changes:
+            return False
+        lines = changes[filename]
+        if not self.lines_only or lines is None:
+            return True
+        try:
+            line_number = int(issue.line_number)
+        except ValueError:
+            return True
+        # Issues about the whole file are not on any line.
+        return line_number <= 0 or line_number in lines
+
+
+class ListedFiles(ChangedFiles):
+    """Files given by name, such as the files an editor or a commit hook scans.
+
+    Every line of a listed file counts as changed, so all issues in the listed files
+    are kept.
+    """
+
+    def __init__(self, files: list[str]) -> None:
+        """Initialize the listed files.
+
+        Args:
+            files: Paths of the files to scan.
+        """
+        super().__init__("")
+        self.changes: Changes = {os.path.realpath(path): None for path in files}
+
+    def get_changes(self, path: str) -> Optional[Changes]:
+        """Get the listed files.
+
+        Args:
+            path: Directory of the package being scanned.
+
+        Returns:
+            All listed files, with every line changed.
+        """
+        return self.changes
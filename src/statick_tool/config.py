@@ -3,6 +3,7 @@
 Sets what flags are used for each plugin at those levels.
 """
 
+import logging
 import os
 from typing import Any, Optional, Union
 
@@ -15,6 +16,9 @@ class Config:
     Sets what flags are used for each plugin at those levels.
     """
 
+    # Keys of the discovery section of a level that are settings rather than plugins.
+    DISCOVERY_SETTINGS = ["ignore_dirs", "gitignore", "default_ignore_dirs"]
+
     def __init__(
         self,
         base_file: Optional[str],
@@ -147,7 +151,80 @@ class Config:
         Returns:
             A list of discovery plugins enabled for the given level..
         """
-        return self.get_enabled_plugins(level, "discovery")
+        return [
+            plugin
+            for plugin in self.get_enabled_plugins(level, "discovery")
+            if plugin not in self.DISCOVERY_SETTINGS
+        ]
+
+    def get_discovery_ignore_dirs(self, level: str) -> list[str]:
+        """Get patterns of directories to leave out when finding files at a level.
+
+        Patterns of the levels a level inherits from are kept.
+
+        Args:
+            level: The level to get patterns for.
+
+        Returns:
+            Patterns from the ignore_dirs key of the discovery section of the level and
+            the levels it inherits from.
+        """
+        if "levels" not in self.config or level not in self.config["levels"]:
+            return []
+        level_config = self.config["levels"][level] or {}
+        ignore_dirs: list[str] = []
+        for inherited_level in level_config.get("inherits_from") or []:
+            if inherited_level != level:
+                ignore_dirs += self.get_discovery_ignore_dirs(inherited_level)
+        discovery = level_config.get("discovery")
+        level_dirs: Any = []
+        if isinstance(discovery, dict):
+            level_dirs = discovery.get("ignore_dirs") or []
+        if isinstance(level_dirs, str):
+            level_dirs = [level_dirs]
+        ignore_dirs += [str(pattern) for pattern in level_dirs]
+        return list(dict.fromkeys(ignore_dirs))
+
+    def get_discovery_setting(self, level: str, name: str) -> Any:
+        """Get a setting of the discovery section of a level.
+
+        A setting of a level overrides the setting of the levels it inherits from, and a
+        level inherited later overrides one inherited earlier.
+
+        Args:
+            level: The level to get the setting for.
+            name: Key of the setting in the discovery section.
+
+        Returns:
+            Value of the setting, or None if neither the level nor the levels it
+            inherits from set it.
+        """
+        if "levels" not in self.config or level not in self.config["levels"]:
+            return None
+        level_config = self.config["levels"][level] or {}
+        discovery = level_config.get("discovery")
+        if isinstance(discovery, dict) and discovery.get(name) is not None:
+            return discovery[name]
+        for inherited_level in reversed(level_config.get("inherits_from") or []):
+            if inherited_level != level:
+                value = self.get_discovery_setting(inherited_level, name)
+                if value is not None:
+                    return value
+        return None
+
+    def get_discovery_flag(self, level: str, name: str, default: bool = True) -> bool:
+        """Get a setting of the discovery section of a level that is on or off.
+
+        Args:
+            level: The level to get the setting for.
+            name: Key of the setting in the discovery section.
+            default: Value if neither the level nor the levels it inherits from set it.
+
+        Returns:
+            Whether the setting is on.
+        """
+        value = self.get_discovery_setting(level, name)
+        return default if value is None else bool(value)
 
     def get_enabled_reporting_plugins(self, level: str) -> list[str]:
         """Get what reporting plugins are enabled for a certain level.
@@ -246,6 +323,79 @@ class Config:
 
         return tool_flags
 
+    def get_tool_settings(self, plugin: str, level: str) -> dict[str, Any]:
+        """Get all configuration of a tool plugin at a certain level.
+
+        Args:
+            plugin: The plugin to get the configuration for.
+            level: The level to get the configuration for.
+
+        Returns:
+            The configuration of the plugin, including inherited levels.
+        """
+        settings: dict[str, Any] = {}
+        if "levels" not in self.config or level not in self.config["levels"]:
+            return settings
+        level_config = self.config["levels"][level] or {}
+        for inherited_level in level_config.get("inherits_from") or []:
+            if inherited_level != level:
+                settings.update(self.get_tool_settings(plugin, inherited_level))
+        tool_config = level_config.get("tool") or {}
+        # Tools may also be listed without any configuration.
+        if isinstance(tool_config, dict) and tool_config.get(plugin):
+            settings.update(tool_config[plugin])
+        return settings
+
+    def get_tool_timeout(self, plugin: str, level: str) -> Optional[float]:
+        """Get the number of seconds a tool plugin may scan a package for.
+
+        A timeout set for the tool overrides a timeout set for the whole level. Both are
+        inherited from the levels a level inherits from.
+
+        Args:
+            plugin: The plugin to get the timeout for.
+            level: The level to get the timeout for.
+
+        Returns:
+            The timeout in seconds, or None if the tool has no timeout.
+        """
+        timeout = self.get_tool_settings(plugin, level).get("timeout")
+        if timeout is None:
+            timeout = self.get_level_setting(level, "timeout")
+        if timeout is None:
+            return None
+        try:
+            return float(timeout)
+        except (TypeError, ValueError):
+            logging.warning(
+                "Timeout %s of %s at level %s is not a number.", timeout, plugin, level
+            )
+            return None
+
+    def get_level_setting(self, level: str, key: str) -> Any:
+        """Get a setting of a whole level.
+
+        Args:
+            level: The level to get the setting for.
+            key: The key of the setting.
+
+        Returns:
+            The setting of the level, or of the last level it inherits from that has
+            the setting, or None if no level has the setting.
+        """
+        if "levels" not in self.config or level not in self.config["levels"]:
+            return None
+        level_config = self.config["levels"][level] or {}
+        if key in level_config:
+            return level_config[key]
+        value = None
+        for inherited_level in level_config.get("inherits_from") or []:
+            if inherited_level != level:
+                inherited_value = self.get_level_setting(inherited_level, key)
+                if inherited_value is not None:
+                    value = inherited_value
+        return value
+
     def get_discovery_config(
         self, plugin: str, level: str, key: str, default: Optional[str] = None
     ) -> Optional[str]:
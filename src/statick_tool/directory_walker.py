@@ -0,0 +1,128 @@
+"""List the files below a directory, listing many directories at the same time.
+
+Listing a directory on a network filesystem mostly waits for the server, so the
+directories of a large package are listed on a pool of threads. Files are returned in
+the same order however many threads list them: the files of a directory sorted by name,
+then the files below each of its subdirectories, by name. Like os.walk, directories
+that can not be listed are skipped and symbolic links to directories are not followed.
+Each listing can be pruned before its subdirectories are listed, so that subtrees that
+are not wanted are never listed.
+"""
+
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, NamedTuple, Optional
+
+
+class Listing(NamedTuple):
+    """Files and subdirectories of a directory, sorted by name."""
+
+    files: list[os.DirEntry[str]]
+    dirs: list[str]
+
+
+# Function given a directory and its listing that returns the entries to keep.
+Prune = Callable[[str, Listing], Listing]
+
+
+def list_dir(path: str, stat: bool = False) -> Listing:
+    """List the files and subdirectories of a directory.
+
+    Args:
+        path: Directory to list.
+        stat: Whether to stat each file while listing.
+
+    Returns:
+        Files and subdirectories to descend into, sorted by name.
+    """
+    files: list[os.DirEntry[str]] = []
+    dirs: list[str] = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    if not entry.is_symlink():
+                        dirs.append(entry.path)
+                    continue
+                if stat:
+                    try:
+                        entry.stat()
+                    except OSError:
+                        pass
+                files.append(entry)
+    except OSError:
+        return Listing([], [])
+    files.sort(key=lambda entry: entry.name)
+    dirs.sort()
+    return Listing(files, dirs)
+
+
+def scan_files(  # pylint: disable=too-many-locals
+    path: str, threads: int = 1, stat: bool = False, prune: Optional[Prune] = None
+) -> list[os.DirEntry[str]]:
+    """List the files below a directory.
+
+    Args:
+        path: Directory to list.
+        threads: Number of directories listed at the same time.
+        stat: Whether to stat each file while listing, so that stat() of the entries
+            returned does not touch the filesystem again, unless it failed.
+        prune: Function that leaves out files and subdirectories of each listing.
+            Subdirectories left out are not listed.
+
+    Returns:
+        Entries of the files, in the order of the directories top-down by name.
+    """
+
+    def list_pruned(directory: str) -> Listing:
+        listing = list_dir(directory, stat)
+        if prune is None:
+            return listing
+        return prune(directory, listing)
+
+    listings: dict[str, Listing] = {}
+    if threads <= 1:
+        pending = [path]
+        while pending:
+            directory = pending.pop()
+            listings[directory] = list_pruned(directory)
+            pending += listings[directory].dirs
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            futures: dict[Future[Listing], str] = {
+                executor.submit(list_pruned, path): path
+            }
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    directory = futures.pop(future)
+                    listings[directory] = future.result()
+                    for subdir in listings[directory].dirs:
+                        futures[executor.submit(list_pruned, subdir)] = subdir
+
+    entries: list[os.DirEntry[str]] = []
+    stack = [path]
+    while stack:
+        listing = listings[stack.pop()]
+        entries += listing.files
+        stack += reversed(listing.dirs)
+    return entries
+
+
+def walk_files(path: str, threads: int = 1, prune: Optional[Prune] = None) -> list[str]:
+    """List the paths of the files below a directory.
+
+    Args:
+        path: Directory to list.
+        threads: Number of directories listed at the same time.
+        prune: Function that leaves out files and subdirectories of each listing.
+
+    Returns:
+        Paths of the files, joined to the directory like os.walk does, in the order of
+        the directories top-down by name.
+    """
+    return [entry.path for entry in scan_files(path, threads, prune=prune)]
@@ -0,0 +1,123 @@
+"""Cache of the types of the files found in a package.
+
+Discovery plugins look at the output of the file command, or a description found from
+the first bytes or extension of a file, to tell its type. The types are kept on disk
+between runs, one file per package below the cache directory, so that only files that
+were added or changed since the previous run are looked at again.
+
+A file has not changed while its modification time, size and inode are the same. The
+modification time of a directory is not enough, since it does not change when the
+contents of a file in it change. Entries are only used by the same version of Statick,
+and only while the file command is still there or still missing.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from importlib.metadata import PackageNotFoundError, version
+from typing import Any, Tuple
+
+
+class DiscoveryCache:
+    """Cache of the types of the files found in a package."""
+
+    # Changing the format of entries or how types are found invalidates all entries.
+    FORMAT_VERSION = 1
+
+    def __init__(self, cache_dir: str, package_path: str, file_command: bool) -> None:
+        """Initialize the cache and read the entries of the package.
+
+        Args:
+            cache_dir: Directory to keep the entries of packages in.
+            package_path: Path of the package.
+            file_command: Whether the file command exists.
+        """
+        name = hashlib.sha256(os.path.abspath(package_path).encode("utf8")).hexdigest()
+        self.cache_file = os.path.join(cache_dir, name[:32] + ".json")
+        self.header = self.get_header(file_command)
+        self.entries: dict[str, list[Any]] = {}
+        self.stats: dict[str, Tuple[int, int, int]] = {}
+        if os.path.isfile(self.cache_file):
+            try:
+                with open(self.cache_file, "r", encoding="utf8") as fid:
+                    cached = json.load(fid)
+            except (OSError, ValueError) as ex:
+                logging.warning(
+                    "Unable to read discovery cache %s: %s", self.cache_file, ex
+                )
+            else:
+                if isinstance(cached, dict) and cached.get("header") == self.header:
+                    self.entries = cached.get("files", {})
+
+    @classmethod
+    def get_header(cls, file_command: bool) -> dict[str, Any]:
+        """Get what entries must have been found with to be used.
+
+        Args:
+            file_command: Whether the file command exists.
+
+        Returns:
+            Format of the entries, version of Statick and whether the file command
+            exists.
+        """
+        try:
+            statick_version = version("statick")
+        except PackageNotFoundError:
+            statick_version = ""
+        return {
+            "format": cls.FORMAT_VERSION,
+            "statick": statick_version,
+            "file_command": file_command,
+        }
+
+    def restore(self, file_dict: dict[str, str], entry: os.DirEntry[str]) -> bool:
+        """Restore the type of a file found before, if it has not changed.
+
+        Args:
+            file_dict: What discovery plugins know about the file.
+            entry: Directory entry of the file, which has been stat.
+
+        Returns:
+            True if the type was restored, False if it has to be found again.
+        """
+        try:
+            stat = entry.stat()
+        except OSError:
+            return False
+        key = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        path = file_dict["path"]
+        self.stats[path] = key
+        cached = self.entries.get(path)
+        if cached is None or tuple(cached[:3]) != key:
+            return False
+        file_dict["file_cmd_out"] = cached[3]
+        return True
+
+    def save(self, files: dict[str, dict[str, str]]) -> None:
+        """Write the types of the files found in this run to the cache file.
+
+        Files that were not stat while walking the package, and files whose type no
+        discovery plugin looked at, are left out.
+
+        Args:
+            files: Files found in the package, by absolute path.
+        """
+        if not self.stats:
+            return
+        entries: dict[str, list[Any]] = {}
+        for path, file_dict in files.items():
+            if path in self.stats and dict.__contains__(file_dict, "file_cmd_out"):
+                entries[path] = list(self.stats[path]) + [
+                    dict.__getitem__(file_dict, "file_cmd_out")
+                ]
+        tmp_file = f"{self.cache_file}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            with open(tmp_file, "w", encoding="utf8") as fid:
+                json.dump({"header": self.header, "files": entries}, fid)
+            os.replace(tmp_file, self.cache_file)
+        except OSError as ex:
+            logging.warning(
+                "Unable to write discovery cache %s: %s", self.cache_file, ex
+            )
@@ -1,14 +1,21 @@
 """Discovery plugin."""
 
+import functools
 import logging
 import os
 import subprocess
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Optional, Union
 
+from statick_tool.directory_walker import scan_files, walk_files
+from statick_tool.discovery_cache import DiscoveryCache
 from statick_tool.exceptions import Exceptions
+from statick_tool.file_type import sniff_file_type
 from statick_tool.package import Package
 from statick_tool.plugin_context import PluginContext
+from statick_tool.prune_rules import PruneRules
 
 
 class DiscoveryPlugin:
@@ -16,6 +23,12 @@ class DiscoveryPlugin:
 
     plugin_context = None
 
+    # Number of files passed to each run of the file command.
+    FILE_CMD_BATCH_SIZE = 256
+
+    # Whether the file command was found, for each value of $PATH looked in.
+    file_command_found: dict[str, bool] = {}
+
     def get_name(self) -> Optional[str]:
         """Get name of plugin.
 
@@ -53,28 +66,172 @@ class DiscoveryPlugin:
             exceptions: Exceptions to apply to discovery.
         """
 
-    def find_files(self, package: Package) -> None:
+    def find_files(
+        self,
+        package: Package,
+        cache: Optional[DiscoveryCache] = None,
+        prune_rules: Optional[PruneRules] = None,
+    ) -> None:
         """Walk the package path exactly once to discover files for analysis.
 
+        Directories are listed on as many threads as get_walk_threads() says, leaving
+        out the files and directories the prune rules say. The files are indexed once
+        for all discovery plugins, see Package.get_file_index().
+
         Args:
             package: Package to scan.
+            cache: Cache of the types of files found in earlier runs, if any.
+            prune_rules: Rules of what to leave out, or None for get_prune_rules().
         """
-        if package._walked:  # pylint: disable=protected-access
-            return
+        if not package._walked:  # pylint: disable=protected-access
+            if prune_rules is None:
+                prune_rules = self.get_prune_rules(package)
+            entries = scan_files(
+                package.path,
+                self.get_walk_threads(),
+                stat=cache is not None,
+                prune=prune_rules.prune,
+            )
+            file_dicts = self.get_file_dicts([entry.path for entry in entries])
+            for entry, file_dict in zip(entries, file_dicts):
+                if cache is not None:
+                    cache.restore(file_dict, entry)
+                package.files[file_dict["path"]] = file_dict
+            package.file_index = None
+            package._walked = True  # pylint: disable=protected-access
+
+        package.get_file_index()
+
+    def get_prune_rules(
+        self,
+        package: Package,
+        level: Optional[str] = None,
+        exceptions: Optional[Exceptions] = None,
+    ) -> PruneRules:
+        """Get the rules of which files and directories to leave out of a package.
 
-        for root, _, files in os.walk(package.path):
-            for fname in files:
-                full_path = os.path.join(root, fname)
-                abs_path = os.path.abspath(full_path)
-                file_output = self.get_file_cmd_output(full_path)
-                file_dict = {
-                    "name": fname.lower(),
-                    "path": abs_path,
-                    "file_cmd_out": file_output,
-                }
-                package.files[abs_path] = file_dict
+        Args:
+            package: Package to walk.
+            level: Level whose discovery settings are used, if any.
+            exceptions: Exceptions whose file exceptions for all tools leave out
+                directories, if any.
 
-        package._walked = True  # pylint: disable=protected-access
+        Returns:
+            Rules leaving out the usual directories, the output and cache directories
+            and what the level, the exceptions and .gitignore files of the package say.
+        """
+        is_excepted = None
+        if exceptions is not None:
+            is_excepted = functools.partial(exceptions.is_dir_excepted, package)
+        ignore_dirs: list[str] = []
+        skip_dirs: list[str] = []
+        gitignore = True
+        default_dirs = True
+        if self.plugin_context is not None:
+            args = self.plugin_context.args
+            skip_dirs = [
+                getattr(args, "output_directory", None) or "",
+                getattr(args, "cache_dir", None) or "",
+            ]
+            config = self.plugin_context.config
+            if level is not None and config is not None:
+                ignore_dirs = config.get_discovery_ignore_dirs(level)
+                gitignore = config.get_discovery_flag(level, "gitignore")
+                default_dirs = config.get_discovery_flag(level, "default_ignore_dirs")
+        return PruneRules(
+            package.path,
+            ignore_dirs,
+            skip_dirs,
+            gitignore=gitignore,
+            is_excepted=is_excepted,
+            default_dirs=default_dirs,
+        )
+
+    def get_walk_threads(self) -> int:
+        """Get the number of directories listed at the same time when finding files.
+
+        Returns:
+            Number of threads from --walk-threads, or from --max-procs if not set.
+        """
+        if self.plugin_context is None:
+            return 1
+        args = self.plugin_context.args
+        threads: int = getattr(args, "walk_threads", 0) or getattr(args, "max_procs", 1)
+        return max(1, int(threads))
+
+    def get_file_dict(self, full_path: str) -> dict[str, str]:
+        """Get what discovery plugins need to know about a file.
+
+        Args:
+            full_path: Full path to file.
+
+        Returns:
+            Lowercase name of the file, its absolute path and output of the file command.
+        """
+        return self.get_file_dicts([full_path])[0]
+
+    def get_file_dicts(self, full_paths: list[str]) -> list[dict[str, str]]:
+        """Get what discovery plugins need to know about many files.
+
+        The output of the file command is only found once a discovery plugin first
+        looks it up, for all of the files at once.
+
+        Args:
+            full_paths: Full paths to the files.
+
+        Returns:
+            Lowercase name of each file, its absolute path and output of the file
+            command, in the order of the paths.
+        """
+        file_dicts = [FileDict(full_path) for full_path in full_paths]
+        pending = PendingFileTypes(self, file_dicts)
+        for file_dict in file_dicts:
+            file_dict.pending = pending
+        return list(file_dicts)
+
+    def update_files(
+        self,
+        package: Package,
+        paths: set[str],
+        prune_rules: Optional[PruneRules] = None,
+    ) -> set[str]:
+        """Update the files found in a package after files in it changed.
+
+        Args:
+            package: Package whose files were found.
+            paths: Paths that changed. Anything below a path that is a directory, or
+                that no longer exists, may have changed.
+            prune_rules: Rules of what to leave out, or None for get_prune_rules().
+
+        Returns:
+            Absolute paths of the files that were added, changed or removed.
+        """
+        if prune_rules is None:
+            prune_rules = self.get_prune_rules(package)
+        changed: set[str] = set()
+        found: list[str] = []
+        for path in paths:
+            path = os.path.abspath(path)
+            prefix = path + os.sep
+            for known in [name for name in package.files if name.startswith(prefix)]:
+                if not os.path.isfile(known):
+                    del package.files[known]
+                    changed.add(known)
+            if prune_rules.is_pruned(path):
+                continue
+            if os.path.isdir(path):
+                found += walk_files(path, self.get_walk_threads(), prune_rules.prune)
+            elif os.path.isfile(path):
+                found.append(path)
+            elif path in package.files:
+                del package.files[path]
+                changed.add(path)
+        for file_dict in self.get_file_dicts(found):
+            package.files[file_dict["path"]] = file_dict
+            changed.add(file_dict["path"])
+        if changed:
+            package.file_index = None
+        return changed
 
     def get_file_cmd_output(self, full_path: str) -> str:
         """Run the file command (if it exists) on the supplied path.
@@ -114,6 +271,107 @@ class DiscoveryPlugin:
             logging.warning("OSError on file command for %s", full_path)
             return ""
 
+    def get_file_types(self, full_paths: list[str]) -> list[str]:
+        """Get the output of the file command for many files, running it only if needed.
+
+        Files that can be told apart by their first bytes or their extension get a
+        description in the words of the file command without running it. The file
+        command is run on the other files. If the file command does not exist, the
+        output is empty for every file, as before.
+
+        Args:
+            full_paths: Full paths to the files.
+
+        Returns:
+            Output of the file command for each file, in the order of the paths.
+        """
+        if not full_paths or not self.file_command_exists():
+            return ["" for _ in full_paths]
+
+        outputs: list[str] = []
+        unknown: list[int] = []
+        for index, full_path in enumerate(full_paths):
+            description = sniff_file_type(full_path)
+            if description is None:
+                unknown.append(index)
+                outputs.append("")
+            else:
+                outputs.append(f"{full_path}: {description}\n".lower())
+        file_cmd_outputs = self.get_file_cmd_outputs(
+            [full_paths[index] for index in unknown]
+        )
+        for index, file_cmd_output in zip(unknown, file_cmd_outputs):
+            outputs[index] = file_cmd_output
+        return outputs
+
+    def get_file_cmd_outputs(self, full_paths: list[str]) -> list[str]:
+        """Run the file command on many files.
+
+        The files are passed to the file command in batches, and the batches run at
+        the same time. The output for each file is the same as from
+        get_file_cmd_output.
+
+        Args:
+            full_paths: Full paths to the files.
+
+        Returns:
+            Output of the file command for each file, in the order of the paths.
+        """
+        if not full_paths or not self.file_command_exists():
+            return ["" for _ in full_paths]
+
+        size = self.FILE_CMD_BATCH_SIZE
+        batches = [full_paths[i : i + size] for i in range(0, len(full_paths), size)]
+        if len(batches) == 1:
+            return self.run_file_cmd(batches[0])
+        max_workers = os.cpu_count() or 1
+        if self.plugin_context is not None:
+            max_workers = getattr(self.plugin_context.args, "max_procs", max_workers)
+        outputs: list[str] = []
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            for batch_outputs in executor.map(self.run_file_cmd, batches):
+                outputs += batch_outputs
+        return outputs
+
+    def run_file_cmd(self, full_paths: list[str]) -> list[str]:
+        """Run the file command once on a batch of files.
+
+        Each file name is followed by a null character, so that names containing
+        colons are split from the description correctly. If the output can not be
+        split up, the file command is run on each file instead.
+
+        Args:
+            full_paths: Full paths to the files.
+
+        Returns:
+            Output of the file command for each file, in the order of the paths.
+        """
+        try:
+            output: str = subprocess.check_output(
+                ["file", "--print0", "--no-pad"] + full_paths, universal_newlines=True
+            )
+        except (subprocess.CalledProcessError, OSError) as ex:
+            logging.debug(
+                "Running the file command on %d files failed: %s", len(full_paths), ex
+            )
+            return [self.get_file_cmd_output(full_path) for full_path in full_paths]
+
+        # Each record but the first ends with the name of the next file, and each
+        # description starts with a colon.
+        records = output.split("\0")
+        if len(records) != len(full_paths) + 1:
+            return [self.get_file_cmd_output(full_path) for full_path in full_paths]
+        outputs: list[str] = []
+        name = records[0]
+        for index, record in enumerate(records[1:]):
+            if index < len(full_paths) - 1:
+                description, _, next_name = record.rpartition("\n")
+            else:
+                description, next_name = record.rstrip("\n"), ""
+            outputs.append(f"{name}{description}\n".lower())
+            name = next_name
+        return outputs
+
     def set_plugin_context(self, plugin_context: Union[None, PluginContext]) -> None:
         """Set the plugin context.
 
@@ -122,21 +380,235 @@ class DiscoveryPlugin:
         """
         self.plugin_context = plugin_context
 
+    def get_working_dir(self) -> Optional[str]:
+        """Get the directory to run tools of this plugin in.
+
+        Returns:
+            Output directory of the plugin context, or None to run tools in the current
+            working directory.
+        """
+        return self.plugin_context.output_dir if self.plugin_context else None
+
+    def get_output_path(self, filename: str) -> str:
+        """Get the path to write a log or scratch file of this plugin to.
+
+        Args:
+            filename: Name of the file.
+
+        Returns:
+            Path of the file in the output directory of the plugin context, or relative
+            to the current working directory if there is no output directory.
+        """
+        if self.plugin_context is None:
+            return filename
+        return self.plugin_context.get_output_path(filename)
+
     @staticmethod
     def file_command_exists() -> bool:
         """Return whether the 'file' command is available on $PATH.
 
+        The answer is kept for each value of $PATH, so $PATH is only searched once.
+
         Returns:
             True if the 'file' command is available on $PATH, False otherwise.
         """
+        search_path = os.environ["PATH"]
+        found = DiscoveryPlugin.file_command_found.get(search_path)
+        if found is not None:
+            return found
+
         if sys.platform == "win32":
             command_name = "file.exe"
         else:
             command_name = "file"
 
-        for path in os.environ["PATH"].split(os.pathsep):
+        found = False
+        for path in search_path.split(os.pathsep):
             exe_path = os.path.join(path, command_name)
             if os.path.isfile(exe_path) and os.access(exe_path, os.X_OK):
-                return True
+                found = True
+                break
+
+        DiscoveryPlugin.file_command_found[search_path] = found
+        return found
 
-        return False
+
+class FileDict(dict):  # type: ignore
+    """What discovery plugins need to know about a file.
+
+    The name and path of the file are known from the start. The output of the file
+    command is found when "file_cmd_out" is first looked up with [], get() or in,
+    together with the other files found at the same time.
+    """
+
+    def __init__(self, full_path: str) -> None:
+        """Initialize the file.
+
+        Args:
+            full_path: Full path to the file.
+        """
+        super().__init__(
+            name=os.path.basename(full_path).lower(), path=os.path.abspath(full_path)
+        )
+        self.full_path = full_path
+        self.pending: Optional[PendingFileTypes] = None
+
+    def resolve(self) -> None:
+        """Find the output of the file command if it is not known yet."""
+        if dict.__contains__(self, "file_cmd_out"):
+            return
+        if self.pending is not None:
+            self.pending.resolve()
+        # A shallow copy shares the pending files of the original without being one.
+        if not dict.__contains__(self, "file_cmd_out"):
+            PendingFileTypes(DiscoveryPlugin(), [self]).resolve()
+
+    def __missing__(self, key: str) -> str:
+        """Find the output of the file command when it is first looked up.
+
+        Args:
+            key: Key that was looked up.
+
+        Returns:
+            Output of the file command.
+
+        Raises:
+            KeyError: If the key is not the output of the file command.
+        """
+        if key != "file_cmd_out":
+            raise KeyError(key)
+        self.resolve()
+        return str(dict.__getitem__(self, key))
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a value, finding the output of the file command if needed.
+
+        Args:
+            key: Key to look up.
+            default: Value if the key is not found.
+
+        Returns:
+            Value of the key, or the default.
+        """
+        if key == "file_cmd_out":
+            self.resolve()
+        return super().get(key, default)
+
+    def __contains__(self, key: object) -> bool:
+        """Check for a key, the output of the file command is always there.
+
+        Args:
+            key: Key to look for.
+
+        Returns:
+            True if the key is found, False otherwise.
+        """
+        return key == "file_cmd_out" or super().__contains__(key)
+
+    def __eq__(self, other: object) -> bool:
+        """Compare with another dict once the output of the file command is found.
+
+        Args:
+            other: Object to compare with.
+
+        Returns:
+            True if the keys and values are equal, False otherwise.
+        """
+        self.resolve()
+        if isinstance(other, FileDict):
+            other.resolve()
+        return super().__eq__(other)
+
+    def __ne__(self, other: object) -> bool:
+        """Compare with another dict once the output of the file command is found.
+
+        Args:
+            other: Object to compare with.
+
+        Returns:
+            True if the keys or values differ, False otherwise.
+        """
+        return not self == other
+
+    __hash__ = None
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """Pickle and copy without finding the output of the file command.
+
+        A file whose type is not known yet is pickled together with the files found at
+        the same time, so that their types are still found together once unpickled.
+
+        Returns:
+            Function, arguments, state and items to rebuild the dict.
+        """
+        return (
+            FileDict,
+            (self.full_path,),
+            {"full_path": self.full_path, "pending": self.pending},
+            None,
+            iter(dict.items(self)),
+        )
+
+
+class PendingFileTypes:  # pylint: disable=too-few-public-methods
+    """Files found together whose output of the file command is not known yet."""
+
+    def __init__(self, plugin: DiscoveryPlugin, file_dicts: list[FileDict]) -> None:
+        """Initialize the pending files.
+
+        Args:
+            plugin: Discovery plugin to find the types of the files with.
+            file_dicts: Files whose types are not known yet.
+        """
+        self.plugin = plugin
+        self.file_dicts = file_dicts
+        self.lock = threading.Lock()
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Get the state to pickle, which leaves out the plugin and the lock.
+
+        Returns:
+            State of the pending files.
+        """
+        with self.lock:
+            return {"file_dicts": list(self.file_dicts)}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Restore the pickled state with a new plugin and lock.
+
+        Args:
+            state: State of the pending files.
+        """
+        self.plugin = DiscoveryPlugin()
+        self.file_dicts = state["file_dicts"]
+        self.lock = threading.Lock()
+
+    def resolve(self, wanted: Optional[list[FileDict]] = None) -> None:
+        """Find the output of the file command for pending files.
+
+        Discovery plugins run concurrently, so only the first plugin to look finds
+        the types, and the others wait for it.
+
+        Args:
+            wanted: Files to find the types of, or None for all of the pending files.
+        """
+        with self.lock:
+            wanted_ids = None if wanted is None else {id(item) for item in wanted}
+            file_dicts: list[FileDict] = []
+            still_pending: list[FileDict] = []
+            for file_dict in self.file_dicts:
+                if dict.__contains__(file_dict, "file_cmd_out"):
+                    continue
+                if wanted_ids is None or id(file_dict) in wanted_ids:
+                    file_dicts.append(file_dict)
+                else:
+                    still_pending.append(file_dict)
+            self.file_dicts = still_pending
+            if not file_dicts:
+                return
+            outputs = self.plugin.get_file_types(
+                [file_dict.full_path for file_dict in file_dicts]
+            )
+            for file_dict, output in zip(file_dicts, outputs):
+                dict.__setitem__(file_dict, "file_cmd_out", output)
+                file_dict.pending = None
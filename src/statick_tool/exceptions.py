@@ -21,6 +21,111 @@ from statick_tool.issue import Issue
 from statick_tool.package import Package
 
 
+class GlobMatcher:
+    """Match paths against many glob patterns at once.
+
+    Patterns are matched like fnmatch.fnmatch does. Patterns without wildcards are
+    looked up in a set, patterns with a single * at the start or the end are checked
+    with str.endswith or str.startswith, and all other patterns are combined into one
+    regular expression.
+    """
+
+    WILDCARDS = re.compile(r"[*?\[]")
+
+    def __init__(self, globs: list[str]) -> None:
+        """Compile patterns.
+
+        Args:
+            globs: Patterns to match.
+        """
+        self.exact: set[str] = set()
+        suffixes: list[str] = []
+        prefixes: list[str] = []
+        regexes: list[str] = []
+        for glob in dict.fromkeys(os.path.normcase(glob) for glob in globs):
+            wildcards = self.WILDCARDS.findall(glob)
+            if not wildcards:
+                self.exact.add(glob)
+            elif wildcards == ["*"] and glob.startswith("*"):
+                suffixes.append(glob[1:])
+            elif wildcards == ["*"] and glob.endswith("*"):
+                prefixes.append(glob[:-1])
+            else:
+                regexes.append(fnmatch.translate(glob))
+        self.suffixes = tuple(suffixes)
+        self.prefixes = tuple(prefixes)
+        self.regex: Optional[Pattern[str]] = (
+            re.compile("|".join(regexes)) if regexes else None
+        )
+
+    def __bool__(self) -> bool:
+        """Check whether there are any patterns.
+
+        Returns:
+            True if a path can match, False otherwise.
+        """
+        return bool(self.exact or self.suffixes or self.prefixes or self.regex)
+
+    def match(self, path: str) -> bool:
+        """Check whether a path matches any of the patterns.
+
+        Args:
+            path: Path to check.
+
+        Returns:
+            True if the path matches a pattern, False otherwise.
+        """
+        path = os.path.normcase(path)
+        return (
+            path in self.exact
+            or (bool(self.suffixes) and path.endswith(self.suffixes))
+            or (bool(self.prefixes) and path.startswith(self.prefixes))
+            or (self.regex is not None and self.regex.match(path) is not None)
+        )
+
+
+class FileExceptionMatcher:  # pylint: disable=too-few-public-methods
+    """Match paths against the globs of file exceptions for a tool."""
+
+    # Hack to avoid exceptions for everything on Travis CI: this pattern is matched
+    # against paths with the prefix removed.
+    TRAVIS_GLOB = "*/build/*"
+    TRAVIS_PREFIX = "/home/travis/build/"
+
+    def __init__(self, globs: list[str]) -> None:
+        """Compile the globs of file exceptions.
+
+        Args:
+            globs: Patterns of the file exceptions.
+        """
+        self.globs = GlobMatcher([glob for glob in globs if glob != self.TRAVIS_GLOB])
+        self.travis_globs = GlobMatcher(
+            [glob for glob in globs if glob == self.TRAVIS_GLOB]
+        )
+
+    def match(self, path: str, rel_path: Optional[str] = None) -> bool:
+        """Check whether a file is excepted.
+
+        Args:
+            path: Absolute path of the file.
+            rel_path: Path of the file relative to its package, if it is also matched.
+
+        Returns:
+            True if the path or relative path matches a glob, False otherwise.
+        """
+        if self.globs.match(path) or (
+            rel_path is not None and self.globs.match(rel_path)
+        ):
+            return True
+        if not self.travis_globs:
+            return False
+        if path.startswith(self.TRAVIS_PREFIX):
+            path = path[len(self.TRAVIS_PREFIX) :]
+        return self.travis_globs.match(path) or (
+            rel_path is not None and self.travis_globs.match(rel_path)
+        )
+
+
 class Exceptions:
     """Interface for applying exceptions."""
 
@@ -37,6 +142,12 @@ class Exceptions:
                 self.exceptions: dict[Any, Any] = yaml.safe_load(fname)
             except (yaml.YAMLError, yaml.scanner.ScannerError) as ex:  # pyright: ignore
                 raise ValueError(f"{filename} is not a valid YAML file: {ex}") from ex
+        # Exceptions and compiled file exception matchers, by package and tool.
+        self.package_exceptions: dict[str, dict[Any, Any]] = {}
+        self.file_matchers: dict[
+            tuple[str, Optional[str]], tuple[list[Any], FileExceptionMatcher]
+        ] = {}
+        self.dir_matchers: dict[str, FileExceptionMatcher] = {}
 
     def get_ignore_packages(self) -> list[str]:
         """Get list of packages to skip when scanning a workspace.
@@ -55,6 +166,23 @@ class Exceptions:
     def get_exceptions(self, package: Package) -> dict[Any, Any]:
         """Get specific exceptions for given package.
 
+        The exceptions of each package are only gathered once.
+
+        Args:
+            package: Package to get exceptions for.
+
+        Returns:
+            Exceptions for the given package.
+        """
+        exceptions = self.package_exceptions.get(package.name)
+        if exceptions is None:
+            exceptions = self.gather_exceptions(package)
+            self.package_exceptions[package.name] = exceptions
+        return exceptions
+
+    def gather_exceptions(self, package: Package) -> dict[Any, Any]:
+        """Gather the global exceptions and the exceptions of a package.
+
         Args:
             package: Package to get exceptions for.
 
@@ -107,26 +235,71 @@ class Exceptions:
         Returns:
             List of files with exceptions removed.
         """
-        exceptions: dict[Any, Any] = self.get_exceptions(package)
-        to_remove = []
-        for filename in file_list:
-            removed = False
-            for exception in exceptions["file"]:
-                if exception["tools"] == "all":
-                    for pattern in exception["globs"]:
-                        # Hack to avoid exceptions for everything on Travis CI.
-                        fname = filename
-                        prefix = "/home/travis/build/"
-                        if pattern == "*/build/*" and fname.startswith(prefix):
-                            fname = fname[len(prefix) :]
-                        if fnmatch.fnmatch(fname, pattern):
-                            to_remove.append(filename)
-                            removed = True
-                            break
-                    if removed:
-                        break
-        file_list = [filename for filename in file_list if filename not in to_remove]
-        return file_list
+        matcher = self.get_file_matcher(
+            package, None, self.get_exceptions(package)["file"]
+        )
+        return [filename for filename in file_list if not matcher.match(filename)]
+
+    def is_dir_excepted(self, package: Package, path: str) -> bool:
+        """Check whether every file below a directory is excepted for all tools.
+
+        Only globs of exceptions with tools=all that end with * are used. If the path
+        of the directory followed by a separator matches such a glob, then so does the
+        path of every file below the directory, since the * at the end also matches the
+        rest of the path.
+
+        Args:
+            package: Package the directory is in.
+            path: Path of the directory.
+
+        Returns:
+            True if filter_file_exceptions_early would remove every file below the
+            directory, False otherwise.
+        """
+        matcher = self.dir_matchers.get(package.name)
+        if matcher is None:
+            matcher = FileExceptionMatcher(
+                [
+                    pattern
+                    for exception in self.get_exceptions(package)["file"]
+                    if exception["tools"] == "all"
+                    for pattern in exception["globs"]
+                    if pattern.endswith("*")
+                ]
+            )
+            self.dir_matchers[package.name] = matcher
+        return matcher.match(os.path.join(path, ""))
+
+    def get_file_matcher(
+        self, package: Package, tool: Optional[str], exceptions: list[Any]
+    ) -> FileExceptionMatcher:
+        """Get the compiled globs of the file exceptions of a tool.
+
+        Matchers are kept for each package and tool while the same exceptions are
+        applied.
+
+        Args:
+            package: Package the exceptions are for.
+            tool: Tool the exceptions apply to, or None for exceptions with tools=all.
+            exceptions: List of file exceptions.
+
+        Returns:
+            Matcher of the globs of the exceptions that apply to the tool.
+        """
+        key = (package.name, tool)
+        cached = self.file_matchers.get(key)
+        if cached is not None and cached[0] is exceptions:
+            return cached[1]
+        globs = [
+            pattern
+            for exception in exceptions
+            if exception["tools"] == "all"
+            or (tool is not None and tool in exception["tools"])
+            for pattern in exception["globs"]
+        ]
+        matcher = FileExceptionMatcher(globs)
+        self.file_matchers[key] = (exceptions, matcher)
+        return matcher
 
     def filter_file_exceptions(
         self, package: Package, exceptions: list[Any], issues: dict[str, list[Issue]]
@@ -141,31 +314,25 @@ class Exceptions:
         Returns:
             Filtered issues.
         """
-        for tool, tool_issues in list(  # pylint: disable=too-many-nested-blocks
-            issues.items()
-        ):
+        for tool, tool_issues in list(issues.items()):
+            matcher = self.get_file_matcher(package, tool, exceptions)
+            excepted: dict[str, bool] = {}
             warning_printed = False
-            to_remove: list[Issue] = []
             for issue in tool_issues:
+                if issue.filename in excepted:
+                    continue
                 if not os.path.isabs(issue.filename):
                     if not warning_printed:
                         self.print_exception_warning(tool)
                         warning_printed = True
+                    excepted[issue.filename] = False
                     continue
-                rel_path: str = os.path.relpath(issue.filename, package.path)
-                for exception in exceptions:
-                    if exception["tools"] == "all" or tool in exception["tools"]:
-                        for pattern in exception["globs"]:
-                            # Hack to avoid exceptions for everything on Travis CI.
-                            fname: str = issue.filename
-                            prefix: str = "/home/travis/build/"
-                            if pattern == "*/build/*" and fname.startswith(prefix):
-                                fname = fname[len(prefix) :]
-                            if fnmatch.fnmatch(fname, pattern) or fnmatch.fnmatch(
-                                rel_path, pattern
-                            ):
-                                to_remove.append(issue)
-            issues[tool] = [issue for issue in tool_issues if issue not in to_remove]
+                excepted[issue.filename] = matcher.match(
+                    issue.filename, os.path.relpath(issue.filename, package.path)
+                )
+            issues[tool] = [
+                issue for issue in tool_issues if not excepted[issue.filename]
+            ]
 
         return issues
 
@@ -0,0 +1,191 @@
+"""Index of the files found in a package.
+
+Discovery plugins look for files by extension, by name, by the start of their name or
+by words in the output of the file command. The files of a package are indexed once by
+extension and by name, so each plugin only looks at the files it finds instead of at
+every file. Files are indexed by the output of the file command when a plugin first
+asks for the type of a file it has not found by extension or name, grouping files with
+the same description, so that the output is only searched once for each description
+and the file command only runs for files whose type is needed.
+"""
+
+import bisect
+import threading
+from typing import Any, Iterable, Optional
+
+
+def get_extension(name: str) -> str:
+    """Get the extension of a file name.
+
+    Unlike os.path.splitext, a name that starts with a dot and has no other dot is an
+    extension, so that an extension matches exactly the names that end with it.
+
+    Args:
+        name: Lowercase name of the file.
+
+    Returns:
+        Extension including the dot, or an empty string if the name has no dot.
+    """
+    dot = name.rfind(".")
+    return name[dot:] if dot >= 0 else ""
+
+
+class FileIndex:  # pylint: disable=too-many-instance-attributes
+    """Index of the files found in a package."""
+
+    def __init__(self, files: dict[str, dict[str, str]]) -> None:
+        """Index files.
+
+        Args:
+            files: Files found in the package, by absolute path, in the order they
+                were found.
+        """
+        self.files = files
+        self.order: dict[str, int] = {}
+        self.by_extension: dict[str, list[str]] = {}
+        self.by_name: dict[str, list[str]] = {}
+        for position, (path, file_dict) in enumerate(files.items()):
+            self.order[path] = position
+            name = file_dict["name"]
+            self.by_name.setdefault(name, []).append(path)
+            self.by_extension.setdefault(get_extension(name), []).append(path)
+        self.sorted_names: Optional[list[str]] = None
+        self.by_file_type: dict[str, list[str]] = {}
+        self.typed: set[str] = set()
+        self.lock = threading.Lock()
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Get the state to pickle, which leaves out the lock.
+
+        Returns:
+            State of the index.
+        """
+        state = self.__dict__.copy()
+        del state["lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Restore the pickled state and create a new lock.
+
+        Args:
+            state: State of the index.
+        """
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def get_file_types(
+        self, paths: Optional[Iterable[str]] = None
+    ) -> dict[str, list[str]]:
+        """Group files by the output of the file command.
+
+        The output of the file command is only found for the files that are asked for
+        and have not been grouped yet.
+
+        Args:
+            paths: Paths of the files to group, or None for every file.
+
+        Returns:
+            Paths of the files grouped so far with each description of the file
+            command.
+        """
+        if paths is None:
+            paths = self.files
+        # Discovery plugins running at the same time share the index.
+        with self.lock:
+            new_paths = [path for path in paths if path not in self.typed]
+            if not new_paths:
+                return self.get_groups()
+            # Files found together have their types found together, in one batch for
+            # each set of pending files.
+            batches: dict[int, tuple[Any, list[Any]]] = {}
+            for path in new_paths:
+                pending = getattr(self.files[path], "pending", None)
+                if pending is not None:
+                    batches.setdefault(id(pending), (pending, []))[1].append(
+                        self.files[path]
+                    )
+            for pending, file_dicts in batches.values():
+                pending.resolve(file_dicts)
+            for path in sorted(new_paths, key=self.order.__getitem__):
+                output = self.files[path]["file_cmd_out"]
+                # The output starts with the path of the file, which is not grouped.
+                prefix = path.lower() + ": "
+                if output.startswith(prefix):
+                    output = output[len(prefix) :]
+                self.by_file_type.setdefault(output, []).append(path)
+                self.typed.add(path)
+            return self.get_groups()
+
+    def get_groups(self) -> dict[str, list[str]]:
+        """Copy the files grouped so far, which other plugins may add to.
+
+        Returns:
+            Paths of the files grouped so far with each description of the file
+            command.
+        """
+        return {output: list(paths) for output, paths in self.by_file_type.items()}
+
+    def find(
+        self,
+        extensions: Iterable[str] = (),
+        names: Iterable[str] = (),
+        prefixes: Iterable[str] = (),
+        file_types: Iterable[str] = (),
+        exclude: tuple[str, ...] = (),
+    ) -> list[str]:
+        """Find files by extension, name, start of name or output of the file command.
+
+        Args:
+            extensions: Lowercase extensions, including the dot.
+            names: Lowercase names.
+            prefixes: Lowercase starts of names.
+            file_types: Words in the lowercase output of the file command.
+            exclude: Lowercase endings of names of files to leave out.
+
+        Returns:
+            Paths of the files that match any of the arguments, in the order the files
+            were found.
+        """
+        found: list[str] = []
+        for extension in extensions:
+            found += self.by_extension.get(extension, [])
+        for name in names:
+            found += self.by_name.get(name, [])
+        if prefixes:
+            if self.sorted_names is None:
+                self.sorted_names = sorted(self.by_name)
+            for prefix in prefixes:
+                start = bisect.bisect_left(self.sorted_names, prefix)
+                for name in self.sorted_names[start:]:
+                    if not name.startswith(prefix):
+                        break
+                    found += self.by_name[name]
+        if file_types:
+            # Only files not found otherwise and not left out need their type.
+            known = set(found)
+            candidates = [
+                path
+                for path in self.files
+                if path not in known
+                and not (exclude and self.files[path]["name"].endswith(exclude))
+            ]
+            for output, paths in self.get_file_types(candidates).items():
+                if any(file_type in output for file_type in file_types):
+                    found += paths
+        if exclude:
+            found = [
+                path for path in found if not self.files[path]["name"].endswith(exclude)
+            ]
+        return self.merge(found)
+
+    def merge(self, *path_lists: list[str]) -> list[str]:
+        """Merge lists of files found in the package.
+
+        Args:
+            path_lists: Lists of paths of files.
+
+        Returns:
+            Paths in any of the lists, once each, in the order the files were found.
+        """
+        paths = {path for path_list in path_lists for path in path_list}
+        return sorted(paths, key=self.order.__getitem__)
@@ -0,0 +1,148 @@
+"""Find the type of a file without running the file command.
+
+Discovery plugins look for words such as "python script" in the output of the file
+command, but most files are decided by their extension or their first bytes. Files
+with an extension that a discovery plugin already finds them by are named after it
+without being opened, since they are found whatever their content. Only the start of
+the other files is read, to tell empty files, binary files and scripts with a known
+interpreter apart, so that scripts are still found by their content whatever their
+extension. Files that can not be decided this way are left to the file command.
+"""
+
+import os
+import re
+from typing import Optional
+
+# Number of bytes read from the start of each file.
+SNIFF_SIZE = 512
+
+# Descriptions of binary files, by the bytes they start with.
+MAGIC_TYPES = [
+    (b"\x7fELF", "ELF"),
+    (b"\x89PNG", "PNG image data"),
+    (b"GIF8", "GIF image data"),
+    (b"\xff\xd8\xff", "JPEG image data"),
+    (b"%PDF-", "PDF document"),
+    (b"PK\x03\x04", "Zip archive data"),
+    (b"\x1f\x8b", "gzip compressed data"),
+]
+
+# Text in these encodings has null bytes, so it is left to the file command.
+UNICODE_BOMS = (b"\xff\xfe", b"\xfe\xff")
+
+# Descriptions of scripts, by the name of their interpreter without version numbers.
+SHEBANG_TYPES = {
+    "bash": "Bourne-Again shell script",
+    "csh": "C shell script",
+    "dash": "a /bin/dash script",
+    "ksh": "Korn shell script",
+    "perl": "Perl script",
+    "python": "Python script",
+    "sh": "POSIX shell script",
+    "tcsh": "Tenex C shell script",
+    "zsh": "Paul Falstad's zsh script",
+}
+
+# Descriptions of files, by an extension that a discovery plugin finds files by. Files
+# with other extensions may still be found by their content, so they are not listed.
+EXTENSION_TYPES = {
+    ".bash": "Bourne-Again shell script",
+    ".bib": "BibTeX text file",
+    ".c": "C source",
+    ".cc": "C++ source",
+    ".class": "compiled Java class data",
+    ".cmake": "CMake text",
+    ".cpp": "C++ source",
+    ".css": "CSS text",
+    ".cxx": "C++ source",
+    ".h": "C source",
+    ".hpp": "C++ source",
+    ".html": "HTML document",
+    ".hxx": "C++ source",
+    ".java": "Java source",
+    ".js": "JavaScript source",
+    ".md": "Markdown text",
+    ".pl": "Perl script",
+    ".py": "Python script",
+    ".rst": "reStructuredText text",
+    ".sh": "POSIX shell script",
+    ".tex": "LaTeX document",
+    ".xml": "XML document text",
+    ".yaml": "YAML text",
+    ".yml": "YAML text",
+    ".zsh": "Paul Falstad's zsh script",
+}
+
+
+def get_shebang_type(line: bytes) -> Optional[str]:
+    """Get the type of a script from its first line.
+
+    Args:
+        line: First line of the file.
+
+    Returns:
+        Description of the script, or None if the line does not name a known
+        interpreter.
+    """
+    if not line.startswith(b"#!"):
+        return None
+    words = line[2:].decode("utf8", "replace").split()
+    if words and os.path.basename(words[0]) == "env":
+        # The interpreter is the first word after the options and variables of env.
+        words = [word for word in words[1:] if "=" not in word]
+        words = [word for word in words if not word.startswith("-")]
+    if not words:
+        return None
+    match = re.match(r"[a-z]+", os.path.basename(words[0]))
+    if match is None:
+        return None
+    return SHEBANG_TYPES.get(match.group())
+
+
+def get_extension_type(full_path: str) -> Optional[str]:
+    """Get the type of a file from its extension alone.
+
+    Args:
+        full_path: Full path to the file.
+
+    Returns:
+        Description of the file, or None if the extension does not decide it.
+    """
+    return EXTENSION_TYPES.get(os.path.splitext(full_path)[1].lower())
+
+
+def sniff_file_type(  # pylint: disable=too-many-return-statements
+    full_path: str,
+) -> Optional[str]:
+    """Get the type of a file from its extension, or else from its first bytes.
+
+    Files with an extension that a discovery plugin finds files by are not opened.
+
+    Args:
+        full_path: Full path to the file.
+
+    Returns:
+        Description of the file, or None if the file command is needed to tell.
+    """
+    extension_type = get_extension_type(full_path)
+    if extension_type is not None:
+        return extension_type
+    try:
+        with open(full_path, "rb") as fid:
+            head = fid.read(SNIFF_SIZE)
+    except OSError:
+        return None
+
+    if not head:
+        return "empty"
+    for magic, description in MAGIC_TYPES:
+        if head.startswith(magic):
+            return description
+    if head.startswith(UNICODE_BOMS):
+        return None
+    if b"\0" in head:
+        return "data"
+    shebang_type = get_shebang_type(head.split(b"\n", 1)[0])
+    if shebang_type is not None:
+        return shebang_type + ", text executable"
+    return None
@@ -0,0 +1,260 @@
+"""Watch a directory tree for changed files.
+
+On Linux the kernel reports changes through inotify, so nothing is read until a file
+changes. Elsewhere, or if inotify can not be used, the tree is listed again every
+interval and compared with the previous listing.
+
+Changes are reported as paths. A path that is a directory, or that no longer exists,
+means anything below it may have changed, such as when a directory is moved into the
+tree or the kernel dropped events.
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import time
+from typing import Optional, Tuple
+
+# Directories whose contents change without any sources changing.
+IGNORED_DIRS = [".git", ".hg", ".svn"]
+
+
+class FileWatcher:
+    """Watch a directory tree by listing it again every interval."""
+
+    def __init__(
+        self, path: str, ignore: Optional[list[str]] = None, interval: float = 1.0
+    ) -> None:
+        """Initialize the watcher.
+
+        Args:
+            path: Top directory of the tree to watch.
+            ignore: Directories whose changes are ignored, such as the output directory.
+            interval: Seconds between listings of the tree.
+        """
+        self.path = os.path.abspath(path)
+        self.ignore = {os.path.abspath(directory) for directory in ignore or []}
+        self.interval = interval
+        self.files: dict[str, Tuple[int, int]] = {}
+        self.start()
+
+    def start(self) -> None:
+        """Start watching, by listing the files in the tree."""
+        self.files = self.list_files()
+
+    def is_ignored(self, directory: str, name: str) -> bool:
+        """Check if changes in a directory are ignored.
+
+        Args:
+            directory: Parent of the directory.
+            name: Name of the directory.
+
+        Returns:
+            True if changes in the directory are ignored, False otherwise.
+        """
+        return name in IGNORED_DIRS or os.path.join(directory, name) in self.ignore
+
+    def list_files(self) -> dict[str, Tuple[int, int]]:
+        """List the files in the tree.
+
+        Returns:
+            Modification time and size of each file.
+        """
+        files: dict[str, Tuple[int, int]] = {}
+        for root, dirs, names in os.walk(self.path):
+            dirs[:] = [name for name in dirs if not self.is_ignored(root, name)]
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files[path] = (stat.st_mtime_ns, stat.st_size)
+        return files
+
+    def poll(self, timeout: float) -> set[str]:
+        """Wait for files to change.
+
+        Args:
+            timeout: Seconds to wait for.
+
+        Returns:
+            Paths that changed, which is empty if nothing changed in time.
+        """
+        time.sleep(min(timeout, self.interval))
+        files = self.list_files()
+        changed = {
+            path
+            for path in set(files) | set(self.files)
+            if files.get(path) != self.files.get(path)
+        }
+        self.files = files
+        return changed
+
+    def wait(self, settle: float = 0.2) -> set[str]:
+        """Wait until files change and then stop changing.
+
+        Editors often save a file in several steps, so changes are gathered until none
+        happen for a while.
+
+        Args:
+            settle: Seconds without changes after which the changes are reported.
+
+        Returns:
+            Paths that changed.
+        """
+        changed: set[str] = set()
+        while not changed:
+            changed = self.poll(3600.0)
+        while True:
+            more = self.poll(settle)
+            if not more:
+                return changed
+            changed |= more
+
+    def close(self) -> None:
+        """Stop watching."""
+
+
+class InotifyWatcher(FileWatcher):
+    """Watch a directory tree with Linux inotify."""
+
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_ISDIR = 0x40000000
+    WATCH_MASK = (
+        IN_MODIFY
+        | IN_ATTRIB
+        | IN_CLOSE_WRITE
+        | IN_MOVED_FROM
+        | IN_MOVED_TO
+        | IN_CREATE
+        | IN_DELETE
+        | IN_ONLYDIR
+    )
+    EVENT = struct.Struct("iIII")
+
+    def start(self) -> None:
+        """Start watching, by watching every directory in the tree.
+
+        Raises:
+            OSError: If inotify can not be used.
+        """
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self.dirs: dict[int, str] = {}
+        try:
+            self.add_tree(self.path)
+        except OSError:
+            self.close()
+            raise
+
+    def add_watch(self, directory: str) -> None:
+        """Watch a directory.
+
+        Args:
+            directory: Directory to watch.
+
+        Raises:
+            OSError: If the directory can not be watched, such as when the limit of
+                watches is reached.
+        """
+        wd = self.libc.inotify_add_watch(
+            self.fd, os.fsencode(directory), self.WATCH_MASK
+        )
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"{os.strerror(errno)}: {directory}")
+        self.dirs[wd] = directory
+
+    def add_tree(self, directory: str) -> None:
+        """Watch a directory and all directories below it.
+
+        Args:
+            directory: Top directory to watch.
+        """
+        for root, dirs, _ in os.walk(directory):
+            dirs[:] = [name for name in dirs if not self.is_ignored(root, name)]
+            try:
+                self.add_watch(root)
+            except FileNotFoundError:
+                continue
+
+    def poll(self, timeout: float) -> set[str]:
+        """Wait for files to change.
+
+        Args:
+            timeout: Seconds to wait for.
+
+        Returns:
+            Paths that changed, which is empty if nothing changed in time.
+        """
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+        data = os.read(self.fd, 1 << 16)
+        changed: set[str] = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = self.EVENT.unpack_from(data, offset)
+            offset += self.EVENT.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+            if mask & self.IN_Q_OVERFLOW:
+                logging.warning("Too many changes at once, finding files again.")
+                changed.add(self.path)
+                continue
+            directory = self.dirs.get(wd)
+            if mask & self.IN_IGNORED:
+                self.dirs.pop(wd, None)
+                continue
+            if directory is None or not name or self.is_ignored(directory, name):
+                continue
+            path = os.path.join(directory, name)
+            changed.add(path)
+            if mask & self.IN_ISDIR and mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                self.add_tree(path)
+        return changed
+
+    def close(self) -> None:
+        """Stop watching."""
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def create_watcher(
+    path: str, ignore: Optional[list[str]] = None, interval: float = 1.0
+) -> FileWatcher:
+    """Watch a directory tree with inotify where possible, by listing it otherwise.
+
+    Args:
+        path: Top directory of the tree to watch.
+        ignore: Directories whose changes are ignored, such as the output directory.
+        interval: Seconds between listings of the tree when inotify is not used.
+
+    Returns:
+        Watcher of the tree.
+    """
+    try:
+        return InotifyWatcher(path, ignore, interval)
+    except (OSError, AttributeError) as ex:
+        logging.info("Unable to use inotify, listing files instead: %s", ex)
+        return FileWatcher(path, ignore, interval)
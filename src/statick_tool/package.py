@@ -1,5 +1,9 @@
 """Package interface."""
 
+from typing import Optional
+
+from statick_tool.file_index import FileIndex
+
 
 class Package(dict):  # type: ignore
     """Default implementation of package interface."""
@@ -17,3 +21,17 @@ class Package(dict):  # type: ignore
         self.path = path
         self.files: dict[str, dict[str, str]] = {}
         self._walked = False
+        self.file_index: Optional[FileIndex] = None
+
+    def get_file_index(self) -> FileIndex:
+        """Get the index of the files found in the package.
+
+        The index is made the first time it is needed after the files change. Whoever
+        changes the files sets file_index to None.
+
+        Returns:
+            Index of the files.
+        """
+        if self.file_index is None or self.file_index.files is not self.files:
+            self.file_index = FileIndex(self.files)
+        return self.file_index
@@ -0,0 +1,164 @@
+"""Find the packages in a workspace.
+
+A directory is a package if it contains a ROS package manifest or Python packaging
+file. Directories containing an ignore marker are skipped along with everything below
+them.
+
+Each directory is listed once. Listings can be kept on disk between runs. A kept listing
+is used while the modification time of its directory is unchanged, since adding,
+removing or renaming an entry in a directory updates the modification time of that
+directory.
+"""
+
+import json
+import logging
+import os
+from typing import Any, Optional
+
+from statick_tool.package import Package
+
+
+class PackageIndex:
+    """Find the packages in a workspace."""
+
+    IGNORE_FILES = ["AMENT_IGNORE", "CATKIN_IGNORE", "COLCON_IGNORE"]
+    PACKAGE_INDICATORS = ["package.xml", "setup.py", "pyproject.toml"]
+
+    def __init__(self, cache_file: Optional[str] = None) -> None:
+        """Initialize the index.
+
+        Args:
+            cache_file: File to keep directory listings in between runs. Listings are
+                not kept if no file is given.
+        """
+        self.cache_file = cache_file
+        self.listings: dict[str, dict[str, Any]] = {}
+        self.visited: dict[str, dict[str, Any]] = {}
+        if cache_file is not None and os.path.isfile(cache_file):
+            try:
+                with open(cache_file, "r", encoding="utf8") as fid:
+                    listings = json.load(fid)
+            except (OSError, ValueError) as ex:
+                logging.warning("Unable to read package index %s: %s", cache_file, ex)
+            else:
+                if isinstance(listings, dict):
+                    self.listings = listings
+
+    def save(self) -> None:
+        """Write the listings of the directories visited in this run to the cache file.
+
+        Directories that were not visited, for example because they were removed, are
+        dropped from the cache file.
+        """
+        if self.cache_file is None:
+            return
+        tmp_file = f"{self.cache_file}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(
+                os.path.dirname(os.path.abspath(self.cache_file)), exist_ok=True
+            )
+            with open(tmp_file, "w", encoding="utf8") as fid:
+                json.dump(self.visited, fid)
+            os.replace(tmp_file, self.cache_file)
+        except OSError as ex:
+            logging.warning("Unable to write package index %s: %s", self.cache_file, ex)
+
+    def list_dir(self, path: str) -> dict[str, Any]:
+        """List the markers and subdirectories of a directory.
+
+        Args:
+            path: Directory to list.
+
+        Returns:
+            Names of package indicators and ignore markers in the directory under
+            "markers", and name and whether it is a symbolic link of each subdirectory
+            under "dirs", sorted by name.
+        """
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return {"mtime": None, "markers": [], "dirs": []}
+
+        listing = self.listings.get(path)
+        if listing is None or listing.get("mtime") != mtime:
+            markers: list[str] = []
+            dirs: list[list[Any]] = []
+            try:
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        if entry.name in self.PACKAGE_INDICATORS + self.IGNORE_FILES:
+                            markers.append(entry.name)
+                        try:
+                            if entry.is_dir():
+                                dirs.append([entry.name, entry.is_symlink()])
+                        except OSError:
+                            continue
+            except OSError:
+                pass
+            listing = {"mtime": mtime, "markers": markers, "dirs": sorted(dirs)}
+
+        self.visited[path] = listing
+        return listing
+
+    def is_ignored(self, listing: dict[str, Any]) -> bool:
+        """Check if a directory contains an ignore marker.
+
+        Args:
+            listing: Listing of the directory.
+
+        Returns:
+            True if the directory and everything below it are ignored, False otherwise.
+        """
+        return any(marker in self.IGNORE_FILES for marker in listing["markers"])
+
+    def find_packages(
+        self,
+        path: str,
+        ignore_packages: Optional[list[str]] = None,
+        package_names: Optional[list[str]] = None,
+    ) -> list[Package]:
+        """Find the packages below a workspace directory.
+
+        The workspace directory itself is not a package. Packages are returned in the
+        order they are found, walking the workspace top-down by name.
+
+        Args:
+            path: Workspace directory.
+            ignore_packages: Names of packages to leave out. Directories below them are
+                still searched.
+            package_names: Names of the only packages wanted. The whole workspace is
+                still searched, since more than one package can have a wanted name.
+
+        Returns:
+            Packages found.
+        """
+        path = os.path.abspath(path)
+        packages: list[Package] = []
+        wanted = set(package_names) if package_names is not None else None
+        if wanted is not None and not wanted:
+            return packages
+
+        listing = self.list_dir(path)
+        if self.is_ignored(listing):
+            return packages
+
+        stack = [(path, listing)]
+        while stack:
+            root, listing = stack.pop()
+            children = []
+            for name, is_symlink in listing["dirs"]:
+                full_dir = os.path.join(root, name)
+                child = self.list_dir(full_dir)
+                if self.is_ignored(child):
+                    continue
+                if any(
+                    marker in self.PACKAGE_INDICATORS for marker in child["markers"]
+                ) and not (ignore_packages and name in ignore_packages):
+                    if wanted is None or name in wanted:
+                        packages.append(Package(name, full_dir))
+                # Like os.walk, symbolic links to directories are not followed.
+                if not is_symlink:
+                    children.append((full_dir, child))
+            stack += reversed(children)
+
+        return packages
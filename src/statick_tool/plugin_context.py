@@ -1,12 +1,38 @@
 """Plugin context interface."""
 
 import argparse
-from typing import NamedTuple
+import os
+from typing import NamedTuple, Optional
 
 from statick_tool.config import Config
 from statick_tool.resources import Resources
+from statick_tool.result_cache import ResultCache
 
-PluginContext = NamedTuple(
-    "PluginContext",
-    [("args", argparse.Namespace), ("resources", Resources), ("config", Config)],
-)
+
+class PluginContext(NamedTuple):
+    """Context shared by the plugins that scan a package.
+
+    Plugins write logs and scratch files below the output directory instead of the
+    current working directory, which is shared by every thread of the process. Tool
+    plugins reuse issues kept in the result cache, if one is in use.
+    """
+
+    args: argparse.Namespace
+    resources: Resources
+    config: Config
+    output_dir: Optional[str] = None
+    result_cache: Optional[ResultCache] = None
+
+    def get_output_path(self, *names: str) -> str:
+        """Get the path of a file written by a plugin.
+
+        Args:
+            names: Path of the file relative to the output directory.
+
+        Returns:
+            Path of the file below the output directory, or relative to the current
+            working directory if there is no output directory.
+        """
+        if self.output_dir is None:
+            return os.path.join(*names)
+        return os.path.join(self.output_dir, *names)
@@ -0,0 +1,137 @@
+"""Registry of plugins that are loaded on first use.
+
+Plugins are advertised through entry points. Looking up the entry points only reads
+package metadata, so the names of all plugins are known cheaply at startup. The module
+providing a plugin is imported, and the plugin instantiated, the first time the plugin is
+used. Gathering the arguments of the plugins imports every plugin module, but only
+instantiates the plugins that add arguments of their own.
+"""
+
+import argparse
+import sys
+from collections.abc import MutableMapping
+from typing import Any, Iterator, Optional
+
+if sys.version_info < (3, 10):
+    from importlib_metadata import entry_points
+else:
+    from importlib.metadata import entry_points
+
+
+class PluginRegistry(MutableMapping):  # type: ignore[type-arg]
+    """Registry of plugins that are loaded on first use."""
+
+    def __init__(self, group: str, base: Optional[type] = None) -> None:
+        """Initialize the registry from the entry points of a plugin group.
+
+        Args:
+            group: Name of the entry point group that advertises the plugins.
+            base: Base class of the plugins, whose gather_args adds no arguments.
+        """
+        self.group = group
+        self.base = base
+        self.entry_points = {
+            plugin_type.name: plugin_type for plugin_type in entry_points(group=group)
+        }
+        self.plugin_types: dict[str, type] = {}
+        self.plugins: dict[str, Any] = {}
+
+    def get_plugin_type(self, name: str) -> type:
+        """Get the class of a plugin without instantiating it.
+
+        Args:
+            name: Name of a plugin advertised by an entry point.
+
+        Returns:
+            Class of the plugin.
+        """
+        if name not in self.plugin_types:
+            self.plugin_types[name] = self.entry_points[name].load()
+        return self.plugin_types[name]
+
+    def gather_args(self, args: argparse.ArgumentParser) -> None:
+        """Add the arguments of the plugins to a parser.
+
+        Plugins that are not loaded yet and do not override gather_args of the base
+        class add no arguments, so they are not instantiated.
+
+        Args:
+            args: Argument parser that arguments will be added to.
+        """
+        for name in list(self):
+            if name not in self.plugins and self.base is not None:
+                gather_args = getattr(self.get_plugin_type(name), "gather_args", None)
+                if gather_args is getattr(self.base, "gather_args", None):
+                    continue
+            self[name].gather_args(args)
+
+    def __getitem__(self, name: str) -> Any:
+        """Get a plugin, loading it if this is the first time it is used.
+
+        Args:
+            name: Name of the plugin.
+
+        Returns:
+            Plugin instance.
+        """
+        if name not in self.plugins:
+            self.plugins[name] = self.get_plugin_type(name)()
+        return self.plugins[name]
+
+    def __setitem__(self, name: str, plugin: Any) -> None:
+        """Add or replace a plugin.
+
+        Args:
+            name: Name of the plugin.
+            plugin: Plugin instance.
+        """
+        self.plugins[name] = plugin
+
+    def __delitem__(self, name: str) -> None:
+        """Remove a plugin.
+
+        Args:
+            name: Name of the plugin.
+        """
+        if name not in self:
+            raise KeyError(name)
+        self.plugins.pop(name, None)
+        self.plugin_types.pop(name, None)
+        self.entry_points.pop(name, None)
+
+    def __contains__(self, name: object) -> bool:
+        """Check if a plugin is available without loading it.
+
+        Args:
+            name: Name of the plugin.
+
+        Returns:
+            True if the plugin is available, False otherwise.
+        """
+        return name in self.plugins or name in self.entry_points
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the names of available plugins without loading them.
+
+        Returns:
+            Iterator over plugin names.
+        """
+        yield from self.entry_points
+        yield from (name for name in self.plugins if name not in self.entry_points)
+
+    def __len__(self) -> int:
+        """Get the number of available plugins.
+
+        Returns:
+            Number of available plugins.
+        """
+        return len(set(self.entry_points) | set(self.plugins))
+
+    def __repr__(self) -> str:
+        """Get a printable representation of the registry.
+
+        Returns:
+            Names of the available plugins and whether each one is loaded.
+        """
+        names = {name: name in self.plugins for name in self}
+        return f"PluginRegistry({self.group!r}, loaded={names})"
@@ -0,0 +1,102 @@
+"""Run plugins concurrently while honoring the dependencies between them.
+
+Plugins declare the other plugins that must run before them. Those declarations form a
+directed acyclic graph. Any plugin whose dependencies have all finished is free to run
+at the same time as other ready plugins, up to a maximum number of workers.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class PluginScheduler:
+    """Run plugins concurrently while honoring the dependencies between them."""
+
+    def __init__(self, max_workers: int = 1) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            max_workers: Maximum number of plugins to run at the same time.
+        """
+        self.max_workers = max(1, max_workers)
+
+    @staticmethod
+    def get_ready(
+        pending: list[str], dependencies: dict[str, list[str]], done: set[str]
+    ) -> list[str]:
+        """Get pending plugins whose dependencies have all finished.
+
+        Args:
+            pending: Plugins that have not been started, in preferred run order.
+            dependencies: Names of plugins each plugin depends on.
+            done: Plugins that have finished.
+
+        Returns:
+            Plugins that are ready to run, in preferred run order.
+        """
+        return [
+            name
+            for name in pending
+            if all(dependency in done for dependency in dependencies.get(name, []))
+        ]
+
+    def run(
+        self,
+        plugins: list[str],
+        dependencies: dict[str, list[str]],
+        task: Callable[[str], T],
+    ) -> dict[str, T]:
+        """Run a task for each plugin once its dependencies have finished.
+
+        Dependencies on plugins that are not in the list of plugins to run are assumed
+        to be satisfied already.
+
+        Args:
+            plugins: Names of plugins to run, in preferred run order.
+            dependencies: Names of plugins each plugin depends on.
+            task: Function to call with the name of each plugin.
+
+        Returns:
+            Result of the task for each plugin, in the same order as the plugins list.
+
+        Raises:
+            ValueError: If the dependencies between plugins form a cycle.
+        """
+        dependencies = {
+            name: [dep for dep in dependencies.get(name, []) if dep in plugins]
+            for name in plugins
+        }
+        pending = list(plugins)
+        done: set[str] = set()
+        results: dict[str, T] = {}
+
+        if self.max_workers == 1:
+            while pending:
+                ready = self.get_ready(pending, dependencies, done)
+                if not ready:
+                    raise ValueError(f"Circular dependency between plugins {pending}")
+                name = ready[0]
+                pending.remove(name)
+                results[name] = task(name)
+                done.add(name)
+            return {name: results[name] for name in plugins}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            running: dict[Future[T], str] = {}
+            while pending or running:
+                for name in self.get_ready(pending, dependencies, done):
+                    if len(running) >= self.max_workers:
+                        break
+                    pending.remove(name)
+                    running[executor.submit(task, name)] = name
+                if not running:
+                    raise ValueError(f"Circular dependency between plugins {pending}")
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    results[name] = future.result()
+                    done.add(name)
+
+        return {name: results[name] for name in plugins}
@@ -1,7 +1,6 @@
 """Discover C files to analyze."""
 
 import logging
-from collections import OrderedDict
 from typing import Optional
 
 from statick_tool.discovery_plugin import DiscoveryPlugin
@@ -30,22 +29,16 @@ class CDiscoveryPlugin(DiscoveryPlugin):
             level: The level of scanning.
             exceptions: Optional exceptions to apply.
         """
-        c_files: list[str] = []
         c_extensions = (".c", ".cc", ".cpp", ".cxx", ".h", ".hxx", ".hpp")
         c_output = ("c source", "c program", "c++ source")
 
         self.find_files(package)
 
-        for file_dict in package.files.values():
-            if file_dict["name"].endswith(c_extensions):
-                c_files.append(file_dict["path"])
-
-            if any(
-                item in file_dict["file_cmd_out"] for item in c_output
-            ) and not file_dict["name"].endswith(".cfg"):
-                c_files.append(file_dict["path"])
-
-        c_files = list(OrderedDict.fromkeys(c_files))
+        index = package.get_file_index()
+        c_files: list[str] = index.merge(
+            index.find(extensions=c_extensions),
+            index.find(file_types=c_output, exclude=(".cfg",)),
+        )
 
         logging.info("  %d C/C++ files found.", len(c_files))
         if exceptions:
@@ -66,17 +66,12 @@ class CMakeDiscoveryPlugin(DiscoveryPlugin):
         if self.plugin_context is None:
             return
 
-        package["cmake_src"] = []
-
         self.find_files(package)
 
-        for file_dict in package.files.values():
-            # Check for all lower-case file name since that is how they are stored.
-            if (
-                file_dict["name"].endswith(".cmake")
-                or file_dict["name"] == "cmakelists.txt"
-            ):
-                package["cmake_src"].append(file_dict["path"])
+        # Check for all lower-case file name since that is how they are stored.
+        package["cmake_src"] = package.get_file_index().find(
+            extensions=[".cmake"], names=["cmakelists.txt"]
+        )
 
         package["make_targets"] = []
         package["headers"] = []
@@ -88,7 +83,9 @@ class CMakeDiscoveryPlugin(DiscoveryPlugin):
         package["cmake"] = [os.path.join(package.path, "CMakeLists.txt")]
 
         cmake_template = self.plugin_context.resources.get_file("CMakeLists.txt.in")
-        shutil.copyfile(cmake_template, "CMakeLists.txt")  # type: ignore
+        shutil.copyfile(
+            cmake_template, self.get_output_path("CMakeLists.txt")  # type: ignore
+        )
 
         tool_flags: Union[str, None] = self.plugin_context.config.get_tool_config(
             "make", level, "flags", ""
@@ -137,12 +134,19 @@ class CMakeDiscoveryPlugin(DiscoveryPlugin):
 
         try:
             output: str = subprocess.check_output(
-                subproc_args, stderr=subprocess.STDOUT, universal_newlines=True
+                subproc_args,
+                stderr=subprocess.STDOUT,
+                universal_newlines=True,
+                cwd=self.get_working_dir(),
             )
         except subprocess.CalledProcessError as ex:
             output = ex.output
             logging.warning("Problem running CMake! Returncode = %d", ex.returncode)
-            logging.warning("From %s, running %s", os.getcwd(), subproc_args)
+            logging.warning(
+                "From %s, running %s",
+                self.get_working_dir() or os.getcwd(),
+                subproc_args,
+            )
             logging.warning("CMake output: %s", ex.output)
 
         except OSError:
@@ -152,7 +156,7 @@ class CMakeDiscoveryPlugin(DiscoveryPlugin):
         logging.debug("%s", output)
 
         if self.plugin_context and self.plugin_context.args.output_directory:
-            with open("cmake.log", "w", encoding="utf8") as fid:
+            with open(self.get_output_path("cmake.log"), "w", encoding="utf8") as fid:
                 fid.write(output)
 
         self.process_output(output, package)
@@ -1,7 +1,6 @@
 """Discover CSS files to analyze."""
 
 import logging
-from collections import OrderedDict
 from typing import Optional
 
 from statick_tool.discovery_plugin import DiscoveryPlugin
@@ -30,17 +29,11 @@ class CSSDiscoveryPlugin(DiscoveryPlugin):
             level: The level of scanning.
             exceptions: Optional exceptions to apply.
         """
-        src_files: list[str] = []
-
         self.find_files(package)
 
-        for file_dict in package.files.values():
-            if file_dict["name"].endswith(".css") and not file_dict["name"].endswith(
-                ".min.css"
-            ):
-                src_files.append(file_dict["path"])
-
-        src_files = list(OrderedDict.fromkeys(src_files))
+        src_files: list[str] = package.get_file_index().find(
+            extensions=[".css"], exclude=(".min.css",)
+        )
 
         logging.info("  %d CSS source files found.", len(src_files))
         if exceptions:
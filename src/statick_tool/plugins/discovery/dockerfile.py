@@ -1,7 +1,6 @@
 """Discover Dockerfile files to analyze."""
 
 import logging
-from collections import OrderedDict
 from typing import Optional
 
 from statick_tool.discovery_plugin import DiscoveryPlugin
@@ -30,18 +29,13 @@ class DockerfileDiscoveryPlugin(DiscoveryPlugin):
             level: The level of scanning.
             exceptions: Optional exceptions to apply.
         """
-        src_files: list[str] = []
         yaml_extensions = (".yaml", ".yml")
 
         self.find_files(package)
 
-        for file_dict in package.files.values():
-            if file_dict["name"].startswith("dockerfile") and not file_dict[
-                "name"
-            ].endswith(yaml_extensions):
-                src_files.append(file_dict["path"])
-
-        src_files = list(OrderedDict.fromkeys(src_files))
+        src_files: list[str] = package.get_file_index().find(
+            prefixes=["dockerfile"], exclude=yaml_extensions
+        )
 
         logging.info("  %d Dockerfile files found.", len(src_files))
         if exceptions:
@@ -1,7 +1,6 @@
 """Discover Groovy files to analyze."""
 
 import logging
-from collections import OrderedDict
 from typing import Optional
 
 from statick_tool.discovery_plugin import DiscoveryPlugin
@@ -30,19 +29,11 @@ class GroovyDiscoveryPlugin(DiscoveryPlugin):
             level: The level of scanning.
             exceptions: Optional exceptions to apply.
         """
-        src_files: list[str] = []
-
         self.find_files(package)
 
-        for file_dict in package.files.values():
-            if (
-                file_dict["name"].endswith(".groovy")
-                or file_dict["name"].endswith(".gradle")
-                or file_dict["name"].startswith("jenkinsfile")
-            ):
-                src_files.append(file_dict["path"])
-
-        src_files = list(OrderedDict.fromkeys(src_files))
+        src_files: list[str] = package.get_file_index().find(
+            extensions=[".groovy", ".gradle"], prefixes=["jenkinsfile"]
+        )
 
         logging.info("  %d Groovy source files found.", len(src_files))
         if exceptions:
@@ -1,7 +1,6 @@
 """Discover HTML files to analyze."""
 
 import logging
-from collections import OrderedDict
 from typing import Optional
 
 from statick_tool.discovery_plugin import DiscoveryPlugin
@@ -30,18 +29,11 @@ class HTMLDiscoveryPlugin(DiscoveryPlugin):
             level: The level of scanning.
             exceptions: Optional exceptions to apply.
         """
-        src_files: list[str] = []
-
         self.find_files(package)
 
-        for file_dict in package.files.values():
-            if (
-                file_dict["name"].endswith(".html")
-                or "html document" in file_dict["file_cmd_out"]
-            ):
-                src_files.append(file_dict["path"])
-
-        src_files = list(OrderedDict.fromkeys(src_files))
+        src_files: list[str] = package.get_file_index().find(
+            extensions=[".html"], file_types=["html document"]
+        )
 
         logging.info("  %d HTML source files found.", len(src_files))
         if exceptions:
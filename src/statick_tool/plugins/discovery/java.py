@@ -1,7 +1,6 @@
 """Discover Java files to analyze."""
 
 import logging
-from collections import OrderedDict
 from typing import Optional
 
 from statick_tool.discovery_plugin import DiscoveryPlugin
@@ -30,19 +29,11 @@ class JavaDiscoveryPlugin(DiscoveryPlugin):
             level: The level of scanning.
             exceptions: Optional exceptions to apply.
         """
-        java_src_files: list[str] = []
-        java_class_files: list[str] = []
-
         self.find_files(package)
 
-        for file_dict in package.files.values():
-            if file_dict["name"].endswith(".java"):
-                java_src_files.append(file_dict["path"])
-            if file_dict["name"].endswith(".class"):
-                java_class_files.append(file_dict["path"])
-
-        java_src_files = list(OrderedDict.fromkeys(java_src_files))
-        java_class_files = list(OrderedDict.fromkeys(java_class_files))
+        index = package.get_file_index()
+        java_src_files: list[str] = index.find(extensions=[".java"])
+        java_class_files: list[str] = index.find(extensions=[".class"])
 
         logging.info("  %d java source files found.", len(java_src_files))
         if exceptions:
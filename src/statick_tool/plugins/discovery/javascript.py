@@ -1,7 +1,6 @@
 """Discover JavaScript files to analyze."""
 
 import logging
-from collections import OrderedDict
 from typing import Optional
 
 from statick_tool.discovery_plugin import DiscoveryPlugin
@@ -30,17 +29,11 @@ class JavaScriptDiscoveryPlugin(DiscoveryPlugin):
             level: The level of scanning.
             exceptions: Optional exceptions to apply.
         """
-        src_files: list[str] = []
-
         self.find_files(package)
 
-        for file_dict in package.files.values():
-            if file_dict["name"].endswith(".js") and not file_dict["name"].endswith(
-                ".min.js"
-            ):
-                src_files.append(file_dict["path"])
-
-        src_files = list(OrderedDict.fromkeys(src_files))
+        src_files: list[str] = package.get_file_index().find(
+            extensions=[".js"], exclude=(".min.js",)
+        )
 
         logging.info("  %d JavaScript source files found.", len(src_files))
         if exceptions:
@@ -1,7 +1,6 @@
 """Discover Markdown files to analyze."""
 
 import logging
-from collections import OrderedDict
 from typing import Optional
 
 from statick_tool.discovery_plugin import DiscoveryPlugin
@@ -30,15 +29,9 @@ class MarkdownDiscoveryPlugin(DiscoveryPlugin):
             level: The level of scanning.
             exceptions: Optional exceptions to apply.
         """
-        src_files: list[str] = []
-
         self.find_files(package)
 
-        for file_dict in package.files.values():
-            if file_dict["name"].endswith(".md"):
-                src_files.append(file_dict["path"])
-
-        src_files = list(OrderedDict.fromkeys(src_files))
+        src_files: list[str] = package.get_file_index().find(extensions=[".md"])
 
         logging.info("  %d markdown files found.", len(src_files))
         if exceptions:
@@ -1,9 +1,7 @@
 """Discover Maven POM files to analyze."""
 
-import fnmatch
 import logging
 import os
-from collections import OrderedDict
 from typing import Optional
 
 from statick_tool.discovery_plugin import DiscoveryPlugin
@@ -32,29 +30,17 @@ class MavenDiscoveryPlugin(DiscoveryPlugin):
             level: The level of scanning.
             exceptions: Optional exceptions to apply.
         """
+        self.find_files(package)
+
+        all_poms: list[str] = package.get_file_index().find(names=["pom.xml"])
+        if exceptions:
+            all_poms = exceptions.filter_file_exceptions_early(package, all_poms)
+
         top_poms: list[str] = []
-        all_poms: list[str] = []
-        deepest_pom_level = 999999
-
-        for root, _, files in os.walk(package.path):
-            for f in fnmatch.filter(files, "pom.xml"):
-                full_path = os.path.join(root, f)
-                # Kind of an ugly hack, but it makes sure long paths don't
-                # mess up our depth tracking
-                if exceptions and not exceptions.filter_file_exceptions_early(
-                    package, [full_path]
-                ):
-                    continue
-                depth = full_path.count(os.sep)
-                if depth < deepest_pom_level:
-                    deepest_pom_level = depth
-                    top_poms = []
-                if depth == deepest_pom_level:
-                    top_poms.append(full_path)
-                all_poms.append(full_path)
-
-        top_poms = list(OrderedDict.fromkeys(top_poms))
-        all_poms = list(OrderedDict.fromkeys(all_poms))
+        if all_poms:
+            # Counting separators keeps long paths from messing up the depth.
+            top_depth = min(path.count(os.sep) for path in all_poms)
+            top_poms = [path for path in all_poms if path.count(os.sep) == top_depth]
 
         logging.info("  %d Maven POM files found.", len(all_poms))
         logging.info("  %d top-level Maven POM files found.", len(top_poms))
@@ -29,13 +29,9 @@ class PDDLDiscoveryPlugin(DiscoveryPlugin):
             level: The level of scanning.
             exceptions: Optional exceptions to apply.
         """
-        pddl_files: list[str] = []
-
         self.find_files(package)
 
-        for file_dict in package.files.values():
-            if file_dict["name"].endswith(".pddl"):
-                pddl_files.append(file_dict["path"])
+        pddl_files: list[str] = package.get_file_index().find(extensions=[".pddl"])
 
         logging.info("  %d PDDL files found.", len(pddl_files))
         if exceptions:
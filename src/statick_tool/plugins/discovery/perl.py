@@ -1,7 +1,6 @@
 """Discover Perl files to analyze."""
 
 import logging
-from collections import OrderedDict
 from typing import Optional
 
 from statick_tool.discovery_plugin import DiscoveryPlugin
@@ -30,18 +29,11 @@ class PerlDiscoveryPlugin(DiscoveryPlugin):
             level: The level of scanning.
             exceptions: Optional exceptions to apply.
         """
-        perl_files: list[str] = []
-
         self.find_files(package)
 
-        for file_dict in package.files.values():
-            if (
-                file_dict["name"].endswith(".pl")
-                or "perl script" in file_dict["file_cmd_out"]
-            ):
-                perl_files.append(file_dict["path"])
-
-        perl_files = list(OrderedDict.fromkeys(perl_files))
+        perl_files: list[str] = package.get_file_index().find(
+            extensions=[".pl"], file_types=["perl script"]
+        )
 
         logging.info("  %d Perl files found.", len(perl_files))
         if exceptions:
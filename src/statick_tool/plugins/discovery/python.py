@@ -1,7 +1,6 @@
 """Discover python files to analyze."""
 
 import logging
-from collections import OrderedDict
 from typing import Optional
 
 from statick_tool.discovery_plugin import DiscoveryPlugin
@@ -30,19 +29,13 @@ class PythonDiscoveryPlugin(DiscoveryPlugin):
             level: The level of scanning.
             exceptions: Optional exceptions to apply.
         """
-        python_files: list[str] = []
-
         self.find_files(package)
 
-        for file_dict in package.files.values():
-            if file_dict["name"].endswith(".py"):
-                python_files.append(file_dict["path"])
-            elif "python script" in file_dict["file_cmd_out"] and not file_dict[
-                "name"
-            ].endswith(".cfg"):
-                python_files.append(file_dict["path"])
-
-        python_files = list(OrderedDict.fromkeys(python_files))
+        index = package.get_file_index()
+        python_files: list[str] = index.merge(
+            index.find(extensions=[".py"]),
+            index.find(file_types=["python script"], exclude=(".cfg",)),
+        )
 
         logging.info("  %d python files found.", len(python_files))
         if exceptions:
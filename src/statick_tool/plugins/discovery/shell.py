@@ -1,7 +1,6 @@
 """Discover shell files to analyze."""
 
 import logging
-from collections import OrderedDict
 from typing import Optional
 
 from statick_tool.discovery_plugin import DiscoveryPlugin
@@ -30,20 +29,14 @@ class ShellDiscoveryPlugin(DiscoveryPlugin):
             level: The level of scanning.
             exceptions: Optional exceptions to apply.
         """
-        shell_files: list[str] = []
         shell_extensions = (".sh", ".bash", ".zsh", ".csh", ".ksh", ".dash")
         shell_output = ("shell script", "dash script", "zsh script")
 
         self.find_files(package)
 
-        for file_dict in package.files.values():
-            if file_dict["name"].endswith(shell_extensions):
-                shell_files.append(file_dict["path"])
-
-            if any(item in file_dict["file_cmd_out"] for item in shell_output):
-                shell_files.append(file_dict["path"])
-
-        shell_files = list(OrderedDict.fromkeys(shell_files))
+        shell_files: list[str] = package.get_file_index().find(
+            extensions=shell_extensions, file_types=shell_output
+        )
 
         logging.info("  %d shell files found.", len(shell_files))
         if exceptions:
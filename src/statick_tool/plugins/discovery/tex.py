@@ -1,7 +1,6 @@
 """Discover TeX files to analyze."""
 
 import logging
-from collections import OrderedDict
 from typing import Optional, Tuple
 
 from statick_tool.discovery_plugin import DiscoveryPlugin
@@ -30,23 +29,17 @@ class TexDiscoveryPlugin(DiscoveryPlugin):
             level: The level of scanning.
             exceptions: Optional exceptions to apply.
         """
-        tex_files: list[str] = []
         tex_extensions: Tuple[str, str] = (".tex", ".bib")
         tex_ignore_extensions = (".sty", ".log", ".cls")
         tex_output = ["latex document", "bibtex text file", "latex 2e document"]
 
         self.find_files(package)
 
-        for file_dict in package.files.values():
-            if file_dict["name"].endswith(tex_extensions):
-                tex_files.append(file_dict["path"])
-
-            if any(
-                item in file_dict["file_cmd_out"] for item in tex_output
-            ) and not file_dict["name"].endswith(tex_ignore_extensions):
-                tex_files.append(file_dict["path"])
-
-        tex_files = list(OrderedDict.fromkeys(tex_files))
+        index = package.get_file_index()
+        tex_files: list[str] = index.merge(
+            index.find(extensions=tex_extensions),
+            index.find(file_types=tex_output, exclude=tex_ignore_extensions),
+        )
 
         logging.info("  %d TeX files found.", len(tex_files))
         if exceptions:
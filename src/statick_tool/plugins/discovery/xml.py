@@ -1,7 +1,6 @@
 """Discover XML files to analyze."""
 
 import logging
-from collections import OrderedDict
 from typing import Optional, Tuple
 
 from statick_tool.discovery_plugin import DiscoveryPlugin
@@ -30,16 +29,11 @@ class XMLDiscoveryPlugin(DiscoveryPlugin):
             level: The level of scanning.
             exceptions: Optional exceptions to apply.
         """
-        xml_files: list[str] = []
         xml_extensions: Tuple[str, str] = (".xml", ".launch")
 
         self.find_files(package)
 
-        for file_dict in package.files.values():
-            if file_dict["name"].endswith(xml_extensions):
-                xml_files.append(file_dict["path"])
-
-        xml_files = list(OrderedDict.fromkeys(xml_files))
+        xml_files: list[str] = package.get_file_index().find(extensions=xml_extensions)
 
         logging.info("  %d XML files found.", len(xml_files))
         if exceptions:
@@ -1,7 +1,6 @@
 """Discover YAML files to analyze."""
 
 import logging
-from collections import OrderedDict
 from typing import Optional
 
 from statick_tool.discovery_plugin import DiscoveryPlugin
@@ -29,16 +28,13 @@ class YAMLDiscoveryPlugin(DiscoveryPlugin):
         Returns:
             None
         """
-        yaml_files: list[str] = []
         yaml_extensions = (".yaml", ".yml")
 
         self.find_files(package)
 
-        for file_dict in package.files.values():
-            if file_dict["name"].endswith(yaml_extensions):
-                yaml_files.append(file_dict["path"])
-
-        yaml_files = list(OrderedDict.fromkeys(yaml_files))
+        yaml_files: list[str] = package.get_file_index().find(
+            extensions=yaml_extensions
+        )
 
         logging.info("  %d YAML files found.", len(yaml_files))
         if exceptions:
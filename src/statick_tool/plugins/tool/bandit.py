@@ -77,7 +77,7 @@ class BanditToolPlugin(ToolPlugin):
         flags += user_flags
 
         try:
-            output = subprocess.check_output(
+            output = self.check_output(
                 [bandit_bin] + flags + files,
                 stderr=subprocess.STDOUT,
                 universal_newlines=True,
@@ -51,7 +51,7 @@ class BlackToolPlugin(ToolPlugin):
         tool_bin = self.get_binary()
         try:
             subproc_args = [tool_bin] + flags + files
-            output = subprocess.check_output(
+            output = self.check_output(
                 subproc_args, stderr=subprocess.STDOUT, universal_newlines=True
             )
 
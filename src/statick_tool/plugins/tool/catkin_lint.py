@@ -22,6 +22,28 @@ class CatkinLintToolPlugin(ToolPlugin):
         """
         return "catkin_lint"
 
+    @classmethod
+    def get_cache_granularity(cls) -> str:
+        """Get how the results of this tool are cached.
+
+        catkin_lint checks the package as a whole.
+
+        Returns:
+            How the results of this tool are cached.
+        """
+        return "package"
+
+    @classmethod
+    def needs_whole_package(cls) -> bool:
+        """Check if this tool needs the whole package when scanning changed files.
+
+        catkin_lint checks the package as a whole.
+
+        Returns:
+            True, since the tool needs all files of the package.
+        """
+        return True
+
     def get_file_types(self) -> list[str]:
         """Return a list of file types the plugin can scan.
 
@@ -50,7 +72,7 @@ class CatkinLintToolPlugin(ToolPlugin):
 
         try:
             subproc_args = [tool_bin, package.path] + flags
-            output = subprocess.check_output(
+            output = self.check_output(
                 subproc_args, stderr=subprocess.STDOUT, universal_newlines=True
             )
         except subprocess.CalledProcessError as ex:
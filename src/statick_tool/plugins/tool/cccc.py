@@ -15,7 +15,6 @@ import subprocess
 from pathlib import Path
 from typing import Any, Optional
 
-import xmltodict
 import yaml
 
 from statick_tool.issue import Issue
@@ -107,16 +106,19 @@ class CCCCToolPlugin(ToolPlugin):
             return []
         opts.append(" --lang=c++")
 
+        # Imported here so that loading the plugin does not import xmltodict.
+        import xmltodict  # pylint: disable=import-outside-toplevel
+
         issues: list[Issue] = []
 
         for src in package["c_src"]:
-            tool_output_dir: str = ".cccc-" + Path(src).name
+            tool_output_dir: str = self.get_output_path(".cccc-" + Path(src).name)
             opts.append("--outdir=" + tool_output_dir)
 
             try:
                 subproc_args: list[str] = [cccc_bin] + opts + [src]
                 logging.debug(" ".join(subproc_args))
-                log_output: bytes = subprocess.check_output(
+                log_output: bytes = self.check_output(
                     subproc_args, stderr=subprocess.STDOUT
                 )
             except subprocess.CalledProcessError as ex:
@@ -134,7 +136,7 @@ class CCCCToolPlugin(ToolPlugin):
             logging.debug("%s", log_output)
 
             if self.plugin_context and self.plugin_context.args.output_directory:
-                with open(self.get_name() + ".log", "ab") as flog:
+                with open(self.get_output_path(self.get_name() + ".log"), "ab") as flog:
                     flog.write(log_output)
 
             try:
@@ -55,7 +55,7 @@ class ChktexToolPlugin(ToolPlugin):
         tool_bin = self.get_binary()
         try:
             subproc_args: list[str] = [tool_bin] + flags + files
-            output = subprocess.check_output(
+            output = self.check_output(
                 subproc_args, stderr=subprocess.STDOUT, universal_newlines=True
             )
 
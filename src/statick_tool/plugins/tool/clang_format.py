@@ -124,7 +124,7 @@ class ClangFormatToolPlugin(ToolPlugin):
 
         try:
             for src in files:
-                output = subprocess.check_output(
+                output = self.check_output(
                     [clang_format_bin, src, "-output-replacements-xml"],
                     stderr=subprocess.STDOUT,
                     universal_newlines=True,
@@ -165,7 +165,9 @@ class ClangFormatToolPlugin(ToolPlugin):
             logging.debug("%s", output)
 
         if self.plugin_context and self.plugin_context.args.output_directory:
-            with open(self.get_name() + ".log", "w", encoding="utf8") as fid:
+            with open(
+                self.get_output_path(self.get_name() + ".log"), "w", encoding="utf8"
+            ) as fid:
                 for output in total_output:
                     fid.write(output)
 
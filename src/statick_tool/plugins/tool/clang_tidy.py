@@ -91,7 +91,7 @@ class ClangTidyToolPlugin(ToolPlugin):
                 files += target["src"]
 
         try:
-            output = subprocess.check_output(
+            output = self.check_output(
                 [clang_tidy_bin] + flags + files,
                 stderr=subprocess.STDOUT,
                 universal_newlines=True,
@@ -114,7 +114,9 @@ class ClangTidyToolPlugin(ToolPlugin):
         logging.debug("%s", output)
 
         if self.plugin_context and self.plugin_context.args.output_directory:
-            with open(self.get_name() + ".log", "w", encoding="utf8") as fid:
+            with open(
+                self.get_output_path(self.get_name() + ".log"), "w", encoding="utf8"
+            ) as fid:
                 fid.write(output)
 
         issues: list[Issue] = self.parse_tool_output(output)
@@ -55,7 +55,7 @@ class CMakelintToolPlugin(ToolPlugin):
         tool_bin = self.get_binary()
         try:
             subproc_args = [tool_bin] + flags + cmake_files
-            output = subprocess.check_output(
+            output = self.check_output(
                 subproc_args, stderr=subprocess.STDOUT, universal_newlines=True
             )
         except subprocess.CalledProcessError as ex:
@@ -7,8 +7,6 @@ import re
 import subprocess
 from typing import Match, Optional, Pattern
 
-from packaging.version import Version
-
 from statick_tool.issue import Issue
 from statick_tool.package import Package
 from statick_tool.tool_plugin import ToolPlugin
@@ -112,6 +110,11 @@ class CppcheckToolPlugin(ToolPlugin):
 
         cppcheck_bin = self.get_binary()
 
+        # Imported here so that loading the plugin does not import packaging.
+        from packaging.version import (  # pylint: disable=import-outside-toplevel
+            Version,
+        )
+
         try:
             version = self.parse_version(self.get_version())
             # If specific version is not specified just use the installed version.
@@ -151,7 +154,7 @@ class CppcheckToolPlugin(ToolPlugin):
                 include_args.append(include_dir)
 
         try:
-            output = subprocess.check_output(
+            output = self.check_output(
                 [cppcheck_bin] + flags + include_args + files,
                 stderr=subprocess.STDOUT,
                 universal_newlines=True,
@@ -165,7 +168,9 @@ class CppcheckToolPlugin(ToolPlugin):
         logging.debug("%s", output)
 
         if self.plugin_context and self.plugin_context.args.output_directory:
-            with open(self.get_name() + ".log", "w", encoding="utf8") as fid:
+            with open(
+                self.get_output_path(self.get_name() + ".log"), "w", encoding="utf8"
+            ) as fid:
                 fid.write(output)
 
         issues: list[Issue] = self.parse_tool_output(output)
@@ -70,7 +70,7 @@ class CpplintToolPlugin(ToolPlugin):
                 files += target["src"]
 
         try:
-            output = subprocess.check_output(
+            output = self.check_output(
                 [cpplint] + flags + files,
                 stderr=subprocess.STDOUT,
                 universal_newlines=True,
@@ -89,7 +89,9 @@ class CpplintToolPlugin(ToolPlugin):
         logging.debug("%s", output)
 
         if self.plugin_context and self.plugin_context.args.output_directory:
-            with open(self.get_name() + ".log", "w", encoding="utf8") as fid:
+            with open(
+                self.get_output_path(self.get_name() + ".log"), "w", encoding="utf8"
+            ) as fid:
                 fid.write(output)
 
         issues: list[Issue] = self.parse_tool_output(output)
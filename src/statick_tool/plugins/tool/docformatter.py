@@ -59,7 +59,7 @@ class DocformatterToolPlugin(ToolPlugin):
 
         try:
             subproc_args = [tool_bin] + flags + files
-            output = subprocess.check_output(
+            output = self.check_output(
                 subproc_args, stderr=subprocess.STDOUT, universal_newlines=True
             )
 
@@ -51,6 +51,15 @@ class DockerfileULintToolPlugin(ToolPlugin):
         """
         return self.get_version_from_npm()
 
+    @classmethod
+    def get_default_config_file(cls) -> Optional[str]:
+        """Get the name of the configuration file of the tool in the resources.
+
+        Returns:
+            Name of the configuration file.
+        """
+        return "dockerfile_lint_rules.yaml"
+
     # pylint: disable=too-many-locals
     def process_files(
         self, package: Package, level: str, files: list[str], user_flags: list[str]
@@ -68,18 +77,7 @@ class DockerfileULintToolPlugin(ToolPlugin):
         """
         tool_bin = self.get_binary()
 
-        tool_config = "dockerfile_lint_rules.yaml"
-        user_config = None
-        if self.plugin_context is not None:
-            user_config = self.plugin_context.config.get_tool_config(
-                self.get_name(), level, "config"
-            )
-        if user_config is not None:
-            tool_config = user_config
-
-        format_file_name = None
-        if self.plugin_context is not None:
-            format_file_name = self.plugin_context.resources.get_file(tool_config)
+        format_file_name = self.get_resource_config(level)
         flags: list[str] = []
         if format_file_name is not None:
             flags += ["-r", format_file_name]
@@ -91,7 +89,7 @@ class DockerfileULintToolPlugin(ToolPlugin):
         for src in files:
             try:
                 exe = [tool_bin] + flags + ["-f", src]
-                output = subprocess.check_output(
+                output = self.check_output(
                     exe, stderr=subprocess.STDOUT, universal_newlines=True
                 )
                 total_output.append(self.add_filename(output, src))
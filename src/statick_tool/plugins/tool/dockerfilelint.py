@@ -30,6 +30,15 @@ class DockerfileLintToolPlugin(ToolPlugin):
         """
         return ["dockerfile_src"]
 
+    @classmethod
+    def get_default_config_file(cls) -> Optional[str]:
+        """Get the name of the configuration file of the tool in the resources.
+
+        Returns:
+            Name of the configuration file.
+        """
+        return ".dockerfilelintrc"
+
     # pylint: disable=too-many-locals
     def process_files(
         self, package: Package, level: str, files: list[str], user_flags: list[str]
@@ -47,21 +56,10 @@ class DockerfileLintToolPlugin(ToolPlugin):
         """
         tool_bin = self.get_binary()
 
-        tool_config = ".dockerfilelintrc"
-        user_config = None
-        if self.plugin_context is not None:
-            user_config = self.plugin_context.config.get_tool_config(
-                self.get_name(), level, "config"
-            )
-        if user_config is not None:
-            tool_config = user_config
-
-        format_file_name = None
+        format_file_name = self.get_resource_config(level)
         format_file_path = None
-        if self.plugin_context is not None:
-            format_file_name = self.plugin_context.resources.get_file(tool_config)
-            if format_file_name is not None:
-                format_file_path = pathlib.Path(format_file_name).resolve().parent
+        if format_file_name is not None:
+            format_file_path = pathlib.Path(format_file_name).resolve().parent
         flags: list[str] = []
         if format_file_path is not None:
             flags += ["-c", str(format_file_path)]
@@ -72,7 +70,7 @@ class DockerfileLintToolPlugin(ToolPlugin):
 
         try:
             exe = [tool_bin] + flags + files
-            output = subprocess.check_output(
+            output = self.check_output(
                 exe, stderr=subprocess.STDOUT, universal_newlines=True
             )
             total_output.append(output)
@@ -31,6 +31,50 @@ class ESLintToolPlugin(ToolPlugin):
         """
         return ["html_src", "javascript_src"]
 
+    @classmethod
+    def get_default_config_file(cls) -> Optional[str]:
+        """Get the name of the configuration file of the tool in the resources.
+
+        Returns:
+            Name of the configuration file.
+        """
+        return "eslint.config.mjs"
+
+    def get_install_dir(self, level: str) -> Optional[str]:
+        """Get the directory eslint is installed in, where its configuration is read.
+
+        Args:
+            level: The analysis level.
+
+        Returns:
+            Directory from the install_dir setting of the tool, if any.
+        """
+        if self.plugin_context is None:
+            return None
+        install_dir: Optional[str] = self.plugin_context.config.get_tool_config(
+            self.get_name(), level, "install_dir"
+        )
+        return install_dir
+
+    def get_config_files(self, level: str) -> list[str]:
+        """Get the configuration files the tool reads outside of the package.
+
+        Args:
+            level: The analysis level.
+
+        Returns:
+            Paths of the configuration file in the resources and of the configuration
+            file in the install directory, if they exist.
+        """
+        config_files = super().get_config_files(level)
+        install_dir = self.get_install_dir(level)
+        tool_config = self.get_config_file_name(level)
+        if install_dir is not None and tool_config is not None:
+            installed = pathlib.Path(install_dir, tool_config).expanduser()
+            if installed.exists():
+                config_files.append(str(installed))
+        return config_files
+
     def get_format_file(self, level: str) -> Tuple[Optional[str], bool]:
         """Retrieve format file path.
 
@@ -40,30 +84,14 @@ class ESLintToolPlugin(ToolPlugin):
         Returns:
             Tuple containing the format file path and a boolean indicating if the file was copied.
         """
-        tool_config = "eslint.config.mjs"
-        user_config = None
-        if self.plugin_context is not None:
-            user_config = self.plugin_context.config.get_tool_config(
-                self.get_name(), level, "config"
-            )
-        if user_config is not None:
-            tool_config = user_config
-
-        install_dir = None
-        if self.plugin_context is not None:
-            install_dir = self.plugin_context.config.get_tool_config(
-                self.get_name(), level, "install_dir"
-            )
+        tool_config = self.get_config_file_name(level)
+        install_dir = self.get_install_dir(level)
         copied_file = False
         format_file_name = None
-        if install_dir is not None:
+        if install_dir is not None and tool_config is not None:
             format_file_path = pathlib.Path(install_dir, tool_config).expanduser()
 
-            if (
-                not format_file_path.exists()
-                and tool_config is not None
-                and self.plugin_context is not None
-            ):
+            if not format_file_path.exists() and self.plugin_context is not None:
                 file_path = self.plugin_context.resources.get_file(tool_config)
                 if file_path is not None:
                     config_file_path = pathlib.Path(file_path)
@@ -77,7 +105,7 @@ class ESLintToolPlugin(ToolPlugin):
                     copied_file = True
 
             format_file_name = str(format_file_path)
-        elif self.plugin_context is not None:
+        elif self.plugin_context is not None and tool_config is not None:
             format_file_name = self.plugin_context.resources.get_file(tool_config)
 
         return (format_file_name, copied_file)
@@ -112,7 +140,7 @@ class ESLintToolPlugin(ToolPlugin):
         for src in files:
             try:
                 exe = [tool_bin] + flags + [src]
-                output = subprocess.check_output(
+                output = self.check_output(
                     exe, stderr=subprocess.STDOUT, universal_newlines=True
                 )
                 total_output.append(output)
@@ -51,6 +51,15 @@ class GroovyLintToolPlugin(ToolPlugin):
         """
         return self.get_version_from_npm()
 
+    @classmethod
+    def get_default_config_file(cls) -> Optional[str]:
+        """Get the name of the configuration file of the tool in the resources.
+
+        Returns:
+            Name of the configuration file.
+        """
+        return ".groovylintrc.json"
+
     def process_files(
         self, package: Package, level: str, files: list[str], user_flags: list[str]
     ) -> Optional[list[str]]:
@@ -67,18 +76,7 @@ class GroovyLintToolPlugin(ToolPlugin):
         """
         tool_bin = self.get_binary()
 
-        tool_config = ".groovylintrc.json"
-        user_config = None
-        format_file_name = None
-
-        if self.plugin_context:
-            user_config = self.plugin_context.config.get_tool_config(
-                self.get_name(), level, "config"
-            )
-        if user_config is not None:
-            tool_config = user_config
-        if self.plugin_context:
-            format_file_name = self.plugin_context.resources.get_file(tool_config)
+        format_file_name = self.get_resource_config(level)
 
         flags: list[str] = []
         if format_file_name is not None:
@@ -91,7 +89,7 @@ class GroovyLintToolPlugin(ToolPlugin):
         total_output: list[str] = []
         try:
             exe = [tool_bin] + flags + files
-            output = subprocess.check_output(
+            output = self.check_output(
                 exe,
                 stderr=subprocess.STDOUT,
                 universal_newlines=True,
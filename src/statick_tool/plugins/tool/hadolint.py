@@ -85,6 +85,15 @@ class HadolintToolPlugin(ToolPlugin):
             version = self.get_version_from_docker()
         return version
 
+    @classmethod
+    def get_default_config_file(cls) -> Optional[str]:
+        """Get the name of the configuration file of the tool in the resources.
+
+        Returns:
+            Name of the configuration file.
+        """
+        return ".hadolint.yaml"
+
     # pylint: disable=too-many-locals
     def process_files(
         self, package: Package, level: str, files: list[str], user_flags: list[str]
@@ -100,18 +109,7 @@ class HadolintToolPlugin(ToolPlugin):
         Returns:
             List of output strings or None.
         """
-        tool_config = ".hadolint.yaml"
-        user_config = None
-        if self.plugin_context is not None:
-            user_config = self.plugin_context.config.get_tool_config(
-                self.get_name(), level, "config"
-            )
-        if user_config is not None:
-            tool_config = user_config
-
-        config_file_path = None
-        if self.plugin_context is not None:
-            config_file_path = self.plugin_context.resources.get_file(tool_config)
+        config_file_path = self.get_resource_config(level)
         flags: list[str] = ["-f", "json", "--no-fail"]
         if "-f" in user_flags:
             idx = user_flags.index("-f")
@@ -167,7 +165,7 @@ class HadolintToolPlugin(ToolPlugin):
         try:
             exe = [tool_bin] + flags
             exe.extend(files)
-            output = subprocess.check_output(
+            output = self.check_output(
                 exe, stderr=subprocess.STDOUT, universal_newlines=True
             )
             return output
@@ -221,7 +219,7 @@ class HadolintToolPlugin(ToolPlugin):
                 )
                 exe.extend(flags)
                 exe.append("Dockerfile")
-                output = subprocess.check_output(
+                output = self.check_output(
                     exe, stderr=subprocess.STDOUT, universal_newlines=True
                 )
                 if output:
@@ -54,7 +54,7 @@ class IsortToolPlugin(ToolPlugin):
 
         try:
             subproc_args = [tool_bin] + flags + files
-            output = subprocess.check_output(
+            output = self.check_output(
                 subproc_args, stderr=subprocess.STDOUT, universal_newlines=True
             )
             total_output.append(output)
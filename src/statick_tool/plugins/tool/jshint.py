@@ -29,6 +29,15 @@ class JSHintToolPlugin(ToolPlugin):
         """
         return ["html_src", "javascript_src"]
 
+    @classmethod
+    def get_default_config_file(cls) -> Optional[str]:
+        """Get the name of the configuration file of the tool in the resources.
+
+        Returns:
+            Name of the configuration file.
+        """
+        return ".jshintrc"
+
     # pylint: disable=too-many-locals
     def process_files(
         self, package: Package, level: str, files: list[str], user_flags: list[str]
@@ -46,18 +55,7 @@ class JSHintToolPlugin(ToolPlugin):
         """
         tool_bin = self.get_binary()
 
-        tool_config = ".jshintrc"
-        user_config = None
-        if self.plugin_context is not None:
-            user_config = self.plugin_context.config.get_tool_config(
-                self.get_name(), level, "config"
-            )
-        if user_config is not None:
-            tool_config = user_config
-
-        format_file_name = None
-        if self.plugin_context is not None:
-            format_file_name = self.plugin_context.resources.get_file(tool_config)
+        format_file_name = self.get_resource_config(level)
         flags: list[str] = []
         if format_file_name is not None:
             flags += ["-c", format_file_name]
@@ -69,7 +67,7 @@ class JSHintToolPlugin(ToolPlugin):
         for src in files:
             try:
                 exe = [tool_bin] + flags + [src]
-                output = subprocess.check_output(
+                output = self.check_output(
                     exe, stderr=subprocess.STDOUT, universal_newlines=True
                 )
 
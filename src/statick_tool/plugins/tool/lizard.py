@@ -6,8 +6,6 @@ import re
 from contextlib import redirect_stdout
 from typing import Match, Optional, Pattern
 
-import lizard
-
 from statick_tool.issue import Issue
 from statick_tool.package import Package
 from statick_tool.tool_plugin import ToolPlugin
@@ -28,6 +26,28 @@ class LizardToolPlugin(ToolPlugin):
         """
         return "lizard"
 
+    @classmethod
+    def get_cache_granularity(cls) -> str:
+        """Get how the results of this tool are cached.
+
+        Lizard scans the whole package at once.
+
+        Returns:
+            How the results of this tool are cached.
+        """
+        return "package"
+
+    @classmethod
+    def needs_whole_package(cls) -> bool:
+        """Check if this tool needs the whole package when scanning changed files.
+
+        Lizard always scans the package directory.
+
+        Returns:
+            True, since the tool needs all files of the package.
+        """
+        return True
+
     def scan(self, package: Package, level: str) -> Optional[list[Issue]]:
         """Run tool and gather output.
 
@@ -41,6 +61,9 @@ class LizardToolPlugin(ToolPlugin):
         if not package.path:
             return []
 
+        # Imported here so that loading the plugin does not import lizard.
+        import lizard  # pylint: disable=import-outside-toplevel
+
         # The following is a modification of lizard.py's main().
         raw_user_flags = (
             [lizard.__file__] + [package.path] + self.get_user_flags(level)
@@ -73,7 +96,9 @@ class LizardToolPlugin(ToolPlugin):
 
         logging.debug("%s", output)
         if self.plugin_context and self.plugin_context.args.output_directory:
-            with open(self.get_name() + ".log", "w", encoding="utf8") as fid:
+            with open(
+                self.get_output_path(self.get_name() + ".log"), "w", encoding="utf8"
+            ) as fid:
                 fid.write(output)
 
         issues: list[Issue] = self.parse_tool_output(output)
@@ -21,6 +21,28 @@ class MakeToolPlugin(ToolPlugin):
         """
         return "make"
 
+    @classmethod
+    def get_cache_granularity(cls) -> str:
+        """Get how the results of this tool are cached.
+
+        Make builds the whole package.
+
+        Returns:
+            How the results of this tool are cached.
+        """
+        return "package"
+
+    @classmethod
+    def needs_whole_package(cls) -> bool:
+        """Check if this tool needs the whole package when scanning changed files.
+
+        Make builds all targets of the package.
+
+        Returns:
+            True, since the tool needs all files of the package.
+        """
+        return True
+
     def scan(self, package: Package, level: str) -> Optional[list[Issue]]:
         """Run tool and gather output.
 
@@ -41,11 +63,15 @@ class MakeToolPlugin(ToolPlugin):
         make_args: list[str] = [tool_bin, "statick_cmake_target"]
 
         try:
-            output = subprocess.check_output(
-                [tool_bin, "clean"], universal_newlines=True
+            # Make runs in the build directory configured by the CMake discovery plugin.
+            output = self.check_output(
+                [tool_bin, "clean"], universal_newlines=True, cwd=self.get_working_dir()
             )
-            output = subprocess.check_output(
-                make_args, stderr=subprocess.STDOUT, universal_newlines=True
+            output = self.check_output(
+                make_args,
+                stderr=subprocess.STDOUT,
+                universal_newlines=True,
+                cwd=self.get_working_dir(),
             )
 
         except subprocess.CalledProcessError as ex:
@@ -61,7 +87,9 @@ class MakeToolPlugin(ToolPlugin):
         logging.debug("%s", output)
 
         if self.plugin_context and self.plugin_context.args.output_directory:
-            with open(self.get_name() + ".log", "w", encoding="utf8") as fid:
+            with open(
+                self.get_output_path(self.get_name() + ".log"), "w", encoding="utf8"
+            ) as fid:
                 fid.write(output)
 
         issues: list[Issue] = self.parse_package_output(package, output)
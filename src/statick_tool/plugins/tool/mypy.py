@@ -22,6 +22,17 @@ class MypyToolPlugin(ToolPlugin):
         """
         return "mypy"
 
+    @classmethod
+    def get_cache_granularity(cls) -> str:
+        """Get how the results of this tool are cached.
+
+        Type checking a file depends on the other files it imports.
+
+        Returns:
+            How the results of this tool are cached.
+        """
+        return "package"
+
     def get_file_types(self) -> list[str]:
         """Return a list of file types the plugin can scan.
 
@@ -56,7 +67,7 @@ class MypyToolPlugin(ToolPlugin):
 
         try:
             subproc_args = [tool_bin] + flags + files
-            output = subprocess.check_output(
+            output = self.check_output(
                 subproc_args, stderr=subprocess.STDOUT, universal_newlines=True
             )
 
@@ -79,7 +79,7 @@ class PerlCriticToolPlugin(ToolPlugin):
         perlcritic_bin = self.get_binary()
 
         try:
-            output = subprocess.check_output(
+            output = self.check_output(
                 [perlcritic_bin] + flags + files,
                 stderr=subprocess.STDOUT,
                 universal_newlines=True,
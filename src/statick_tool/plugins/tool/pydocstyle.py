@@ -51,7 +51,7 @@ class PydocstyleToolPlugin(ToolPlugin):
 
         try:
             subproc_args = [tool_bin] + flags + files
-            output = subprocess.check_output(
+            output = self.check_output(
                 subproc_args, stderr=subprocess.STDOUT, universal_newlines=True
             )
 
@@ -21,6 +21,17 @@ class PylintToolPlugin(ToolPlugin):
         """
         return "pylint"
 
+    @classmethod
+    def get_cache_granularity(cls) -> str:
+        """Get how the results of this tool are cached.
+
+        Pylint infers types from imported modules and finds duplicate code across files.
+
+        Returns:
+            How the results of this tool are cached.
+        """
+        return "package"
+
     def get_file_types(self) -> list[str]:
         """Return a list of file types the plugin can scan.
 
@@ -57,7 +68,7 @@ class PylintToolPlugin(ToolPlugin):
 
         try:
             subproc_args = [tool_bin] + flags + files
-            output = subprocess.check_output(
+            output = self.check_output(
                 subproc_args, stderr=subprocess.STDOUT, universal_newlines=True
             )
 
@@ -21,6 +21,17 @@ class PyrightToolPlugin(ToolPlugin):
         """
         return "pyright"
 
+    @classmethod
+    def get_cache_granularity(cls) -> str:
+        """Get how the results of this tool are cached.
+
+        Type checking a file depends on the other files it imports.
+
+        Returns:
+            How the results of this tool are cached.
+        """
+        return "package"
+
     def get_file_types(self) -> list[str]:
         """Return a list of file types the plugin can scan.
 
@@ -53,7 +64,7 @@ class PyrightToolPlugin(ToolPlugin):
 
         try:
             subproc_args = [tool_bin] + flags + files
-            output = subprocess.check_output(
+            output = self.check_output(
                 subproc_args, stderr=subprocess.STDOUT, universal_newlines=True
             )
 
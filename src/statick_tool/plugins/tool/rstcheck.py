@@ -53,7 +53,7 @@ class RstcheckToolPlugin(ToolPlugin):
 
         try:
             exe = [tool_bin] + flags + files
-            output = subprocess.check_output(
+            output = self.check_output(
                 exe, stderr=subprocess.STDOUT, universal_newlines=True
             )
             total_output.append(output)
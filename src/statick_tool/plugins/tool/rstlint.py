@@ -1,15 +1,15 @@
 """Apply rst-lint tool and gather results."""
 
 import logging
-from typing import Optional
-
-import restructuredtext_lint
-from docutils.utils import SystemMessage
+from typing import TYPE_CHECKING, Optional
 
 from statick_tool.issue import Issue
 from statick_tool.package import Package
 from statick_tool.tool_plugin import ToolPlugin
 
+if TYPE_CHECKING:
+    from docutils.utils import SystemMessage
+
 
 class RstlintToolPlugin(ToolPlugin):
     """Apply rst-lint tool and gather results."""
@@ -47,6 +47,9 @@ class RstlintToolPlugin(ToolPlugin):
         Returns:
             A list of issues found by the tool.
         """
+        # Imported here so that loading the plugin does not import docutils.
+        import restructuredtext_lint  # pylint: disable=import-outside-toplevel
+
         flags: list[str] = []
         user_flags = self.get_user_flags(level)
         flags += user_flags
@@ -55,7 +58,7 @@ class RstlintToolPlugin(ToolPlugin):
         if "rst_src" in package:
             files += package["rst_src"]
 
-        total_output: list[SystemMessage] = []
+        total_output: list["SystemMessage"] = []
 
         for src in files:
             output = restructuredtext_lint.lint_file(src, None, flags)
@@ -64,7 +67,9 @@ class RstlintToolPlugin(ToolPlugin):
         for output in total_output:
             logging.debug("%s", str(output))
 
-        with open(self.get_name() + ".log", "w", encoding="utf8") as fid:
+        with open(
+            self.get_output_path(self.get_name() + ".log"), "w", encoding="utf8"
+        ) as fid:
             for output in total_output:
                 fid.write(str(output))
 
@@ -73,7 +78,7 @@ class RstlintToolPlugin(ToolPlugin):
 
     # pylint: enable=too-many-locals
 
-    def parse_tool_output(self, total_output: list[SystemMessage]) -> list[Issue]:
+    def parse_tool_output(self, total_output: list["SystemMessage"]) -> list[Issue]:
         """Parse tool output and report issues.
 
         Args:
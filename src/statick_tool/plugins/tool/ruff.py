@@ -49,7 +49,7 @@ class RuffToolPlugin(ToolPlugin):
 
         try:
             subproc_args = ["ruff"] + flags + files
-            output = subprocess.check_output(
+            output = self.check_output(
                 subproc_args, stderr=subprocess.STDOUT, universal_newlines=True
             )
         except subprocess.CalledProcessError as ex:
@@ -31,6 +31,29 @@ class SpotbugsToolPlugin(ToolPlugin):
         """
         return ["make"]
 
+    @classmethod
+    def get_cache_granularity(cls) -> str:
+        """Get how the results of this tool are cached.
+
+        Spotbugs scans the output of a Maven build, which is not part of the package
+        files.
+
+        Returns:
+            How the results of this tool are cached.
+        """
+        return "none"
+
+    @classmethod
+    def needs_whole_package(cls) -> bool:
+        """Check if this tool needs the whole package when scanning changed files.
+
+        Spotbugs scans the Maven build of the package.
+
+        Returns:
+            True, since the tool needs all files of the package.
+        """
+        return True
+
     def scan(self, package: Package, level: str) -> Optional[list[Issue]]:
         """Run tool and gather output.
 
@@ -77,7 +100,7 @@ class SpotbugsToolPlugin(ToolPlugin):
         for pom in package["top_poms"]:
             try:
                 # The spotbugs:spotbugs-maven-plugin split is auto-concatenated
-                output = subprocess.check_output(
+                output = self.check_output(
                     ["mvn", "com.github.spotbugs:spotbugs-maven-plugin:spotbugs"]
                     + flags,
                     cwd=os.path.dirname(pom),
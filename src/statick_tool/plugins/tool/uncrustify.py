@@ -93,13 +93,13 @@ class UncrustifyToolPlugin(ToolPlugin):
 
             for src in files:
                 cmd = [uncrustify_bin, "-c", format_file_name, "-f", src]
-                output = subprocess.check_output(
+                output = self.check_output(
                     cmd,  # type: ignore
                     stderr=subprocess.STDOUT,
                     universal_newlines=True,
                 )
                 src_cmd = ["cat", src]
-                src_output = subprocess.check_output(
+                src_output = self.check_output(
                     src_cmd, stderr=subprocess.STDOUT, universal_newlines=True
                 )
                 diff = difflib.context_diff(
@@ -137,7 +137,9 @@ class UncrustifyToolPlugin(ToolPlugin):
             logging.debug("%s", output)
 
         if self.plugin_context and self.plugin_context.args.output_directory:
-            with open(self.get_name() + ".log", "w", encoding="utf8") as fid:
+            with open(
+                self.get_output_path(self.get_name() + ".log"), "w", encoding="utf8"
+            ) as fid:
                 for output in total_output:
                     fid.write(output)
 
@@ -90,7 +90,7 @@ class ValValidateToolPlugin(ToolPlugin):
                 + package["pddl_domain_src"]
                 + package["pddl_problem_src"]
             )
-            output = subprocess.check_output(
+            output = self.check_output(
                 subproc_args, stderr=subprocess.STDOUT, universal_newlines=True
             )
 
@@ -108,7 +108,9 @@ class ValValidateToolPlugin(ToolPlugin):
         logging.debug("%s", output)
 
         if self.plugin_context and self.plugin_context.args.output_directory:
-            with open(self.get_name() + ".log", "w", encoding="utf-8") as fid:
+            with open(
+                self.get_output_path(self.get_name() + ".log"), "w", encoding="utf-8"
+            ) as fid:
                 fid.write(output)
 
         issues: list[Issue] = self.parse_tool_output(
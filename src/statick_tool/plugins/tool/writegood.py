@@ -70,7 +70,7 @@ class WriteGoodToolPlugin(ToolPlugin):
 
         try:
             exe = [tool_bin] + flags + files
-            output = subprocess.check_output(
+            output = self.check_output(
                 exe, stderr=subprocess.STDOUT, universal_newlines=True
             )
             total_output.append(output)
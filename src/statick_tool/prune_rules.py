@@ -0,0 +1,345 @@
+"""Decide which files and directories of a package are left out while walking it.
+
+Build trees, install trees, version control metadata, dependencies fetched by npm and
+virtualenvs often hold far more files than the sources of a package. Pruning them while
+the package is walked means they are never listed and no discovery plugin looks at
+their type. A directory is pruned if
+
+- its name is one of the DEFAULT_IGNORE_DIRS, or one of the ROOT_IGNORE_DIRS directly
+  below the package,
+- it contains an ignore marker such as COLCON_IGNORE, or is a virtualenv,
+- it is the output or cache directory of Statick,
+- it matches a pattern of the discovery.ignore_dirs setting of the level,
+- every file below it is excluded by file exceptions with tools=all, or
+- it is ignored by a .gitignore file in the package.
+
+The DEFAULT_IGNORE_DIRS and ROOT_IGNORE_DIRS, and .gitignore files, can each be turned
+off. Files ignored by a .gitignore file are left out too. Patterns of .gitignore files
+follow the rules of git: a pattern with a slash before its end is relative to the
+directory of the .gitignore file, a pattern ending in a slash only matches directories,
+a pattern starting with ! includes again what an earlier pattern ignored, and the last
+pattern that matches decides. Only .gitignore files in the package are read.
+"""
+
+import fnmatch
+import logging
+import os
+import re
+from typing import Callable, Iterable, NamedTuple, Optional
+
+from statick_tool.directory_walker import Listing
+from statick_tool.package_index import PackageIndex
+
+# Directories left out wherever they are in a package.
+DEFAULT_IGNORE_DIRS = {".git", ".hg", ".svn", "__pycache__", "node_modules"}
+
+# Directories left out when they are directly below the package.
+ROOT_IGNORE_DIRS = {"build", "install"}
+
+# File that marks a directory as a virtualenv.
+VIRTUALENV_MARKER = "pyvenv.cfg"
+
+
+class IgnorePattern(NamedTuple):
+    """Pattern of a .gitignore file."""
+
+    regex: re.Pattern[str]
+    negate: bool
+    dir_only: bool
+    anchored: bool
+    base: str
+
+
+def translate_glob(glob: str) -> str:
+    """Translate a pattern of a .gitignore file to a regular expression.
+
+    Args:
+        glob: Pattern without its leading !, leading slash or trailing slash.
+
+    Returns:
+        Regular expression matching the whole path relative to the directory of the
+        .gitignore file, or the whole name for patterns without a slash.
+    """
+    parts: list[str] = []
+    i = 0
+    while i < len(glob):
+        if glob.startswith("**/", i) and (i == 0 or glob[i - 1] == "/"):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif glob.startswith("/**", i) and i + 3 == len(glob):
+            parts.append("/.*")
+            i += 3
+        elif glob[i] == "*":
+            while i < len(glob) and glob[i] == "*":
+                i += 1
+            parts.append("[^/]*")
+            continue
+        elif glob[i] == "?":
+            parts.append("[^/]")
+            i += 1
+        elif glob[i] == "[":
+            end = glob.find("]", i + 2)
+            if end < 0:
+                parts.append(re.escape("["))
+                i += 1
+                continue
+            body = glob[i + 1 : end].replace("\\", "\\\\")
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            parts.append("[" + body + "]")
+            i = end + 1
+        elif glob[i] == "\\" and i + 1 < len(glob):
+            parts.append(re.escape(glob[i + 1]))
+            i += 2
+        else:
+            parts.append(re.escape(glob[i]))
+            i += 1
+    return "".join(parts) + r"\Z"
+
+
+def parse_gitignore(line: str, base: str) -> Optional[IgnorePattern]:
+    """Parse a line of a .gitignore file.
+
+    Args:
+        line: Line of the file.
+        base: Absolute path of the directory of the file.
+
+    Returns:
+        Pattern of the line, or None if the line is blank or a comment.
+    """
+    line = line.rstrip("\n").rstrip("\r")
+    if not line.endswith("\\ "):
+        line = line.rstrip(" ")
+    if not line or line.startswith("#"):
+        return None
+    negate = line.startswith("!")
+    if negate:
+        line = line[1:]
+    elif line.startswith(("\\!", "\\#")):
+        line = line[1:]
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    anchored = "/" in line
+    line = line.lstrip("/")
+    if not line:
+        return None
+    return IgnorePattern(
+        re.compile(translate_glob(line)), negate, dir_only, anchored, base
+    )
+
+
+class PruneRules:  # pylint: disable=too-many-instance-attributes
+    """Decide which files and directories of a package are left out while walking."""
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        root: str,
+        ignore_dirs: Iterable[str] = (),
+        skip_dirs: Iterable[str] = (),
+        *,
+        gitignore: bool = True,
+        is_excepted: Optional[Callable[[str], bool]] = None,
+        default_dirs: bool = True,
+    ) -> None:
+        """Initialize the rules of a package.
+
+        Args:
+            root: Path of the package.
+            ignore_dirs: Patterns of directories to leave out. Patterns with a slash
+                match the path relative to the package, others match the name.
+            skip_dirs: Paths of directories to leave out, such as the output directory.
+            gitignore: Whether to honor .gitignore files.
+            is_excepted: Function telling whether every file below an absolute path of
+                a directory is excluded by exceptions, if any.
+            default_dirs: Whether to leave out the DEFAULT_IGNORE_DIRS and the
+                ROOT_IGNORE_DIRS.
+        """
+        self.root = os.path.abspath(root)
+        self.skip_dirs = {os.path.abspath(path) for path in skip_dirs if path}
+        name_globs = [glob.strip("/") for glob in ignore_dirs if "/" not in glob]
+        path_globs = [glob.strip("/") for glob in ignore_dirs if "/" in glob]
+        self.name_regex = self.compile_globs(name_globs)
+        self.path_regex = self.compile_globs(path_globs)
+        self.gitignore = gitignore
+        self.default_dirs = default_dirs
+        self.is_excepted = is_excepted
+        self.patterns: dict[str, list[IgnorePattern]] = {}
+
+    @staticmethod
+    def compile_globs(globs: list[str]) -> Optional[re.Pattern[str]]:
+        """Compile shell style patterns into one regular expression.
+
+        Args:
+            globs: Patterns to compile.
+
+        Returns:
+            Regular expression matching any of the patterns, or None if there are none.
+        """
+        if not globs:
+            return None
+        return re.compile("|".join(fnmatch.translate(glob) for glob in globs))
+
+    def get_patterns(
+        self, directory: str, names: Optional[set[str]] = None
+    ) -> list[IgnorePattern]:
+        """Get the .gitignore patterns that apply to the entries of a directory.
+
+        Args:
+            directory: Absolute path of a directory in the package.
+            names: Names of the files in the directory, if it has been listed.
+
+        Returns:
+            Patterns of the .gitignore files in the directory and the directories above
+            it in the package, in the order they apply.
+        """
+        patterns = self.patterns.get(directory)
+        if patterns is not None:
+            return patterns
+        patterns = []
+        if directory != self.root and directory.startswith(self.root + os.sep):
+            patterns = self.get_patterns(os.path.dirname(directory))
+        if self.gitignore and (names is None or ".gitignore" in names):
+            own_patterns = self.read_gitignore(directory)
+            if own_patterns:
+                patterns = patterns + own_patterns
+        self.patterns[directory] = patterns
+        return patterns
+
+    @staticmethod
+    def read_gitignore(directory: str) -> list[IgnorePattern]:
+        """Read the .gitignore file of a directory.
+
+        Args:
+            directory: Absolute path of the directory.
+
+        Returns:
+            Patterns of the file, or no patterns if there is no such file.
+        """
+        path = os.path.join(directory, ".gitignore")
+        if not os.path.isfile(path):
+            return []
+        try:
+            with open(path, encoding="utf8", errors="replace") as fid:
+                lines = fid.readlines()
+        except OSError as ex:
+            logging.warning("Unable to read %s: %s", path, ex)
+            return []
+        patterns = [parse_gitignore(line, directory) for line in lines]
+        return [pattern for pattern in patterns if pattern is not None]
+
+    def is_ignored(
+        self, directory: str, name: str, is_dir: bool, patterns: list[IgnorePattern]
+    ) -> bool:
+        """Check whether an entry of a directory is left out by name or path.
+
+        Args:
+            directory: Absolute path of the directory.
+            name: Name of the entry.
+            is_dir: Whether the entry is a directory.
+            patterns: .gitignore patterns that apply to the directory.
+
+        Returns:
+            True if the entry is left out, False otherwise.
+        """
+        path = os.path.join(directory, name)
+        if is_dir:
+            if path in self.skip_dirs:
+                return True
+            if self.default_dirs and (
+                name in DEFAULT_IGNORE_DIRS
+                or (directory == self.root and name in ROOT_IGNORE_DIRS)
+            ):
+                return True
+            if self.name_regex is not None and self.name_regex.match(name):
+                return True
+            if self.path_regex is not None and self.path_regex.match(
+                os.path.relpath(path, self.root).replace(os.sep, "/")
+            ):
+                return True
+            if self.is_excepted is not None and self.is_excepted(path):
+                return True
+        ignored = False
+        for pattern in patterns:
+            # Only patterns that would change the outcome are tried.
+            if ignored != pattern.negate or (pattern.dir_only and not is_dir):
+                continue
+            if pattern.anchored:
+                subject = path[len(pattern.base) + 1 :].replace(os.sep, "/")
+            else:
+                subject = name
+            if pattern.regex.match(subject):
+                ignored = not pattern.negate
+        return ignored
+
+    def prune(self, directory: str, listing: Listing) -> Listing:
+        """Leave out the entries of a directory that are not part of the package.
+
+        Args:
+            directory: Directory that was listed.
+            listing: Files and subdirectories of the directory.
+
+        Returns:
+            Files and subdirectories that are kept. A directory other than the package
+            that has an ignore marker or is a virtualenv keeps nothing.
+        """
+        directory = os.path.abspath(directory)
+        names = {entry.name for entry in listing.files}
+        if directory != self.root and self.has_marker(names):
+            return Listing([], [])
+        patterns = self.get_patterns(directory, names)
+        return Listing(
+            [
+                entry
+                for entry in listing.files
+                if not self.is_ignored(directory, entry.name, False, patterns)
+            ],
+            [
+                path
+                for path in listing.dirs
+                if not self.is_ignored(
+                    directory, os.path.basename(path), True, patterns
+                )
+            ],
+        )
+
+    def is_pruned(self, path: str) -> bool:
+        """Check whether a path below the package is left out.
+
+        Args:
+            path: Path of a file or directory.
+
+        Returns:
+            True if the path, or a directory above it in the package, is left out.
+        """
+        path = os.path.abspath(path)
+        if not path.startswith(self.root + os.sep):
+            return False
+        parts = path[len(self.root) + 1 :].split(os.sep)
+        directory = self.root
+        for index, name in enumerate(parts):
+            is_dir = index < len(parts) - 1 or os.path.isdir(path)
+            if self.is_ignored(directory, name, is_dir, self.get_patterns(directory)):
+                return True
+            directory = os.path.join(directory, name)
+            if is_dir and self.has_marker(
+                marker
+                for marker in PackageIndex.IGNORE_FILES + [VIRTUALENV_MARKER]
+                if os.path.exists(os.path.join(directory, marker))
+            ):
+                return True
+        return False
+
+    @staticmethod
+    def has_marker(names: Iterable[str]) -> bool:
+        """Check whether the files of a directory mark it as left out.
+
+        Args:
+            names: Names of files in the directory.
+
+        Returns:
+            True if a file is an ignore marker or marks a virtualenv.
+        """
+        return any(
+            name in PackageIndex.IGNORE_FILES or name == VIRTUALENV_MARKER
+            for name in names
+        )
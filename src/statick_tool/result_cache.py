@@ -0,0 +1,419 @@
+"""Cache of tool results.
+
+Running a tool again on a file that has not changed finds the same issues. Issues are
+kept on disk, keyed on everything that affects them: the name, binary and version of the
+tool, its user flags and level configuration, the configuration files the tool reads
+from the resources, the files at the top of the package and the configuration files in
+its subdirectories, and the path and contents of the scanned file. Tool plugins only
+pass files without a cache entry to the tool.
+
+Tools that find issues across files, or that do not scan individual files, can instead
+cache the issues of a whole package, keyed on the contents of every file in the package,
+or opt out of caching.
+
+Each entry is a file below the cache directory. Once the entries take up more than the
+size limit, the least recently used entries are removed.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Any, Optional, Tuple
+
+from statick_tool.issue import Issue
+from statick_tool.package import Package
+from statick_tool.tool_version_cache import ToolVersionCache
+
+
+class ResultCache:
+    """Cache of tool results."""
+
+    # Changing the format of entries or keys invalidates all entries.
+    FORMAT_VERSION = 2
+
+    # Files in the subdirectories of a package that tools read their configuration
+    # from, by name and by prefix of the name.
+    CONFIG_FILE_NAMES = {
+        ".clang-format",
+        ".clang-tidy",
+        ".editorconfig",
+        ".flake8",
+        ".pycodestyle",
+        ".pydocstyle",
+        ".pylintrc",
+        ".yamllint",
+        "mypy.ini",
+        "package.json",
+        "pylintrc",
+        "pyproject.toml",
+        "setup.cfg",
+        "tox.ini",
+    }
+    CONFIG_FILE_PREFIXES = (
+        ".dockerfilelintrc",
+        ".eslintrc",
+        ".groovylintrc",
+        ".hadolint",
+        ".htmllintrc",
+        ".jshintrc",
+        ".markdownlint",
+        ".stylelintrc",
+        "eslint.config",
+        "stylelint.config",
+    )
+
+    def __init__(
+        self, cache_dir: str, max_size: int, tool_versions: ToolVersionCache
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory to keep the entries in.
+            max_size: Number of bytes the entries may take up.
+            tool_versions: Cache to get the versions of tools from.
+        """
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.tool_versions = tool_versions
+        self.lock = threading.Lock()
+        self.file_hashes: dict[str, Tuple[int, int, str]] = {}
+        self.config_hashes: dict[str, str] = {}
+
+    def get_file_hash(self, path: str) -> Optional[str]:
+        """Get the hash of the contents of a file.
+
+        Hashes are reused while the modification time and size of the file are
+        unchanged, so each file is read at most once per run.
+
+        Args:
+            path: Path of the file.
+
+        Returns:
+            Hash of the contents, or None if the file can not be read.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        with self.lock:
+            entry = self.file_hashes.get(path)
+        if entry is not None and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+            return entry[2]
+
+        digest = hashlib.sha256()
+        try:
+            with open(path, "rb") as fid:
+                for chunk in iter(lambda: fid.read(1 << 20), b""):
+                    digest.update(chunk)
+        except OSError:
+            return None
+        file_hash = digest.hexdigest()
+        with self.lock:
+            self.file_hashes[path] = (stat.st_mtime_ns, stat.st_size, file_hash)
+        return file_hash
+
+    def get_config_hash(self, package: Package) -> str:
+        """Get the hash of the configuration files of a package.
+
+        Tools keep their configuration in files such as pyproject.toml, setup.cfg or
+        .eslintrc at the top of the package, or in subdirectories closer to the files
+        they apply to. Changing any file at the top of the package, or a known
+        configuration file among the files found in its subdirectories, invalidates the
+        entries of the package.
+
+        Args:
+            package: Package to hash the files of.
+
+        Returns:
+            Hash of the names and contents of the files.
+        """
+        with self.lock:
+            if package.path in self.config_hashes:
+                return self.config_hashes[package.path]
+
+        digest = hashlib.sha256()
+        try:
+            with os.scandir(package.path) as entries:
+                paths = sorted(entry.path for entry in entries if entry.is_file())
+        except OSError:
+            paths = []
+        nested = sorted(
+            path
+            for path in package.files
+            if self.is_config_file(path)
+            and os.path.dirname(os.path.relpath(path, package.path))
+        )
+        for path in paths + nested:
+            name = os.path.relpath(path, package.path)
+            digest.update(f"{name}:{self.get_file_hash(path)}\n".encode())
+        config_hash = digest.hexdigest()
+        with self.lock:
+            self.config_hashes[package.path] = config_hash
+        return config_hash
+
+    @classmethod
+    def is_config_file(cls, path: str) -> bool:
+        """Check if a file is a known configuration file of a tool.
+
+        Args:
+            path: Path of the file.
+
+        Returns:
+            True if tools read their configuration from files with this name.
+        """
+        name = os.path.basename(path)
+        return name in cls.CONFIG_FILE_NAMES or name.startswith(
+            cls.CONFIG_FILE_PREFIXES
+        )
+
+    def get_tool_key(self, plugin: Any, package: Package, level: str) -> str:
+        """Get the part of the keys that depends on the tool and its configuration.
+
+        Args:
+            plugin: Tool plugin that scans the package.
+            package: Package being scanned.
+            level: Level the package is scanned at.
+
+        Returns:
+            Hash of the tool and its configuration.
+        """
+        plugin_context = plugin.plugin_context
+        parts: dict[str, Any] = {
+            "format": self.FORMAT_VERSION,
+            "tool": plugin.get_name(),
+            "binary": plugin.get_binary(),
+            "version": self.tool_versions.get_version(plugin),
+            "flags": plugin.get_user_flags(level),
+            "settings": plugin_context.config.get_tool_settings(
+                plugin.get_name(), level
+            ),
+            "mapping_file_suffix": getattr(
+                plugin_context.args, "mapping_file_suffix", None
+            ),
+            "config_files": {
+                path: self.get_file_hash(path)
+                for path in plugin.get_config_files(level)
+            },
+            "package_config": self.get_config_hash(package),
+        }
+        return hashlib.sha256(
+            json.dumps(parts, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+    def get_entry_file(self, key: str) -> str:
+        """Get the file an entry is kept in.
+
+        Args:
+            key: Key of the entry.
+
+        Returns:
+            Path of the file.
+        """
+        return os.path.join(self.cache_dir, key[:2], key + ".json")
+
+    def load_entry(self, key: str) -> Optional[list[Issue]]:
+        """Load the issues of an entry and mark the entry as recently used.
+
+        Args:
+            key: Key of the entry.
+
+        Returns:
+            Issues of the entry, or None if there is no valid entry.
+        """
+        entry_file = self.get_entry_file(key)
+        try:
+            with open(entry_file, "r", encoding="utf8") as fid:
+                issues = [Issue(*item) for item in json.load(fid)]
+        except (OSError, ValueError, TypeError):
+            return None
+        try:
+            os.utime(entry_file)
+        except OSError:
+            pass
+        return issues
+
+    def store_entry(self, key: str, issues: list[Issue]) -> None:
+        """Store the issues of an entry.
+
+        Args:
+            key: Key of the entry.
+            issues: Issues to store.
+        """
+        entry_file = self.get_entry_file(key)
+        tmp_file = f"{entry_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(entry_file), exist_ok=True)
+            with open(tmp_file, "w", encoding="utf8") as fid:
+                json.dump([list(issue) for issue in issues], fid)
+            os.replace(tmp_file, entry_file)
+        except OSError as ex:
+            logging.warning("Unable to write result cache entry %s: %s", entry_file, ex)
+
+    @staticmethod
+    def get_key(*parts: str) -> str:
+        """Combine the parts of a key.
+
+        Args:
+            parts: Parts of the key.
+
+        Returns:
+            Key of the entry.
+        """
+        return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+    def get_files(
+        self, plugin: Any, package: Package, level: str, files: list[str]
+    ) -> dict[str, list[Issue]]:
+        """Get the cached issues of the files a tool scans.
+
+        Args:
+            plugin: Tool plugin that scans the files.
+            package: Package being scanned.
+            level: Level the package is scanned at.
+            files: Files to scan.
+
+        Returns:
+            Issues of each file with a cache entry.
+        """
+        tool_key = self.get_tool_key(plugin, package, level)
+        cached: dict[str, list[Issue]] = {}
+        for path in files:
+            file_hash = self.get_file_hash(path)
+            if file_hash is None:
+                continue
+            issues = self.load_entry(self.get_key(tool_key, path, file_hash))
+            if issues is not None:
+                cached[path] = issues
+        return cached
+
+    # pylint: disable=too-many-arguments, too-many-positional-arguments
+    def set_files(
+        self,
+        plugin: Any,
+        package: Package,
+        level: str,
+        files: list[str],
+        issues: list[Issue],
+    ) -> None:
+        """Store the issues a tool found in the files it scanned.
+
+        Nothing is stored if an issue is not in one of the files, since the issues can
+        then not be split up between the files.
+
+        Args:
+            plugin: Tool plugin that scanned the files.
+            package: Package being scanned.
+            level: Level the package is scanned at.
+            files: Files that were scanned.
+            issues: Issues found in the files.
+        """
+        file_issues: dict[str, list[Issue]] = {
+            os.path.realpath(path): [] for path in files
+        }
+        for issue in issues:
+            real_path = os.path.realpath(issue.filename)
+            if real_path not in file_issues:
+                logging.debug(
+                    "Not caching %s results, %s was not scanned.",
+                    plugin.get_name(),
+                    issue.filename,
+                )
+                return
+            file_issues[real_path].append(issue)
+
+        tool_key = self.get_tool_key(plugin, package, level)
+        for path in files:
+            file_hash = self.get_file_hash(path)
+            if file_hash is not None:
+                self.store_entry(
+                    self.get_key(tool_key, path, file_hash),
+                    file_issues[os.path.realpath(path)],
+                )
+
+    # pylint: enable=too-many-arguments, too-many-positional-arguments
+
+    def get_package_key(
+        self, plugin: Any, package: Package, level: str
+    ) -> Optional[str]:
+        """Get the key of the issues a tool finds in a whole package.
+
+        Args:
+            plugin: Tool plugin that scans the package.
+            package: Package being scanned.
+            level: Level the package is scanned at.
+
+        Returns:
+            Key of the entry, or None if the files of the package are not known or can
+            not be read.
+        """
+        if not package.files:
+            return None
+        parts = [self.get_tool_key(plugin, package, level), package.path]
+        for path in sorted(package.files):
+            file_hash = self.get_file_hash(path)
+            if file_hash is None:
+                return None
+            parts.append(f"{path}:{file_hash}")
+        return self.get_key(*parts)
+
+    def get_package(
+        self, plugin: Any, package: Package, level: str
+    ) -> Optional[list[Issue]]:
+        """Get the cached issues a tool found in a whole package.
+
+        Args:
+            plugin: Tool plugin that scans the package.
+            package: Package being scanned.
+            level: Level the package is scanned at.
+
+        Returns:
+            Issues found in the package, or None if there is no cache entry.
+        """
+        key = self.get_package_key(plugin, package, level)
+        if key is None:
+            return None
+        return self.load_entry(key)
+
+    def set_package(
+        self, plugin: Any, package: Package, level: str, issues: list[Issue]
+    ) -> None:
+        """Store the issues a tool found in a whole package.
+
+        Args:
+            plugin: Tool plugin that scanned the package.
+            package: Package that was scanned.
+            level: Level the package was scanned at.
+            issues: Issues found in the package.
+        """
+        key = self.get_package_key(plugin, package, level)
+        if key is not None:
+            self.store_entry(key, issues)
+
+    def prune(self) -> None:
+        """Remove the least recently used entries until the size limit is met."""
+        entries: list[Tuple[float, int, str]] = []
+        total_size = 0
+        try:
+            with os.scandir(self.cache_dir) as subdirs:
+                for subdir in subdirs:
+                    if not subdir.is_dir():
+                        continue
+                    with os.scandir(subdir.path) as files:
+                        for entry in files:
+                            stat = entry.stat()
+                            entries.append((stat.st_mtime, stat.st_size, entry.path))
+                            total_size += stat.st_size
+        except OSError as ex:
+            logging.warning("Unable to list result cache %s: %s", self.cache_dir, ex)
+            return
+
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total_size -= size
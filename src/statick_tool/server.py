@@ -0,0 +1,478 @@
+"""Long-lived Statick server and its client.
+
+Each run of statick reads its configuration, exceptions and profile, loads its plugins
+and walks the package before any tool runs. Editors and commit hooks that run statick
+many times a minute mostly pay for that fixed overhead. The server keeps a Statick
+instance with its configuration, exceptions and plugins loaded, and remembers the files
+it found in each package, and scans packages on request over a local Unix socket.
+
+Requests and responses are single lines of JSON. A request gives the path of the
+package, and optionally the level to scan at and a list of files to scan instead of the
+whole package. The response holds the issues found, whether the scan succeeded, and the
+output of the reporting plugins, which the client prints.
+
+The configuration, exceptions and profile are read again when their files change, and
+only files that changed since the previous request are passed to the file command.
+
+Only the user running the server may connect to it. Without a runtime directory, the
+socket is kept in a directory of the temporary directory that only the user can use,
+and the client checks that the server it connects to runs as the same user.
+"""
+
+import argparse
+import contextlib
+import copy
+import functools
+import io
+import json
+import logging
+import os
+import signal
+import socket
+import socketserver
+import struct
+import sys
+import tempfile
+import time
+from stat import S_ISDIR
+from typing import Any, NoReturn, Optional, Tuple
+
+from statick_tool.args import Args
+from statick_tool.directory_walker import scan_files
+from statick_tool.discovery_plugin import DiscoveryPlugin
+from statick_tool.package import Package
+from statick_tool.prune_rules import PruneRules
+from statick_tool.statick_tool import Statick
+
+# Files found in a package, with the modification time and size they were found with.
+WalkedFiles = dict[str, Tuple[Tuple[int, int], dict[str, str]]]
+
+
+def get_socket_dir() -> str:
+    """Get the directory of the socket when the user has no runtime directory.
+
+    Returns:
+        Path of a directory in the temporary directory named after the user id.
+    """
+    return os.path.join(tempfile.gettempdir(), f"statick-{os.getuid()}")
+
+
+def get_default_socket() -> str:
+    """Get the socket the server listens on if none is given.
+
+    Returns:
+        Path of the socket in the runtime directory of the user, or in the socket
+        directory of the user in the temporary directory if there is none.
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, "statick.sock")
+    return os.path.join(get_socket_dir(), "statick.sock")
+
+
+def check_socket_dir(socket_path: str, create: bool = False) -> None:
+    """Check that the socket directory in the temporary directory is private.
+
+    Only the user may own and use the directory, since other users could otherwise put
+    their own socket or a link in its place. Sockets elsewhere, such as in the runtime
+    directory, are not checked.
+
+    Args:
+        socket_path: Path of the socket.
+        create: Whether to create the directory if it does not exist.
+
+    Raises:
+        OSError: If the directory is not a directory owned by the user that only the
+            user can use.
+    """
+    socket_dir = os.path.dirname(os.path.abspath(socket_path))
+    if socket_dir != get_socket_dir():
+        return
+    if create:
+        try:
+            os.mkdir(socket_dir, 0o700)
+        except FileExistsError:
+            pass
+    info = os.lstat(socket_dir)
+    if not S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise OSError(f"{socket_dir} is not a private directory of the user")
+
+
+def get_peer_uid(sock: socket.socket, socket_path: str) -> int:
+    """Get the user id of the process at the other end of a Unix socket.
+
+    Args:
+        sock: Connected socket.
+        socket_path: Path of the socket, whose owner is used where the credentials of
+            the peer are not available.
+
+    Returns:
+        User id of the peer.
+    """
+    if hasattr(socket, "SO_PEERCRED"):
+        creds = sock.getsockopt(
+            socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i")
+        )
+        _, uid, _ = struct.unpack("3i", creds)
+        return int(uid)
+    return os.stat(socket_path).st_uid
+
+
+class StatickServer:
+    """Statick instance kept loaded between scans."""
+
+    def __init__(self, statick: Statick, args: argparse.Namespace) -> None:
+        """Initialize the server.
+
+        Args:
+            statick: Statick instance with its plugins loaded.
+            args: Arguments from command line, used for every scan.
+        """
+        self.statick = statick
+        self.args = args
+        self.walked: dict[str, WalkedFiles] = {}
+        self.config_mtimes: Optional[list[Optional[int]]] = None
+        self.unix_server: Optional[socketserver.UnixStreamServer] = None
+
+    def get_config_mtimes(self) -> list[Optional[int]]:
+        """Get the modification times of the configuration and exceptions files.
+
+        Returns:
+            Modification time of each file, or None for files that can not be found.
+        """
+        resources = self.statick.resources
+        filenames = [
+            resources.get_file("config.yaml"),
+            resources.get_file(self.args.config or ""),
+            resources.get_file(self.args.exceptions or "exceptions.yaml"),
+        ]
+        mtimes: list[Optional[int]] = []
+        for filename in filenames:
+            try:
+                mtimes.append(os.stat(filename).st_mtime_ns if filename else None)
+            except OSError:
+                mtimes.append(None)
+        return mtimes
+
+    def refresh(self) -> None:
+        """Read the configuration and exceptions again if their files changed."""
+        mtimes = self.get_config_mtimes()
+        if mtimes == self.config_mtimes:
+            return
+        if self.config_mtimes is not None:
+            logging.info("Configuration changed, reading it again.")
+        self.statick.get_config(self.args)
+        self.statick.get_exceptions(self.args)
+        self.config_mtimes = mtimes
+
+    def get_prune_rules(self, path: str, level: Optional[str]) -> PruneRules:
+        """Get the rules of which files and directories to leave out of a package.
+
+        Args:
+            path: Path of the package.
+            level: Level whose discovery settings are used, if any.
+
+        Returns:
+            Rules leaving out the output and cache directories, the directories of the
+            level, directories excepted for all tools and what the discovery plugins
+            leave out by default.
+        """
+        ignore_dirs: list[str] = []
+        gitignore = True
+        default_dirs = True
+        config = self.statick.config
+        if level is not None and config is not None:
+            ignore_dirs = config.get_discovery_ignore_dirs(level)
+            gitignore = config.get_discovery_flag(level, "gitignore")
+            default_dirs = config.get_discovery_flag(level, "default_ignore_dirs")
+        is_excepted = None
+        if self.statick.exceptions is not None:
+            is_excepted = functools.partial(
+                self.statick.exceptions.is_dir_excepted,
+                Package(os.path.basename(path), path),
+            )
+        return PruneRules(
+            path,
+            ignore_dirs,
+            [self.args.output_directory, self.args.cache_dir],
+            gitignore=gitignore,
+            is_excepted=is_excepted,
+            default_dirs=default_dirs,
+        )
+
+    def walk_package(self, path: str, level: Optional[str] = None) -> Package:
+        """Find the files in a package, reusing what was found for unchanged files.
+
+        Args:
+            path: Path of the package.
+            level: Level whose discovery.ignore_dirs setting is used, if any.
+
+        Returns:
+            Package with its files found.
+        """
+        package = Package(os.path.basename(path), path)
+        previous = self.walked.get(path, {})
+        walked: WalkedFiles = {}
+        changed: list[str] = []
+        stats: dict[str, Tuple[int, int]] = {}
+        threads = self.args.walk_threads or self.args.max_procs
+        prune_rules = self.get_prune_rules(path, level)
+        for entry in scan_files(path, threads, stat=True, prune=prune_rules.prune):
+            abs_path = os.path.abspath(entry.path)
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            file_stat = (stat.st_mtime_ns, stat.st_size)
+            stats[abs_path] = file_stat
+            if abs_path in previous and previous[abs_path][0] == file_stat:
+                walked[abs_path] = previous[abs_path]
+            else:
+                changed.append(abs_path)
+        for file_dict in DiscoveryPlugin().get_file_dicts(changed):
+            walked[file_dict["path"]] = (stats[file_dict["path"]], file_dict)
+        for abs_path in stats:
+            package.files[abs_path] = walked[abs_path][1]
+        self.walked[path] = walked
+        package._walked = True  # pylint: disable=protected-access
+        return package
+
+    def scan(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Scan a package.
+
+        Args:
+            request: Path of the package, and optionally the level to scan at and the
+                files to scan, relative to the package or absolute.
+
+        Returns:
+            Issues found by each tool, or None if the scan failed, whether the scan
+            succeeded, and the output of the reporting plugins.
+        """
+        path = os.path.abspath(request["path"])
+        args = copy.copy(self.args)
+        args.path = path
+        if request.get("level"):
+            args.level = request["level"]
+        if request.get("files") is not None:
+            args.files = [os.path.join(path, name) for name in request["files"]]
+
+        self.refresh()
+        # Each scan starts over, rather than adding to the previous scans.
+        self.statick.timings = []
+        self.statick.tool_versions = []
+        self.statick.changed_files = None
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            if os.path.isdir(path):
+                package: Optional[Package] = self.walk_package(
+                    path, self.statick.get_level(path, args)
+                )
+            else:
+                package = None
+            issues, success = self.statick.run(path, args, time.time(), package)
+        if issues is not None:
+            success = success and not any(issues.values())
+        return {
+            "issues": (
+                None
+                if issues is None
+                else {
+                    tool: [list(issue) for issue in tool_issues]
+                    for tool, tool_issues in issues.items()
+                }
+            ),
+            "success": success,
+            "output": output.getvalue(),
+        }
+
+    def handle(self, line: bytes) -> dict[str, Any]:
+        """Handle a request.
+
+        Args:
+            line: Request as a line of JSON.
+
+        Returns:
+            Response to the request.
+        """
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict) or not isinstance(
+                request.get("path"), str
+            ):
+                raise ValueError("request must be an object with a path")
+        except ValueError as ex:
+            return {"error": f"Invalid request: {ex}"}
+        logging.info("Scanning %s", request["path"])
+        try:
+            return self.scan(request)
+        except Exception as ex:  # pylint: disable=broad-exception-caught
+            logging.exception("Scan of %s failed", request["path"])
+            return {"error": f"Scan failed: {ex}"}
+
+    def serve(self, socket_path: str) -> None:
+        """Answer requests on a Unix socket until interrupted.
+
+        Requests are answered one at a time, since scans share the Statick instance.
+
+        Args:
+            socket_path: Path of the socket to listen on.
+
+        Raises:
+            OSError: If another server is listening on the socket, or the directory of
+                the socket is not private.
+        """
+        check_socket_dir(socket_path, create=True)
+        if os.path.exists(socket_path):
+            try:
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                    sock.connect(socket_path)
+            except OSError:
+                os.remove(socket_path)
+            else:
+                raise OSError(f"A server is already listening on {socket_path}")
+
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            """Answer a request made to the server."""
+
+            def handle(self) -> None:
+                """Read a request and write the response."""
+                response = server.handle(self.rfile.readline())
+                self.wfile.write(json.dumps(response).encode() + b"\n")
+
+        # Only the user running the server may connect to it.
+        old_umask = os.umask(0o077)
+        try:
+            self.unix_server = socketserver.UnixStreamServer(socket_path, Handler)
+        finally:
+            os.umask(old_umask)
+
+        self.refresh()
+        logging.info("Statick server listening on %s", socket_path)
+        with self.unix_server:
+            try:
+                self.unix_server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                os.remove(socket_path)
+
+    def shutdown(self) -> None:
+        """Stop answering requests, from another thread than the one serving."""
+        if self.unix_server is not None:
+            self.unix_server.shutdown()
+
+
+def send_request(socket_path: str, request: dict[str, Any]) -> dict[str, Any]:
+    """Send a request to the server and wait for its response.
+
+    Args:
+        socket_path: Path of the socket the server listens on.
+        request: Request to send.
+
+    Returns:
+        Response of the server.
+
+    Raises:
+        OSError: If the server can not be reached, the directory of the socket is not
+            private or the server runs as another user.
+        ValueError: If the response is not valid.
+    """
+    check_socket_dir(socket_path)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        peer_uid = get_peer_uid(sock, socket_path)
+        if peer_uid != os.getuid():
+            raise OSError(f"the server at {socket_path} runs as user {peer_uid}")
+        sock.sendall(json.dumps(request).encode() + b"\n")
+        with sock.makefile("rb") as fid:
+            line = fid.readline()
+    if not line:
+        raise ValueError("the server closed the connection without responding")
+    response: dict[str, Any] = json.loads(line)
+    return response
+
+
+def serve_main(argv: Optional[list[str]] = None) -> None:  # pragma: no cover
+    """Run the Statick server, as the statick-serve command.
+
+    Args:
+        argv: Arguments to parse, or None for the arguments from the command line.
+    """
+    args = Args("Statick server")
+    args.parser.add_argument(
+        "--socket",
+        dest="socket",
+        type=str,
+        default=get_default_socket(),
+        help="Path of the Unix socket to listen on",
+    )
+    statick = Statick(args.get_user_paths(argv))
+    statick.gather_args(args.parser)
+    parsed_args = args.get_args(argv)
+    statick.set_logging_level(parsed_args)
+
+    def stop(signum: int, frame: Any) -> NoReturn:  # pylint: disable=unused-argument
+        sys.exit(0)
+
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        StatickServer(statick, parsed_args).serve(parsed_args.socket)
+    except OSError as ex:
+        logging.error("Unable to start server: %s", ex)
+        sys.exit(1)
+
+
+def client_main(argv: Optional[list[str]] = None) -> None:  # pragma: no cover
+    """Ask the Statick server to scan a package and print the report.
+
+    This is the statick-client command.
+
+    Args:
+        argv: Arguments to parse, or None for the arguments from the command line.
+    """
+    parser = argparse.ArgumentParser(description="Statick client")
+    parser.add_argument("path", help="Path of package to scan")
+    parser.add_argument(
+        "files", nargs="*", help="Files to scan, instead of the whole package"
+    )
+    parser.add_argument(
+        "--socket",
+        dest="socket",
+        type=str,
+        default=get_default_socket(),
+        help="Path of the Unix socket the server listens on",
+    )
+    parser.add_argument(
+        "--level", dest="level", type=str, help="Scan level to use from config file"
+    )
+    parser.add_argument(
+        "--check",
+        dest="check",
+        action="store_true",
+        help="Return code 1 means there were issues",
+    )
+    parsed_args = parser.parse_args(argv)
+    logging.basicConfig(format="%(levelname)s: %(message)s")
+
+    request: dict[str, Any] = {"path": os.path.abspath(parsed_args.path)}
+    if parsed_args.level:
+        request["level"] = parsed_args.level
+    if parsed_args.files:
+        request["files"] = [os.path.abspath(name) for name in parsed_args.files]
+    try:
+        response = send_request(parsed_args.socket, request)
+    except (OSError, ValueError) as ex:
+        logging.error("Unable to scan with server at %s: %s", parsed_args.socket, ex)
+        sys.exit(1)
+
+    if "error" in response:
+        logging.error("%s", response["error"])
+        sys.exit(1)
+    sys.stdout.write(response["output"])
+    if response["issues"] is None:
+        Statick.print_no_issues()
+    if parsed_args.check and not response["success"]:
+        sys.exit(1)
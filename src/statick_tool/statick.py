@@ -2,6 +2,7 @@
 """Executable script for running Statick against one or more packages."""
 
 import argparse
+import logging
 import sys
 import time
 
@@ -9,6 +10,7 @@ from tabulate import tabulate
 
 from statick_tool.args import Args
 from statick_tool.statick_tool import Statick
+from statick_tool.timing import format_timing_summary, format_timings, write_trace
 
 
 def run(
@@ -35,6 +37,28 @@ def run(
     return success
 
 
+def report_timings(
+    statick: Statick, parsed_args: argparse.Namespace
+) -> None:  # pragma: no cover
+    """Print, write and warn about the timings of a run, as the arguments ask.
+
+    Args:
+        statick: Statick instance that ran.
+        parsed_args: Parsed arguments from command line.
+    """
+    timings = statick.get_timings()
+    if parsed_args.timings:
+        print(format_timings(timings))
+        if len({timing.package for timing in timings if timing.plugin_type}) > 1:
+            print(format_timing_summary(timings, parsed_args.timings_top))
+    if parsed_args.trace_file:
+        write_trace(timings, parsed_args.trace_file)
+
+    timeouts = statick.get_timeouts()
+    if timeouts:
+        logging.warning("Tools timed out:\n%s", format_timings(timeouts))
+
+
 def main() -> None:  # pragma: no cover
     """Run Statick."""
     start_time: float = time.time()
@@ -52,12 +76,17 @@ def main() -> None:  # pragma: no cover
         success = statick.collect_tool_versions(parsed_args)
     elif parsed_args.workspace:
         _, success = statick.run_workspace(parsed_args, start_time)
+    elif parsed_args.watch:
+        # Only watching needs the watch module.
+        from statick_tool.watch import (  # pylint: disable=import-outside-toplevel
+            PackageWatch,
+        )
+
+        success = PackageWatch(statick, parsed_args, parsed_args.path).run()
     else:
         success = run(statick, parsed_args, start_time)
 
-    timings = statick.get_timings()
-    if parsed_args.timings:
-        print(tabulate(timings, headers="keys", tablefmt="pretty"))
+    report_timings(statick, parsed_args)
 
     if parsed_args.show_all_tool_versions or parsed_args.show_run_tool_versions:
         tool_versions = statick.get_tool_versions()
@@ -1,35 +1,52 @@
 """Code analysis front-end."""
 
+# pylint: disable=too-many-lines
+
 import argparse
+import contextlib
 import copy
 import io
 import logging
 import multiprocessing
 import os
+import subprocess
 import sys
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from importlib.metadata import version
 from logging.handlers import MemoryHandler
-from typing import Any, Optional, Tuple
+from threading import Lock
+from typing import Iterator, Optional, Tuple
 
+from statick_tool.changed_files import ChangedFiles, ListedFiles
 from statick_tool.config import Config
+from statick_tool.discovery_cache import DiscoveryCache
 from statick_tool.discovery_plugin import DiscoveryPlugin
 from statick_tool.exceptions import Exceptions
 from statick_tool.issue import Issue
 from statick_tool.package import Package
+from statick_tool.package_index import PackageIndex
 from statick_tool.plugin_context import PluginContext
+from statick_tool.plugin_registry import PluginRegistry
+from statick_tool.plugin_scheduler import PluginScheduler
 from statick_tool.profile import Profile
+from statick_tool.reporting_plugin import ReportingPlugin
 from statick_tool.resources import Resources
-from statick_tool.timing import Timing
+from statick_tool.result_cache import ResultCache
+from statick_tool.timing import Timing, TimingStart
+from statick_tool.tool_plugin import ToolPlugin
+from statick_tool.tool_result import ToolResult
 from statick_tool.tool_version import ToolVersion
-
-if sys.version_info < (3, 10):
-    from importlib_metadata import entry_points
-else:
-    from importlib.metadata import entry_points
+from statick_tool.tool_version_cache import ToolVersionCache
+from statick_tool.workspace_scheduler import (
+    WorkspaceJob,
+    WorkspaceResults,
+    WorkspaceScheduler,
+)
+from statick_tool.workspace_worker import WorkspaceWorker
 
 
-class Statick:  # pylint: disable=too-many-instance-attributes
+class Statick:  # pylint: disable=too-many-instance-attributes, too-many-public-methods
     """Code analysis front-end."""
 
     def __init__(self, user_paths: list[str]) -> None:
@@ -39,30 +56,30 @@ class Statick:  # pylint: disable=too-many-instance-attributes
             user_paths: List of paths to search for resource files.
         """
         self.default_level = "default"
+        self.user_paths = user_paths
         self.resources = Resources(user_paths)
 
-        self.discovery_plugins: dict[str, Any] = {}
-        plugins = entry_points(group="statick_tool.plugins.discovery")
-        for plugin_type in plugins:
-            plugin = plugin_type.load()
-            self.discovery_plugins[plugin_type.name] = plugin()
-
-        self.reporting_plugins: dict[str, Any] = {}
-        plugins = entry_points(group="statick_tool.plugins.reporting")
-        for plugin_type in plugins:
-            plugin = plugin_type.load()
-            self.reporting_plugins[plugin_type.name] = plugin()
-
-        self.tool_plugins: dict[str, Any] = {}
-        plugins = entry_points(group="statick_tool.plugins.tool")
-        for plugin_type in plugins:
-            plugin = plugin_type.load()
-            self.tool_plugins[plugin_type.name] = plugin()
+        # Plugins are imported and instantiated the first time they are used, so only
+        # the plugins enabled for the levels being scanned pay their import cost.
+        self.discovery_plugins = PluginRegistry(
+            "statick_tool.plugins.discovery", DiscoveryPlugin
+        )
+        self.reporting_plugins = PluginRegistry(
+            "statick_tool.plugins.reporting", ReportingPlugin
+        )
+        self.tool_plugins = PluginRegistry("statick_tool.plugins.tool", ToolPlugin)
 
         self.config: Optional[Config] = None
         self.exceptions: Optional[Exceptions] = None
         self.timings: list[Timing] = []
         self.tool_versions: list[ToolVersion] = []
+        self.tool_version_cache = ToolVersionCache()
+        self.result_cache: Optional[ResultCache] = None
+        self.changed_files: Optional[ChangedFiles] = None
+        self.profiles: dict[str, Tuple[int, Profile]] = {}
+        # Time, as from time.time(), by which all tools must finish.
+        self.deadline: Optional[float] = None
+        self.timeouts: list[Timing] = []
 
     @staticmethod
     def set_logging_level(args: argparse.Namespace) -> None:
@@ -243,6 +260,21 @@ class Statick:  # pylint: disable=too-many-instance-attributes
             action="store_true",
             help="Enable printing timing information to stdout",
         )
+        args.add_argument(
+            "--timings-top",
+            dest="timings_top",
+            type=int,
+            default=10,
+            help="Number of slowest tool runs to list in the timing summary of a "
+            "workspace",
+        )
+        args.add_argument(
+            "--trace-file",
+            dest="trace_file",
+            type=str,
+            help="Write when each discovery, tool and reporting plugin ran, in which "
+            "process, to a Chrome trace file that Perfetto or chrome://tracing can show",
+        )
 
         # Statick workspace arguments.
         args.add_argument(
@@ -255,10 +287,18 @@ class Statick:  # pylint: disable=too-many-instance-attributes
             "--max-procs",
             dest="max_procs",
             type=self.set_cpu_count,
-            default=int(multiprocessing.cpu_count() / 2),
+            default=max(1, int(multiprocessing.cpu_count() / 2)),
             help="Maximum number of CPU cores to use. "
             "Defaults to half the available CPU cores. Setting to -1 will "
-            "cause Statick to use all available CPU cores",
+            "cause Statick to use all available CPU cores. Tool plugins that do not "
+            "depend on each other run concurrently up to this limit",
+        )
+        args.add_argument(
+            "--walk-threads",
+            dest="walk_threads",
+            type=int,
+            help="Number of directories listed at the same time when finding the "
+            "files in a package. Defaults to --max-procs",
         )
         args.add_argument(
             "--packages-file",
@@ -272,15 +312,63 @@ class Statick:  # pylint: disable=too-many-instance-attributes
             action="store_true",
             help="List packages and levels, only used when running on a workspace",
         )
+        args.add_argument(
+            "--fail-fast",
+            dest="fail_fast",
+            action="store_true",
+            help="Stop scanning the remaining packages once a package has issues, "
+            "only used when running on a workspace",
+        )
+        args.add_argument(
+            "--workspace-timeout",
+            dest="workspace_timeout",
+            type=float,
+            help="Number of seconds a workspace scan may take. Tools still running "
+            "then are stopped and recorded as timed out, and packages that have not "
+            "started are not scanned",
+        )
+        args.add_argument(
+            "--cache-dir",
+            dest="cache_dir",
+            type=str,
+            help="Directory to keep caches in between runs, such as tool versions, "
+            "tool results and the packages found in a workspace",
+        )
+        args.add_argument(
+            "--changed-since",
+            dest="changed_since",
+            type=str,
+            help="Only scan files changed since the given git reference, such as "
+            "origin/main, including uncommitted and untracked files",
+        )
+        args.add_argument(
+            "--changed-lines-only",
+            dest="changed_lines_only",
+            action="store_true",
+            help="Only report issues on lines changed since the --changed-since "
+            "reference, rather than all issues in changed files",
+        )
+        args.add_argument(
+            "--watch",
+            dest="watch",
+            action="store_true",
+            help="Scan the package again whenever its files change, only running the "
+            "tools that scan the changed files, until interrupted. Not used when "
+            "running on a workspace",
+        )
+        args.add_argument(
+            "--result-cache-size",
+            dest="result_cache_size",
+            type=int,
+            default=1024,
+            help="Size in MiB of the tool results kept in the cache directory. The "
+            "least recently used results are removed first. Set to 0 to disable the "
+            "result cache",
+        )
 
-        for _, plugin in list(self.discovery_plugins.items()):
-            plugin.gather_args(args)
-
-        for _, plugin in list(self.reporting_plugins.items()):
-            plugin.gather_args(args)
-
-        for _, plugin in list(self.tool_plugins.items()):
-            plugin.gather_args(args)
+        self.discovery_plugins.gather_args(args)
+        self.reporting_plugins.gather_args(args)
+        self.tool_plugins.gather_args(args)
 
     def get_level(self, path: str, args: argparse.Namespace) -> Optional[str]:
         """Get level to scan package at.
@@ -305,7 +393,7 @@ class Statick:  # pylint: disable=too-many-instance-attributes
             logging.error("Could not find profile file %s!", profile_filename)
             return None
         try:
-            profile = Profile(profile_resource)
+            profile = self.get_profile(profile_resource)
         except OSError as ex:
             # This isn't quite redundant with the profile_resource check: it's possible
             # that something else triggers an OSError, like permissions.
@@ -320,6 +408,23 @@ class Statick:  # pylint: disable=too-many-instance-attributes
 
         return level
 
+    def get_profile(self, filename: str) -> Profile:
+        """Get a profile, only reading the file again once it changes.
+
+        Args:
+            filename: Name of the profile file.
+
+        Returns:
+            Profile read from the file.
+        """
+        mtime = os.stat(filename).st_mtime_ns
+        cached = self.profiles.get(filename)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        profile = Profile(filename)
+        self.profiles[filename] = (mtime, profile)
+        return profile
+
     def add_timing(
         self, package: str, name: str, plugin_type: str, duration: str
     ) -> None:
@@ -342,15 +447,27 @@ class Statick:  # pylint: disable=too-many-instance-attributes
         """
         return self.timings
 
+    def get_timeouts(self) -> list[Timing]:
+        """Return the tools that timed out on each package.
+
+        Returns:
+            Package, tool and duration of each tool that timed out.
+        """
+        return self.timeouts
+
     def add_tool_version(self, tool: str, tool_version: str) -> None:
         """Add an entry to the tool versions list.
 
+        Entries that are already in the list, such as the same tool scanning another
+        package in a workspace, are not added again.
+
         Args:
             tool: Name of the tool.
             tool_version: Version of the tool.
         """
         this_tool_version = ToolVersion(tool, tool_version)
-        self.tool_versions.append(this_tool_version)
+        if this_tool_version not in self.tool_versions:
+            self.tool_versions.append(this_tool_version)
 
     def get_tool_versions(self) -> list[ToolVersion]:
         """Return list of version for each tool.
@@ -360,6 +477,54 @@ class Statick:  # pylint: disable=too-many-instance-attributes
         """
         return self.tool_versions
 
+    def load_tool_version_cache(self, args: argparse.Namespace) -> None:
+        """Load tool versions kept on disk, if a cache directory is in use.
+
+        Args:
+            args: Arguments from command line.
+        """
+        if args.cache_dir:
+            self.tool_version_cache.load(
+                os.path.join(args.cache_dir, "tool_versions.json")
+            )
+
+    def load_result_cache(self, args: argparse.Namespace) -> None:
+        """Set up the cache of tool results, if a cache directory is in use.
+
+        Args:
+            args: Arguments from command line.
+        """
+        if not args.cache_dir or args.result_cache_size <= 0:
+            self.result_cache = None
+            return
+        self.result_cache = ResultCache(
+            os.path.join(args.cache_dir, "results"),
+            args.result_cache_size * 1024 * 1024,
+            self.tool_version_cache,
+        )
+
+    def load_changed_files(self, args: argparse.Namespace) -> None:
+        """Set up scanning only changed files, if a git reference is given.
+
+        The server can instead list the files to scan in a files argument.
+
+        Args:
+            args: Arguments from command line.
+        """
+        files = getattr(args, "files", None)
+        if files is not None:
+            self.changed_files = ListedFiles(files)
+        elif not args.changed_since:
+            self.changed_files = None
+        elif (
+            self.changed_files is None
+            or self.changed_files.ref != args.changed_since
+            or self.changed_files.lines_only != args.changed_lines_only
+        ):
+            self.changed_files = ChangedFiles(
+                args.changed_since, args.changed_lines_only
+            )
+
     def collect_tool_versions(self, args: argparse.Namespace) -> bool:
         """Print out all tool versions.
 
@@ -390,158 +555,307 @@ class Statick:  # pylint: disable=too-many-instance-attributes
 
         plugin_context = PluginContext(args, self.resources, self.config)
 
-        for plugin_name, plugin in list(self.tool_plugins.items()):
+        self.load_tool_version_cache(args)
+        plugins = list(self.tool_plugins.items())
+        for _, plugin in plugins:
             plugin.set_plugin_context(plugin_context)
-            self.add_tool_version(plugin_name, plugin.get_version())
+
+        with ThreadPoolExecutor(max_workers=args.max_procs) as executor:
+            tool_versions = executor.map(
+                lambda item: self.tool_version_cache.get_version(item[1]), plugins
+            )
+            for (plugin_name, _), tool_version in zip(plugins, tool_versions):
+                self.add_tool_version(plugin_name, tool_version)
+        self.tool_version_cache.save()
 
         return success
 
-    # pylint: disable=too-many-locals, too-many-return-statements, too-many-branches
-    # pylint: disable=too-many-statements
-    def run(
-        self, path: str, args: argparse.Namespace, start_time: Optional[float] = None
-    ) -> Tuple[Optional[dict[str, list[Issue]]], bool]:
-        """Run scan tools against targets on path.
+    def run_discovery_plugin(
+        self, plugin_name: str, package: Package, level: str, package_lock: Lock
+    ) -> Timing:
+        """Run a single discovery plugin against a package.
+
+        The plugin scans a private copy of the package so that discovery plugins running
+        at the same time never see each other's partial results. Keys the plugin adds or
+        replaces are merged back into the shared package once the plugin is done.
 
         Args:
-            path: Path to the target.
-            args: Arguments from command line.
-            start_time: Start time of the scan.
+            plugin_name: Name of the discovery plugin to run.
+            package: Package to scan.
+            level: Level to scan package at.
+            package_lock: Lock guarding access to the shared package.
 
         Returns:
-            Issues found and success status.
+            Timing of the scan.
         """
-        success = True
+        plugin = self.discovery_plugins[plugin_name]
+        with package_lock:
+            private_package = copy.copy(package)
+            before = dict(private_package)
+
+        logging.info("Running %s discovery plugin...", plugin.get_name())
+        plugin_start = TimingStart.now()
+        plugin.scan(private_package, level, self.exceptions)
+        timing = plugin_start.stop(package.name, plugin.get_name(), "Discovery")
+
+        with package_lock:
+            for key, value in private_package.items():
+                if key not in before or before[key] is not value:
+                    package[key] = value
+        logging.info("%s discovery plugin done.", plugin.get_name())
+        return timing
+
+    def run_tool_plugin(
+        self, plugin_name: str, package: Package, level: str
+    ) -> ToolResult:
+        """Run a single tool plugin against a package.
 
-        path = os.path.abspath(path)
-        if not os.path.exists(path):
-            logging.error("No package found at %s!", path)
-            return None, False
+        Args:
+            plugin_name: Name of the tool plugin to run.
+            package: Package to scan.
+            level: Level to scan package at.
 
-        package = Package(os.path.basename(path), path)
-        level: Optional[str] = self.get_level(path, args)
-        logging.info("level: %s", level)
-        if level is None:
-            logging.error("Level is not valid.")
-            return None, False
+        Returns:
+            Issues found, timing of the scan, version of the tool and whether the
+            tool timed out.
+        """
+        plugin = self.tool_plugins[plugin_name]
+        logging.info("Running %s tool plugin...", plugin.get_name())
+        plugin_start = TimingStart.now()
+        plugin.deadline = self.get_tool_deadline(plugin_name, level, time.time())
+        scan_package = package
+        if self.changed_files is not None and not plugin.needs_whole_package():
+            scan_package = self.changed_files.filter_package(package)
+        try:
+            # Entries for a whole package are keyed on all of its files, so they are
+            # not used when only the changed files are scanned.
+            if (
+                self.result_cache is not None
+                and plugin.get_cache_granularity() == "package"
+                and scan_package is package
+            ):
+                tool_issues = self.result_cache.get_package(plugin, package, level)
+                if tool_issues is not None:
+                    logging.info("  Reusing cached results of the package.")
+                else:
+                    tool_issues = plugin.scan(package, level)
+                    if tool_issues is not None:
+                        self.result_cache.set_package(
+                            plugin, package, level, tool_issues
+                        )
+            else:
+                tool_issues = plugin.scan(scan_package, level)
+        except subprocess.TimeoutExpired:
+            return ToolResult(
+                None,
+                plugin_start.stop(package.name, plugin.get_name(), "Tool"),
+                self.tool_version_cache.get_version(plugin),
+                True,
+            )
+        finally:
+            plugin.deadline = None
+        return ToolResult(
+            tool_issues,
+            plugin_start.stop(package.name, plugin.get_name(), "Tool"),
+            self.tool_version_cache.get_version(plugin),
+        )
 
-        if not self.config or (
-            level != self.default_level and not self.config.has_level(level)
-        ):
-            logging.error("Can't find specified level %s in config!", level)
-            return None, False
+    def get_tool_deadline(
+        self, plugin_name: str, level: str, start_time: float
+    ) -> Optional[float]:
+        """Get the time by which a tool plugin must finish scanning a package.
 
-        orig_path = os.getcwd()
-        if args.output_directory:
-            if not os.path.isdir(args.output_directory):
-                try:
-                    os.mkdir(args.output_directory)
-                except OSError as ex:
-                    logging.error(
-                        "Unable to create output directory at %s: %s",
-                        args.output_directory,
-                        ex,
-                    )
-                    return None, False
+        Args:
+            plugin_name: Name of the tool plugin.
+            level: Level the package is scanned at.
+            start_time: Time the tool plugin started.
 
-            output_dir = os.path.join(args.output_directory, package.name + "-" + level)
+        Returns:
+            Time, as from time.time(), by which the tool must finish, or None if it has
+            no timeout.
+        """
+        deadlines: list[float] = []
+        if self.config is not None:
+            timeout = self.config.get_tool_timeout(plugin_name, level)
+            if timeout is not None:
+                deadlines.append(start_time + timeout)
+        if self.deadline is not None:
+            deadlines.append(self.deadline)
+        return min(deadlines) if deadlines else None
+
+    def get_output_dir(
+        self, args: argparse.Namespace, package: Package, level: str
+    ) -> Optional[str]:
+        """Get the directory to write output for a package to.
 
-            if not os.path.isdir(output_dir):
-                try:
-                    os.mkdir(output_dir)
-                except OSError as ex:
-                    logging.error(
-                        "Unable to create output directory at %s: %s", output_dir, ex
-                    )
-                    return None, False
-            logging.info("Writing output to: %s", output_dir)
+        Args:
+            args: Arguments from command line.
+            package: Package being scanned.
+            level: Level the package is scanned at.
+
+        Returns:
+            Output directory for the package, or None if no output directory is in use.
+        """
+        if not args.output_directory:
+            return None
+        return os.path.join(args.output_directory, package.name + "-" + level)
 
-            os.chdir(output_dir)
+    def make_output_dir(
+        self, args: argparse.Namespace, package: Package, level: str
+    ) -> bool:
+        """Create the directory to write output for a package to.
 
-        logging.info("------")
-        logging.info(
-            "Scanning package %s (%s) at level %s", package.name, package.path, level
-        )
+        Args:
+            args: Arguments from command line.
+            package: Package being scanned.
+            level: Level the package is scanned at.
 
-        issues: dict[str, list[Issue]] = {}
+        Returns:
+            True if the output directory exists or is not in use, False otherwise.
+        """
+        output_dir = self.get_output_dir(args, package, level)
+        if output_dir is None:
+            return True
 
-        ignore_packages = self.get_ignore_packages()
-        if package.name in ignore_packages:
-            logging.info(
-                "Package %s is configured to be ignored by Statick.", package.name
-            )
-            return issues, True
+        if not os.path.isdir(args.output_directory):
+            try:
+                os.mkdir(args.output_directory)
+            except OSError as ex:
+                logging.error(
+                    "Unable to create output directory at %s: %s",
+                    args.output_directory,
+                    ex,
+                )
+                return False
 
-        plugin_context = PluginContext(args, self.resources, self.config)
+        if not os.path.isdir(output_dir):
+            try:
+                os.mkdir(output_dir)
+            except OSError as ex:
+                logging.error(
+                    "Unable to create output directory at %s: %s", output_dir, ex
+                )
+                return False
+        logging.info("Writing output to: %s", output_dir)
+        return True
+
+    def run_discovery(  # pylint: disable=too-many-locals
+        self,
+        package: Package,
+        level: str,
+        plugin_context: PluginContext,
+        args: argparse.Namespace,
+    ) -> bool:
+        """Find the files in a package and run the discovery plugins on them.
 
+        Args:
+            package: Package to scan.
+            level: Level to scan package at.
+            plugin_context: Context to give to the discovery plugins.
+            args: Arguments from command line.
+
+        Returns:
+            True if all discovery plugins were found, False otherwise.
+        """
         logging.info("---Discovery---")
         if not DiscoveryPlugin.file_command_exists():
             logging.info(
                 "file command isn't available, discovery plugins will be less effective"
             )
 
+        assert self.config is not None
         discovery_plugins = self.config.get_enabled_discovery_plugins(level)
         if not discovery_plugins:
             discovery_plugins = list(self.discovery_plugins)
         # Get timing information for finding files for discovery plugins.
         dummy_plugin = DiscoveryPlugin()
-        plugin_start = time.time()
-        dummy_plugin.find_files(package)
-        duration = format(time.time() - plugin_start, ".4f")
-        timing = Timing(package.name, "find files", "Discovery", duration)
-        self.timings.append(timing)
+        dummy_plugin.set_plugin_context(plugin_context)
+        plugin_start = TimingStart.now()
+        discovery_cache = None
+        if args.cache_dir and not package._walked:  # pylint: disable=protected-access
+            discovery_cache = DiscoveryCache(
+                os.path.join(args.cache_dir, "discovery"),
+                package.path,
+                DiscoveryPlugin.file_command_exists(),
+            )
+        dummy_plugin.find_files(
+            package,
+            discovery_cache,
+            dummy_plugin.get_prune_rules(package, level, self.exceptions),
+        )
+        self.timings.append(plugin_start.stop(package.name, "find files", "Discovery"))
 
-        plugins_ran: list[Any] = []
+        discovery_plan: list[str] = []
         for plugin_name in discovery_plugins:
             if plugin_name not in self.discovery_plugins:
                 logging.error("Can't find specified discovery plugin %s!", plugin_name)
-                return None, False
+                return False
 
             plugin = self.discovery_plugins[plugin_name]
             dependencies = plugin.get_discovery_dependencies()
-            for dependency_name in dependencies:
-                dependency_plugin = self.discovery_plugins[dependency_name]
-                if dependency_plugin.get_name() in plugins_ran:
-                    continue
-                dependency_plugin.set_plugin_context(plugin_context)
-                logging.info(
-                    "Running %s discovery plugin...", dependency_plugin.get_name()
-                )
-                plugin_start = time.time()
-                dependency_plugin.scan(package, level, self.exceptions)
-                duration = format(time.time() - plugin_start, ".4f")
-                timing = Timing(
-                    package.name, dependency_plugin.get_name(), "Discovery", duration
-                )
-                self.timings.append(timing)
-                logging.info("%s discovery plugin done.", dependency_plugin.get_name())
-                plugins_ran.append(dependency_plugin.get_name())
-
-            if plugin.get_name() not in plugins_ran:
-                plugin.set_plugin_context(plugin_context)
-                logging.info("Running %s discovery plugin...", plugin.get_name())
-                plugin_start = time.time()
-                plugin.scan(package, level, self.exceptions)
-                duration = format(time.time() - plugin_start, ".4f")
-                timing = Timing(package.name, plugin.get_name(), "Discovery", duration)
-                self.timings.append(timing)
-                logging.info("%s discovery plugin done.", plugin.get_name())
-                plugins_ran.append(plugin.get_name())
+            for dependency_name in dependencies + [plugin_name]:
+                if dependency_name not in self.discovery_plugins:
+                    logging.error(
+                        "Can't find specified discovery plugin %s!", dependency_name
+                    )
+                    return False
+                if dependency_name not in discovery_plan:
+                    self.discovery_plugins[dependency_name].set_plugin_context(
+                        plugin_context
+                    )
+                    discovery_plan.append(dependency_name)
+
+        package_lock = Lock()
+        scheduler = PluginScheduler(args.max_procs)
+        discovery_timings = scheduler.run(
+            discovery_plan,
+            {
+                plugin_name: self.discovery_plugins[
+                    plugin_name
+                ].get_discovery_dependencies()
+                for plugin_name in discovery_plan
+            },
+            lambda plugin_name: self.run_discovery_plugin(
+                plugin_name, package, level, package_lock
+            ),
+        )
+        self.timings += discovery_timings.values()
+        if discovery_cache is not None:
+            discovery_cache.save(package.files)
         logging.info("---Discovery---")
+        return True
 
-        logging.info("---Tools---")
+    def plan_tools(
+        self, level: str, plugin_context: PluginContext, args: argparse.Namespace
+    ) -> Optional[list[str]]:
+        """Work out which tool plugins run at a level and in what order.
+
+        Tools that others depend on are placed before them.
+
+        Args:
+            level: Level to scan at.
+            plugin_context: Context to give to the tool plugins.
+            args: Arguments from command line.
+
+        Returns:
+            Names of tool plugins to run, or None if a plugin or one of its dependencies
+            can not be found.
+        """
+        assert self.config is not None
         enabled_plugins = self.config.get_enabled_tool_plugins(level)
         if not enabled_plugins:
             enabled_plugins = list(self.tool_plugins)
         plugins_to_run = copy.copy(enabled_plugins)
-        plugins_ran = []
+        plugins_ran: list[str] = []
         plugin_dependencies: list[str] = []
+        # Work out which tools run and in what order before running any of them, so
+        # that tools without dependencies between them can run at the same time.
         while plugins_to_run:
             plugin_name = plugins_to_run[0]
 
             if plugin_name not in self.tool_plugins:
                 logging.error("Can't find specified tool plugin %s!", plugin_name)
-                return None, False
+                return None
 
             if args.force_tool_list is not None:
                 force_tool_list = args.force_tool_list.split(",")
@@ -566,7 +880,7 @@ class Statick:  # pylint: disable=too-many-instance-attributes
                             plugin_name,
                             dependency_name,
                         )
-                        return None, False
+                        return None
                     plugin_dependencies.append(dependency_name)
                     if dependency_name in plugins_to_run:
                         plugins_to_run.remove(dependency_name)
@@ -576,31 +890,86 @@ class Statick:  # pylint: disable=too-many-instance-attributes
             if not dependencies_met:
                 continue
 
-            logging.info("Running %s tool plugin...", plugin.get_name())
-            plugin_start = time.time()
-            tool_issues = plugin.scan(package, level)
-            duration = format(time.time() - plugin_start, ".4f")
-            timing = Timing(package.name, plugin.get_name(), "Tool", duration)
-            self.timings.append(timing)
-            self.add_tool_version(plugin.get_name(), plugin.get_version())
-            if tool_issues is not None:
-                issues[plugin_name] = tool_issues
+            plugins_to_run.remove(plugin_name)
+            plugins_ran.append(plugin_name)
+
+        return plugins_ran
+
+    def get_tool_dependencies(self, plugin_names: list[str]) -> dict[str, list[str]]:
+        """Get the tools each of the given tool plugins depends on.
+
+        Args:
+            plugin_names: Names of tool plugins.
+
+        Returns:
+            Names of the tool plugins each tool plugin depends on.
+        """
+        return {
+            plugin_name: self.tool_plugins[plugin_name].get_tool_dependencies()
+            for plugin_name in plugin_names
+        }
+
+    def collect_tool_results(
+        self,
+        package: Package,
+        tool_results: dict[str, ToolResult],
+        issues: dict[str, list[Issue]],
+    ) -> bool:
+        """Record the timings, versions and issues of tool plugins that have run.
+
+        Args:
+            package: Package that was scanned.
+            tool_results: Result of each tool plugin, in the planned order.
+            issues: Issues found by each tool plugin, updated in place.
+
+        Returns:
+            True if all tool plugins succeeded, False otherwise.
+        """
+        success = True
+        # Results are collected in the planned order so that issues, timings and tool
+        # versions do not depend on which tool happened to finish first.
+        for plugin_name, result in tool_results.items():
+            plugin = self.tool_plugins[plugin_name]
+            self.timings.append(result.timing)
+            self.add_tool_version(plugin.get_name(), result.version)
+            self.tool_version_cache.set_version(plugin, result.version)
+            if result.issues is not None:
+                issues[plugin_name] = result.issues
                 logging.info("%s tool plugin done.", plugin.get_name())
+            elif result.timed_out:
+                logging.error(
+                    "%s tool plugin timed out on package %s after %s s",
+                    plugin.get_name(),
+                    package.name,
+                    result.timing.duration,
+                )
+                self.timeouts.append(result.timing)
+                success = False
             else:
                 logging.error("%s tool plugin failed", plugin.get_name())
                 success = False
+        return success
 
-            plugins_to_run.remove(plugin_name)
-            plugins_ran.append(plugin_name)
-
-        logging.info("---Tools---")
-
-        if self.exceptions is not None:
-            issues = self.exceptions.filter_issues(package, issues)
+    def report_package(
+        self,
+        package: Package,
+        issues: dict[str, list[Issue]],
+        level: str,
+        plugin_context: PluginContext,
+    ) -> bool:
+        """Run the reporting plugins on the issues found in a package.
 
-        os.chdir(orig_path)
+        Args:
+            package: Package that was scanned.
+            issues: Issues found by each tool plugin.
+            level: Level the package was scanned at.
+            plugin_context: Context to give to the reporting plugins.
 
+        Returns:
+            True if all reporting plugins were found, False otherwise.
+        """
         logging.info("---Reporting---")
+        assert self.config is not None
         reporting_plugins = self.config.get_enabled_reporting_plugins(level)
         if not reporting_plugins:
             if "print_to_console" in self.reporting_plugins:
@@ -610,23 +979,118 @@ class Statick:  # pylint: disable=too-many-instance-attributes
         for plugin_name in reporting_plugins:
             if plugin_name not in self.reporting_plugins:
                 logging.error("Can't find specified reporting plugin %s!", plugin_name)
-                return None, False
+                return False
 
             plugin = self.reporting_plugins[plugin_name]
             plugin.set_plugin_context(plugin_context)
             logging.info("Running %s reporting plugin...", plugin.get_name())
-            plugin_start = time.time()
+            plugin_start = TimingStart.now()
             plugin.report(package, issues, level)
-            duration = format(time.time() - plugin_start, ".4f")
-            timing = Timing(package.name, plugin.get_name(), "Reporting", duration)
-            self.timings.append(timing)
+            self.timings.append(
+                plugin_start.stop(package.name, plugin.get_name(), "Reporting")
+            )
             logging.info("%s reporting plugin done.", plugin.get_name())
         logging.info("---Reporting---")
+        return True
+
+    # pylint: disable=too-many-locals, too-many-return-statements, too-many-branches
+    # pylint: disable=too-many-statements
+    def run(
+        self,
+        path: str,
+        args: argparse.Namespace,
+        start_time: Optional[float] = None,
+        package: Optional[Package] = None,
+    ) -> Tuple[Optional[dict[str, list[Issue]]], bool]:
+        """Run scan tools against targets on path.
+
+        Args:
+            path: Path to the target.
+            args: Arguments from command line.
+            start_time: Start time of the scan.
+            package: Package at path whose files have already been found, such as by
+                the server. A new package is made if not given.
+
+        Returns:
+            Issues found and success status.
+        """
+        path = os.path.abspath(path)
+        if not os.path.exists(path):
+            logging.error("No package found at %s!", path)
+            return None, False
+
+        if package is None:
+            package = Package(os.path.basename(path), path)
+        level: Optional[str] = self.get_level(path, args)
+        logging.info("level: %s", level)
+        if level is None:
+            logging.error("Level is not valid.")
+            return None, False
+
+        if not self.config or (
+            level != self.default_level and not self.config.has_level(level)
+        ):
+            logging.error("Can't find specified level %s in config!", level)
+            return None, False
+
+        if not self.make_output_dir(args, package, level):
+            return None, False
+        output_dir = self.get_output_dir(args, package, level)
+
+        logging.info("------")
+        logging.info(
+            "Scanning package %s (%s) at level %s", package.name, package.path, level
+        )
+
+        issues: dict[str, list[Issue]] = {}
+
+        ignore_packages = self.get_ignore_packages()
+        if package.name in ignore_packages:
+            logging.info(
+                "Package %s is configured to be ignored by Statick.", package.name
+            )
+            return issues, True
+
+        self.load_tool_version_cache(args)
+        self.load_result_cache(args)
+        self.load_changed_files(args)
+        plugin_context = PluginContext(
+            args, self.resources, self.config, output_dir, self.result_cache
+        )
+
+        if not self.run_discovery(package, level, plugin_context, args):
+            return None, False
+
+        logging.info("---Tools---")
+        plugins_ran = self.plan_tools(level, plugin_context, args)
+        if plugins_ran is None:
+            return None, False
+
+        scheduler = PluginScheduler(args.max_procs)
+        tool_results = scheduler.run(
+            plugins_ran,
+            self.get_tool_dependencies(plugins_ran),
+            lambda plugin_name: self.run_tool_plugin(plugin_name, package, level),
+        )
+        success = self.collect_tool_results(package, tool_results, issues)
+
+        self.tool_version_cache.save()
+        if self.result_cache is not None:
+            self.result_cache.prune()
+        logging.info("---Tools---")
+
+        if self.exceptions is not None:
+            issues = self.exceptions.filter_issues(package, issues)
+        if self.changed_files is not None:
+            issues = self.changed_files.filter_issues(package, issues)
+
+        if not self.report_package(package, issues, level, plugin_context):
+            return None, False
 
         if start_time is not None:
-            duration = format(time.time() - start_time, ".4f")
-            timing = Timing("Overall", "", "", duration)
-            self.timings.append(timing)
+            self.timings.append(
+                TimingStart.from_time(start_time).stop("Overall", "", "")
+            )
         logging.info("Done!")
 
         return issues, success
@@ -656,31 +1120,12 @@ class Statick:  # pylint: disable=too-many-instance-attributes
                     )
                     return None, False
 
-        ignore_packages = self.get_ignore_packages()
-        ignore_files = ["AMENT_IGNORE", "CATKIN_IGNORE", "COLCON_IGNORE"]
-        package_indicators = ["package.xml", "setup.py", "pyproject.toml"]
-
-        packages = []
-        for root, dirs, files in os.walk(parsed_args.path):
-            if any(item in files for item in ignore_files):
-                dirs.clear()
-                continue
-            for sub_dir in dirs:
-                full_dir = os.path.join(root, sub_dir)
-                files = os.listdir(full_dir)
-                if any(item in package_indicators for item in files) and not any(
-                    item in files for item in ignore_files
-                ):
-                    if ignore_packages and sub_dir in ignore_packages:
-                        continue
-                    packages.append(Package(sub_dir, full_dir))
-
+        package_names: Optional[list[str]] = None
         if parsed_args.packages_file is not None:
-            packages_file_list = []
             try:
                 packages_file = os.path.abspath(parsed_args.packages_file)
                 with open(packages_file, "r", encoding="utf8") as fname:
-                    packages_file_list = [
+                    package_names = [
                         package.strip()
                         for package in fname.readlines()
                         if package.strip() and package[0] != "#"
@@ -688,9 +1133,15 @@ class Statick:  # pylint: disable=too-many-instance-attributes
             except OSError:
                 logging.error("Packages file not found")
                 return None, False
-            packages = [
-                package for package in packages if package.name in packages_file_list
-            ]
+
+        cache_file = None
+        if parsed_args.cache_dir:
+            cache_file = os.path.join(parsed_args.cache_dir, "package_index.json")
+        package_index = PackageIndex(cache_file)
+        packages = package_index.find_packages(
+            parsed_args.path, self.get_ignore_packages(), package_names
+        )
+        package_index.save()
 
         if parsed_args.list_packages:
             for package in packages:
@@ -699,55 +1150,33 @@ class Statick:  # pylint: disable=too-many-instance-attributes
                 )
             return None, True
 
-        count = 0
-        total_issues: list[Any] = []
-        num_packages = len(packages)
-        mp_args = []
-        if multiprocessing.get_start_method() == "fork":
-            logging.info("-- Scanning %d packages --", num_packages)
-            for package in packages:
-                count += 1
-                mp_args.append((parsed_args, count, package, num_packages))
-
-            with multiprocessing.Pool(parsed_args.max_procs) as pool:
-                total_issues, all_timings = zip(  # type: ignore
-                    *pool.starmap(self.scan_package, mp_args)
+        if parsed_args.workspace_timeout is not None:
+            self.deadline = (
+                start_time if start_time is not None else time.time()
+            ) + parsed_args.workspace_timeout
+
+        results = WorkspaceResults()
+        self.load_changed_files(parsed_args)
+        logging.info("-- Scanning %d packages --", len(packages))
+        self.scan_packages(parsed_args, packages, results)
+
+        results.flush()
+        for numbers, state in [
+            (results.failed, "failed"),
+            (results.timed_out, "timed out"),
+            (results.skipped, "were skipped"),
+        ]:
+            if numbers:
+                logging.error(
+                    "Packages %s: %s",
+                    state,
+                    ", ".join(packages[number - 1].name for number in numbers),
                 )
-                for timings in all_timings:
-                    for timing in timings:
-                        self.timings.append(timing)
-        else:
-            logging.warning(
-                "Statick's plugin manager does not currently support multiprocessing"
-                " without UNIX's fork function. Falling back to a single process."
-            )
-            logging.info("-- Scanning %d packages --", num_packages)
-            for package in packages:
-                count += 1
-                pkg_issues, pkg_timings = self.scan_package(
-                    parsed_args, count, package, num_packages
-                )
-                total_issues.append(pkg_issues)
-                for timing in pkg_timings:
-                    self.timings.append(timing)
-                    break
-
         logging.info("-- All packages run --")
         logging.info("-- overall report --")
 
-        success = True
-        issues: dict[str, list[Issue]] = {}
-        for issue in total_issues:
-            if issue is not None:
-                for key, value in list(issue.items()):
-                    if key in issues:
-                        issues[key] += value
-                        if value:
-                            success = False
-                    else:
-                        issues[key] = value
-                        if value:
-                            success = False
+        success = results.success
+        issues = results.issues
 
         enabled_reporting_plugins: list[str] = []
 
@@ -782,72 +1211,290 @@ class Statick:  # pylint: disable=too-many-instance-attributes
             logging.info("%s reporting plugin done.", plugin.get_name())
 
         if start_time is not None:
-            duration = format(time.time() - start_time, ".4f")
-            timing = Timing("Overall", "", "", duration)
-            self.timings.append(timing)
+            self.timings.append(
+                TimingStart.from_time(start_time).stop("Overall", "", "")
+            )
 
         return issues, success
 
-    def scan_package(
+    def plan_package(
+        self, parsed_args: argparse.Namespace, count: int, package: Package
+    ) -> Optional[WorkspaceJob]:
+        """Work out the level and tools to scan a workspace package with.
+
+        Args:
+            parsed_args: Parsed arguments from command line.
+            count: Current package count.
+            package: Package to scan.
+
+        Returns:
+            Package to scan and the tools to scan it with, or None if the package can
+            not be scanned.
+        """
+        level: Optional[str] = self.get_level(package.path, parsed_args)
+        if level is None:
+            logging.error("Level is not valid for package %s.", package.name)
+            return None
+
+        if not self.config or (
+            level != self.default_level and not self.config.has_level(level)
+        ):
+            logging.error("Can't find specified level %s in config!", level)
+            return None
+
+        if not self.make_output_dir(parsed_args, package, level):
+            return None
+
+        plugin_context = PluginContext(parsed_args, self.resources, self.config)
+        tools = self.plan_tools(level, plugin_context, parsed_args)
+        if tools is None:
+            return None
+
+        return WorkspaceJob(
+            count, package, level, tools, self.get_tool_dependencies(tools)
+        )
+
+    def discover_package(
+        self, parsed_args: argparse.Namespace, package: Package, level: str
+    ) -> Tuple[Optional[Package], list[Timing]]:
+        """Find the files in a workspace package while buffering output.
+
+        Args:
+            parsed_args: Parsed arguments from command line.
+            package: Package to scan.
+            level: Level to scan package at.
+
+        Returns:
+            Package with the files found, or None if discovery failed, and the timings
+            of discovery.
+        """
+        first_timing = len(self.timings)
+        discovered: Optional[Package] = package
+        with self.buffer_output():
+            logging.info("-- Discovering package %s --", package.name)
+            plugin_context = PluginContext(
+                parsed_args,
+                self.resources,
+                self.config,  # type: ignore
+                self.get_output_dir(parsed_args, package, level),
+                self.result_cache,
+            )
+            if not self.run_discovery(package, level, plugin_context, parsed_args):
+                discovered = None
+        # Timings are handed to the parent process rather than kept by the worker.
+        timings = self.timings[first_timing:]
+        del self.timings[first_timing:]
+        return discovered, timings
+
+    def scan_package_tool(
         self,
         parsed_args: argparse.Namespace,
-        count: int,
         package: Package,
-        num_packages: int,
-    ) -> Tuple[Optional[dict[str, list[Issue]]], list[Timing]]:
-        """Scan each package in a separate process while buffering output.
+        level: str,
+        plugin_name: str,
+    ) -> ToolResult:
+        """Run a single tool plugin against a workspace package while buffering output.
 
         Args:
             parsed_args: Parsed arguments from command line.
-            count: Current package count.
-            package: Package to scan.
-            num_packages: Total number of packages.
+            package: Package with the files found by discovery.
+            level: Level to scan package at.
+            plugin_name: Name of the tool plugin to run.
+
+        Returns:
+            Issues found, timing of the scan, version of the tool and whether the
+            tool timed out.
+        """
+        with self.buffer_output():
+            logging.info("-- Running %s on package %s --", plugin_name, package.name)
+            plugin_context = PluginContext(
+                parsed_args,
+                self.resources,
+                self.config,  # type: ignore
+                self.get_output_dir(parsed_args, package, level),
+                self.result_cache,
+            )
+            self.tool_plugins[plugin_name].set_plugin_context(plugin_context)
+            result = self.run_tool_plugin(plugin_name, package, level)
+        self.tool_version_cache.save()
+        return result
+
+    # pylint: disable=too-many-arguments, too-many-positional-arguments
+    def finish_package(
+        self,
+        parsed_args: argparse.Namespace,
+        job: WorkspaceJob,
+        package: Optional[Package],
+        discovery_timings: list[Timing],
+        tool_results: dict[str, ToolResult],
+    ) -> Optional[dict[str, list[Issue]]]:
+        """Filter and report the issues of a workspace package once all tools are done.
+
+        Args:
+            parsed_args: Parsed arguments from command line.
+            job: Package that was scanned and the tools it was scanned with.
+            package: Package with the files found by discovery, or None if discovery
+                failed.
+            discovery_timings: Timings of discovery.
+            tool_results: Result of each tool plugin.
+
+        Returns:
+            Issues found, or None if the package could not be scanned.
+        """
+        self.timings += discovery_timings
+        if package is None:
+            return None
+
+        issues: dict[str, list[Issue]] = {}
+        self.collect_tool_results(package, tool_results, issues)
+        if self.exceptions is not None:
+            issues = self.exceptions.filter_issues(package, issues)
+        if self.changed_files is not None:
+            issues = self.changed_files.filter_issues(package, issues)
+
+        plugin_context = PluginContext(
+            parsed_args, self.resources, self.config  # type: ignore
+        )
+        if not self.report_package(package, issues, job.level, plugin_context):
+            return None
+        return issues
+
+    def scan_packages(
+        self,
+        parsed_args: argparse.Namespace,
+        packages: list[Package],
+        results: WorkspaceResults,
+    ) -> None:
+        """Scan the packages of a workspace using a pool of worker processes.
+
+        Each package is discovered by one task and then scanned by one task per tool,
+        so that idle workers can help with the tools of any package. Packages are
+        reported and their issues merged as soon as they finish.
+
+        Args:
+            parsed_args: Parsed arguments from command line.
+            packages: Packages to scan.
+            results: Issues of finished packages, updated as packages finish.
+        """
+        num_packages = len(packages)
+        self.load_tool_version_cache(parsed_args)
+
+        jobs: list[WorkspaceJob] = []
+        for count, package in enumerate(packages, 1):
+            job = self.plan_package(parsed_args, count, package)
+            if job is None:
+                logging.error("Failed to run statick on package %s!", package.name)
+                results.add(count, None)
+            else:
+                jobs.append(job)
+
+        def finish(
+            job: WorkspaceJob,
+            package: Optional[Package],
+            discovery_timings: list[Timing],
+            tool_results: dict[str, ToolResult],
+        ) -> None:
+            if job.number in scheduler.skipped:
+                results.skip(job.number)
+                return
+            issues = self.finish_package(
+                parsed_args, job, package, discovery_timings, tool_results
+            )
+            has_issues = results.add(
+                job.number,
+                issues,
+                timed_out=any(result.timed_out for result in tool_results.values()),
+            )
+            if issues is not None:
+                logging.info(
+                    "-- Done scanning package %s (%d of %d) --",
+                    job.package.name,
+                    job.number,
+                    num_packages,
+                )
+            else:
+                logging.error("Failed to run statick on package %s!", job.package.name)
+            logging.info(
+                "-- %d of %d packages finished --", results.num_finished, num_packages
+            )
+            if has_issues and parsed_args.fail_fast:
+                logging.warning(
+                    "Package %s has issues, not scanning the remaining packages.",
+                    job.package.name,
+                )
+                scheduler.stop()
+
+        # Workers build their own Statick instance instead of inheriting this one, so
+        # they are started without forking this process.
+        executor = ProcessPoolExecutor(
+            max_workers=parsed_args.max_procs,
+            mp_context=multiprocessing.get_context(self.get_worker_start_method()),
+            initializer=WorkspaceWorker.initialize,
+            initargs=(self.user_paths, parsed_args, self.deadline),
+        )
+        scheduler = WorkspaceScheduler(executor, parsed_args.max_procs, self.deadline)
+        with executor:
+            scheduler.run(
+                jobs,
+                WorkspaceWorker.discover_package,
+                WorkspaceWorker.scan_package_tool,
+                finish,
+            )
+
+        self.tool_version_cache.save()
+        self.load_result_cache(parsed_args)
+        if self.result_cache is not None:
+            self.result_cache.prune()
+
+    @staticmethod
+    def get_worker_start_method() -> str:
+        """Get the method used to start workspace worker processes.
 
         Returns:
-            Issues found and timings.
+            forkserver where it is available, spawn otherwise.
+        """
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            return "forkserver"
+        return "spawn"
+
+    @staticmethod
+    @contextlib.contextmanager
+    def buffer_output() -> Iterator[None]:
+        """Buffer logging and capture output, so output of a package is kept together.
+
+        Output printed while buffering is logged once buffering ends. Errors flush the
+        buffered logging right away.
+
+        Yields:
+            Nothing, output is buffered while the context is active.
         """
         logger = logging.getLogger()
         old_handler = None
         handler = None
-        if logger.handlers[0]:
+        if logger.handlers:
             old_handler = logger.handlers[0]
             handler = MemoryHandler(10000, flushLevel=logging.ERROR, target=old_handler)
             logger.removeHandler(old_handler)
             logger.addHandler(handler)
 
-        logging.info(
-            "-- Scanning package %s (%d of %d) --", package.name, count, num_packages
-        )
-
         sio = io.StringIO()
         old_stdout = sys.stdout
         old_stderr = sys.stderr
         sys.stdout = sio
         sys.stderr = sio
 
-        issues, dummy = self.run(package.path, parsed_args)
-        timings = self.get_timings()
-
-        sys.stdout = old_stdout
-        sys.stderr = old_stderr
-        logging.info(sio.getvalue())
-
-        if issues is not None:
-            logging.info(
-                "-- Done scanning package %s (%d of %d) --",
-                package.name,
-                count,
-                num_packages,
-            )
-        else:
-            logging.error("Failed to run statick on package %s!", package.name)
-
-        if handler is not None and old_handler is not None:
-            handler.flush()
-            logger.removeHandler(handler)
-            logger.addHandler(old_handler)
-
-        return issues, timings
+        try:
+            yield
+        finally:
+            sys.stdout = old_stdout
+            sys.stderr = old_stderr
+            if sio.getvalue():
+                logging.info(sio.getvalue())
+
+            if handler is not None and old_handler is not None:
+                handler.flush()
+                logger.removeHandler(handler)
+                logger.addHandler(old_handler)
 
     @staticmethod
     def print_no_issues() -> None:
@@ -1,13 +1,334 @@
-"""Timing interface."""
-
-from typing import NamedTuple
-
-Timing = NamedTuple(
-    "Timing",
-    [
-        ("package", str),
-        ("name", str),
-        ("plugin_type", str),
-        ("duration", str),
-    ],
-)
+"""Timing interface.
+
+Besides the duration shown by --timings, each timing keeps when it started and ended,
+the process and thread it ran in and the CPU time of the commands it ran, so that a run
+can be written as a Chrome trace and viewed as a timeline in Perfetto or
+chrome://tracing. The timings of many packages can also be summarized per plugin.
+
+The CPU time of commands is only known for the whole process, so it is left out of the
+timings of steps that ran at the same time as a step of another thread.
+"""
+
+import json
+import math
+import os
+import sys
+import threading
+import time
+from typing import Any, NamedTuple, Optional
+
+from tabulate import tabulate
+
+
+class Timing(NamedTuple):
+    """Duration of a step of a scan.
+
+    Start and end are from time.perf_counter(), which is the same clock in all
+    processes of a run. They are zero for timings that were not measured with
+    TimingStart.
+    """
+
+    package: str
+    name: str
+    plugin_type: str
+    duration: str
+    start: float = 0.0
+    end: float = 0.0
+    pid: int = 0
+    thread: int = 0
+    child_cpu: Optional[float] = 0.0
+
+
+# Threads of this process that are running a step, with whether a step of another
+# thread ran at the same time.
+_STEPS_LOCK = threading.Lock()
+_STEPS: dict[int, list[bool]] = {}
+
+
+def start_step() -> None:
+    """Note that the current thread started a step.
+
+    Steps of threads that have ended without stopping, such as when a plugin raised an
+    exception, are forgotten.
+    """
+    ident = threading.get_ident()
+    with _STEPS_LOCK:
+        alive = {thread.ident for thread in threading.enumerate()}
+        for other in list(_STEPS):
+            if other not in alive:
+                del _STEPS[other]
+        for other, overlapped in _STEPS.items():
+            if other != ident:
+                overlapped[0] = True
+        _STEPS[ident] = [any(other != ident for other in _STEPS)]
+
+
+def stop_step() -> bool:
+    """Note that the current thread stopped its step.
+
+    Returns:
+        True if no step of another thread ran at any time during the step.
+    """
+    with _STEPS_LOCK:
+        overlapped = _STEPS.pop(threading.get_ident(), None)
+    return overlapped is not None and not overlapped[0]
+
+
+def get_child_cpu_time() -> float:
+    """Get the CPU time used by finished child processes of this process.
+
+    Returns:
+        User and system CPU time in seconds, or zero where it is not available.
+    """
+    if sys.platform == "win32":
+        return 0.0
+    import resource  # pylint: disable=import-outside-toplevel
+
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+class TimingStart(NamedTuple):
+    """Clocks read at the start of a step, to make a timing once the step ends."""
+
+    counter: float
+    child_cpu: float
+    step: bool = False
+
+    @classmethod
+    def now(cls) -> "TimingStart":
+        """Read the clocks at the start of a step of the current thread.
+
+        Returns:
+            Start of the step.
+        """
+        start_step()
+        return cls(time.perf_counter(), get_child_cpu_time(), True)
+
+    @classmethod
+    def from_time(cls, start_time: float) -> "TimingStart":
+        """Get the start of a step that started at a time from time.time().
+
+        Args:
+            start_time: Time the step started at.
+
+        Returns:
+            Start of the step. The CPU time of commands counts from the start of the
+            process.
+        """
+        return cls(time.perf_counter() - (time.time() - start_time), 0.0)
+
+    def stop(self, package: str, name: str, plugin_type: str) -> Timing:
+        """Make the timing of a step that ends now.
+
+        The CPU time of commands run by the step is None if a step of another thread
+        ran at the same time, since the commands of that step are counted as well.
+
+        Args:
+            package: Name of the package.
+            name: Name of the plugin.
+            plugin_type: Type of the plugin.
+
+        Returns:
+            Timing of the step.
+        """
+        end = time.perf_counter()
+        child_cpu: Optional[float] = get_child_cpu_time() - self.child_cpu
+        if self.step and not stop_step():
+            child_cpu = None
+        return Timing(
+            package,
+            name,
+            plugin_type,
+            format(end - self.counter, ".4f"),
+            self.counter,
+            end,
+            os.getpid(),
+            threading.get_native_id(),
+            child_cpu,
+        )
+
+
+def format_timings(timings: list[Timing], tablefmt: str = "pretty") -> str:
+    """Format the durations of timings as a table.
+
+    Args:
+        timings: Timings to format.
+        tablefmt: Table format of tabulate.
+
+    Returns:
+        Table with the package, name, plugin type and duration of each timing.
+    """
+    return str(
+        tabulate(
+            [timing[:4] for timing in timings],
+            headers=list(Timing._fields[:4]),
+            tablefmt=tablefmt,
+        )
+    )
+
+
+def get_trace_events(
+    timings: list[Timing], main_pid: Optional[int] = None
+) -> list[dict[str, Any]]:
+    """Get the Chrome trace events of timings.
+
+    Each measured timing is a complete event on the thread it ran in, starting at the
+    time since the first timing started. Processes other than the main process are
+    named as workers. The CPU time of commands is left out of steps that ran at the
+    same time as other steps of their process.
+
+    Args:
+        timings: Timings of the run.
+        main_pid: Process ID of the main process, this process by default.
+
+    Returns:
+        Trace events.
+    """
+    measured = [timing for timing in timings if timing.end]
+    if not measured:
+        return []
+    if main_pid is None:
+        main_pid = os.getpid()
+    origin = min(timing.start for timing in measured)
+    events: list[dict[str, Any]] = []
+    for pid in sorted({timing.pid for timing in measured}):
+        events.append(
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": pid,
+                "args": {"name": "statick" if pid == main_pid else "statick worker"},
+            }
+        )
+    for timing in measured:
+        args: dict[str, Any] = {"package": timing.package}
+        if timing.child_cpu is not None:
+            args["child_cpu_seconds"] = round(timing.child_cpu, 4)
+        events.append(
+            {
+                "name": timing.name or timing.package,
+                "cat": timing.plugin_type or timing.package,
+                "ph": "X",
+                "ts": round((timing.start - origin) * 1e6, 1),
+                "dur": round((timing.end - timing.start) * 1e6, 1),
+                "pid": timing.pid,
+                "tid": timing.thread,
+                "args": args,
+            }
+        )
+    return events
+
+
+def write_trace(timings: list[Timing], filename: str) -> None:
+    """Write timings to a file in the Chrome trace event format.
+
+    Args:
+        timings: Timings of the run.
+        filename: File to write the trace to.
+    """
+    with open(filename, "w", encoding="utf8") as fid:
+        json.dump(
+            {"traceEvents": get_trace_events(timings), "displayTimeUnit": "ms"}, fid
+        )
+
+
+class TimingSummary(NamedTuple):
+    """Durations of a plugin across the packages of a run, in seconds."""
+
+    plugin_type: str
+    name: str
+    runs: int
+    total: float
+    mean: float
+    p50: float
+    p95: float
+    max: float
+
+
+def get_percentile(durations: list[float], fraction: float) -> float:
+    """Get a percentile of durations by the nearest rank.
+
+    Args:
+        durations: Durations, sorted from shortest to longest.
+        fraction: Fraction of durations at or below the percentile, such as 0.95.
+
+    Returns:
+        Shortest duration that at least the fraction of durations are at or below.
+    """
+    rank = max(1, math.ceil(fraction * len(durations)))
+    return durations[rank - 1]
+
+
+def summarize_timings(timings: list[Timing]) -> list[TimingSummary]:
+    """Summarize the durations of each plugin across packages.
+
+    The overall timing of the run is left out.
+
+    Args:
+        timings: Timings of the run.
+
+    Returns:
+        Summary of each plugin, the plugin with the longest total first.
+    """
+    durations: dict[tuple[str, str], list[float]] = {}
+    for timing in timings:
+        if timing.plugin_type:
+            durations.setdefault((timing.plugin_type, timing.name), []).append(
+                float(timing.duration)
+            )
+    summaries: list[TimingSummary] = []
+    for (plugin_type, name), values in durations.items():
+        values.sort()
+        total = sum(values)
+        summaries.append(
+            TimingSummary(
+                plugin_type,
+                name,
+                len(values),
+                total,
+                total / len(values),
+                get_percentile(values, 0.5),
+                get_percentile(values, 0.95),
+                values[-1],
+            )
+        )
+    summaries.sort(key=lambda summary: summary.total, reverse=True)
+    return summaries
+
+
+def get_slowest(timings: list[Timing], count: int) -> list[Timing]:
+    """Get the tool timings that took longest.
+
+    Args:
+        timings: Timings of the run.
+        count: Number of timings to get.
+
+    Returns:
+        Timings of tools scanning packages, the slowest first.
+    """
+    tool_timings = [timing for timing in timings if timing.plugin_type == "Tool"]
+    tool_timings.sort(key=lambda timing: float(timing.duration), reverse=True)
+    return tool_timings[:count]
+
+
+def format_timing_summary(timings: list[Timing], count: int = 10) -> str:
+    """Format the summary of each plugin and the slowest tools as tables.
+
+    Args:
+        timings: Timings of the run.
+        count: Number of slowest tool timings to show.
+
+    Returns:
+        Tables of the summaries and of the slowest tools.
+    """
+    summary = tabulate(
+        [
+            summary[:3] + tuple(format(value, ".4f") for value in summary[3:])
+            for summary in summarize_timings(timings)
+        ],
+        headers=list(TimingSummary._fields),
+        tablefmt="pretty",
+    )
+    slowest = format_timings(get_slowest(timings, count))
+    return f"{summary}\nSlowest tools:\n{slowest}"
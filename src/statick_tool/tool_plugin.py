@@ -5,18 +5,22 @@ import logging
 import os
 import re
 import shlex
+import signal
 import subprocess
-from typing import Any, Match, Optional, Pattern, Union
+import time
+from typing import Any, Literal, Match, Optional, Pattern, Union, overload
 
 from statick_tool.issue import Issue
 from statick_tool.package import Package
 from statick_tool.plugin_context import PluginContext
 
 
-class ToolPlugin:
+class ToolPlugin:  # pylint: disable=too-many-public-methods
     """Default implementation of tool plugin."""
 
     plugin_context = None
+    # Time, as from time.time(), by which the commands of the current scan must finish.
+    deadline: Optional[float] = None
     TOOL_MISSING_STR = "Not installed"
     TOOL_UNKNOWN_STR = "Unknown"
 
@@ -37,6 +41,30 @@ class ToolPlugin:
         """
         return []
 
+    @classmethod
+    def get_cache_granularity(cls) -> str:
+        """Get how the results of this tool are cached.
+
+        Tools that find issues across files, or that run on the whole package, should
+        cache per package or not at all.
+
+        Returns:
+            "file" to cache the issues of each file passed to process_files, which only
+            applies to plugins that use the default scan, "package" to cache the issues
+            of the whole package, or "none" to always run the tool.
+        """
+        return "file"
+
+    @classmethod
+    def needs_whole_package(cls) -> bool:
+        """Check if this tool needs the whole package when scanning changed files.
+
+        Returns:
+            True if the tool needs all files of the package, False if it only needs the
+            changed files.
+        """
+        return False
+
     def gather_args(self, args: argparse.Namespace) -> None:
         """Gather arguments.
 
@@ -184,21 +212,49 @@ class ToolPlugin:
             if file_type in package and package[file_type]:
                 files += package[file_type]
 
-        if files:
+        if not files:
+            return []
+
+        result_cache = self.plugin_context.result_cache if self.plugin_context else None
+        if result_cache is None or self.get_cache_granularity() != "file":
+            result_cache = None
+            cached: dict[str, list[Issue]] = {}
+        else:
+            cached = result_cache.get_files(self, package, level, files)
+            if cached:
+                logging.info(
+                    "  Reusing cached results of %d of %d files.",
+                    len(cached),
+                    len(files),
+                )
+
+        issues: list[Issue] = []
+        changed = [path for path in files if path not in cached]
+        if changed:
             total_output = (  # pylint: disable=assignment-from-no-return
-                self.process_files(package, level, files, self.get_user_flags(level))
+                self.process_files(package, level, changed, self.get_user_flags(level))
             )
-            if total_output is not None:
-                if self.plugin_context and self.plugin_context.args.output_directory:
-                    with open(self.get_name() + ".log", "w", encoding="utf8") as fid:
-                        for output in total_output:
-                            fid.write(output)
-
-                return self.parse_output(total_output, package)
-
-            return None
+            if total_output is None:
+                return None
+
+            if self.plugin_context and self.plugin_context.args.output_directory:
+                with open(
+                    self.get_output_path(self.get_name() + ".log"),
+                    "w",
+                    encoding="utf8",
+                ) as fid:
+                    for output in total_output:
+                        fid.write(output)
+
+            issues = self.parse_output(  # pylint: disable=assignment-from-no-return
+                total_output, package
+            )
+            if result_cache is not None:
+                result_cache.set_files(self, package, level, changed, issues)
 
-        return []
+        for path in files:
+            issues += cached.get(path, [])
+        return issues
 
     def process_files(
         self, package: Package, level: str, files: list[str], user_flags: list[str]
@@ -236,6 +292,29 @@ class ToolPlugin:
         """
         self.plugin_context = plugin_context
 
+    def get_output_path(self, filename: str) -> str:
+        """Get the path to write a log or scratch file of this plugin to.
+
+        Args:
+            filename: Name of the file.
+
+        Returns:
+            Path of the file in the output directory of the plugin context, or relative
+            to the current working directory if there is no output directory.
+        """
+        if self.plugin_context is None:
+            return filename
+        return self.plugin_context.get_output_path(filename)
+
+    def get_working_dir(self) -> Optional[str]:
+        """Get the directory to run tools of this plugin in.
+
+        Returns:
+            Output directory of the plugin context, or None to run tools in the current
+            working directory.
+        """
+        return self.plugin_context.output_dir if self.plugin_context else None
+
     def load_mapping(self) -> dict[str, str]:
         """Load a mapping between warnings and identifiers.
 
@@ -302,6 +381,139 @@ class ToolPlugin:
             flags = list(lex)
         return flags
 
+    @classmethod
+    def get_default_config_file(cls) -> Optional[str]:
+        """Get the name of the configuration file of the tool in the resources.
+
+        Returns:
+            Name of the configuration file, or None if the tool does not read one.
+        """
+        return None
+
+    def get_config_file_name(self, level: str) -> Optional[str]:
+        """Get the name of the configuration file of the tool at a level.
+
+        Args:
+            level: Level at which to scan.
+
+        Returns:
+            Name of the file from the config setting of the tool at the level, or the
+            default configuration file of the tool.
+        """
+        config_file_name = self.get_default_config_file()
+        if self.plugin_context is not None:
+            user_config = self.plugin_context.config.get_tool_config(
+                self.get_name(), level, "config"
+            )
+            if user_config is not None:
+                config_file_name = user_config
+        return config_file_name
+
+    def get_resource_config(self, level: str) -> Optional[str]:
+        """Find the configuration file of the tool at a level in the resources.
+
+        Args:
+            level: Level at which to scan.
+
+        Returns:
+            Path of the configuration file, or None if it is not found.
+        """
+        config_file_name = self.get_config_file_name(level)
+        if self.plugin_context is None or config_file_name is None:
+            return None
+        return self.plugin_context.resources.get_file(config_file_name)
+
+    def get_config_files(self, level: str) -> list[str]:
+        """Get the configuration files the tool reads outside of the package.
+
+        The contents of these files are part of the key of cached results, so editing
+        them runs the tool again.
+
+        Args:
+            level: Level at which to scan.
+
+        Returns:
+            Paths of the configuration files.
+        """
+        config_file = self.get_resource_config(level)
+        return [config_file] if config_file is not None else []
+
+    @overload
+    def check_output(
+        self, args: list[str], *, universal_newlines: Literal[True], **kwargs: Any
+    ) -> str: ...
+
+    @overload
+    def check_output(
+        self, args: list[str], *, text: Literal[True], **kwargs: Any
+    ) -> str: ...
+
+    @overload
+    def check_output(
+        self,
+        args: list[str],
+        *,
+        universal_newlines: Literal[False, None] = None,
+        text: Literal[False, None] = None,
+        **kwargs: Any,
+    ) -> bytes: ...
+
+    def check_output(self, args: list[str], **kwargs: Any) -> Union[str, bytes]:
+        """Run a command of the tool and return its output.
+
+        Works like subprocess.check_output. If the scan has a deadline, the command runs
+        in a process group of its own, and the whole group is killed if the command has
+        not finished by the deadline, so that helpers started by the tool do not keep
+        running.
+
+        Args:
+            args: Command to run.
+            kwargs: Arguments to subprocess, such as stderr, cwd or universal_newlines.
+
+        Returns:
+            Output of the command, as text if universal_newlines or text is set and as
+            bytes otherwise.
+
+        Raises:
+            CalledProcessError: If the command returns a non-zero exit code.
+            TimeoutExpired: If the deadline passed before the command finished.
+        """
+        output: Union[str, bytes]
+        if self.deadline is None:
+            output = subprocess.check_output(args, **kwargs)
+            return output
+
+        timeout = self.deadline - time.time()
+        if timeout <= 0:
+            raise subprocess.TimeoutExpired(args, 0)
+        with subprocess.Popen(
+            args, stdout=subprocess.PIPE, start_new_session=True, **kwargs
+        ) as process:
+            try:
+                output, _ = process.communicate(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                self.kill_process_group(process)
+                process.communicate()
+                raise
+        if process.returncode:
+            raise subprocess.CalledProcessError(process.returncode, args, output=output)
+        return output
+
+    @staticmethod
+    def kill_process_group(process: subprocess.Popen[Any]) -> None:
+        """Kill a process and every process in its process group.
+
+        Args:
+            process: Process started in a process group of its own.
+        """
+        try:
+            if hasattr(os, "killpg"):
+                os.killpg(process.pid, signal.SIGKILL)
+            else:
+                process.kill()
+        except OSError:
+            pass
+
     @staticmethod
     def is_valid_executable(path: str) -> bool:
         """Return whether a provided command exists and is executable.
@@ -0,0 +1,18 @@
+"""Tool result interface."""
+
+from typing import NamedTuple, Optional
+
+from statick_tool.issue import Issue
+from statick_tool.timing import Timing
+
+
+class ToolResult(NamedTuple):
+    """Result of running a tool plugin on a package.
+
+    The issues are None if the tool failed or timed out.
+    """
+
+    issues: Optional[list[Issue]]
+    timing: Timing
+    version: str
+    timed_out: bool = False
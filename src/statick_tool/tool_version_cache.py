@@ -0,0 +1,188 @@
+"""Cache of tool versions.
+
+Finding the version of a tool means running the tool (or a package manager) in a
+subprocess. Versions do not change during a run, so each tool is probed at most once per
+run, including tools that turn out not to be installed.
+
+Versions can also be kept on disk between runs. Entries on disk are keyed on the
+resolved path of the tool binary and are only used while the modification time of that
+binary is unchanged.
+"""
+
+import json
+import logging
+import os
+import shutil
+from threading import Lock
+from typing import Any, Optional, Tuple
+
+
+class ToolVersionCache:
+    """Cache of tool versions."""
+
+    def __init__(self, cache_file: Optional[str] = None) -> None:
+        """Initialize the cache.
+
+        Args:
+            cache_file: File to keep versions in between runs. Versions are only kept
+                for the current run if no file is given.
+        """
+        self.cache_file: Optional[str] = None
+        self.versions: dict[Tuple[str, str], str] = {}
+        self.disk_versions: dict[str, dict[str, Any]] = {}
+        self.dirty = False
+        self.lock = Lock()
+        self.probe_locks: dict[Tuple[str, str], Lock] = {}
+        if cache_file is not None:
+            self.load(cache_file)
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Get the state to pickle, which leaves out the locks.
+
+        Workers scanning packages in other processes receive a copy of the versions
+        found so far.
+
+        Returns:
+            State of the cache.
+        """
+        state = self.__dict__.copy()
+        del state["lock"]
+        del state["probe_locks"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Restore the pickled state and create new locks.
+
+        Args:
+            state: State of the cache.
+        """
+        self.__dict__.update(state)
+        self.lock = Lock()
+        self.probe_locks = {}
+
+    def load(self, cache_file: str) -> None:
+        """Load versions kept on disk by a previous run.
+
+        Args:
+            cache_file: File the versions are kept in.
+        """
+        with self.lock:
+            if self.cache_file == cache_file:
+                return
+            self.cache_file = cache_file
+            self.disk_versions = {}
+            if not os.path.isfile(cache_file):
+                return
+            try:
+                with open(cache_file, "r", encoding="utf8") as fid:
+                    versions = json.load(fid)
+            except (OSError, ValueError) as ex:
+                logging.warning(
+                    "Unable to read tool version cache %s: %s", cache_file, ex
+                )
+                return
+            if isinstance(versions, dict):
+                self.disk_versions = versions
+
+    def save(self) -> None:
+        """Write versions found during this run to the cache file.
+
+        Entries written by other processes since the file was loaded are kept.
+        """
+        with self.lock:
+            if self.cache_file is None or not self.dirty:
+                return
+            versions: dict[str, dict[str, Any]] = {}
+            try:
+                with open(self.cache_file, "r", encoding="utf8") as fid:
+                    versions = json.load(fid)
+            except (OSError, ValueError):
+                pass
+            versions.update(self.disk_versions)
+
+            cache_dir = os.path.dirname(os.path.abspath(self.cache_file))
+            tmp_file = f"{self.cache_file}.{os.getpid()}.tmp"
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                with open(tmp_file, "w", encoding="utf8") as fid:
+                    json.dump(versions, fid, indent=2, sort_keys=True)
+                os.replace(tmp_file, self.cache_file)
+            except OSError as ex:
+                logging.warning(
+                    "Unable to write tool version cache %s: %s", self.cache_file, ex
+                )
+                return
+            self.disk_versions = versions
+            self.dirty = False
+
+    @staticmethod
+    def get_binary_stamp(tool_bin: str) -> Optional[Tuple[str, float]]:
+        """Get the resolved path and modification time of a tool binary.
+
+        Args:
+            tool_bin: Name or path of the tool binary.
+
+        Returns:
+            Resolved path and modification time of the binary, or None if the binary
+            can not be found.
+        """
+        which = shutil.which(tool_bin)
+        if which is None:
+            return None
+        path = os.path.realpath(which)
+        try:
+            return path, os.stat(path).st_mtime
+        except OSError:
+            return None
+
+    def set_version(self, plugin: Any, tool_version: str) -> None:
+        """Remember the version of the tool run by a plugin, found by another process.
+
+        Args:
+            plugin: Tool plugin the version belongs to.
+            tool_version: Version of the tool that's installed.
+        """
+        key = (plugin.get_name(), plugin.get_binary() or "")
+        with self.lock:
+            self.versions.setdefault(key, tool_version)
+
+    def get_version(self, plugin: Any) -> str:
+        """Get the version of the tool run by a plugin, probing it only if needed.
+
+        Args:
+            plugin: Tool plugin to get the version for.
+
+        Returns:
+            Version of the tool that's installed.
+        """
+        key = (plugin.get_name(), plugin.get_binary() or "")
+        with self.lock:
+            if key in self.versions:
+                return self.versions[key]
+            probe_lock = self.probe_locks.setdefault(key, Lock())
+
+        # Only one thread probes each tool, the others wait for its answer.
+        with probe_lock:
+            with self.lock:
+                if key in self.versions:
+                    return self.versions[key]
+
+            stamp = self.get_binary_stamp(key[1]) if key[1] else None
+            disk_key = f"{key[0]}:{stamp[0]}" if stamp else None
+            with self.lock:
+                entry = self.disk_versions.get(disk_key) if disk_key else None
+            if stamp and entry and entry.get("mtime") == stamp[1]:
+                tool_version = str(entry.get("version"))
+            else:
+                tool_version = plugin.get_version()
+                if stamp and disk_key:
+                    with self.lock:
+                        self.disk_versions[disk_key] = {
+                            "mtime": stamp[1],
+                            "version": tool_version,
+                        }
+                        self.dirty = True
+
+            with self.lock:
+                self.versions[key] = tool_version
+            return tool_version
@@ -0,0 +1,307 @@
+"""Scan a package again whenever its files change.
+
+The package is scanned once as usual, keeping the files found by discovery and the
+issues found by each tool. Whenever files change, only the changed files are looked at
+again, the discovery plugins sort the files into file types again, and only the tools
+that scan a changed file are run again, along with the tools that depend on them. The
+issues of the other tools are kept, and the issues of the package are reported again.
+
+Tools that do not say which file types they scan, and changes to files at the top of
+the package that no tool scans, such as the pyproject.toml or setup.cfg that configure
+tools, run every tool again.
+"""
+
+import argparse
+import logging
+import os
+import time
+from typing import Any, Optional
+
+from statick_tool.discovery_plugin import DiscoveryPlugin
+from statick_tool.file_watcher import FileWatcher, create_watcher
+from statick_tool.issue import Issue
+from statick_tool.package import Package
+from statick_tool.plugin_context import PluginContext
+from statick_tool.plugin_scheduler import PluginScheduler
+from statick_tool.statick_tool import Statick
+
+
+class PackageWatch:  # pylint: disable=too-many-instance-attributes
+    """Scan a package again whenever its files change."""
+
+    def __init__(self, statick: Statick, args: argparse.Namespace, path: str) -> None:
+        """Initialize the watch.
+
+        Args:
+            statick: Statick instance with its configuration and exceptions loaded.
+            args: Arguments from command line.
+            path: Path of the package to watch.
+        """
+        self.statick = statick
+        self.args = args
+        self.package = Package(
+            os.path.basename(os.path.abspath(path)), os.path.abspath(path)
+        )
+        self.level = ""
+        self.plugin_context: Optional[PluginContext] = None
+        self.tools: list[str] = []
+        self.issues: dict[str, list[Issue]] = {}
+        self.success = False
+
+    def start(self) -> bool:
+        """Scan the whole package.
+
+        Returns:
+            True if the package was scanned, False otherwise.
+        """
+        statick = self.statick
+        level = statick.get_level(self.package.path, self.args)
+        if level is None:
+            logging.error("Level is not valid.")
+            return False
+        if not statick.config or (
+            level != statick.default_level and not statick.config.has_level(level)
+        ):
+            logging.error("Can't find specified level %s in config!", level)
+            return False
+        if not statick.make_output_dir(self.args, self.package, level):
+            return False
+        self.level = level
+
+        statick.load_tool_version_cache(self.args)
+        statick.load_result_cache(self.args)
+        self.plugin_context = PluginContext(
+            self.args,
+            statick.resources,
+            statick.config,
+            statick.get_output_dir(self.args, self.package, level),
+            statick.result_cache,
+        )
+        if not self.discover():
+            return False
+        tools = statick.plan_tools(level, self.plugin_context, self.args)
+        if tools is None:
+            return False
+        self.tools = tools
+        return self.scan(tools)
+
+    def discover(self) -> bool:
+        """Run the discovery plugins on the files found in the package.
+
+        Returns:
+            True if all discovery plugins were found, False otherwise.
+        """
+        assert self.plugin_context is not None
+        # Changes are found again on every scan, since files change while watching.
+        self.statick.changed_files = None
+        self.statick.load_changed_files(self.args)
+        return self.statick.run_discovery(
+            self.package, self.level, self.plugin_context, self.args
+        )
+
+    def scan(self, tools: list[str]) -> bool:
+        """Run tools on the package and report all issues of the package.
+
+        Args:
+            tools: Names of the tool plugins to run, in the planned order.
+
+        Returns:
+            True if the tools ran and the issues were reported, False otherwise.
+        """
+        statick = self.statick
+        assert self.plugin_context is not None
+        logging.info("---Tools---")
+        scheduler = PluginScheduler(self.args.max_procs)
+        tool_results = scheduler.run(
+            tools,
+            {
+                plugin_name: [
+                    dependency for dependency in dependencies if dependency in tools
+                ]
+                for plugin_name, dependencies in statick.get_tool_dependencies(
+                    tools
+                ).items()
+            },
+            lambda plugin_name: statick.run_tool_plugin(
+                plugin_name, self.package, self.level
+            ),
+        )
+        for plugin_name in tools:
+            self.issues.pop(plugin_name, None)
+        self.success = statick.collect_tool_results(
+            self.package, tool_results, self.issues
+        )
+        statick.tool_version_cache.save()
+        if statick.result_cache is not None:
+            statick.result_cache.prune()
+        logging.info("---Tools---")
+
+        issues = {
+            plugin_name: self.issues[plugin_name]
+            for plugin_name in self.tools
+            if plugin_name in self.issues
+        }
+        if statick.exceptions is not None:
+            issues = statick.exceptions.filter_issues(self.package, issues)
+        if statick.changed_files is not None:
+            issues = statick.changed_files.filter_issues(self.package, issues)
+        if any(issues.values()):
+            self.success = False
+        return (
+            statick.report_package(
+                self.package, issues, self.level, self.plugin_context
+            )
+            and self.success
+        )
+
+    def get_scanned_files(self, plugin_name: str) -> Optional[set[str]]:
+        """Get the files a tool scans.
+
+        Args:
+            plugin_name: Name of the tool plugin.
+
+        Returns:
+            Absolute paths of the files of the file types of the tool, or None if the
+            tool does not say which file types it scans.
+        """
+        file_types = self.statick.tool_plugins[plugin_name].get_file_types()
+        if not file_types:
+            return None
+        files: set[str] = set()
+        for file_type in file_types:
+            files.update(self.get_paths(self.package.get(file_type)))
+        return files
+
+    @classmethod
+    def get_paths(cls, value: Any) -> set[str]:
+        """Get the paths of files in a value found by discovery.
+
+        Args:
+            value: Value found by discovery, such as a list of files or make targets.
+
+        Returns:
+            Absolute paths of the files.
+        """
+        if isinstance(value, str):
+            return {os.path.abspath(value)}
+        if isinstance(value, dict):
+            return cls.get_paths(value.get("src"))
+        if isinstance(value, list):
+            paths: set[str] = set()
+            for item in value:
+                paths.update(cls.get_paths(item))
+            return paths
+        return set()
+
+    def get_affected_tools(
+        self, changed: set[str], before: dict[str, Optional[set[str]]]
+    ) -> list[str]:
+        """Get the tools to run again after files changed.
+
+        Args:
+            changed: Absolute paths of the files that changed.
+            before: Files each tool scanned before the files changed.
+
+        Returns:
+            Names of the tool plugins to run again, in the planned order.
+        """
+        scanned: dict[str, Optional[set[str]]] = {
+            plugin_name: self.get_scanned_files(plugin_name)
+            for plugin_name in self.tools
+        }
+        known: set[str] = set()
+        for files in list(scanned.values()) + list(before.values()):
+            known.update(files or set())
+        # Files at the top of the package that no tool scans often configure tools.
+        if any(
+            path not in known and os.path.dirname(path) == self.package.path
+            for path in changed
+        ):
+            return list(self.tools)
+
+        dependencies = self.statick.get_tool_dependencies(self.tools)
+        affected: list[str] = []
+        for plugin_name in self.tools:
+            files = scanned[plugin_name]
+            old_files = before.get(plugin_name)
+            if (
+                files is None
+                or old_files is None
+                or changed & (files | old_files)
+                or any(
+                    dependency in affected for dependency in dependencies[plugin_name]
+                )
+            ):
+                affected.append(plugin_name)
+        return affected
+
+    def rescan(self, paths: set[str]) -> bool:
+        """Scan the package again after files changed.
+
+        Args:
+            paths: Paths that changed.
+
+        Returns:
+            True if the tools ran and the issues were reported, False otherwise.
+        """
+        plugin = DiscoveryPlugin()
+        plugin.set_plugin_context(self.plugin_context)
+        changed = plugin.update_files(
+            self.package,
+            paths,
+            plugin.get_prune_rules(self.package, self.level, self.statick.exceptions),
+        )
+        if not changed:
+            return self.success
+        before = {
+            plugin_name: self.get_scanned_files(plugin_name)
+            for plugin_name in self.tools
+        }
+        self.statick.timings = []
+        if not self.discover():
+            return False
+        tools = self.get_affected_tools(changed, before)
+        logging.info(
+            "%d files changed, running %s again.",
+            len(changed),
+            ", ".join(tools) if tools else "no tools",
+        )
+        if not tools:
+            return self.success
+        return self.scan(tools)
+
+    def get_ignored_dirs(self) -> list[str]:
+        """Get the directories whose changes are ignored.
+
+        Returns:
+            Output and cache directories, whose files are written by Statick itself.
+        """
+        return [
+            os.path.abspath(directory)
+            for directory in [self.args.output_directory, self.args.cache_dir]
+            if directory
+        ]
+
+    def run(self) -> bool:
+        """Scan the package, and again whenever its files change, until interrupted.
+
+        Returns:
+            True if the last scan found no issues, False otherwise.
+        """
+        if not self.start():
+            return False
+        watcher: FileWatcher = create_watcher(
+            self.package.path, self.get_ignored_dirs()
+        )
+        logging.info("Watching %s for changes.", self.package.path)
+        try:
+            while True:
+                paths = watcher.wait()
+                start_time = time.time()
+                self.rescan(paths)
+                logging.info("Scanned again in %.2f s.", time.time() - start_time)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            watcher.close()
+        return self.success
@@ -0,0 +1,312 @@
+"""Scan the packages in a workspace one tool at a time.
+
+Handing whole packages to workers leaves most workers idle while the largest package
+finishes. Instead, each package is discovered as one task and then every tool that
+scans it is a task of its own. All tasks share a single queue, so a worker that becomes
+idle takes the next ready task from any package. Tools still run after the tools they
+depend on within each package.
+
+Workers keep the packages they discovered or scanned, so tool tasks are first sent
+without the discovered package and its files. Only a worker that does not have the
+package yet is sent the task again with the package.
+"""
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from typing import Any, Callable, NamedTuple, Optional, Tuple
+
+from statick_tool.issue import Issue
+from statick_tool.package import Package
+from statick_tool.plugin_scheduler import PluginScheduler
+from statick_tool.timing import Timing
+
+
+class WorkspaceJob(NamedTuple):
+    """Package to scan in a workspace and the tools to scan it with."""
+
+    number: int
+    package: Package
+    level: str
+    tools: list[str]
+    dependencies: dict[str, list[str]]
+
+
+class PackageState:  # pylint: disable=too-few-public-methods
+    """Progress of a package whose files have been discovered."""
+
+    def __init__(
+        self, job: WorkspaceJob, package: Package, timings: list[Timing]
+    ) -> None:
+        """Initialize the progress of a package.
+
+        Args:
+            job: Package to scan and the tools to scan it with.
+            package: Package with the files found by discovery.
+            timings: Timings of discovery.
+        """
+        self.job = job
+        self.package = package
+        self.timings = timings
+        self.pending = list(job.tools)
+        self.done: set[str] = set()
+        self.results: dict[str, Any] = {}
+
+
+class WorkspaceScheduler:
+    """Scan the packages in a workspace one tool at a time."""
+
+    def __init__(
+        self,
+        executor: Executor,
+        max_workers: int = 1,
+        deadline: Optional[float] = None,
+    ) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            executor: Executor to run discovery and tool tasks with.
+            max_workers: Number of workers the executor runs tasks on.
+            deadline: Time, as from time.time(), after which no more packages are
+                discovered.
+        """
+        self.executor = executor
+        self.max_workers = max(1, max_workers)
+        self.deadline = deadline
+        self.stopped = False
+        self.skipped: set[int] = set()
+
+    def stop(self) -> None:
+        """Stop scanning, for example because a package has issues.
+
+        No more tasks are started. Tasks that are already running are left to finish
+        but their results are not used.
+        """
+        self.stopped = True
+
+    # pylint: disable=too-many-locals, too-many-branches
+    def run(
+        self,
+        jobs: list[WorkspaceJob],
+        discover: Callable[[int, Package, str], Tuple[Optional[Package], list[Timing]]],
+        scan: Callable[[int, Optional[Package], str, str], Any],
+        finish: Callable[
+            [WorkspaceJob, Optional[Package], list[Timing], dict[str, Any]], None
+        ],
+    ) -> None:
+        """Discover and scan all packages.
+
+        Tools of packages that have already been discovered are started before the
+        next package is discovered, so that packages finish in order as far as
+        possible.
+
+        Args:
+            jobs: Packages to scan and the tools to scan them with.
+            discover: Task that finds the files in a package, given the number of the
+                package, the package and level. Returns the package with its files, or
+                None if discovery failed, and the timings of discovery.
+            scan: Task that runs a tool on a package, given the number of the package,
+                the discovered package, level and name of the tool. The package is
+                first None, and the task returns None if the worker running it does
+                not have the discovered package, in which case it is run again with the
+                package.
+            finish: Called with the job, the discovered package, the discovery timings
+                and the result of each tool, in the order of the job's tools, once all
+                tools have scanned a package. Packages are finished in the order they
+                complete, and finish may call stop to skip the remaining packages.
+                Packages not discovered by the deadline are finished without a
+                discovered package, and their numbers are kept in skipped.
+
+        Raises:
+            ValueError: If the dependencies between the tools of a package form a cycle.
+        """
+        self.stopped = False
+        self.skipped = set()
+        undiscovered = list(jobs)
+        states: dict[int, PackageState] = {}
+        running: dict[Future[Any], Tuple[WorkspaceJob, Optional[str]]] = {}
+        resend: list[Tuple[WorkspaceJob, str]] = []
+
+        while undiscovered or states or running or resend:
+            if self.stopped:
+                for future in running:
+                    future.cancel()
+                return
+
+            if (
+                undiscovered
+                and self.deadline is not None
+                and time.time() >= self.deadline
+            ):
+                for job in undiscovered:
+                    logging.warning(
+                        "Workspace timeout reached, not scanning package %s.",
+                        job.package.name,
+                    )
+                    self.skipped.add(job.number)
+                    finish(job, None, [], {})
+                undiscovered = []
+                continue
+
+            while resend and len(running) < self.max_workers:
+                job, resend_tool = resend.pop(0)
+                future = self.executor.submit(
+                    scan, job.number, states[job.number].package, job.level, resend_tool
+                )
+                running[future] = (job, resend_tool)
+
+            for job, tool in self.get_ready(undiscovered, states):
+                if len(running) >= self.max_workers:
+                    break
+                if tool is None:
+                    undiscovered.remove(job)
+                    future = self.executor.submit(
+                        discover, job.number, job.package, job.level
+                    )
+                else:
+                    states[job.number].pending.remove(tool)
+                    future = self.executor.submit(
+                        scan, job.number, None, job.level, tool
+                    )
+                running[future] = (job, tool)
+
+            if not running:
+                raise ValueError(
+                    "Circular dependency between tools "
+                    f"{[state.pending for state in states.values()]}"
+                )
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                job, tool = running.pop(future)
+                if tool is None:
+                    package, timings = future.result()
+                    if package is None or not job.tools:
+                        finish(job, package, timings, {})
+                    else:
+                        states[job.number] = PackageState(job, package, timings)
+                    continue
+
+                result = future.result()
+                if result is None:
+                    resend.append((job, tool))
+                    continue
+                state = states[job.number]
+                state.results[tool] = result
+                state.done.add(tool)
+                if len(state.done) == len(job.tools):
+                    del states[job.number]
+                    results = {name: state.results[name] for name in job.tools}
+                    finish(job, state.package, state.timings, results)
+
+    @staticmethod
+    def get_ready(
+        undiscovered: list[WorkspaceJob], states: dict[int, PackageState]
+    ) -> list[Tuple[WorkspaceJob, Optional[str]]]:
+        """Get the tasks that are ready to run, in the order to start them.
+
+        Args:
+            undiscovered: Packages that have not started discovery, in order.
+            states: Progress of packages that have been discovered.
+
+        Returns:
+            Job and tool of each ready task. The tool is None for discovery tasks.
+        """
+        ready: list[Tuple[WorkspaceJob, Optional[str]]] = []
+        for state in states.values():
+            ready += [
+                (state.job, tool)
+                for tool in PluginScheduler.get_ready(
+                    state.pending,
+                    {
+                        name: [dep for dep in deps if dep in state.job.tools]
+                        for name, deps in state.job.dependencies.items()
+                    },
+                    state.done,
+                )
+            ]
+        ready += [(job, None) for job in undiscovered]
+        return ready
+
+
+class WorkspaceResults:  # pylint: disable=too-many-instance-attributes
+    """Issues of workspace packages, merged as packages finish.
+
+    Packages can finish in any order. The issues of a package are merged once all
+    packages before it have finished, so the merged issues are in package order no
+    matter which package finished first, while only packages that finished early are
+    held on to. The workspace only succeeds if no package has issues and every package
+    was scanned without a tool timing out.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the results."""
+        self.issues: dict[str, list[Issue]] = {}
+        self.success = True
+        self.num_finished = 0
+        self.next_number = 1
+        self.waiting: dict[int, Optional[dict[str, list[Issue]]]] = {}
+        self.failed: list[int] = []
+        self.timed_out: list[int] = []
+        self.skipped: list[int] = []
+
+    def add(
+        self,
+        number: int,
+        package_issues: Optional[dict[str, list[Issue]]],
+        timed_out: bool = False,
+    ) -> bool:
+        """Add the issues of a finished package.
+
+        Args:
+            number: Number of the package in the workspace, starting at 1.
+            package_issues: Issues found in the package, or None if the package could
+                not be scanned.
+            timed_out: Whether a tool timed out on the package.
+
+        Returns:
+            True if issues were found in the package, False otherwise.
+        """
+        if package_issues is None and number not in self.skipped:
+            self.failed.append(number)
+        if timed_out:
+            self.timed_out.append(number)
+        if timed_out or package_issues is None:
+            self.success = False
+        self.num_finished += 1
+        self.waiting[number] = package_issues
+        while self.next_number in self.waiting:
+            self.merge(self.waiting.pop(self.next_number))
+            self.next_number += 1
+        return package_issues is not None and any(package_issues.values())
+
+    def skip(self, number: int) -> None:
+        """Add a package that was not scanned, for example after the workspace timeout.
+
+        Args:
+            number: Number of the package in the workspace, starting at 1.
+        """
+        self.skipped.append(number)
+        self.add(number, None)
+
+    def merge(self, package_issues: Optional[dict[str, list[Issue]]]) -> None:
+        """Merge the issues of a package into the issues of the workspace.
+
+        Args:
+            package_issues: Issues found in the package, or None if the package could
+                not be scanned.
+        """
+        if package_issues is None:
+            return
+        for key, value in package_issues.items():
+            if key in self.issues:
+                self.issues[key] += value
+            else:
+                self.issues[key] = list(value)
+            if value:
+                self.success = False
+
+    def flush(self) -> None:
+        """Merge the issues of all finished packages, for example after stopping early."""
+        for number in sorted(self.waiting):
+            self.merge(self.waiting.pop(number))
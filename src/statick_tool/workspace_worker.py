@@ -0,0 +1,140 @@
+"""Worker processes that scan workspace packages.
+
+Each worker process builds its own Statick instance once, when the process starts, from
+the user paths and the parsed command line arguments. Tasks only carry the package to
+scan, its level and the name of the tool to run, so the parent's Statick instance is
+never sent to workers. Workers do not rely on inheriting state from a forked parent and
+work with the forkserver and spawn start methods.
+
+Workers keep the packages they discovered or were sent, keyed by package number, so
+the files of a package are not sent along with every tool that scans it.
+"""
+
+import argparse
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Optional, Tuple
+
+from statick_tool.package import Package
+from statick_tool.timing import Timing
+from statick_tool.tool_result import ToolResult
+
+if TYPE_CHECKING:
+    from statick_tool.statick_tool import Statick
+
+
+class WorkspaceWorker:
+    """Statick instance of a workspace worker process."""
+
+    statick: Optional["Statick"] = None
+    parsed_args: Optional[argparse.Namespace] = None
+    packages: "OrderedDict[int, Package]" = OrderedDict()
+
+    @classmethod
+    def initialize(
+        cls,
+        user_paths: list[str],
+        parsed_args: argparse.Namespace,
+        deadline: Optional[float] = None,
+    ) -> None:
+        """Build the Statick instance of this worker process.
+
+        Args:
+            user_paths: List of paths to search for resource files.
+            parsed_args: Parsed arguments from command line.
+            deadline: Time, as from time.time(), by which all tools must finish.
+        """
+        # Imported here because statick_tool imports this module.
+        from statick_tool.statick_tool import (  # pylint: disable=import-outside-toplevel
+            Statick,
+        )
+
+        Statick.set_logging_level(parsed_args)
+        statick = Statick(user_paths)
+        statick.get_config(parsed_args)
+        statick.get_exceptions(parsed_args)
+        statick.load_tool_version_cache(parsed_args)
+        statick.load_result_cache(parsed_args)
+        statick.load_changed_files(parsed_args)
+        statick.deadline = deadline
+        cls.statick = statick
+        cls.parsed_args = parsed_args
+        cls.packages = OrderedDict()
+
+    @classmethod
+    def get_statick(cls) -> Tuple["Statick", argparse.Namespace]:
+        """Get the Statick instance of this worker process.
+
+        Returns:
+            Statick instance and parsed arguments from command line.
+
+        Raises:
+            RuntimeError: If the worker process has not been initialized.
+        """
+        if cls.statick is None or cls.parsed_args is None:
+            raise RuntimeError("Workspace worker has not been initialized")
+        return cls.statick, cls.parsed_args
+
+    @classmethod
+    def keep_package(cls, number: int, package: Package) -> None:
+        """Keep a discovered package for the tools that scan it.
+
+        Only as many packages as there are workers are kept, since about that many
+        packages are scanned at a time. Packages that are no longer kept are sent
+        again if they are needed.
+
+        Args:
+            number: Number of the package in the workspace.
+            package: Package with the files found by discovery.
+        """
+        cls.packages[number] = package
+        cls.packages.move_to_end(number)
+        max_packages = max(1, getattr(cls.parsed_args, "max_procs", 1) or 1)
+        while len(cls.packages) > max_packages:
+            cls.packages.popitem(last=False)
+
+    @classmethod
+    def discover_package(
+        cls, number: int, package: Package, level: str
+    ) -> Tuple[Optional[Package], list[Timing]]:
+        """Find the files in a workspace package.
+
+        Args:
+            number: Number of the package in the workspace.
+            package: Package to scan.
+            level: Level to scan package at.
+
+        Returns:
+            Package with the files found, or None if discovery failed, and the timings
+            of discovery.
+        """
+        statick, parsed_args = cls.get_statick()
+        discovered, timings = statick.discover_package(parsed_args, package, level)
+        if discovered is not None:
+            cls.keep_package(number, discovered)
+        return discovered, timings
+
+    @classmethod
+    def scan_package_tool(
+        cls, number: int, package: Optional[Package], level: str, plugin_name: str
+    ) -> Optional[ToolResult]:
+        """Run a single tool plugin against a workspace package.
+
+        Args:
+            number: Number of the package in the workspace.
+            package: Package with the files found by discovery, or None to use the
+                package kept by this worker.
+            level: Level to scan package at.
+            plugin_name: Name of the tool plugin to run.
+
+        Returns:
+            Issues found, timing of the scan, version of the tool and whether the
+            tool timed out, or None if no package was given and this worker does not
+            have the package.
+        """
+        statick, parsed_args = cls.get_statick()
+        if package is None:
+            package = cls.packages.get(number)
+            if package is None:
+                return None
+        cls.keep_package(number, package)
+        return statick.scan_package_tool(parsed_args, package, level, plugin_name)
@@ -0,0 +1,538 @@
+"""Benchmark the overhead of Statick itself on synthetic workspaces.
+
+A workspace of packages is generated with Python, YAML, C++, shell and binary files,
+nested packages and packages that are ignored. The tools are stand-in scripts found
+first on the PATH that print recorded output for every file they are given after an
+optional delay, so the time measured is spent in Statick rather than in the tools.
+
+Each phase is measured several times and the median and minimum are written as JSON,
+so that results of different releases can be compared::
+
+    python tests/benchmark/benchmark.py --packages 20 --files 50 --output results.json
+
+The stand-in tools are POSIX shell scripts, so the benchmark does not run on Windows.
+"""
+
+import argparse
+import contextlib
+import functools
+import io
+import json
+import os
+import platform
+import shutil
+import stat
+import statistics
+import sys
+import tempfile
+import time
+from importlib import metadata
+from typing import Any, Callable, Iterator, Optional
+
+from statick_tool.args import Args
+from statick_tool.discovery_plugin import DiscoveryPlugin
+from statick_tool.exceptions import Exceptions
+from statick_tool.issue import Issue
+from statick_tool.package import Package
+from statick_tool.plugins.tool.pycodestyle import PycodestyleToolPlugin
+from statick_tool.plugins.tool.pylint import PylintToolPlugin
+from statick_tool.plugins.tool.yamllint import YamllintToolPlugin
+from statick_tool.statick_tool import Statick
+
+RSC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rsc")
+
+# Output line each stand-in tool prints per issue, in the format Statick asks it for.
+FAKE_TOOL_OUTPUT = {
+    "pycodestyle": "$file:$line: [E501] line too long (100 > 79 characters)",
+    "pylint": "$file:$line: [C0114(missing-module-docstring), ] "
+    "Missing module docstring",
+    "yamllint": '$file:$line:1: [warning] missing document start "---" '
+    "(document-start)",
+}
+
+FAKE_TOOL_SCRIPT = """#!/bin/sh
+if [ "$1" = "--version" ]; then
+    echo "{name} 0.0.0"
+    exit 0
+fi
+sleep "${{STATICK_BENCHMARK_DELAY:-0}}"
+for file in "$@"; do
+    [ -f "$file" ] || continue
+    line=1
+    while [ "$line" -le "${{STATICK_BENCHMARK_ISSUES:-1}}" ]; do
+        echo "{output}"
+        line=$((line + 1))
+    done
+done
+"""
+
+PYTHON_SOURCE = '''"""Generated module."""
+
+import os
+
+
+def join(name):
+    """Join a name to the current directory."""
+    return os.path.join(os.getcwd(), name)
+'''
+
+YAML_SOURCE = "name: generated\nvalues:\n  - 1\n  - 2\n"
+
+CPP_SOURCE = '#include "header.h"\n\nint add(int a, int b) { return a + b; }\n'
+
+SHELL_SOURCE = '#!/bin/sh\necho "generated"\n'
+
+
+def write_file(path: str, content: str, mode: Optional[int] = None) -> None:
+    """Write a file, making its directory if needed.
+
+    Args:
+        path: Path of the file.
+        content: Content of the file.
+        mode: Permissions to give the file, if any.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf8") as fid:
+        fid.write(content)
+    if mode is not None:
+        os.chmod(path, mode)
+
+
+def make_package(path: str, name: str, files: int) -> None:
+    """Generate a package with files of each kind.
+
+    Args:
+        path: Directory of the package.
+        name: Name of the package.
+        files: Number of files of each kind.
+    """
+    write_file(
+        os.path.join(path, "package.xml"),
+        f"<package><name>{name}</name></package>\n",
+    )
+    for i in range(files):
+        write_file(os.path.join(path, name, f"module_{i}.py"), PYTHON_SOURCE)
+        write_file(os.path.join(path, "config", f"config_{i}.yaml"), YAML_SOURCE)
+        write_file(os.path.join(path, "src", f"source_{i}.cpp"), CPP_SOURCE)
+        write_file(os.path.join(path, "include", f"header_{i}.h"), "#pragma once\n")
+        # Scripts without an extension are only found by what the file command says.
+        write_file(os.path.join(path, "scripts", f"script_{i}"), SHELL_SOURCE, 0o755)
+        write_file(os.path.join(path, "data", f"blob_{i}.bin"), "\0\1\2\3" * 64)
+        write_file(os.path.join(path, "build", f"generated_{i}.py"), PYTHON_SOURCE)
+
+
+def make_workspace(root: str, packages: int, files: int) -> str:
+    """Generate a workspace of packages.
+
+    Every package has a nested package with a few files, and one more package is
+    ignored with a marker file.
+
+    Args:
+        root: Directory to generate the workspace in.
+        packages: Number of packages.
+        files: Number of files of each kind in each package.
+
+    Returns:
+        Path of the workspace.
+    """
+    workspace = os.path.join(root, "workspace")
+    for i in range(packages):
+        path = os.path.join(workspace, "src", f"group_{i % 4}", f"package_{i}")
+        make_package(path, f"package_{i}", files)
+        make_package(
+            os.path.join(path, "nested", f"package_{i}_nested"),
+            f"package_{i}_nested",
+            max(1, files // 10),
+        )
+    ignored = os.path.join(workspace, "src", "package_ignored")
+    make_package(ignored, "package_ignored", files)
+    write_file(os.path.join(ignored, "CATKIN_IGNORE"), "")
+    return workspace
+
+
+def make_fake_tools(directory: str) -> str:
+    """Write the stand-in tool scripts.
+
+    Args:
+        directory: Directory to write the scripts to.
+
+    Returns:
+        The directory, to put first on the PATH.
+    """
+    for name, output in FAKE_TOOL_OUTPUT.items():
+        write_file(
+            os.path.join(directory, name),
+            FAKE_TOOL_SCRIPT.format(name=name, output=output),
+            stat.S_IRWXU,
+        )
+    return directory
+
+
+@contextlib.contextmanager
+def timed_method(cls: Any, name: str, durations: list[float]) -> Iterator[None]:
+    """Record the duration of every call of a method of a class.
+
+    Only calls made in this process are recorded.
+
+    Args:
+        cls: Class of the method.
+        name: Name of the method.
+        durations: List the durations are appended to.
+
+    Yields:
+        Nothing, calls are recorded while the context is active.
+    """
+    method = getattr(cls, name)
+
+    @functools.wraps(method)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            durations.append(time.perf_counter() - start)
+
+    setattr(cls, name, wrapper)
+    try:
+        yield
+    finally:
+        setattr(cls, name, method)
+
+
+def make_statick(argv: list[str]) -> tuple[Statick, argparse.Namespace]:
+    """Make a Statick instance with the benchmark configuration.
+
+    Args:
+        argv: Arguments to add to the configuration, level and exceptions.
+
+    Returns:
+        Statick instance and its parsed arguments.
+    """
+    args = Args("Statick benchmark")
+    statick = Statick(args.get_user_paths([]))
+    statick.gather_args(args.parser)
+    parsed_args = args.get_args(
+        [
+            "--config",
+            os.path.join(RSC, "config.yaml"),
+            "--exceptions",
+            os.path.join(RSC, "exceptions.yaml"),
+            "--level",
+            "benchmark",
+        ]
+        + argv
+    )
+    statick.get_config(parsed_args)
+    statick.get_exceptions(parsed_args)
+    return statick, parsed_args
+
+
+def sum_timings(statick: Statick, phases: dict[str, float]) -> None:
+    """Add up the timings of a run by phase.
+
+    Args:
+        statick: Statick instance that ran.
+        phases: Seconds spent in each phase, updated in place.
+    """
+    for timing in statick.get_timings():
+        if timing.name == "find files":
+            phase = "find_files"
+        elif timing.plugin_type:
+            phase = timing.plugin_type.lower()
+        else:
+            phase = "overall"
+        phases[phase] = phases.get(phase, 0.0) + float(timing.duration)
+
+
+def benchmark_package(path: str, output_dir: str, max_procs: int) -> dict[str, float]:
+    """Scan a single package in this process.
+
+    Args:
+        path: Path of the package.
+        output_dir: Directory to write the output of the scan to.
+        max_procs: Number of tools and discovery plugins run at the same time.
+
+    Returns:
+        Seconds spent in each phase of the scan.
+    """
+    statick, parsed_args = make_statick(
+        ["--output-directory", output_dir, "--max-procs", str(max_procs)]
+    )
+    classification: list[float] = []
+    filtering: list[float] = []
+    parsing: list[float] = []
+    phases: dict[str, float] = {}
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(
+            timed_method(DiscoveryPlugin, "get_file_types", classification)
+        )
+        stack.enter_context(timed_method(Exceptions, "filter_issues", filtering))
+        for plugin_class in [
+            PycodestyleToolPlugin,
+            PylintToolPlugin,
+            YamllintToolPlugin,
+        ]:
+            stack.enter_context(timed_method(plugin_class, "parse_output", parsing))
+        stack.enter_context(contextlib.redirect_stdout(io.StringIO()))
+        start = time.perf_counter()
+        statick.run(path, parsed_args, time.time())
+        phases["wall"] = time.perf_counter() - start
+    sum_timings(statick, phases)
+    phases["file_classification"] = sum(classification)
+    # Files are classified when discovery plugins first look at them, not when walked.
+    phases["walk"] = phases.get("find_files", 0.0)
+    phases["exception_filtering"] = sum(filtering)
+    phases["parsing"] = sum(parsing)
+    return phases
+
+
+def benchmark_workspace(path: str, output_dir: str, max_procs: int) -> dict[str, float]:
+    """Scan a workspace with worker processes.
+
+    Phases other than the wall time add up the time of all workers.
+
+    Args:
+        path: Path of the workspace.
+        output_dir: Directory to write the output of the scan to.
+        max_procs: Number of worker processes.
+
+    Returns:
+        Seconds spent in each phase of the scan.
+    """
+    statick, parsed_args = make_statick(
+        [
+            "--output-directory",
+            output_dir,
+            "--max-procs",
+            str(max_procs),
+            "-ws",
+        ]
+    )
+    parsed_args.path = path
+    phases: dict[str, float] = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        statick.run_workspace(parsed_args, time.time())
+        phases["wall"] = time.perf_counter() - start
+    sum_timings(statick, phases)
+    return phases
+
+
+def benchmark_filtering(package: Package, issues_per_file: int) -> dict[str, float]:
+    """Filter issues and files of every Python file of a package with the exceptions.
+
+    Args:
+        package: Package to filter issues of.
+        issues_per_file: Number of issues of each file.
+
+    Returns:
+        Seconds spent filtering issues, and files as discovery plugins do.
+    """
+    exceptions = Exceptions(os.path.join(RSC, "exceptions.yaml"))
+    files = sorted(package.files) or [os.path.join(package.path, "module.py")]
+    issues = {
+        "pylint": [
+            Issue(path, line, "pylint", "C0114", 3, "Missing module docstring", None)
+            for path in files
+            for line in range(1, issues_per_file + 1)
+        ]
+    }
+    start = time.perf_counter()
+    exceptions.filter_issues(package, issues)
+    phases = {"exception_filtering": time.perf_counter() - start}
+    start = time.perf_counter()
+    exceptions.filter_file_exceptions_early(package, files)
+    phases["early_exception_filtering"] = time.perf_counter() - start
+    return phases
+
+
+def benchmark_parsing(files: list[str], issues_per_file: int) -> dict[str, float]:
+    """Parse recorded output of each stand-in tool.
+
+    Args:
+        files: Files the output is about.
+        issues_per_file: Number of issues of each file.
+
+    Returns:
+        Seconds spent parsing the output of each tool.
+    """
+    phases: dict[str, float] = {}
+    for plugin in [PycodestyleToolPlugin(), PylintToolPlugin(), YamllintToolPlugin()]:
+        template = FAKE_TOOL_OUTPUT[plugin.get_name()]
+        output = "\n".join(
+            template.replace("$file", path).replace("$line", str(line))
+            for path in files
+            for line in range(1, issues_per_file + 1)
+        )
+        start = time.perf_counter()
+        plugin.parse_output([output])
+        phases[plugin.get_name()] = time.perf_counter() - start
+    return phases
+
+
+def summarize(runs: list[dict[str, float]]) -> dict[str, dict[str, float]]:
+    """Get the median and minimum of each phase over repeated runs.
+
+    Args:
+        runs: Seconds spent in each phase of each run.
+
+    Returns:
+        Median and minimum seconds of each phase.
+    """
+    phases = sorted({phase for run in runs for phase in run})
+    return {
+        phase: {
+            "median": statistics.median(run.get(phase, 0.0) for run in runs),
+            "min": min(run.get(phase, 0.0) for run in runs),
+        }
+        for phase in phases
+    }
+
+
+def repeat(
+    count: int, function: Callable[[], dict[str, float]]
+) -> list[dict[str, float]]:
+    """Run a benchmark several times.
+
+    Args:
+        count: Number of runs.
+        function: Benchmark to run.
+
+    Returns:
+        Seconds spent in each phase of each run.
+    """
+    return [function() for _ in range(count)]
+
+
+def get_statick_version() -> str:
+    """Get the version of Statick being measured.
+
+    Returns:
+        Installed version of Statick, or unknown if it is not installed.
+    """
+    try:
+        return metadata.version("statick")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def run_benchmarks(options: argparse.Namespace) -> dict[str, Any]:
+    """Generate a workspace and run every benchmark on it.
+
+    Args:
+        options: Parsed benchmark arguments.
+
+    Returns:
+        Parameters of the benchmark, the environment and the results of each benchmark.
+    """
+    root = tempfile.mkdtemp(prefix="statick-benchmark-")
+    old_environ = dict(os.environ)
+    try:
+        workspace = make_workspace(root, options.packages, options.files)
+        tools_dir = make_fake_tools(os.path.join(root, "bin"))
+        os.environ["PATH"] = tools_dir + os.pathsep + os.environ.get("PATH", "")
+        os.environ["STATICK_BENCHMARK_DELAY"] = str(options.tool_delay)
+        os.environ["STATICK_BENCHMARK_ISSUES"] = str(options.issues)
+
+        output_dir = os.path.join(root, "output")
+        os.makedirs(output_dir)
+        package_path = os.path.join(workspace, "src", "group_0", "package_0")
+        package = Package("package_0", package_path)
+        DiscoveryPlugin().find_files(package)
+        python_files = [path for path in package.files if path.endswith(".py")]
+
+        results = {
+            "package": summarize(
+                repeat(
+                    options.repeat,
+                    lambda: benchmark_package(
+                        package_path, output_dir, options.max_procs
+                    ),
+                )
+            ),
+            "workspace": summarize(
+                repeat(
+                    options.repeat,
+                    lambda: benchmark_workspace(
+                        workspace, output_dir, options.max_procs
+                    ),
+                )
+            ),
+            "exception_filtering": summarize(
+                repeat(
+                    options.repeat,
+                    lambda: benchmark_filtering(package, options.issues),
+                )
+            ),
+            "parsing": summarize(
+                repeat(
+                    options.repeat,
+                    lambda: benchmark_parsing(python_files, options.issues),
+                )
+            ),
+        }
+    finally:
+        os.environ.clear()
+        os.environ.update(old_environ)
+        shutil.rmtree(root, ignore_errors=True)
+
+    return {
+        "statick": get_statick_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "parameters": vars(options),
+        "results": results,
+    }
+
+
+def get_parser() -> argparse.ArgumentParser:
+    """Get the parser of the benchmark arguments.
+
+    Returns:
+        Argument parser.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", maxsplit=1)[0])
+    parser.add_argument("--packages", type=int, default=10, help="Number of packages")
+    parser.add_argument(
+        "--files", type=int, default=20, help="Number of files of each kind per package"
+    )
+    parser.add_argument(
+        "--issues", type=int, default=2, help="Number of issues per file of each tool"
+    )
+    parser.add_argument(
+        "--tool-delay",
+        type=float,
+        default=0.0,
+        help="Seconds each stand-in tool waits before printing its output",
+    )
+    parser.add_argument(
+        "--max-procs", type=int, default=2, help="Number of processes to use"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Number of times to run each benchmark"
+    )
+    parser.add_argument("--output", help="File to write the results to as JSON")
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Run the benchmarks and print or write the results.
+
+    Args:
+        argv: Arguments, from the command line by default.
+    """
+    options = get_parser().parse_args(argv)
+    results = run_benchmarks(options)
+    text = json.dumps(results, indent=2, sort_keys=True)
+    if options.output:
+        with open(options.output, "w", encoding="utf8") as fid:
+            fid.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    if sys.platform == "win32":
+        sys.exit("The benchmark stand-in tools need a POSIX shell.")
+    main()
@@ -0,0 +1,102 @@
+"""Unit tests of the benchmark suite."""
+
+import json
+import os
+import sys
+
+import benchmark
+import pytest
+
+pytestmark = pytest.mark.skipif(
+    sys.platform == "win32", reason="the stand-in tools need a POSIX shell"
+)
+
+
+def test_make_workspace(tmp_path):
+    """Test generating a workspace.
+
+    Expected result: packages, nested packages and the ignored package are generated
+    """
+    workspace = benchmark.make_workspace(str(tmp_path), 2, 3)
+    package = os.path.join(workspace, "src", "group_1", "package_1")
+    assert os.path.isfile(os.path.join(package, "package.xml"))
+    assert len(os.listdir(os.path.join(package, "package_1"))) == 3
+    assert os.path.isfile(
+        os.path.join(package, "nested", "package_1_nested", "package.xml")
+    )
+    assert os.path.isfile(
+        os.path.join(workspace, "src", "package_ignored", "CATKIN_IGNORE")
+    )
+
+
+def test_main(tmp_path):
+    """Test running the benchmarks on a small workspace.
+
+    Expected result: the results of every phase are written as JSON, and the stand-in
+    tools report issues that are parsed
+    """
+    output = tmp_path / "results.json"
+    benchmark.main(
+        [
+            "--packages",
+            "2",
+            "--files",
+            "2",
+            "--repeat",
+            "1",
+            "--max-procs",
+            "1",
+            "--output",
+            str(output),
+        ]
+    )
+    with open(output, encoding="utf8") as fid:
+        results = json.load(fid)
+
+    assert results["parameters"]["packages"] == 2
+    assert set(results["results"]) == {
+        "exception_filtering",
+        "package",
+        "parsing",
+        "workspace",
+    }
+    package = results["results"]["package"]
+    for phase in [
+        "discovery",
+        "exception_filtering",
+        "file_classification",
+        "find_files",
+        "parsing",
+        "reporting",
+        "tool",
+        "walk",
+        "wall",
+    ]:
+        assert package[phase]["min"] >= 0
+    assert package["parsing"]["median"] > 0
+    assert results["results"]["workspace"]["wall"]["median"] > 0
+    assert set(results["results"]["parsing"]) == {"pycodestyle", "pylint", "yamllint"}
+    assert set(results["results"]["exception_filtering"]) == {
+        "early_exception_filtering",
+        "exception_filtering",
+    }
+
+
+def test_stand_in_tool_output(tmp_path):
+    """Test that the stand-in tools print output the tool plugins parse.
+
+    Expected result: each issue of each file is parsed
+    """
+    files = [str(tmp_path / "a.py"), str(tmp_path / "b.py")]
+    for plugin_class in [
+        benchmark.PycodestyleToolPlugin,
+        benchmark.PylintToolPlugin,
+        benchmark.YamllintToolPlugin,
+    ]:
+        plugin = plugin_class()
+        template = benchmark.FAKE_TOOL_OUTPUT[plugin.get_name()]
+        output = "\n".join(
+            template.replace("$file", path).replace("$line", "1") for path in files
+        )
+        issues = plugin.parse_output([output])
+        assert [issue.filename for issue in issues] == files
@@ -0,0 +1,186 @@
+"""Unit tests of changed_files.py."""
+
+import os
+import subprocess
+
+import pytest
+
+from statick_tool.changed_files import ChangedFiles, ListedFiles
+from statick_tool.issue import Issue
+from statick_tool.package import Package
+
+
+def git(path, *args):
+    """Run a git command in a directory."""
+    subprocess.check_output(
+        [
+            "git",
+            "-C",
+            str(path),
+            "-c",
+            "user.name=test",
+            "-c",
+            "user.email=test@example.com",
+        ]
+        + list(args)
+    )
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """Fixture to get a git repository with a committed, a changed and a new file."""
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    git(repo, "init", "-q")
+    (repo / "same.py").write_text("a = 1\n")
+    (repo / "changed.py").write_text("a = 1\nb = 2\nc = 3\n")
+    git(repo, "add", ".")
+    git(repo, "commit", "-q", "-m", "initial")
+    (repo / "changed.py").write_text("a = 1\nb = 5\nc = 3\nd = 4\n")
+    (repo / "new.py").write_text("a = 1\n")
+    return str(repo)
+
+
+def test_get_changes(repo):
+    """Test finding the changes of a repository.
+
+    Expected result: changed lines of modified files and new files are found
+    """
+    changed_files = ChangedFiles("HEAD")
+    changes = changed_files.get_changes(repo)
+    assert changes == {
+        os.path.realpath(os.path.join(repo, "changed.py")): {2, 4},
+        os.path.realpath(os.path.join(repo, "new.py")): None,
+    }
+    assert changed_files.get_changes(repo) is changes
+
+
+def test_get_changes_invalid_ref(repo):
+    """Test finding the changes since a reference that does not exist.
+
+    Expected result: no changes are found
+    """
+    assert ChangedFiles("not-a-ref").get_changes(repo) is None
+
+
+def test_get_changes_not_a_repo(tmp_path):
+    """Test finding the changes of a directory outside of git.
+
+    Expected result: no changes are found and packages are scanned whole
+    """
+    changed_files = ChangedFiles("HEAD")
+    package = Package("package", str(tmp_path))
+    package["python_src"] = [str(tmp_path / "a.py")]
+    assert changed_files.get_changes(str(tmp_path)) is None
+    assert changed_files.filter_package(package) is package
+    issues = {"pylint": [Issue("a.py", 1, "pylint", "x", 1, "y", None)]}
+    assert changed_files.filter_issues(package, issues) == issues
+
+
+def test_parse_diff():
+    """Test parsing the lines changed from a diff.
+
+    Expected result: lines of hunks that add lines are found
+    """
+    diff = "\n".join(
+        [
+            "diff --git a/x.py b/x.py",
+            "--- a/x.py",
+            "+++ b/x.py",
+            "@@ -1 +1 @@",
+            "-a",
+            "+b",
+            "@@ -5,2 +5,0 @@",
+            "@@ -9,0 +10,3 @@",
+            "diff --git a/y.py b/y.py",
+            "--- a/y.py",
+            "+++ b/y.py",
+            "@@ -3 +2,0 @@",
+        ]
+    )
+    assert ChangedFiles.parse_diff("/top", diff) == {
+        os.path.realpath("/top/x.py"): {1, 10, 11, 12},
+        os.path.realpath("/top/y.py"): set(),
+    }
+
+
+def test_filter_package(repo):
+    """Test keeping only the changed files of a package.
+
+    Expected result: unchanged files are removed from lists of files and make targets
+    """
+    package = Package("repo", repo)
+    same = os.path.join(repo, "same.py")
+    changed = os.path.join(repo, "changed.py")
+    package["python_src"] = [same, changed]
+    package["make_targets"] = [{"name": "target", "src": [same, changed]}]
+    package["cmake_flags"] = "-DX=1"
+    package["names"] = ["same.py"]
+    package.files[same] = {"path": same}
+
+    filtered = ChangedFiles("HEAD").filter_package(package)
+    assert filtered["python_src"] == [changed]
+    assert filtered["make_targets"] == [{"name": "target", "src": [changed]}]
+    assert filtered["cmake_flags"] == "-DX=1"
+    assert filtered["names"] == ["same.py"]
+    assert filtered.files == package.files
+    assert package["python_src"] == [same, changed]
+    assert package["make_targets"][0]["src"] == [same, changed]
+
+
+def test_filter_issues(repo):
+    """Test keeping only the issues in changed files.
+
+    Expected result: issues in unchanged files are removed
+    """
+    package = Package("repo", repo)
+    issues = {
+        "pylint": [
+            Issue(os.path.join(repo, "same.py"), 1, "pylint", "x", 1, "y", None),
+            Issue(os.path.join(repo, "changed.py"), 1, "pylint", "x", 1, "y", None),
+            Issue("new.py", 1, "pylint", "x", 1, "y", None),
+        ]
+    }
+    filtered = ChangedFiles("HEAD").filter_issues(package, issues)
+    assert filtered == {"pylint": issues["pylint"][1:]}
+
+
+def test_filter_issues_lines_only(repo):
+    """Test keeping only the issues on changed lines.
+
+    Expected result: issues on unchanged lines of changed files are removed
+    """
+    package = Package("repo", repo)
+    changed = os.path.join(repo, "changed.py")
+    issues = {
+        "pylint": [
+            Issue(changed, 1, "pylint", "x", 1, "y", None),
+            Issue(changed, 2, "pylint", "x", 1, "y", None),
+            Issue(changed, 0, "pylint", "x", 1, "y", None),
+            Issue(os.path.join(repo, "new.py"), 7, "pylint", "x", 1, "y", None),
+        ]
+    }
+    filtered = ChangedFiles("HEAD", lines_only=True).filter_issues(package, issues)
+    assert filtered == {"pylint": issues["pylint"][1:]}
+
+
+def test_listed_files(repo):
+    """Test keeping only the files given by name.
+
+    Expected result: only the listed file and all of its issues are kept
+    """
+    package = Package("repo", repo)
+    same = os.path.join(repo, "same.py")
+    changed = os.path.join(repo, "changed.py")
+    package["python_src"] = [same, changed]
+    listed_files = ListedFiles([same])
+    assert listed_files.filter_package(package)["python_src"] == [same]
+    issues = {
+        "pylint": [
+            Issue(same, 7, "pylint", "x", 1, "y", None),
+            Issue(changed, 2, "pylint", "x", 1, "y", None),
+        ]
+    }
+    assert listed_files.filter_issues(package, issues) == {
+        "pylint": issues["pylint"][:1]
+    }
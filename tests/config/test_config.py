@@ -176,6 +176,36 @@ def test_config_get_tool_config():
     assert "-Wall" in tool_config
 
 
+def test_config_get_tool_settings():
+    """Test that the Config module gives all configuration of a tool.
+
+    Expected result: tool plugin configuration matches config file
+    """
+    config_file = os.path.join(os.path.dirname(__file__), "rsc", "config.yaml")
+    config = Config(config_file)
+
+    assert config.get_tool_settings("spotbugs", "sei_cert") == {
+        "flags": "",
+        "include": "spotbugs-security.xml",
+    }
+    assert not config.get_tool_settings("spotbugs", "threshold")
+    assert not config.get_tool_settings("spotbugs", "missing")
+
+
+def test_config_get_tool_settings_no_levels(tmp_path):
+    """Test getting tool configuration from configs without levels or level bodies.
+
+    Expected result: no configuration and no error
+    """
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text("other: {}\n")
+    assert not Config(str(config_file)).get_tool_settings("pylint", "default")
+    config_file.write_text("levels:\n  empty:\n")
+    config = Config(str(config_file))
+    assert not config.get_tool_settings("pylint", "empty")
+    assert config.get_tool_timeout("pylint", "empty") is None
+
+
 def test_config_get_discovery_config():
     """Test that the Config module gives correct config for discovery.
 
@@ -389,3 +419,106 @@ def test_get_user_levels_value_error(mock_open):
     mock_open.side_effect = yaml.YAMLError("error")
     with pytest.raises(yaml.YAMLError):
         config.get_user_levels(user_config_file)
+
+
+def test_config_get_tool_timeout(tmp_path):
+    """Test that the Config module gives the timeout of tools.
+
+    Expected result: tool timeouts override level timeouts, both are inherited, and
+    timeouts that are not numbers are ignored
+    """
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text(
+        "levels:\n"
+        "  base:\n"
+        "    timeout: 60\n"
+        "    tool:\n"
+        "      pylint:\n"
+        "        flags: ''\n"
+        "        timeout: 5\n"
+        "      bandit:\n"
+        "        flags: ''\n"
+        "  child:\n"
+        "    inherits_from:\n"
+        "      - base\n"
+        "    tool:\n"
+        "      mypy:\n"
+        "        flags: ''\n"
+        "        timeout: soon\n"
+        "  none:\n"
+        "    tool:\n"
+        "      pylint:\n"
+        "        flags: ''\n"
+    )
+    config = Config(str(config_file))
+
+    assert config.get_tool_timeout("pylint", "base") == 5.0
+    assert config.get_tool_timeout("bandit", "base") == 60.0
+    assert config.get_tool_timeout("pylint", "child") == 5.0
+    assert config.get_tool_timeout("bandit", "child") == 60.0
+    assert config.get_tool_timeout("mypy", "child") is None
+    assert config.get_tool_timeout("pylint", "none") is None
+    assert config.get_tool_timeout("pylint", "missing") is None
+
+
+def test_config_get_discovery_ignore_dirs(tmp_path):
+    """Test that the Config module gives the directories discovery leaves out.
+
+    Expected result: patterns are inherited and added to, and ignore_dirs is not taken
+    for a discovery plugin
+    """
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text(
+        "levels:\n"
+        "  base:\n"
+        "    discovery:\n"
+        "      ignore_dirs:\n"
+        "        - third_party\n"
+        "  child:\n"
+        "    inherits_from:\n"
+        "      - base\n"
+        "    discovery:\n"
+        "      python:\n"
+        "      ignore_dirs: docs/_build\n"
+        "  none:\n"
+        "    discovery:\n"
+        "      - python\n"
+    )
+    config = Config(str(config_file))
+
+    assert config.get_discovery_ignore_dirs("base") == ["third_party"]
+    assert config.get_discovery_ignore_dirs("child") == ["third_party", "docs/_build"]
+    assert not config.get_discovery_ignore_dirs("none")
+    assert not config.get_discovery_ignore_dirs("missing")
+    assert not config.get_enabled_discovery_plugins("base")
+    assert config.get_enabled_discovery_plugins("child") == ["python"]
+
+
+def test_config_get_discovery_flag(tmp_path):
+    """Test that the Config module gives the discovery settings that are on or off.
+
+    Expected result: a level overrides the levels it inherits from, the default is used
+    when no level sets a value, and the settings are not taken for discovery plugins
+    """
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text(
+        "levels:\n"
+        "  base:\n"
+        "    discovery:\n"
+        "      gitignore: false\n"
+        "      default_ignore_dirs: false\n"
+        "  child:\n"
+        "    inherits_from:\n"
+        "      - base\n"
+        "    discovery:\n"
+        "      gitignore: true\n"
+        "  empty:\n"
+    )
+    config = Config(str(config_file))
+
+    assert not config.get_discovery_flag("base", "gitignore")
+    assert config.get_discovery_flag("child", "gitignore")
+    assert not config.get_discovery_flag("child", "default_ignore_dirs")
+    assert config.get_discovery_flag("empty", "gitignore")
+    assert not config.get_discovery_flag("missing", "gitignore", False)
+    assert not config.get_enabled_discovery_plugins("base")
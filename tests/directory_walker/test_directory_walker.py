@@ -0,0 +1,91 @@
+"""Unit tests of directory_walker.py."""
+
+import os
+import sys
+
+import pytest
+
+from statick_tool.directory_walker import Listing, list_dir, scan_files, walk_files
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """Fixture to get a directory tree with nested directories and symbolic links."""
+    for directory in ["b", "a/d", "a/c", "a/c/e"]:
+        (tmp_path / directory).mkdir(parents=True, exist_ok=True)
+    for name in ["z.py", "y.txt", "a/x.py", "a/c/w.py", "a/c/e/v.py", "a/d/u.py"]:
+        (tmp_path / name).write_text("a = 1\n")
+    if sys.platform != "win32":
+        os.symlink(tmp_path / "a", tmp_path / "b" / "link")
+        os.symlink(tmp_path / "z.py", tmp_path / "b" / "file_link.py")
+        os.symlink(tmp_path / "missing.py", tmp_path / "b" / "broken.py")
+    return tmp_path
+
+
+@pytest.mark.parametrize("threads", [1, 4])
+def test_walk_files(tree, threads):
+    """Test listing the files below a directory.
+
+    Expected result: the same files as os.walk, in the order of the directories
+    top-down by name
+    """
+    expected = sorted(
+        os.path.join(root, name) for root, _, files in os.walk(tree) for name in files
+    )
+    paths = walk_files(str(tree), threads)
+    assert sorted(paths) == expected
+    assert paths[:5] == [
+        str(tree / "y.txt"),
+        str(tree / "z.py"),
+        str(tree / "a" / "x.py"),
+        str(tree / "a" / "c" / "w.py"),
+        str(tree / "a" / "c" / "e" / "v.py"),
+    ]
+    assert paths == walk_files(str(tree), 1)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Needs symbolic links")
+def test_scan_files_stat(tree):
+    """Test listing the files below a directory with their stat.
+
+    Expected result: stat is kept, and files that can not be stat are still listed
+    """
+    entries = scan_files(str(tree / "b"), 2, stat=True)
+    assert [entry.name for entry in entries] == ["broken.py", "file_link.py"]
+    assert entries[1].stat().st_size == 6
+    with pytest.raises(OSError):
+        entries[0].stat()
+
+
+def test_list_dir_missing(tmp_path):
+    """Test listing a directory that does not exist.
+
+    Expected result: the listing is empty
+    """
+    assert list_dir(str(tmp_path / "missing")) == ([], [])
+    assert not walk_files(str(tmp_path / "missing"), 2)
+
+
+@pytest.mark.parametrize("threads", [1, 4])
+def test_walk_files_prune(tree, threads):
+    """Test leaving out files and directories while listing.
+
+    Expected result: pruned files are left out and pruned directories are not listed
+    """
+    listed = []
+
+    def prune(directory, listing):
+        listed.append(directory)
+        return Listing(
+            [entry for entry in listing.files if entry.name != "z.py"],
+            [path for path in listing.dirs if os.path.basename(path) != "c"],
+        )
+
+    paths = walk_files(str(tree), threads, prune)
+    assert paths[:3] == [
+        str(tree / "y.txt"),
+        str(tree / "a" / "x.py"),
+        str(tree / "a" / "d" / "u.py"),
+    ]
+    assert not [path for path in paths if path.endswith(("z.py", "w.py", "v.py"))]
+    assert str(tree / "a" / "c") not in listed
@@ -1,14 +1,21 @@
 """Tests for statick_tool.discovery_plugin."""
 
+import argparse
 import contextlib
+import copy
 import os
+import pickle
 import subprocess
 
 import mock
 import pytest
 
+from statick_tool.config import Config
 from statick_tool.discovery_plugin import DiscoveryPlugin
+from statick_tool.exceptions import Exceptions
 from statick_tool.package import Package
+from statick_tool.plugin_context import PluginContext
+from statick_tool.resources import Resources
 
 
 # From https://stackoverflow.com/questions/2059482/python-temporarily-modify-the-current-processs-environment
@@ -56,7 +63,18 @@ def test_discovery_plugin_find_files():
         "test.sh",
     ]
     expected_fullpath = [os.path.join(package.path, filename) for filename in expected]
-    expected_file_cmd_out = [fullpath + ": empty\n" for fullpath in expected_fullpath]
+    # Files with an extension a discovery plugin finds them by are typed by it, even
+    # when they are empty.
+    expected_types = [
+        "empty",
+        "XML document text",
+        "C++ source",
+        "POSIX shell script",
+    ]
+    expected_file_cmd_out = [
+        f"{fullpath}: {file_type}\n"
+        for fullpath, file_type in zip(expected_fullpath, expected_types)
+    ]
     expected_dict = {}
     for i, filename in enumerate(expected):
         expected_dict[expected_fullpath[i]] = {
@@ -86,6 +104,139 @@ def test_discovery_plugin_find_files_multiple():
     assert package.files == expected_dict
 
 
+def test_discovery_plugin_update_files(tmp_path):
+    """Test updating the files found in a package after files changed.
+
+    Expected result: new and changed files are found again and removed files are gone
+    """
+    dp = DiscoveryPlugin()
+    (tmp_path / "keep.py").write_text("a = 1\n")
+    (tmp_path / "change.py").write_text("a = 1\n")
+    (tmp_path / "remove.py").write_text("a = 1\n")
+    (tmp_path / "old").mkdir()
+    (tmp_path / "old" / "gone.py").write_text("a = 1\n")
+    package = Package("package", str(tmp_path))
+    with mock.patch.object(
+        dp, "get_file_cmd_outputs", side_effect=lambda paths: ["text"] * len(paths)
+    ):
+        dp.find_files(package)
+        (tmp_path / "remove.py").unlink()
+        (tmp_path / "old" / "gone.py").unlink()
+        (tmp_path / "old").rmdir()
+        (tmp_path / "new").mkdir()
+        (tmp_path / "new" / "added.py").write_text("a = 1\n")
+        changed = dp.update_files(
+            package,
+            {
+                str(tmp_path / "change.py"),
+                str(tmp_path / "remove.py"),
+                str(tmp_path / "old"),
+                str(tmp_path / "new"),
+            },
+        )
+    assert changed == {
+        str(tmp_path / name)
+        for name in ["change.py", "remove.py", "old/gone.py", "new/added.py"]
+    }
+    assert sorted(package.files) == sorted(
+        str(tmp_path / name) for name in ["change.py", "keep.py", "new/added.py"]
+    )
+    assert package.files[str(tmp_path / "new" / "added.py")]["name"] == "added.py"
+    assert package.get_file_index().find(extensions=[".py"]) == list(package.files)
+
+
+def test_discovery_plugin_find_files_pruned(tmp_path):
+    """Test that find_files leaves out directories that are not part of the package.
+
+    Expected result: the output directory, directories of the ignore_dirs setting of the
+    level and the usual build directories are not walked, also when files change
+    """
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text(
+        "levels:\n  ignore:\n    discovery:\n      ignore_dirs: [third_party]\n"
+    )
+    package_dir = tmp_path / "package"
+    for name in ["a.py", "build/b.py", "output/c.py", "third_party/d.py"]:
+        (package_dir / name).parent.mkdir(parents=True, exist_ok=True)
+        (package_dir / name).write_text("a = 1\n")
+    dp = DiscoveryPlugin()
+    dp.set_plugin_context(
+        PluginContext(
+            argparse.Namespace(output_directory=str(package_dir / "output")),
+            Resources([]),
+            Config(str(config_file)),
+        )
+    )
+    package = Package("package", str(package_dir))
+    rules = dp.get_prune_rules(package, "ignore")
+    with mock.patch.object(
+        dp, "get_file_cmd_outputs", side_effect=lambda paths: ["text"] * len(paths)
+    ):
+        dp.find_files(package, prune_rules=rules)
+        assert list(package.files) == [str(package_dir / "a.py")]
+        (package_dir / "third_party" / "e.py").write_text("a = 1\n")
+        changed = dp.update_files(
+            package, {str(package_dir / "third_party" / "e.py")}, rules
+        )
+    assert not changed
+    assert list(package.files) == [str(package_dir / "a.py")]
+
+
+def test_discovery_plugin_get_prune_rules_settings(tmp_path):
+    """Test that the discovery section of the level can turn off default pruning.
+
+    Expected result: .gitignore files and the default directories are not used when the
+    level turns them off
+    """
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text(
+        "levels:\n"
+        "  all:\n"
+        "    discovery:\n"
+        "      gitignore: false\n"
+        "      default_ignore_dirs: false\n"
+    )
+    package_dir = tmp_path / "package"
+    for name in ["a.py", "build/b.py", "ignored.py"]:
+        (package_dir / name).parent.mkdir(parents=True, exist_ok=True)
+        (package_dir / name).write_text("a = 1\n")
+    (package_dir / ".gitignore").write_text("ignored.py\n")
+    dp = DiscoveryPlugin()
+    dp.set_plugin_context(
+        PluginContext(argparse.Namespace(), Resources([]), Config(str(config_file)))
+    )
+    package = Package("package", str(package_dir))
+    assert dp.get_prune_rules(package).is_pruned(str(package_dir / "ignored.py"))
+    rules = dp.get_prune_rules(package, "all")
+    assert not rules.is_pruned(str(package_dir / "ignored.py"))
+    assert not rules.is_pruned(str(package_dir / "build" / "b.py"))
+
+
+def test_discovery_plugin_find_files_excepted(tmp_path):
+    """Test that find_files leaves out directories excepted for all tools.
+
+    Expected result: directories matching a glob of a file exception for all tools are
+    not walked
+    """
+    exceptions_file = tmp_path / "exceptions.yaml"
+    exceptions_file.write_text(
+        "global:\n"
+        "  exceptions:\n"
+        "    file:\n"
+        "      - tools: all\n"
+        "        globs: ['*/third_party/*']\n"
+    )
+    package_dir = tmp_path / "package"
+    for name in ["a.py", "third_party/b.py", "src/third_party/c.py"]:
+        (package_dir / name).parent.mkdir(parents=True, exist_ok=True)
+        (package_dir / name).write_text("a = 1\n")
+    dp = DiscoveryPlugin()
+    package = Package("package", str(package_dir))
+    rules = dp.get_prune_rules(package, exceptions=Exceptions(str(exceptions_file)))
+    dp.find_files(package, prune_rules=rules)
+    assert list(package.files) == [str(package_dir / "a.py")]
+
+
 def test_discovery_plugin_get_file_cmd_output():
     """Test get_file_cmd_output."""
     dp = DiscoveryPlugin()
@@ -128,6 +279,216 @@ def test_discovery_plugin_get_file_cmd_output_calledprocess_error(
     assert "" == dp.get_file_cmd_output(filepath)
 
 
+@pytest.fixture
+def typed_files(tmp_path):
+    """Fixture to get files of different types, some with unusual names."""
+    (tmp_path / "a.py").write_text("import os\n")
+    (tmp_path / "b.sh").write_text("#!/bin/sh\necho b\n")
+    (tmp_path / "c: d").write_text("text\n")
+    (tmp_path / "\u00e9t\u00e9.c").write_text("int main(void) { return 0; }\n")
+    (tmp_path / "empty").write_text("")
+    return sorted(str(path) for path in tmp_path.iterdir())
+
+
+def test_discovery_plugin_get_file_cmd_outputs(typed_files):
+    """Test running the file command on many files at once.
+
+    Expected result: the output for each file is the same as when running the file
+    command on that file alone
+    """
+    dp = DiscoveryPlugin()
+    if not dp.file_command_exists():
+        pytest.skip("File command does not exist. Skipping test that requires it.")
+    expected = [dp.get_file_cmd_output(path) for path in typed_files]
+    assert dp.get_file_cmd_outputs(typed_files) == expected
+
+    with mock.patch.object(DiscoveryPlugin, "FILE_CMD_BATCH_SIZE", 2):
+        with mock.patch.object(dp, "run_file_cmd", wraps=dp.run_file_cmd) as mocked:
+            assert dp.get_file_cmd_outputs(typed_files) == expected
+    assert mocked.call_count == 3
+    assert not dp.get_file_cmd_outputs([])
+
+
+def test_discovery_plugin_get_file_types(typed_files):
+    """Test getting the types of files, running the file command only if needed.
+
+    Expected result: the file command only runs on the file that can not be told
+    apart by its first bytes or extension
+    """
+    dp = DiscoveryPlugin()
+    if not dp.file_command_exists():
+        pytest.skip("File command does not exist. Skipping test that requires it.")
+    with mock.patch.object(
+        dp, "get_file_cmd_outputs", wraps=dp.get_file_cmd_outputs
+    ) as mocked:
+        outputs = dp.get_file_types(typed_files)
+    mocked.assert_called_once_with([typed_files[2]])
+    assert outputs == [
+        typed_files[0].lower() + ": python script\n",
+        typed_files[1].lower() + ": posix shell script\n",
+        dp.get_file_cmd_output(typed_files[2]),
+        typed_files[3].lower() + ": empty\n",
+        typed_files[4].lower() + ": c source\n",
+    ]
+    with modified_environ(PATH=""):
+        assert dp.get_file_types(typed_files) == [""] * len(typed_files)
+
+
+def test_discovery_plugin_get_file_dicts_lazy(typed_files):
+    """Test that the file command output is only found once it is looked up.
+
+    Expected result: the types of all files are found together on the first lookup
+    """
+    dp = DiscoveryPlugin()
+    with mock.patch.object(
+        dp,
+        "get_file_types",
+        side_effect=lambda paths: [path + ": text" for path in paths],
+    ) as mocked:
+        file_dicts = dp.get_file_dicts(typed_files)
+        assert file_dicts[1]["name"] == "b.sh"
+        assert not mocked.called
+
+        assert file_dicts[1]["file_cmd_out"] == typed_files[1] + ": text"
+        mocked.assert_called_once_with(typed_files)
+        assert file_dicts[0].get("file_cmd_out") == typed_files[0] + ": text"
+        assert "file_cmd_out" in file_dicts[2]
+        assert mocked.call_count == 1
+
+    assert file_dicts[3] == {
+        "name": "empty",
+        "path": typed_files[3],
+        "file_cmd_out": typed_files[3] + ": text",
+    }
+    assert pickle.loads(pickle.dumps(file_dicts[4])) == file_dicts[4]
+    with pytest.raises(KeyError):
+        file_dicts[0]["missing"]  # pylint: disable=pointless-statement
+
+
+def test_discovery_plugin_get_file_dicts_pickle_lazy(typed_files):
+    """Test that pickling files does not find the output of the file command.
+
+    Expected result: no file is typed by pickling, and the unpickled files still have
+    their types found together on the first lookup
+    """
+    dp = DiscoveryPlugin()
+    package = Package("package", os.path.dirname(typed_files[0]))
+    with mock.patch.object(dp, "get_file_types") as mocked:
+        for file_dict in dp.get_file_dicts(typed_files):
+            package.files[file_dict["path"]] = file_dict
+        data = pickle.dumps(package)
+        assert not mocked.called
+    assert not any(
+        dict.__contains__(file_dict, "file_cmd_out")
+        for file_dict in package.files.values()
+    )
+
+    unpickled = pickle.loads(data)
+    with mock.patch.object(
+        DiscoveryPlugin,
+        "get_file_types",
+        side_effect=lambda paths: [path + ": text" for path in paths],
+    ) as mocked:
+        file_dicts = list(unpickled.files.values())
+        assert file_dicts[0]["name"] == "a.py"
+        assert file_dicts[1]["file_cmd_out"] == typed_files[1] + ": text"
+        assert file_dicts[4]["file_cmd_out"] == typed_files[4] + ": text"
+    mocked.assert_called_once_with(typed_files)
+    assert copy.copy(file_dicts[2]) == file_dicts[2]
+
+
+def test_discovery_plugin_get_file_dicts_resolve_some(typed_files):
+    """Test finding the file command output of some of the files found together.
+
+    Expected result: only the files asked for are typed, the others stay pending
+    """
+    dp = DiscoveryPlugin()
+    with mock.patch.object(
+        dp,
+        "get_file_types",
+        side_effect=lambda paths: [path + ": text" for path in paths],
+    ) as mocked:
+        file_dicts = dp.get_file_dicts(typed_files)
+        pending = file_dicts[0].pending
+        pending.resolve([file_dicts[1], file_dicts[3]])
+        mocked.assert_called_once_with([typed_files[1], typed_files[3]])
+        assert dict.__contains__(file_dicts[1], "file_cmd_out")
+        assert not dict.__contains__(file_dicts[0], "file_cmd_out")
+
+        pending.resolve([file_dicts[1]])
+        assert mocked.call_count == 1
+        assert file_dicts[0]["file_cmd_out"] == typed_files[0] + ": text"
+        mocked.assert_called_with([typed_files[0], typed_files[2], typed_files[4]])
+
+
+def test_discovery_plugin_get_file_cmd_outputs_no_file_cmd(typed_files):
+    """Test running the file command on many files when it does not exist.
+
+    Expected result: the output for each file is empty
+    """
+    with modified_environ(PATH=""):
+        dp = DiscoveryPlugin()
+        assert dp.get_file_cmd_outputs(typed_files) == [""] * len(typed_files)
+
+
+def test_discovery_plugin_run_file_cmd_fallback(typed_files):
+    """Test running the file command on a batch when it fails or can not be split.
+
+    Expected result: the file command is run on each file instead
+    """
+    dp = DiscoveryPlugin()
+    with mock.patch.object(
+        dp, "get_file_cmd_output", side_effect=lambda path: path + ": text\n"
+    ):
+        with mock.patch(
+            "statick_tool.discovery_plugin.subprocess.check_output",
+            side_effect=subprocess.CalledProcessError(1, "", output="mocked error"),
+        ):
+            assert dp.run_file_cmd(typed_files) == [
+                path + ": text\n" for path in typed_files
+            ]
+        with mock.patch(
+            "statick_tool.discovery_plugin.subprocess.check_output",
+            return_value="a.py\0: text\n",
+        ):
+            assert dp.run_file_cmd(typed_files) == [
+                path + ": text\n" for path in typed_files
+            ]
+
+
+def test_discovery_plugin_get_walk_threads():
+    """Test getting the number of directories listed at the same time.
+
+    Expected result: --walk-threads is used if set, otherwise --max-procs
+    """
+    dp = DiscoveryPlugin()
+    assert dp.get_walk_threads() == 1
+    dp.set_plugin_context(
+        PluginContext(
+            argparse.Namespace(walk_threads=None, max_procs=3), Resources([]), None
+        )
+    )
+    assert dp.get_walk_threads() == 3
+    dp.plugin_context.args.walk_threads = 8
+    assert dp.get_walk_threads() == 8
+
+
+def test_discovery_plugin_get_output_path():
+    """Test that files of a plugin are written to the output directory."""
+    dp = DiscoveryPlugin()
+    assert dp.get_output_path("discovery.log") == "discovery.log"
+    assert dp.get_working_dir() is None
+
+    output_dir = os.path.join("output", "package-level")
+    dp.set_plugin_context(
+        PluginContext(argparse.Namespace(), Resources([]), None, output_dir)
+    )
+    assert dp.get_output_path("discovery.log") == os.path.join(
+        output_dir, "discovery.log"
+    )
+    assert dp.get_working_dir() == output_dir
+
+
 def test_discovery_plugin_file_cmd_exists():
     """Test when file command exists."""
     dp = DiscoveryPlugin()
@@ -141,3 +502,19 @@ def test_discovery_plugin_no_file_cmd():
     with modified_environ(PATH=""):
         dp = DiscoveryPlugin()
         assert not dp.file_command_exists()
+
+
+def test_discovery_plugin_file_cmd_exists_cached(tmp_path):
+    """Test that $PATH is searched for the file command once for each value.
+
+    Expected result: the answer is kept until $PATH changes
+    """
+    with modified_environ(PATH=str(tmp_path)):
+        dp = DiscoveryPlugin()
+        with mock.patch(
+            "statick_tool.discovery_plugin.os.path.isfile", return_value=False
+        ) as mocked:
+            assert not dp.file_command_exists()
+            assert not dp.file_command_exists()
+        assert mocked.call_count == 1
+    DiscoveryPlugin.file_command_found.pop(str(tmp_path))
@@ -0,0 +1,108 @@
+"""Unit tests of discovery_cache.py."""
+
+import os
+
+import mock
+import pytest
+
+from statick_tool.discovery_cache import DiscoveryCache
+from statick_tool.discovery_plugin import DiscoveryPlugin
+from statick_tool.package import Package
+
+
+@pytest.fixture
+def package_dir(tmp_path):
+    """Fixture to get a package with a few files."""
+    package_dir = tmp_path / "package"
+    (package_dir / "sub").mkdir(parents=True)
+    (package_dir / "a.py").write_text("import os\n")
+    (package_dir / "run").write_text("#!/bin/sh\necho\n")
+    (package_dir / "sub" / "b.txt").write_text("text\n")
+    return package_dir
+
+
+def find_types(cache_dir, package_dir):
+    """Find the files of a package and their types with a cache.
+
+    Args:
+        cache_dir: Directory to keep the cache in.
+        package_dir: Directory of the package.
+
+    Returns:
+        Paths passed to get_file_types, and the package.
+    """
+    cache = DiscoveryCache(str(cache_dir), str(package_dir), True)
+    package = Package("package", str(package_dir))
+    plugin = DiscoveryPlugin()
+    with mock.patch.object(
+        DiscoveryPlugin,
+        "get_file_types",
+        side_effect=lambda paths: [path + ": text\n" for path in paths],
+    ) as mocked:
+        plugin.find_files(package, cache)
+        for file_dict in package.files.values():
+            assert file_dict["file_cmd_out"]
+    cache.save(package.files)
+    classified = [path for call in mocked.call_args_list for path in call[0][0]]
+    return sorted(classified), package
+
+
+def test_restore(tmp_path, package_dir):
+    """Test finding the types of files found in an earlier run.
+
+    Expected result: only files that were added or changed are classified again
+    """
+    cache_dir = tmp_path / "cache"
+    classified, package = find_types(cache_dir, package_dir)
+    assert classified == sorted(package.files)
+
+    classified, package = find_types(cache_dir, package_dir)
+    assert not classified
+    assert package.files[str(package_dir / "a.py")]["file_cmd_out"] == (
+        str(package_dir / "a.py") + ": text\n"
+    )
+
+    (package_dir / "a.py").write_text("import os\nimport sys\n")
+    (package_dir / "sub" / "c.py").write_text("import os\n")
+    (package_dir / "run").unlink()
+    classified, package = find_types(cache_dir, package_dir)
+    assert classified == [str(package_dir / "a.py"), str(package_dir / "sub" / "c.py")]
+
+    cache = DiscoveryCache(str(cache_dir), str(package_dir), True)
+    assert sorted(cache.entries) == sorted(package.files)
+
+
+def test_header_changed(tmp_path, package_dir):
+    """Test finding types after the file command was removed.
+
+    Expected result: entries found with the file command are not used
+    """
+    cache_dir = tmp_path / "cache"
+    find_types(cache_dir, package_dir)
+    cache = DiscoveryCache(str(cache_dir), str(package_dir), False)
+    assert not cache.entries
+    assert DiscoveryCache(str(cache_dir), str(package_dir), True).entries
+
+
+def test_save_nothing_walked(tmp_path, package_dir):
+    """Test saving the cache when the package was not walked with it.
+
+    Expected result: the cache file is not written
+    """
+    cache = DiscoveryCache(str(tmp_path / "cache"), str(package_dir), True)
+    cache.save({str(package_dir / "a.py"): {"file_cmd_out": "text"}})
+    assert not os.path.exists(cache.cache_file)
+
+
+def test_unreadable_cache(tmp_path, package_dir):
+    """Test reading a cache file that is not valid.
+
+    Expected result: a warning is logged and no entries are used
+    """
+    cache = DiscoveryCache(str(tmp_path), str(package_dir), True)
+    with open(cache.cache_file, "w", encoding="utf8") as fid:
+        fid.write("{")
+    with mock.patch("statick_tool.discovery_cache.logging.warning") as mocked:
+        cache = DiscoveryCache(str(tmp_path), str(package_dir), True)
+    assert mocked.called
+    assert not cache.entries
@@ -1,12 +1,13 @@
 """Unit tests for the Exceptions module."""
 
+import fnmatch
 import os
 import tempfile
 from tempfile import TemporaryDirectory
 
 import pytest
 
-from statick_tool.exceptions import Exceptions
+from statick_tool.exceptions import Exceptions, GlobMatcher
 from statick_tool.issue import Issue
 from statick_tool.package import Package
 
@@ -492,3 +493,141 @@ def test_filter_issues_wildcard_exceptions():
 
     issues = exceptions.filter_issues(package, issues)
     assert len(issues["pylint"]) == 1
+
+
+@pytest.mark.parametrize(
+    "glob",
+    [
+        "*",
+        "*.py",
+        "src/*",
+        "/abs/path/x.py",
+        "*/third_party/*",
+        "*test?.py",
+        "*[0-9].c",
+        "x.py",
+    ],
+)
+def test_glob_matcher_like_fnmatch(glob):
+    """Test that compiled globs match the same paths as fnmatch.
+
+    Expected result: each path matches the compiled glob exactly when fnmatch matches
+    """
+    matcher = GlobMatcher([glob])
+    paths = [
+        "x.py",
+        "src/x.py",
+        "/abs/path/x.py",
+        "/abs/third_party/lib/y.c",
+        "/abs/lib/y1.c",
+        "/abs/test1.py",
+        "/abs/test12.py",
+        "",
+    ]
+    for path in paths:
+        assert matcher.match(path) == fnmatch.fnmatch(path, glob), path
+
+
+def test_glob_matcher_many_globs():
+    """Test matching a path against many globs at once.
+
+    Expected result: a path matches if any glob matches
+    """
+    matcher = GlobMatcher(["*.c", "src/*", "*/vendor/*", "setup.py", "*.c"])
+    assert matcher
+    assert matcher.match("/abs/a.c")
+    assert matcher.match("src/a.py")
+    assert matcher.match("/abs/vendor/a.py")
+    assert matcher.match("setup.py")
+    assert not matcher.match("/abs/setup.py")
+    assert not GlobMatcher([])
+    assert not GlobMatcher([]).match("a.py")
+
+
+def test_get_exceptions_cached():
+    """Test that exceptions and matchers are only built once per package and tool.
+
+    Expected result: the same objects are returned, and a different list of
+    exceptions gets a new matcher
+    """
+    exceptions = Exceptions(
+        os.path.join(os.path.dirname(__file__), "early_exceptions.yaml")
+    )
+    package = Package("test", os.path.dirname(__file__))
+    package_exceptions = exceptions.get_exceptions(package)
+    assert exceptions.get_exceptions(package) is package_exceptions
+
+    matcher = exceptions.get_file_matcher(
+        package, "something", package_exceptions["file"]
+    )
+    assert (
+        exceptions.get_file_matcher(package, "something", package_exceptions["file"])
+        is matcher
+    )
+    assert matcher.match("/x/uncommontext.py")
+    assert not exceptions.get_file_matcher(
+        package, None, package_exceptions["file"]
+    ).match("/x/uncommontext.py")
+    other = exceptions.get_file_matcher(package, "something", [])
+    assert other is not matcher
+    assert not other.match("/x/uncommontext.py")
+
+
+def test_filter_file_exceptions_relative_path():
+    """Test that file exceptions match paths relative to the package.
+
+    Expected result: issues in excepted files are removed, once per file, for the tools
+    the exceptions apply to
+    """
+    package = Package("test", "/abs/package")
+    exceptions = Exceptions(
+        os.path.join(os.path.dirname(__file__), "valid_exceptions.yaml")
+    )
+    file_exceptions = [
+        {"tools": ["pylint"], "globs": ["src/generated/*"]},
+        {"tools": "all", "globs": ["*.pyi"]},
+    ]
+    issues = {
+        "pylint": [
+            Issue("/abs/package/src/generated/a.py", 1, "pylint", "a", 1, "a", None),
+            Issue("/abs/package/src/generated/a.py", 2, "pylint", "a", 1, "a", None),
+            Issue("/abs/package/src/a.py", 1, "pylint", "a", 1, "a", None),
+            Issue("/abs/package/src/a.pyi", 1, "pylint", "a", 1, "a", None),
+        ],
+        "bandit": [
+            Issue("/abs/package/src/generated/a.py", 1, "bandit", "a", 1, "a", None),
+        ],
+    }
+
+    issues = exceptions.filter_file_exceptions(package, file_exceptions, issues)
+
+    assert [issue.filename for issue in issues["pylint"]] == ["/abs/package/src/a.py"]
+    assert len(issues["bandit"]) == 1
+
+
+def test_is_dir_excepted(tmp_path):
+    """Test finding directories whose files are all excepted for all tools.
+
+    Expected result: only globs of exceptions for all tools that end with * exclude
+    directories
+    """
+    exceptions_file = tmp_path / "exceptions.yaml"
+    exceptions_file.write_text(
+        "global:\n"
+        "  exceptions:\n"
+        "    file:\n"
+        "      - tools: all\n"
+        "        globs: ['*/third_party/*', '*.py', '*/build/*']\n"
+        "      - tools: [pylint]\n"
+        "        globs: ['*/generated/*']\n"
+    )
+    exceptions = Exceptions(str(exceptions_file))
+    package = Package("test", "/ws/package")
+
+    assert exceptions.is_dir_excepted(package, "/ws/package/third_party")
+    assert exceptions.is_dir_excepted(package, "/ws/package/src/third_party")
+    assert exceptions.is_dir_excepted(package, "/ws/package/build")
+    assert not exceptions.is_dir_excepted(package, "/ws/package/third_party_docs")
+    assert not exceptions.is_dir_excepted(package, "/ws/package/generated")
+    assert not exceptions.is_dir_excepted(package, "/ws/package/src")
+    assert not exceptions.is_dir_excepted(package, "/home/travis/build/package")
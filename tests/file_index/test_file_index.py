@@ -0,0 +1,137 @@
+"""Unit tests of file_index.py."""
+
+import copy
+import pickle
+
+import pytest
+
+from statick_tool.file_index import FileIndex, get_extension
+from statick_tool.package import Package
+
+
+@pytest.fixture
+def package():
+    """Fixture to get a package with files found in it."""
+    package = Package("package", "/package")
+    for path, output in [
+        ("/package/setup.cfg", "python script"),
+        ("/package/b.py", "ascii text"),
+        ("/package/Dockerfile.dev", "ascii text"),
+        ("/package/run", "python script, ascii text executable"),
+        ("/package/a.min.js", "ascii text"),
+        ("/package/a.js", "ascii text"),
+        ("/package/docker/dockerfile", "ascii text"),
+        ("/package/.py", "empty"),
+    ]:
+        name = path.rsplit("/", 1)[1].lower()
+        package.files[path] = {
+            "name": name,
+            "path": path,
+            "file_cmd_out": f"{path.lower()}: {output}\n",
+        }
+    return package
+
+
+@pytest.mark.parametrize(
+    "name,expected",
+    [("a.py", ".py"), ("a.min.js", ".js"), (".py", ".py"), ("makefile", "")],
+)
+def test_get_extension(name, expected):
+    """Test getting the extension of a file name.
+
+    Expected result: the extension matches exactly the names ending with it
+    """
+    assert get_extension(name) == expected
+
+
+def test_find(package):
+    """Test finding files by extension, name, start of name and file type.
+
+    Expected result: matching files are found once each, in the order they were found
+    """
+    index = package.get_file_index()
+    assert index.find(extensions=[".py"]) == ["/package/b.py", "/package/.py"]
+    assert index.find(extensions=[".js"], exclude=(".min.js",)) == ["/package/a.js"]
+    assert index.find(names=["dockerfile"], prefixes=["dockerfile"]) == [
+        "/package/Dockerfile.dev",
+        "/package/docker/dockerfile",
+    ]
+    assert index.find(prefixes=["zzz"]) == []
+    assert index.find(file_types=["python script"], exclude=(".cfg",)) == [
+        "/package/run"
+    ]
+    assert index.find(extensions=[".py"], file_types=["python script"]) == [
+        "/package/setup.cfg",
+        "/package/b.py",
+        "/package/run",
+        "/package/.py",
+    ]
+    assert not index.find(file_types=["package"])
+
+
+def test_get_file_types(package):
+    """Test grouping files by the output of the file command.
+
+    Expected result: the path is left out of the output and files are grouped
+    """
+    file_types = FileIndex(package.files).get_file_types()
+    assert file_types["ascii text\n"] == [
+        "/package/b.py",
+        "/package/Dockerfile.dev",
+        "/package/a.min.js",
+        "/package/a.js",
+        "/package/docker/dockerfile",
+    ]
+    assert len(file_types) == 4
+
+
+def test_find_types_only_needed(package):
+    """Test that only files not found otherwise have their type looked up.
+
+    Expected result: files found by extension or left out are not grouped by type
+    """
+    index = package.get_file_index()
+    assert index.find(
+        extensions=[".py", ".js"], file_types=["python script"], exclude=(".cfg",)
+    ) == [
+        "/package/b.py",
+        "/package/run",
+        "/package/a.min.js",
+        "/package/a.js",
+        "/package/.py",
+    ]
+    assert index.typed == {
+        "/package/Dockerfile.dev",
+        "/package/run",
+        "/package/docker/dockerfile",
+    }
+
+
+def test_merge(package):
+    """Test merging lists of files.
+
+    Expected result: each file once, in the order they were found
+    """
+    index = package.get_file_index()
+    assert index.merge(["/package/a.js", "/package/b.py"], ["/package/a.js"]) == [
+        "/package/b.py",
+        "/package/a.js",
+    ]
+
+
+def test_package_get_file_index(package):
+    """Test getting the index of a package.
+
+    Expected result: the index is kept until the files change, also in copies that
+    discovery plugins scan
+    """
+    index = package.get_file_index()
+    assert package.get_file_index() is index
+    assert copy.copy(package).get_file_index() is index
+    package.files = {}
+    assert package.get_file_index() is not index
+    assert not package.get_file_index().find(extensions=[".py"])
+
+    unpickled = pickle.loads(pickle.dumps(package))
+    assert unpickled.get_file_index().find(extensions=[".py"]) == []
+    assert unpickled.path == package.path
@@ -0,0 +1,84 @@
+"""Unit tests of file_type.py."""
+
+import pytest
+
+from statick_tool.file_type import get_shebang_type, sniff_file_type
+
+
+@pytest.mark.parametrize(
+    "line,expected",
+    [
+        (b"#!/usr/bin/env python3", "Python script"),
+        (b"#!/usr/bin/python3.11 -u", "Python script"),
+        (b"#!/usr/bin/env -S PYTHONPATH=. python3 -u", "Python script"),
+        (b"#!/bin/sh", "POSIX shell script"),
+        (b"#! /bin/bash -e", "Bourne-Again shell script"),
+        (b"#!/usr/bin/perl -w", "Perl script"),
+        (b"#!/bin/zsh", "Paul Falstad's zsh script"),
+        (b"#!/usr/bin/env ruby", None),
+        (b"#!/usr/bin/env", None),
+        (b"import os", None),
+    ],
+)
+def test_get_shebang_type(line, expected):
+    """Test getting the type of a script from its first line.
+
+    Expected result: known interpreters are named, others are left to the file command
+    """
+    assert get_shebang_type(line) == expected
+
+
+@pytest.mark.parametrize(
+    "name,content,expected",
+    [
+        ("empty", b"", "empty"),
+        ("empty.py", b"", "Python script"),
+        ("image", b"\x89PNG\r\n\x1a\n", "PNG image data"),
+        ("object", b"x\x01\x00\x02", "data"),
+        (
+            "script",
+            b"#!/usr/bin/env python\nimport os\n",
+            "Python script, text executable",
+        ),
+        ("script.rb", b"#!/usr/bin/env ruby\nputs 1\n", None),
+        ("module.py", b"import os\n", "Python script"),
+        ("header.H", b"int a;\n", "C source"),
+        ("notes.txt", b"notes\n", None),
+        (
+            "deploy.cfg.txt",
+            b"#!/usr/bin/env python3\nimport os\n",
+            "Python script, text executable",
+        ),
+        ("hook.ini", b"#!/bin/sh\necho hook\n", "POSIX shell script, text executable"),
+        ("logo.png", b"\x89PNG\r\n\x1a\n", "PNG image data"),
+        ("notes", b"notes\n", None),
+        ("utf16.py", b"\xff\xfei\x00m\x00", "Python script"),
+        ("utf16", b"\xff\xfei\x00m\x00", None),
+    ],
+)
+def test_sniff_file_type(tmp_path, name, content, expected):
+    """Test getting the type of a file from its extension or its first bytes.
+
+    Expected result: files with a known extension are named by it, empty, binary and
+    script files are told apart, other files are left to the file command
+    """
+    (tmp_path / name).write_bytes(content)
+    assert sniff_file_type(str(tmp_path / name)) == expected
+
+
+def test_sniff_file_type_missing(tmp_path):
+    """Test getting the type of a file that can not be read.
+
+    Expected result: the file is left to the file command
+    """
+    assert sniff_file_type(str(tmp_path / "missing")) is None
+
+
+def test_sniff_file_type_extension_not_opened(tmp_path):
+    """Test getting the type of a file with a known extension.
+
+    Expected result: the type comes from the extension without opening the file
+    """
+    assert sniff_file_type(str(tmp_path / "missing.py")) == "Python script"
+    assert sniff_file_type(str(tmp_path / "missing.C")) == "C source"
+    assert sniff_file_type(str(tmp_path / "missing.txt")) is None
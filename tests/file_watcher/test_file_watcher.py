@@ -0,0 +1,89 @@
+"""Unit tests of file_watcher.py."""
+
+import os
+import sys
+
+import mock
+import pytest
+
+from statick_tool.file_watcher import (
+    FileWatcher,
+    InotifyWatcher,
+    create_watcher,
+)
+
+WATCHERS = [FileWatcher]
+if sys.platform.startswith("linux"):
+    WATCHERS.append(InotifyWatcher)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """Fixture to get a directory tree with a file, an output and a git directory."""
+    (tmp_path / "a.py").write_text("a = 1\n")
+    (tmp_path / "output").mkdir()
+    (tmp_path / ".git").mkdir()
+    return tmp_path
+
+
+@pytest.mark.parametrize("watcher_class", WATCHERS)
+def test_wait(tree, watcher_class):
+    """Test waiting for files to be created, changed and removed.
+
+    Expected result: the changed paths are reported and ignored directories are not
+    """
+    watcher = watcher_class(str(tree), [str(tree / "output")], interval=0.01)
+    try:
+        (tree / "a.py").write_text("a = 2\n")
+        (tree / "b.py").write_text("b = 1\n")
+        (tree / "output" / "pylint.log").write_text("log\n")
+        (tree / ".git" / "index").write_text("index\n")
+        assert watcher.wait(settle=0.05) == {str(tree / "a.py"), str(tree / "b.py")}
+
+        (tree / "b.py").unlink()
+        assert watcher.wait(settle=0.05) == {str(tree / "b.py")}
+    finally:
+        watcher.close()
+
+
+@pytest.mark.parametrize("watcher_class", WATCHERS)
+def test_wait_new_directory(tree, watcher_class):
+    """Test waiting for files in a directory created while watching.
+
+    Expected result: changes below the new directory are reported
+    """
+    watcher = watcher_class(str(tree), interval=0.01)
+    try:
+        (tree / "sub").mkdir()
+        (tree / "sub" / "c.py").write_text("c = 1\n")
+        changed = watcher.wait(settle=0.05)
+        assert changed & {str(tree / "sub"), str(tree / "sub" / "c.py")}
+
+        (tree / "sub" / "c.py").write_text("c = 2\n")
+        assert watcher.wait(settle=0.05) == {str(tree / "sub" / "c.py")}
+    finally:
+        watcher.close()
+
+
+def test_poll_timeout(tree):
+    """Test polling when nothing changes.
+
+    Expected result: no changes are reported
+    """
+    assert not FileWatcher(str(tree), interval=0.01).poll(0.01)
+
+
+def test_create_watcher_fallback(tree):
+    """Test creating a watcher where inotify can not be used.
+
+    Expected result: a watcher listing the files is created
+    """
+    with mock.patch.object(InotifyWatcher, "start", side_effect=OSError("no inotify")):
+        watcher = create_watcher(str(tree))
+    assert type(watcher) is FileWatcher  # pylint: disable=unidiomatic-typecheck
+    assert watcher.files == {
+        str(tree / "a.py"): (
+            os.stat(tree / "a.py").st_mtime_ns,
+            os.stat(tree / "a.py").st_size,
+        )
+    }
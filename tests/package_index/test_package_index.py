@@ -0,0 +1,186 @@
+"""Unit tests of package_index.py."""
+
+import json
+import os
+
+import mock
+import pytest
+
+from statick_tool.package_index import PackageIndex
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    """Fixture to create a workspace with packages, nested packages and ignored ones."""
+    layout = {
+        "src/ros_package1/package.xml": "",
+        "src/python_package1/setup.py": "",
+        "src/subdir/python_package2/pyproject.toml": "",
+        "src/subdir/ros_package2/package.xml": "",
+        "src/subdir/ros_package2/nested/package.xml": "",
+        "src/ignored/COLCON_IGNORE": "",
+        "src/ignored/ros_package3/package.xml": "",
+        "src/ignored_package/package.xml": "",
+        "src/ignored_package/CATKIN_IGNORE": "",
+        "src/not_a_package/README.md": "",
+    }
+    for name, contents in layout.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(contents)
+    return tmp_path
+
+
+def test_find_packages(workspace):
+    """Test finding the packages in a workspace.
+
+    Expected result: packages are found top-down by name and ignored subtrees are
+    skipped
+    """
+    packages = PackageIndex().find_packages(str(workspace / "src"))
+    assert [package.name for package in packages] == [
+        "python_package1",
+        "ros_package1",
+        "python_package2",
+        "ros_package2",
+        "nested",
+    ]
+    assert packages[0].path == str(workspace / "src" / "python_package1")
+
+
+def test_find_packages_workspace_ignored(workspace):
+    """Test a workspace that is ignored as a whole.
+
+    Expected result: no packages are found
+    """
+    (workspace / "src" / "AMENT_IGNORE").write_text("")
+    assert not PackageIndex().find_packages(str(workspace / "src"))
+
+
+def test_find_packages_ignore_packages(workspace):
+    """Test leaving out packages configured to be ignored.
+
+    Expected result: the package is left out but packages below it are found
+    """
+    packages = PackageIndex().find_packages(
+        str(workspace / "src"), ignore_packages=["ros_package2"]
+    )
+    names = [package.name for package in packages]
+    assert "ros_package2" not in names
+    assert "nested" in names
+
+
+def test_find_packages_package_names(workspace):
+    """Test finding only the wanted packages.
+
+    Expected result: only the wanted package is found
+    """
+    index = PackageIndex()
+    packages = index.find_packages(
+        str(workspace / "src"), package_names=["ros_package1"]
+    )
+    assert [package.name for package in packages] == ["ros_package1"]
+
+    assert not index.find_packages(str(workspace / "src"), package_names=[])
+
+
+def test_find_packages_package_names_duplicate(workspace):
+    """Test finding a wanted package whose name is also used later in the workspace.
+
+    Expected result: both packages with the wanted name are found, even though the
+    first one is found before the rest of the workspace is searched
+    """
+    duplicate = workspace / "src" / "subdir" / "ros_package1"
+    duplicate.mkdir()
+    (duplicate / "package.xml").write_text("")
+    packages = PackageIndex().find_packages(
+        str(workspace / "src"), package_names=["ros_package1"]
+    )
+    assert [package.path for package in packages] == [
+        str(workspace / "src" / "ros_package1"),
+        str(duplicate),
+    ]
+
+
+def test_find_packages_symlink(workspace):
+    """Test that symbolic links to directories are not followed.
+
+    Expected result: the linked package is found but nothing below it is searched
+    """
+    os.symlink(workspace / "src" / "subdir", workspace / "src" / "link")
+    names = [
+        package.name for package in PackageIndex().find_packages(str(workspace / "src"))
+    ]
+    assert names.count("ros_package2") == 1
+
+
+def test_cache(workspace):
+    """Test that listings kept on disk are used while directories are unchanged.
+
+    Expected result: no directory is listed again, and a new package is found once its
+    directory changes
+    """
+    cache_file = str(workspace / "cache" / "package_index.json")
+    index = PackageIndex(cache_file)
+    expected = index.find_packages(str(workspace / "src"))
+    index.save()
+
+    index = PackageIndex(cache_file)
+    with mock.patch("os.scandir") as mock_scandir:
+        mock_scandir.side_effect = AssertionError("directory listed again")
+        assert index.find_packages(str(workspace / "src")) == expected
+
+    (workspace / "src" / "not_a_package" / "package.xml").write_text("")
+    index = PackageIndex(cache_file)
+    names = [package.name for package in index.find_packages(str(workspace / "src"))]
+    assert "not_a_package" in names
+
+
+def test_cache_invalid(workspace):
+    """Test reading a cache file that is not valid JSON.
+
+    Expected result: the cache file is ignored
+    """
+    cache_file = workspace / "package_index.json"
+    cache_file.write_text("{not json")
+    index = PackageIndex(str(cache_file))
+    assert not index.listings
+    assert index.find_packages(str(workspace / "src"))
+
+
+def test_save(workspace):
+    """Test that only directories visited in this run are saved.
+
+    Expected result: the cache file holds the listings of the visited directories
+    """
+    cache_file = workspace / "package_index.json"
+    index = PackageIndex(str(cache_file))
+    index.listings = {"/not/a/directory": {"mtime": 0, "markers": [], "dirs": []}}
+    index.find_packages(str(workspace / "src"))
+    index.save()
+    with open(cache_file, encoding="utf8") as fid:
+        listings = json.load(fid)
+    assert str(workspace / "src") in listings
+    assert "/not/a/directory" not in listings
+
+
+@mock.patch("statick_tool.package_index.os.replace")
+def test_save_oserror(mock_replace, workspace):
+    """Test that failing to write the cache file is not fatal.
+
+    Expected result: no exception is raised
+    """
+    mock_replace.side_effect = OSError("error")
+    index = PackageIndex(str(workspace / "package_index.json"))
+    index.find_packages(str(workspace / "src"))
+    index.save()
+
+
+def test_list_dir_missing(tmp_path):
+    """Test listing a directory that does not exist.
+
+    Expected result: the listing is empty
+    """
+    listing = PackageIndex().list_dir(str(tmp_path / "missing"))
+    assert listing["markers"] == []
+    assert listing["dirs"] == []
@@ -0,0 +1,119 @@
+"""Unit tests of plugin_registry.py."""
+
+import argparse
+import subprocess
+import sys
+
+import pytest
+
+from statick_tool.plugin_registry import PluginRegistry
+from statick_tool.plugins.tool.do_nothing import DoNothingToolPlugin
+from statick_tool.tool_plugin import ToolPlugin
+
+# Generous upper bound so the test only fails on large startup regressions.
+COLD_START_BUDGET_SECONDS = 5.0
+
+# Third-party modules that only a few plugins need while they are scanning.
+HEAVY_MODULES = [
+    "lizard",
+    "xmltodict",
+    "restructuredtext_lint",
+    "docutils",
+    "packaging",
+]
+
+COLD_START_SCRIPT = """
+import argparse
+import sys
+import time
+
+start = time.perf_counter()
+from statick_tool.statick_tool import Statick
+
+statick = Statick([])
+statick.gather_args(argparse.ArgumentParser())
+elapsed = time.perf_counter() - start
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(elapsed)
+print(",".join(heavy))
+"""
+
+
+def test_registry_names_without_loading():
+    """Test that plugin names are available without loading any plugins.
+
+    Expected result: names are listed and nothing is loaded
+    """
+    registry = PluginRegistry("statick_tool.plugins.tool")
+    assert "pylint" in registry
+    assert "not_a_plugin" not in registry
+    assert "pylint" in list(registry)
+    assert len(registry) == len(registry.entry_points)
+    assert not registry.plugins
+
+
+def test_registry_loads_on_first_use():
+    """Test that a plugin is instantiated once when first used.
+
+    Expected result: the same plugin instance is returned on every lookup
+    """
+    registry = PluginRegistry("statick_tool.plugins.tool")
+    plugin = registry["do_nothing"]
+    assert isinstance(plugin, DoNothingToolPlugin)
+    assert registry["do_nothing"] is plugin
+    assert list(registry.plugins) == ["do_nothing"]
+
+
+def test_registry_set_and_delete():
+    """Test adding and removing plugins.
+
+    Expected result: added plugins are available and removed plugins are not
+    """
+    registry = PluginRegistry("statick_tool.plugins.tool")
+    plugin = DoNothingToolPlugin()
+    registry["custom"] = plugin
+    assert registry["custom"] is plugin
+    assert "custom" in list(registry)
+
+    del registry["pylint"]
+    assert "pylint" not in registry
+    with pytest.raises(KeyError):
+        del registry["pylint"]
+    with pytest.raises(KeyError):
+        registry["pylint"]  # pylint: disable=pointless-statement
+
+
+def test_registry_gather_args():
+    """Test gathering the arguments of the plugins.
+
+    Expected result: only plugins that add arguments are instantiated, and their
+    arguments are added
+    """
+    registry = PluginRegistry("statick_tool.plugins.tool", ToolPlugin)
+    parser = argparse.ArgumentParser()
+    registry.gather_args(parser)
+    assert "bandit" in registry.plugins
+    assert "do_nothing" not in registry.plugins
+    assert "do_nothing" in registry.plugin_types
+    assert parser.parse_args(["--bandit-bin", "b"]).bandit_bin == "b"
+
+
+def test_cold_start(record_property):
+    """Test that startup stays fast and does not import heavy plugin dependencies.
+
+    The cold-start latency is recorded as a test property so it shows up in the junit
+    report.
+
+    Expected result: no heavy modules are imported and startup is within budget
+    """
+    output = subprocess.check_output(
+        [sys.executable, "-c", COLD_START_SCRIPT.format(heavy=HEAVY_MODULES)],
+        universal_newlines=True,
+    )
+    lines = output.splitlines()
+    elapsed = float(lines[0])
+    heavy = [name for name in lines[1].split(",") if name]
+    record_property("cold_start_seconds", elapsed)
+
+    assert not heavy
+    assert elapsed < COLD_START_BUDGET_SECONDS
@@ -0,0 +1,89 @@
+"""Unit tests of plugin_scheduler.py."""
+
+import threading
+import time
+
+import pytest
+
+from statick_tool.plugin_scheduler import PluginScheduler
+
+
+def test_run_serial_order():
+    """Test that a single worker runs plugins in dependency order.
+
+    Expected result: dependencies run before the plugins that need them
+    """
+    ran = []
+    scheduler = PluginScheduler(1)
+    results = scheduler.run(
+        ["clang-tidy", "make", "pylint"],
+        {"clang-tidy": ["make"]},
+        lambda name: ran.append(name) or name.upper(),
+    )
+    assert ran == ["make", "clang-tidy", "pylint"]
+    assert list(results) == ["clang-tidy", "make", "pylint"]
+    assert results["make"] == "MAKE"
+
+
+def test_run_concurrent():
+    """Test that independent plugins run at the same time.
+
+    Expected result: both plugins are running before either one finishes
+    """
+    barrier = threading.Barrier(2, timeout=5)
+    scheduler = PluginScheduler(2)
+    results = scheduler.run(["mypy", "pylint"], {}, lambda name: barrier.wait())
+    assert set(results) == {"mypy", "pylint"}
+
+
+def test_run_dependency_order_concurrent():
+    """Test that dependencies are honored with multiple workers.
+
+    Expected result: a plugin never starts before its dependency finishes
+    """
+    finished = []
+
+    def task(name):
+        if name == "make":
+            time.sleep(0.1)
+        else:
+            assert "make" in finished
+        finished.append(name)
+        return name
+
+    scheduler = PluginScheduler(4)
+    results = scheduler.run(
+        ["make", "clang-tidy", "cppcheck"],
+        {"clang-tidy": ["make"], "cppcheck": ["make"]},
+        task,
+    )
+    assert list(results) == ["make", "clang-tidy", "cppcheck"]
+
+
+def test_run_missing_dependency_ignored():
+    """Test that dependencies outside of the plugin list are treated as satisfied.
+
+    Expected result: the plugin runs
+    """
+    scheduler = PluginScheduler(2)
+    results = scheduler.run(["clang-tidy"], {"clang-tidy": ["make"]}, lambda name: 1)
+    assert results == {"clang-tidy": 1}
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_run_cycle(max_workers):
+    """Test that circular dependencies are reported.
+
+    Expected result: ValueError is raised
+    """
+    scheduler = PluginScheduler(max_workers)
+    with pytest.raises(ValueError):
+        scheduler.run(["a", "b"], {"a": ["b"], "b": ["a"]}, lambda name: name)
+
+
+def test_max_workers_minimum():
+    """Test that the number of workers is at least one.
+
+    Expected result: max_workers is 1
+    """
+    assert PluginScheduler(0).max_workers == 1
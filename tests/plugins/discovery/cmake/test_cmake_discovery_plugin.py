@@ -20,7 +20,9 @@ else:
     from importlib.metadata import entry_points
 
 
-def setup_cmake_discovery_plugin(add_plugin_context=True, cmake_flags=""):
+def setup_cmake_discovery_plugin(
+    add_plugin_context=True, cmake_flags="", output_dir=None
+):
     """Create an instance of the CMake discovery plugin."""
     arg_parser = argparse.ArgumentParser()
 
@@ -30,7 +32,9 @@ def setup_cmake_discovery_plugin(add_plugin_context=True, cmake_flags=""):
     config = Config(resources.get_file("config.yaml"))
     cmdp = CMakeDiscoveryPlugin()
     if add_plugin_context:
-        plugin_context = PluginContext(arg_parser.parse_args([]), resources, config)
+        plugin_context = PluginContext(
+            arg_parser.parse_args([]), resources, config, output_dir
+        )
         plugin_context.args.output_directory = os.path.dirname(__file__)
         plugin_context.args.cmake_flags = cmake_flags
         cmdp.set_plugin_context(plugin_context)
@@ -243,3 +247,23 @@ def test_cmake_discovery_plugin_scan_oserror(mock_subprocess_check_output):
     cmdp = setup_cmake_discovery_plugin()
     cmdp.scan(package, "level")
     assert not package["make_targets"]
+
+
+@mock.patch("statick_tool.plugins.discovery.cmake.subprocess.check_output")
+def test_cmake_discovery_plugin_scan_output_dir(mock_subprocess_check_output, tmp_path):
+    """Test that the CMake discovery plugin configures in the output directory.
+
+    Expected result: CMakeLists.txt and the log are written to the output directory and
+    CMake runs there, without changing the current working directory
+    """
+    mock_subprocess_check_output.return_value = "-- Configuring done"
+    cmdp = setup_cmake_discovery_plugin(output_dir=str(tmp_path))
+    package = Package(
+        "valid_package", os.path.join(os.path.dirname(__file__), "valid_package")
+    )
+    cwd = os.getcwd()
+    cmdp.scan(package, "level")
+    assert os.getcwd() == cwd
+    assert os.path.isfile(os.path.join(str(tmp_path), "CMakeLists.txt"))
+    assert os.path.isfile(os.path.join(str(tmp_path), "cmake.log"))
+    assert mock_subprocess_check_output.call_args[1]["cwd"] == str(tmp_path)
@@ -74,6 +74,19 @@ def test_python_discovery_plugin_scan_valid():
     assert set(package["python_src"]) == set(expected_fullpath)
 
 
+def test_python_discovery_plugin_scan_shebang_other_extension(tmp_path):
+    """Test that the Python discovery plugin finds scripts with other extensions.
+
+    Expected result: a Python script is found by its shebang whatever its extension
+    """
+    (tmp_path / "deploy.cfg.txt").write_text("#!/usr/bin/env python3\nimport os\n")
+    (tmp_path / "notes.txt").write_text("notes\n")
+    pydp = PythonDiscoveryPlugin()
+    package = Package("package", str(tmp_path))
+    pydp.scan(package, "level")
+    assert package["python_src"] == [str(tmp_path / "deploy.cfg.txt")]
+
+
 def test_python_discovery_plugin_scan_invalid():
     """Test that the discovery plugin doesn't find non-python files."""
     pydp = PythonDiscoveryPlugin()
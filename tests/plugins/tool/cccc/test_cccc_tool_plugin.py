@@ -281,7 +281,7 @@ def test_cccc_tool_plugin_scan_empty_calledprocesserror(mock_subprocess_check_ou
     assert not issues
 
 
-@mock.patch("statick_tool.plugins.tool.cccc.xmltodict.parse")
+@mock.patch("xmltodict.parse")
 def test_cccc_tool_plugin_scan_filenotfound(mock_xmltodict_parse):
     """Test what happens when a FileNotFoundError is hit (such as if cccc has no output
     for a file).
@@ -57,6 +57,25 @@ def test_eslint_tool_plugin_found():
     )
 
 
+def test_eslint_tool_plugin_get_config_files(tmp_path):
+    """Test that the configuration files of eslint are found.
+
+    Expected result: the configuration file in the resources, and the copy in the
+    install directory once it exists
+    """
+    plugin = setup_eslint_tool_plugin()
+    resource_config = os.path.join(
+        os.path.dirname(__file__), "valid_package", "rsc", "eslint.config.mjs"
+    )
+    with mock.patch.object(plugin, "get_install_dir", return_value=str(tmp_path)):
+        assert plugin.get_config_files("level") == [resource_config]
+        (tmp_path / "eslint.config.mjs").write_text("export default [];\n")
+        assert plugin.get_config_files("level") == [
+            resource_config,
+            str(tmp_path / "eslint.config.mjs"),
+        ]
+
+
 def test_eslint_tool_plugin_scan_valid():
     """Integration test: Make sure the eslint output hasn't changed."""
     plugin = setup_eslint_tool_plugin(test_package="no_plugins")
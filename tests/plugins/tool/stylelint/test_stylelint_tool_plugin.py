@@ -57,6 +57,18 @@ def test_stylelint_tool_plugin_found():
     )
 
 
+def test_stylelint_tool_plugin_get_config_files():
+    """Test that the configuration file of stylelint in the resources is found.
+
+    Expected result: the .stylelintrc of the test resources, whose contents are part of
+    the key of cached results
+    """
+    plugin = setup_stylelint_tool_plugin()
+    assert plugin.get_config_files("level") == [
+        os.path.join(os.path.dirname(__file__), "valid_package", "rsc", ".stylelintrc")
+    ]
+
+
 def test_stylelint_tool_plugin_scan_valid():
     """Integration test: Make sure the stylelint output hasn't changed."""
     plugin = setup_stylelint_tool_plugin()
@@ -0,0 +1,194 @@
+"""Unit tests of prune_rules.py."""
+
+import os
+
+import pytest
+
+from statick_tool.directory_walker import walk_files
+from statick_tool.prune_rules import PruneRules, parse_gitignore
+
+
+@pytest.fixture
+def package(tmp_path):
+    """Fixture to get a package with directories that are not part of its sources."""
+    names = [
+        "setup.py",
+        "src/module.py",
+        "src/build/helper.py",
+        "build/generated.py",
+        "install/lib/module.py",
+        ".git/config",
+        "web/node_modules/left-pad/index.js",
+        "web/app.js",
+        "venv/pyvenv.cfg",
+        "venv/lib/site.py",
+        "vendored/COLCON_IGNORE",
+        "vendored/module.py",
+        "output/report.json",
+        "third_party/lib/lib.c",
+        "docs/_build/index.html",
+        "docs/index.rst",
+    ]
+    for name in names:
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text("a = 1\n")
+    return tmp_path
+
+
+def relative(paths, root):
+    """Get paths relative to a directory, with forward slashes."""
+    return sorted(os.path.relpath(path, root).replace(os.sep, "/") for path in paths)
+
+
+@pytest.mark.parametrize("threads", [1, 3])
+def test_prune(package, threads):
+    """Test walking a package with the default rules.
+
+    Expected result: build, install, version control, npm, virtualenv, marked and
+    output directories are left out
+    """
+    rules = PruneRules(str(package), skip_dirs=[str(package / "output")])
+    paths = walk_files(str(package), threads, rules.prune)
+    assert relative(paths, package) == [
+        "docs/_build/index.html",
+        "docs/index.rst",
+        "setup.py",
+        "src/build/helper.py",
+        "src/module.py",
+        "third_party/lib/lib.c",
+        "web/app.js",
+    ]
+
+
+def test_prune_ignore_dirs(package):
+    """Test leaving out directories matching patterns.
+
+    Expected result: patterns without a slash match names anywhere, patterns with a
+    slash match the path relative to the package
+    """
+    rules = PruneRules(str(package), ["_build", "third_party/*"])
+    paths = relative(walk_files(str(package), 1, rules.prune), package)
+    assert "docs/_build/index.html" not in paths
+    assert "third_party/lib/lib.c" not in paths
+    assert "docs/index.rst" in paths
+
+
+def test_prune_gitignore(package):
+    """Test honoring .gitignore files.
+
+    Expected result: ignored files and directories are left out, negated patterns
+    include files again and nested .gitignore files apply below their directory
+    """
+    (package / ".gitignore").write_text(
+        "# Generated documentation\n/docs/_build/\n*.c\n!lib.c\nweb/*.js\n"
+    )
+    (package / "src" / ".gitignore").write_text("module.py\n")
+    rules = PruneRules(str(package))
+    paths = relative(walk_files(str(package), 2, rules.prune), package)
+    assert paths == [
+        ".gitignore",
+        "docs/index.rst",
+        "output/report.json",
+        "setup.py",
+        "src/.gitignore",
+        "src/build/helper.py",
+        "third_party/lib/lib.c",
+    ]
+
+
+def test_prune_defaults_off(package):
+    """Test turning off the default directories and .gitignore files.
+
+    Expected result: build, install, version control and npm directories and ignored
+    files are walked, markers and virtualenvs are still left out
+    """
+    (package / ".gitignore").write_text("*.js\n")
+    rules = PruneRules(str(package), gitignore=False, default_dirs=False)
+    paths = relative(walk_files(str(package), 1, rules.prune), package)
+    assert "build/generated.py" in paths
+    assert "install/lib/module.py" in paths
+    assert ".git/config" in paths
+    assert "web/node_modules/left-pad/index.js" in paths
+    assert "web/app.js" in paths
+    assert "vendored/module.py" not in paths
+    assert "venv/lib/site.py" not in paths
+
+
+def test_is_pruned(package):
+    """Test checking single paths below a package.
+
+    Expected result: paths below pruned directories are pruned, others are not
+    """
+    (package / ".gitignore").write_text("*.log\n")
+    rules = PruneRules(str(package), ["third_party"])
+    assert rules.is_pruned(str(package / "build" / "generated.py"))
+    assert rules.is_pruned(str(package / "vendored" / "module.py"))
+    assert rules.is_pruned(str(package / "venv" / "lib" / "site.py"))
+    assert rules.is_pruned(str(package / "third_party" / "lib" / "lib.c"))
+    assert rules.is_pruned(str(package / "src" / "debug.log"))
+    assert not rules.is_pruned(str(package / "src" / "module.py"))
+    assert not rules.is_pruned(str(package / "src" / "build" / "helper.py"))
+    assert not rules.is_pruned(str(package))
+
+
+@pytest.mark.parametrize(
+    "line,matches,misses",
+    [
+        ("*.py", ["a.py", "src/a.py"], ["a.pyc"]),
+        ("/a.py", ["a.py"], ["src/a.py"]),
+        ("src/*.py", ["src/a.py"], ["src/sub/a.py", "lib/src/a.py"]),
+        ("**/gen", ["gen", "src/gen"], ["generated"]),
+        ("src/**", ["src/a.py", "src/sub/a.py"], ["src"]),
+        ("a/**/b", ["a/b", "a/x/y/b"], ["a/xb"]),
+        ("file[0-9].txt", ["file1.txt"], ["filea.txt"]),
+        ("\\#notes", ["#notes"], ["notes"]),
+    ],
+)
+def test_parse_gitignore(line, matches, misses):
+    """Test translating .gitignore patterns.
+
+    Expected result: the patterns match what git matches
+    """
+    pattern = parse_gitignore(line, "/base")
+    assert pattern is not None
+    for path in matches:
+        subject = path if pattern.anchored else path.rsplit("/", 1)[-1]
+        assert pattern.regex.match(subject), path
+    for path in misses:
+        subject = path if pattern.anchored else path.rsplit("/", 1)[-1]
+        assert not pattern.regex.match(subject), path
+
+
+def test_parse_gitignore_flags():
+    """Test the flags of .gitignore patterns.
+
+    Expected result: comments and blank lines are skipped, negation and directory only
+    patterns are found
+    """
+    assert parse_gitignore("# comment\n", "/base") is None
+    assert parse_gitignore("   \n", "/base") is None
+    pattern = parse_gitignore("!keep/\n", "/base")
+    assert pattern is not None
+    assert pattern.negate
+    assert pattern.dir_only
+    assert not pattern.anchored
+    assert pattern.base == "/base"
+
+
+def test_prune_excepted(package):
+    """Test leaving out directories whose files are all excepted.
+
+    Expected result: directories the function says are excepted are not walked
+    """
+    checked = []
+
+    def is_excepted(path):
+        checked.append(path)
+        return os.path.basename(path) == "third_party"
+
+    rules = PruneRules(str(package), is_excepted=is_excepted)
+    paths = relative(walk_files(str(package), 1, rules.prune), package)
+    assert "third_party/lib/lib.c" not in paths
+    assert "docs/index.rst" in paths
+    assert str(package / "third_party" / "lib") not in checked
+    assert rules.is_pruned(str(package / "third_party" / "lib" / "lib.c"))
@@ -0,0 +1,292 @@
+"""Unit tests of result_cache.py."""
+
+import argparse
+import os
+import time
+
+import pytest
+
+from statick_tool.config import Config
+from statick_tool.issue import Issue
+from statick_tool.package import Package
+from statick_tool.plugin_context import PluginContext
+from statick_tool.resources import Resources
+from statick_tool.result_cache import ResultCache
+from statick_tool.tool_plugin import ToolPlugin
+from statick_tool.tool_version_cache import ToolVersionCache
+
+
+class CountingToolPlugin(ToolPlugin):
+    """Tool plugin that reports one issue per file and counts the files it scans."""
+
+    def __init__(self, granularity="file"):
+        """Initialize the plugin.
+
+        Args:
+            granularity: How the results of the tool are cached.
+        """
+        self.granularity = granularity
+        self.scanned = []
+
+    def get_name(self):
+        """Get name of tool."""
+        return "counting"
+
+    def get_version(self):
+        """Get version of tool."""
+        return "1.2.3"
+
+    def get_cache_granularity(self):
+        """Get how the results of this tool are cached."""
+        return self.granularity
+
+    def get_file_types(self):
+        """Get the file types the tool scans."""
+        return ["python_src"]
+
+    @classmethod
+    def get_default_config_file(cls):
+        """Get the name of the configuration file of the tool in the resources."""
+        return "counting.cfg"
+
+    def process_files(self, package, level, files, user_flags):
+        """Remember the files scanned."""
+        self.scanned += files
+        return files
+
+    def parse_output(self, total_output, package=None):
+        """Report one issue per file."""
+        return [
+            Issue(path, 1, "counting", "test", 1, "found", None)
+            for path in total_output
+        ]
+
+
+@pytest.fixture
+def package(tmp_path):
+    """Fixture to get a package with two python files."""
+    package_dir = tmp_path / "package"
+    package_dir.mkdir()
+    (package_dir / "setup.py").write_text("setup()\n")
+    (package_dir / "a.py").write_text("a = 1\n")
+    (package_dir / "b.py").write_text("b = 1\n")
+    package = Package("package", str(package_dir))
+    package["python_src"] = [str(package_dir / "a.py"), str(package_dir / "b.py")]
+    for path in package["python_src"] + [str(package_dir / "setup.py")]:
+        package.files[path] = {"name": os.path.basename(path), "path": path}
+    return package
+
+
+def make_plugin(
+    tmp_path, granularity="file", max_size=1 << 20, flags="-x", resources=None
+):
+    """Create a tool plugin with a result cache in its context."""
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text(
+        f"levels:\n  custom:\n    tool:\n      counting:\n        flags: '{flags}'\n"
+    )
+    result_cache = ResultCache(str(tmp_path / "cache"), max_size, ToolVersionCache())
+    plugin = CountingToolPlugin(granularity)
+    plugin.set_plugin_context(
+        PluginContext(
+            argparse.Namespace(output_directory=None),
+            Resources(resources or []),
+            Config(str(config_file)),
+            None,
+            result_cache,
+        )
+    )
+    return plugin, result_cache
+
+
+def test_scan_reuses_unchanged_files(tmp_path, package):
+    """Test that a second scan only passes changed files to the tool.
+
+    Expected result: the unchanged file is not scanned again and its issue is reused
+    """
+    plugin, _ = make_plugin(tmp_path)
+    first = plugin.scan(package, "custom")
+    assert plugin.scanned == package["python_src"]
+
+    plugin.scanned = []
+    with open(package["python_src"][1], "a", encoding="utf8") as fid:
+        fid.write("c = 2\n")
+    second = plugin.scan(package, "custom")
+    assert plugin.scanned == [package["python_src"][1]]
+    assert sorted(second) == sorted(first)
+
+    plugin.scanned = []
+    assert sorted(plugin.scan(package, "custom")) == sorted(first)
+    assert not plugin.scanned
+
+
+def test_scan_config_change(tmp_path, package):
+    """Test that changing a file at the top of the package invalidates the cache.
+
+    Expected result: all files are scanned again
+    """
+    plugin, _ = make_plugin(tmp_path)
+    plugin.scan(package, "custom")
+    plugin.scanned = []
+    (tmp_path / "package" / "setup.cfg").write_text("[flake8]\n")
+    plugin.plugin_context.result_cache.config_hashes = {}
+    plugin.scan(package, "custom")
+    assert plugin.scanned == package["python_src"]
+
+
+def test_scan_nested_config_change(tmp_path, package):
+    """Test that changing a configuration file in a subdirectory invalidates the cache.
+
+    Expected result: all files are scanned again after the nested setup.cfg changes,
+    but not after another nested file changes
+    """
+    nested = tmp_path / "package" / "sub"
+    nested.mkdir()
+    for name in ["setup.cfg", "notes.txt"]:
+        (nested / name).write_text("[flake8]\n")
+        package.files[str(nested / name)] = {"name": name, "path": str(nested / name)}
+    plugin, result_cache = make_plugin(tmp_path)
+    plugin.scan(package, "custom")
+
+    plugin.scanned = []
+    (nested / "notes.txt").write_text("notes\n")
+    result_cache.config_hashes = {}
+    plugin.scan(package, "custom")
+    assert not plugin.scanned
+
+    (nested / "setup.cfg").write_text("[flake8]\nmax-line-length = 100\n")
+    result_cache.config_hashes = {}
+    plugin.scan(package, "custom")
+    assert plugin.scanned == package["python_src"]
+
+
+def test_scan_resource_config_change(tmp_path, package):
+    """Test that editing the resource configuration of a tool invalidates the cache.
+
+    Expected result: all files are scanned again
+    """
+    rsc_dir = tmp_path / "resources" / "rsc"
+    rsc_dir.mkdir(parents=True)
+    (rsc_dir / "counting.cfg").write_text("strict = false\n")
+    plugin, _ = make_plugin(tmp_path, resources=[str(tmp_path / "resources")])
+    assert plugin.get_config_files("custom") == [str(rsc_dir / "counting.cfg")]
+    plugin.scan(package, "custom")
+
+    plugin.scanned = []
+    plugin.scan(package, "custom")
+    assert not plugin.scanned
+
+    (rsc_dir / "counting.cfg").write_text("strict = true\n")
+    plugin.scan(package, "custom")
+    assert plugin.scanned == package["python_src"]
+
+
+def test_scan_level_change(tmp_path, package):
+    """Test that results are kept per level configuration.
+
+    Expected result: other flags scan all files again
+    """
+    plugin, _ = make_plugin(tmp_path)
+    plugin.scan(package, "custom")
+    plugin, _ = make_plugin(tmp_path, flags="-y")
+    plugin.scan(package, "custom")
+    assert plugin.scanned == package["python_src"]
+
+
+def test_scan_granularity_package(tmp_path, package):
+    """Test that tools cached per package are not cached per file.
+
+    Expected result: both scans run the tool on all files
+    """
+    plugin, _ = make_plugin(tmp_path, "package")
+    plugin.scan(package, "custom")
+    plugin.scan(package, "custom")
+    assert plugin.scanned == package["python_src"] * 2
+
+
+def test_set_files_unknown_file(tmp_path, package):
+    """Test that issues in files that were not scanned prevent caching.
+
+    Expected result: nothing is cached
+    """
+    plugin, result_cache = make_plugin(tmp_path)
+    issue = Issue("/elsewhere.h", 1, "counting", "test", 1, "found", None)
+    result_cache.set_files(plugin, package, "custom", package["python_src"], [issue])
+    assert not result_cache.get_files(plugin, package, "custom", package["python_src"])
+
+
+def test_package(tmp_path, package):
+    """Test caching the issues of a whole package.
+
+    Expected result: issues are returned until any file of the package changes
+    """
+    plugin, result_cache = make_plugin(tmp_path, "package")
+    assert result_cache.get_package(plugin, package, "custom") is None
+    issues = [Issue(package["python_src"][0], 1, "counting", "test", 1, "found", None)]
+    result_cache.set_package(plugin, package, "custom", issues)
+    assert result_cache.get_package(plugin, package, "custom") == issues
+
+    with open(package["python_src"][0], "a", encoding="utf8") as fid:
+        fid.write("c = 2\n")
+    assert result_cache.get_package(plugin, package, "custom") is None
+
+
+def test_package_no_files(tmp_path):
+    """Test caching the issues of a package whose files are not known.
+
+    Expected result: nothing is cached
+    """
+    plugin, result_cache = make_plugin(tmp_path, "package")
+    package = Package("package", str(tmp_path))
+    result_cache.set_package(plugin, package, "custom", [])
+    assert result_cache.get_package(plugin, package, "custom") is None
+
+
+def test_load_entry_invalid(tmp_path):
+    """Test loading an entry that is not valid.
+
+    Expected result: the entry is treated as missing
+    """
+    result_cache = ResultCache(str(tmp_path), 1 << 20, ToolVersionCache())
+    entry_file = result_cache.get_entry_file("abcd")
+    os.makedirs(os.path.dirname(entry_file))
+    with open(entry_file, "w", encoding="utf8") as fid:
+        fid.write("not json")
+    assert result_cache.load_entry("abcd") is None
+    with open(entry_file, "w", encoding="utf8") as fid:
+        fid.write("[[1, 2]]")
+    assert result_cache.load_entry("abcd") is None
+
+
+def test_prune(tmp_path):
+    """Test that the least recently used entries are removed first.
+
+    Expected result: the entry used most recently is kept
+    """
+    result_cache = ResultCache(str(tmp_path), 1 << 20, ToolVersionCache())
+    issue = Issue("a.py", 1, "counting", "test", 1, "x" * 100, None)
+    for key in ["aa01", "bb02", "cc03"]:
+        result_cache.store_entry(key, [issue])
+    size = os.path.getsize(result_cache.get_entry_file("aa01"))
+    now = time.time()
+    for offset, key in enumerate(["aa01", "bb02", "cc03"]):
+        os.utime(
+            result_cache.get_entry_file(key), (now - 100 + offset, now - 100 + offset)
+        )
+    assert result_cache.load_entry("aa01") is not None
+
+    result_cache.max_size = size * 2
+    result_cache.prune()
+    assert os.path.isfile(result_cache.get_entry_file("aa01"))
+    assert not os.path.isfile(result_cache.get_entry_file("bb02"))
+    assert os.path.isfile(result_cache.get_entry_file("cc03"))
+
+
+def test_prune_missing_dir(tmp_path):
+    """Test pruning a cache that has no entries yet.
+
+    Expected result: nothing happens
+    """
+    result_cache = ResultCache(str(tmp_path / "missing"), 0, ToolVersionCache())
+    result_cache.prune()
+    assert not os.path.exists(str(tmp_path / "missing"))
@@ -0,0 +1,276 @@
+"""Unit tests of server.py."""
+
+import json
+import os
+import socket
+import threading
+import time
+
+import mock
+import pytest
+
+from statick_tool.args import Args
+from statick_tool.discovery_plugin import DiscoveryPlugin
+from statick_tool.server import (
+    StatickServer,
+    check_socket_dir,
+    get_default_socket,
+    get_peer_uid,
+    get_socket_dir,
+    send_request,
+)
+from statick_tool.statick_tool import Statick
+
+RSC = os.path.join(os.path.dirname(os.path.dirname(__file__)), "statick_tool", "rsc")
+
+
+@pytest.fixture
+def package_dir(tmp_path):
+    """Fixture to get a python package with two files."""
+    package_dir = tmp_path / "test_package"
+    package_dir.mkdir()
+    (package_dir / "package.xml").write_text("<package></package>\n")
+    (package_dir / "a.py").write_text("import os\n")
+    (package_dir / "b.py").write_text("import sys\n")
+    return package_dir
+
+
+@pytest.fixture
+def server(tmp_path):
+    """Fixture to get a server for the test configuration."""
+    config_file = tmp_path / "config.yaml"
+    with open(os.path.join(RSC, "config.yaml"), encoding="utf8") as fid:
+        config_file.write_text(fid.read())
+    args = Args("Statick server")
+    statick = Statick(args.get_user_paths())
+    statick.gather_args(args.parser)
+    parsed_args = args.get_args(
+        [
+            "--config",
+            str(config_file),
+            "--exceptions",
+            os.path.join(RSC, "exceptions.yaml"),
+            "--level",
+            "custom",
+        ]
+    )
+    return StatickServer(statick, parsed_args)
+
+
+def test_scan(server, package_dir):
+    """Test scanning a package.
+
+    Expected result: issues of all files are returned with the console report
+    """
+    response = server.scan({"path": str(package_dir)})
+    filenames = {issue[0] for issue in response["issues"]["pylint"]}
+    assert filenames == {str(package_dir / "a.py"), str(package_dir / "b.py")}
+    assert not response["success"]
+    assert "total unique issues" in response["output"]
+
+
+def test_scan_files(server, package_dir):
+    """Test scanning some of the files of a package.
+
+    Expected result: only the listed file is scanned and only its issues are returned
+    """
+    plugin = server.statick.tool_plugins["pylint"]
+    with mock.patch.object(
+        plugin, "process_files", wraps=plugin.process_files
+    ) as mocked_process_files:
+        response = server.scan(
+            {"path": str(package_dir), "files": [str(package_dir / "a.py")]}
+        )
+    assert mocked_process_files.call_args[0][2] == [str(package_dir / "a.py")]
+    filenames = {issue[0] for issue in response["issues"]["pylint"]}
+    assert filenames == {str(package_dir / "a.py")}
+    assert server.args.level == "custom"
+    assert not hasattr(server.args, "files")
+
+
+def test_scan_missing_level(server, package_dir):
+    """Test scanning at a level that is not in the configuration.
+
+    Expected result: no issues are returned and the scan fails
+    """
+    response = server.scan({"path": str(package_dir), "level": "missing"})
+    assert response["issues"] is None
+    assert not response["success"]
+
+
+def test_walk_package_reuses_unchanged_files(server, package_dir):
+    """Test that the types of files found before are only found again once changed.
+
+    Expected result: only the changed and the new file are passed again
+    """
+    path = str(package_dir)
+    with mock.patch.object(
+        DiscoveryPlugin,
+        "get_file_types",
+        side_effect=lambda paths: ["text"] * len(paths),
+    ) as mocked:
+        package = server.walk_package(path)
+        assert not mocked.called
+        assert all(file_dict["file_cmd_out"] for file_dict in package.files.values())
+        assert mocked.call_count == 1
+        assert sorted(package.files) == sorted(
+            str(package_dir / name) for name in ["a.py", "b.py", "package.xml"]
+        )
+
+        mocked.reset_mock()
+        (package_dir / "b.py").write_text("import sys\nimport os\n")
+        (package_dir / "c.py").write_text("import os\n")
+        package = server.walk_package(path)
+        assert all(file_dict["file_cmd_out"] for file_dict in package.files.values())
+        assert sorted(mocked.call_args[0][0]) == [
+            str(package_dir / "b.py"),
+            str(package_dir / "c.py"),
+        ]
+        assert len(package.files) == 4
+
+
+def test_refresh(server):
+    """Test that the configuration is read again once its file changes.
+
+    Expected result: the configuration is only read again after the change
+    """
+    server.refresh()
+    config = server.statick.config
+    server.refresh()
+    assert server.statick.config is config
+
+    later = time.time() + 10
+    os.utime(server.args.config, (later, later))
+    server.refresh()
+    assert server.statick.config is not config
+
+
+def test_handle_invalid(server):
+    """Test handling requests that are not valid.
+
+    Expected result: an error is returned
+    """
+    assert "error" in server.handle(b"not json")
+    assert "error" in server.handle(b'{"level": "custom"}')
+
+
+def test_handle_scan_error(server, package_dir):
+    """Test handling a request whose scan raises an exception.
+
+    Expected result: an error is returned and the server keeps running
+    """
+    with mock.patch.object(server, "scan", side_effect=RuntimeError("broken")):
+        response = server.handle(json.dumps({"path": str(package_dir)}).encode())
+    assert response == {"error": "Scan failed: broken"}
+
+
+def test_serve(server, package_dir, tmp_path):
+    """Test scanning a package through the socket.
+
+    Expected result: the response is received, a stale socket file is replaced and
+    the socket is removed once the server stops
+    """
+    socket_path = str(tmp_path / "statick.sock")
+    with open(socket_path, "w", encoding="utf8") as fid:
+        fid.write("stale")
+    thread = threading.Thread(target=server.serve, args=(socket_path,))
+    thread.start()
+    try:
+        for _ in range(100):
+            if server.unix_server is not None:
+                break
+            time.sleep(0.05)
+        response = send_request(
+            socket_path, {"path": str(package_dir), "files": ["a.py"]}
+        )
+        with pytest.raises(OSError):
+            StatickServer(server.statick, server.args).serve(socket_path)
+    finally:
+        server.shutdown()
+        thread.join()
+    assert response["issues"]["pylint"]
+    assert not os.path.exists(socket_path)
+
+
+def test_get_default_socket(tmp_path):
+    """Test finding the default socket.
+
+    Expected result: the runtime directory is used if it exists
+    """
+    with mock.patch.dict(os.environ, {"XDG_RUNTIME_DIR": str(tmp_path)}):
+        assert get_default_socket() == str(tmp_path / "statick.sock")
+    with mock.patch.dict(os.environ, {"XDG_RUNTIME_DIR": str(tmp_path / "missing")}):
+        assert get_default_socket() == os.path.join(get_socket_dir(), "statick.sock")
+    assert get_socket_dir().endswith(f"statick-{os.getuid()}")
+
+
+def test_serve_socket_dir(server, package_dir, tmp_path):
+    """Test serving on the default socket in the temporary directory.
+
+    Expected result: a directory only the user can use is created for the socket
+    """
+    with mock.patch("tempfile.gettempdir", return_value=str(tmp_path)):
+        socket_path = os.path.join(get_socket_dir(), "statick.sock")
+        thread = threading.Thread(target=server.serve, args=(socket_path,))
+        thread.start()
+        try:
+            for _ in range(100):
+                if server.unix_server is not None:
+                    break
+                time.sleep(0.05)
+            response = send_request(socket_path, {"path": str(package_dir)})
+        finally:
+            server.shutdown()
+            thread.join()
+        assert os.stat(get_socket_dir()).st_mode & 0o777 == 0o700
+    assert "issues" in response
+
+
+def test_check_socket_dir(tmp_path):
+    """Test checking the socket directory in the temporary directory.
+
+    Expected result: directories other users can use, links and directories of other
+    users are rejected, and sockets elsewhere are not checked
+    """
+    with mock.patch("tempfile.gettempdir", return_value=str(tmp_path)):
+        socket_path = os.path.join(get_socket_dir(), "statick.sock")
+        with pytest.raises(FileNotFoundError):
+            check_socket_dir(socket_path)
+        check_socket_dir(socket_path, create=True)
+        check_socket_dir(socket_path)
+
+        os.chmod(get_socket_dir(), 0o755)
+        with pytest.raises(OSError):
+            check_socket_dir(socket_path, create=True)
+
+        os.rmdir(get_socket_dir())
+        (tmp_path / "elsewhere").mkdir(mode=0o700)
+        os.symlink(tmp_path / "elsewhere", get_socket_dir())
+        with pytest.raises(OSError):
+            check_socket_dir(socket_path)
+
+        with mock.patch("os.getuid", return_value=os.getuid() + 1):
+            with pytest.raises(OSError):
+                check_socket_dir(
+                    os.path.join(get_socket_dir(), "statick.sock"), create=True
+                )
+    check_socket_dir(str(tmp_path / "statick.sock"))
+
+
+def test_send_request_other_user(tmp_path):
+    """Test connecting to a server that runs as another user.
+
+    Expected result: OSError is raised before the request is sent
+    """
+    socket_path = str(tmp_path / "statick.sock")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+        listener.bind(socket_path)
+        listener.listen(1)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(socket_path)
+            assert get_peer_uid(sock, socket_path) == os.getuid()
+        with mock.patch(
+            "statick_tool.server.get_peer_uid", return_value=os.getuid() + 1
+        ):
+            with pytest.raises(OSError):
+                send_request(socket_path, {"path": str(tmp_path)})
@@ -6,6 +6,7 @@ import os
 import shutil
 import subprocess
 import sys
+import threading
 import time
 
 import mock
@@ -188,6 +189,22 @@ def test_get_level_valueerror(mocked_profile_constructor, init_statick):
     assert level is None
 
 
+def test_get_profile_cached(init_statick, tmp_path):
+    """Test that a profile is only read again once its file changes.
+
+    Expected result: the same profile is returned until the file is modified
+    """
+    profile_file = tmp_path / "profile.yaml"
+    profile_file.write_text("default: sei_cert\n")
+    profile = init_statick.get_profile(str(profile_file))
+    assert init_statick.get_profile(str(profile_file)) is profile
+
+    profile_file.write_text("default: custom\n")
+    later = time.time() + 10
+    os.utime(profile_file, (later, later))
+    assert init_statick.get_profile(str(profile_file)).profile["default"] == "custom"
+
+
 def test_custom_exceptions_file(init_statick):
     """Test finding ignored packages specified in custom file.
 
@@ -300,6 +317,125 @@ def test_run():
         print(f"Error: {ex}")
 
 
+@mock.patch("os.chdir")
+def test_run_output_directory_without_chdir(mocked_chdir, tmp_path):
+    """Test that running Statick writes tool logs without changing directory.
+
+    Expected result: the log of each tool is in the output directory of the package and
+    the current working directory is never changed
+    """
+    args = Args("Statick tool")
+    args.parser.add_argument("--path", help="Path of package to scan")
+
+    statick = Statick(args.get_user_paths())
+    statick.gather_args(args.parser)
+    parsed_args = args.get_args(
+        [
+            "--output-directory",
+            str(tmp_path),
+            "--config",
+            os.path.join(os.path.dirname(__file__), "rsc", "config.yaml"),
+            "--exceptions",
+            os.path.join(os.path.dirname(__file__), "rsc", "exceptions.yaml"),
+            "--level",
+            "custom",
+        ]
+    )
+    path = os.path.join(os.path.dirname(__file__), "test_workspace", "test_package")
+    statick.get_config(parsed_args)
+    statick.get_exceptions(parsed_args)
+    issues, success = statick.run(path, parsed_args)
+    assert issues is not None
+    assert os.path.isfile(
+        os.path.join(str(tmp_path), "test_package-custom", "pylint.log")
+    )
+    mocked_chdir.assert_not_called()
+
+
+def test_run_result_cache(tmp_path):
+    """Test running Statick twice with a result cache.
+
+    Expected result: the second run reuses the issues and file types of the first run
+    instead of running the tool and finding the file types again
+    """
+    args = Args("Statick tool")
+    args.parser.add_argument("--path", help="Path of package to scan")
+
+    statick = Statick(args.get_user_paths())
+    statick.gather_args(args.parser)
+    parsed_args = args.get_args(
+        [
+            "--config",
+            os.path.join(os.path.dirname(__file__), "rsc", "config.yaml"),
+            "--exceptions",
+            os.path.join(os.path.dirname(__file__), "rsc", "exceptions.yaml"),
+            "--level",
+            "custom",
+            "--cache-dir",
+            str(tmp_path),
+        ]
+    )
+    path = os.path.join(os.path.dirname(__file__), "test_workspace", "test_package")
+    statick.get_config(parsed_args)
+    statick.get_exceptions(parsed_args)
+    issues, _ = statick.run(path, parsed_args)
+    assert os.path.isdir(os.path.join(str(tmp_path), "results"))
+    assert os.listdir(os.path.join(str(tmp_path), "discovery"))
+
+    with mock.patch.object(
+        statick.tool_plugins["pylint"], "scan", side_effect=AssertionError
+    ), mock.patch.object(DiscoveryPlugin, "get_file_types", side_effect=AssertionError):
+        cached_issues, _ = statick.run(path, parsed_args)
+    assert cached_issues == issues
+
+
+def test_run_changed_since(tmp_path):
+    """Test running Statick on the files changed since a git reference.
+
+    Expected result: only the changed file is scanned and only its issues are reported
+    """
+    package_dir = tmp_path / "test_package"
+    package_dir.mkdir()
+    (package_dir / "package.xml").write_text("<package></package>\n")
+    (package_dir / "same.py").write_text("import os\n")
+    (package_dir / "changed.py").write_text("import os\n")
+    git_args = ["git", "-C", str(package_dir), "-c", "user.name=test"]
+    git_args += ["-c", "user.email=test@example.com"]
+    subprocess.check_output(git_args + ["init", "-q"])
+    subprocess.check_output(git_args + ["add", "."])
+    subprocess.check_output(git_args + ["commit", "-q", "-m", "initial"])
+    (package_dir / "changed.py").write_text("import sys\n")
+
+    args = Args("Statick tool")
+    args.parser.add_argument("--path", help="Path of package to scan")
+    statick = Statick(args.get_user_paths())
+    statick.gather_args(args.parser)
+    parsed_args = args.get_args(
+        [
+            "--config",
+            os.path.join(os.path.dirname(__file__), "rsc", "config.yaml"),
+            "--exceptions",
+            os.path.join(os.path.dirname(__file__), "rsc", "exceptions.yaml"),
+            "--level",
+            "custom",
+            "--changed-since",
+            "HEAD",
+        ]
+    )
+    statick.get_config(parsed_args)
+    statick.get_exceptions(parsed_args)
+    plugin = statick.tool_plugins["pylint"]
+    with mock.patch.object(
+        plugin, "process_files", wraps=plugin.process_files
+    ) as mocked_process_files:
+        issues, _ = statick.run(str(package_dir), parsed_args)
+    assert mocked_process_files.call_args[0][2] == [str(package_dir / "changed.py")]
+    assert issues["pylint"]
+    assert all(
+        issue.filename == str(package_dir / "changed.py") for issue in issues["pylint"]
+    )
+
+
 def test_run_missing_path(init_statick):
     """Test running Statick against a package that does not exist."""
     args = Args("Statick tool")
@@ -601,6 +737,27 @@ def test_run_discovery_dependency(init_statick):
         print(f"Error: {ex}")
 
 
+def test_run_discovery_plugin(init_statick):
+    """Test that a discovery plugin merges its results into the shared package.
+
+    Expected results: keys set by the plugin are visible in the package
+    """
+    package = Package(
+        "test_package", os.path.join(os.path.dirname(__file__), "test_package")
+    )
+    package["existing_key"] = ["value"]
+    DiscoveryPlugin().find_files(package)
+
+    timing = init_statick.run_discovery_plugin(
+        "python", package, "default", threading.Lock()
+    )
+
+    assert timing[:3] == ("test_package", "python", "Discovery")
+    assert float(timing.duration) >= 0
+    assert package["existing_key"] == ["value"]
+    assert len(package["python_src"]) == 1
+
+
 def test_run_no_reporting_plugins(init_statick):
     """Test that no reporting plugins returns successful.
 
@@ -837,6 +994,70 @@ def test_run_called_process_error(mock_subprocess_check_output):
         print(f"Error: {ex}")
 
 
+def test_run_tool_timeout(tmp_path):
+    """Test running Statick when a tool does not finish in time.
+
+    Expected result: the tool is recorded as timed out, its issues are missing and the
+    scan is not successful
+    """
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text(
+        "levels:\n"
+        "  slow:\n"
+        "    discovery:\n"
+        "      - python\n"
+        "    reporting:\n"
+        "      - print_to_console\n"
+        "    tool:\n"
+        "      pylint:\n"
+        "        flags: ''\n"
+        "        timeout: 0.000001\n"
+    )
+    package_dir = tmp_path / "package"
+    package_dir.mkdir()
+    (package_dir / "a.py").write_text("import os\n")
+    args = Args("Statick tool")
+    statick = Statick(args.get_user_paths())
+    statick.gather_args(args.parser)
+    parsed_args = args.get_args(
+        [
+            "--config",
+            str(config_file),
+            "--level",
+            "slow",
+            "--output-directory",
+            str(tmp_path),
+        ]
+    )
+    statick.get_config(parsed_args)
+    statick.get_exceptions(parsed_args)
+
+    issues, success = statick.run(str(package_dir), parsed_args)
+
+    assert "pylint" not in issues
+    assert not success
+    assert [(timing.package, timing.name) for timing in statick.get_timeouts()] == [
+        ("package", "pylint")
+    ]
+    assert statick.tool_plugins["pylint"].deadline is None
+
+
+def test_get_tool_deadline(init_statick):
+    """Test finding the deadline of a tool.
+
+    Expected result: the earlier of the tool timeout and the workspace deadline is used
+    """
+    init_statick.config = mock.MagicMock()
+    init_statick.config.get_tool_timeout.return_value = None
+    assert init_statick.get_tool_deadline("pylint", "default", 100.0) is None
+
+    init_statick.config.get_tool_timeout.return_value = 10.0
+    assert init_statick.get_tool_deadline("pylint", "default", 100.0) == 110.0
+
+    init_statick.deadline = 105.0
+    assert init_statick.get_tool_deadline("pylint", "default", 100.0) == 105.0
+
+
 @pytest.fixture
 def init_statick_ws():
     """Fixture to initialize a Statick instance."""
@@ -1172,7 +1393,7 @@ def test_run_workspace_no_console_reporting_plugins(init_statick_ws):
 def test_run_workspace_invalid_reporting_plugins(init_statick_ws):
     """Test that invalid reporting plugins returns unsuccessful.
 
-    Expected results: issues is empty and success is True
+    Expected results: issues is empty and success is False
     """
     statick = init_statick_ws[0]
     args = init_statick_ws[1]
@@ -1202,7 +1423,7 @@ def test_run_workspace_invalid_reporting_plugins(init_statick_ws):
 
     for tool in issues:
         assert not issues[tool]
-    assert success
+    assert not success
 
 
 def test_run_workspace_with_issues(init_statick_ws):
@@ -1263,7 +1484,7 @@ def test_run_workspace_invalid_level(init_statick_ws):
 
     for tool in issues:
         assert not issues[tool]
-    assert success
+    assert not success
 
     try:
         shutil.rmtree(
@@ -1313,11 +1534,30 @@ def test_run_workspace_no_config(init_statick_ws):
 
     for tool in issues:
         assert not issues[tool]
-    assert success
+    assert not success
 
 
-def test_scan_package(init_statick_ws):
-    """Test running Statick via the scan_package function used in multiprocessing."""
+def scan_workspace_package(statick, parsed_args, count, package):
+    """Scan a workspace package in this process the way workspace workers do."""
+    job = statick.plan_package(parsed_args, count, package)
+    if job is None:
+        return None, []
+    discovered, timings = statick.discover_package(parsed_args, package, job.level)
+    tool_results = {}
+    if discovered is not None:
+        for tool in job.tools:
+            tool_results[tool] = statick.scan_package_tool(
+                parsed_args, discovered, job.level, tool
+            )
+    issues = statick.finish_package(parsed_args, job, discovered, timings, tool_results)
+    return issues, timings
+
+
+def test_scan_workspace_package_no_config(init_statick_ws):
+    """Test scanning a workspace package before the configuration is read.
+
+    Expected result: the package is not planned and no issues are returned
+    """
     statick = init_statick_ws[0]
     args = init_statick_ws[1]
     sys.argv = [
@@ -1329,22 +1569,19 @@ def test_scan_package(init_statick_ws):
 
     parsed_args = args.get_args(sys.argv)
     path = parsed_args.path
-    statick.get_config(parsed_args)
-    statick.get_exceptions(parsed_args)
     package = Package("statick", path)
 
-    issues, dummy = statick.scan_package(parsed_args, 1, package, 1)
+    assert statick.plan_package(parsed_args, 1, package) is None
+    issues, dummy = scan_workspace_package(statick, parsed_args, 1, package)
 
     assert issues is None
 
-    try:
-        shutil.rmtree(os.path.join(os.path.dirname(__file__), "statick_tool-default"))
-    except OSError as ex:
-        print(f"Error: {ex}")
 
+def test_scan_workspace_package_with_issues(init_statick_ws):
+    """Test planning, discovering, scanning and finishing a workspace package.
 
-def test_scan_package_with_issues(init_statick_ws):
-    """Test running Statick via the scan_package function used in multiprocessing."""
+    Expected result: the issues found by the tools of the level are returned
+    """
     if not DiscoveryPlugin.file_command_exists():
         pytest.skip("File command does not exist. Skipping test that requires it.")
     statick = init_statick_ws[0]
@@ -1368,7 +1605,7 @@ def test_scan_package_with_issues(init_statick_ws):
     statick.get_exceptions(parsed_args)
     package = Package("test_package", path)
 
-    issues, dummy = statick.scan_package(parsed_args, 1, package, 1)
+    issues, dummy = scan_workspace_package(statick, parsed_args, 1, package)
 
     assert len(issues["pylint"]) == 1
 
@@ -1378,6 +1615,39 @@ def test_scan_package_with_issues(init_statick_ws):
         print(f"Error: {ex}")
 
 
+def test_discover_package_timings(init_statick_ws):
+    """Test that discovering packages one after another returns the timings of each.
+
+    Expected result: the second discovery only returns the timings of its own package
+    and the timings are not kept by the Statick instance
+    """
+    if not DiscoveryPlugin.file_command_exists():
+        pytest.skip("File command does not exist. Skipping test that requires it.")
+    statick = init_statick_ws[0]
+    args = init_statick_ws[1]
+    sys.argv = init_statick_ws[2]
+
+    parsed_args = args.get_args(sys.argv)
+    statick.get_config(parsed_args)
+    statick.get_exceptions(parsed_args)
+    ws_path = os.path.join(os.path.dirname(__file__), "test_workspace")
+    packages = [
+        Package(name, os.path.join(ws_path, name))
+        for name in ["test_package", "test_package2"]
+    ]
+
+    jobs = [
+        statick.plan_package(parsed_args, count, package)
+        for count, package in enumerate(packages, 1)
+    ]
+    _, first = statick.discover_package(parsed_args, packages[0], jobs[0].level)
+    _, second = statick.discover_package(parsed_args, packages[1], jobs[1].level)
+
+    assert {timing.package for timing in first} == {"test_package"}
+    assert {timing.package for timing in second} == {"test_package2"}
+    assert not statick.get_timings()
+
+
 def test_print_no_issues(caplog):
     """Test that expected error message is logged when no issues are found."""
     args = Args("Statick tool")
@@ -1456,3 +1726,160 @@ def test_print_logging_level_invalid():
 
     logger = logging.getLogger()
     assert logger.getEffectiveLevel() == logging.WARNING
+
+
+def test_run_workspace_timings(init_statick_ws):
+    """Test that timings of every package are kept when scanning a workspace.
+
+    Expected result: file discovery of both packages is timed
+    """
+    statick = init_statick_ws[0]
+    args = init_statick_ws[1]
+    sys.argv = init_statick_ws[2]
+
+    parsed_args = args.get_args(sys.argv)
+    statick.get_config(parsed_args)
+    statick.get_exceptions(parsed_args)
+
+    issues, success = statick.run_workspace(parsed_args)
+
+    assert success
+    packages = [
+        timing.package
+        for timing in statick.get_timings()
+        if timing.name == "find files"
+    ]
+    assert sorted(packages) == ["test_package", "test_package2"]
+
+
+def test_run_workspace_timings_processes(init_statick_ws):
+    """Test that timings of a workspace scan say which process each step ran in.
+
+    Expected result: discovery and tools run in workers and reporting in this process
+    """
+    statick = init_statick_ws[0]
+    args = init_statick_ws[1]
+    sys.argv = init_statick_ws[2]
+    sys.argv.extend(["--max-procs", "2"])
+
+    parsed_args = args.get_args(sys.argv)
+    statick.get_config(parsed_args)
+    statick.get_exceptions(parsed_args)
+
+    statick.run_workspace(parsed_args, time.time())
+
+    pids = {
+        timing.plugin_type: timing.pid
+        for timing in statick.get_timings()
+        if timing.plugin_type
+    }
+    assert pids["Discovery"] != os.getpid()
+    assert pids["Tool"] != os.getpid()
+    assert pids["Reporting"] == os.getpid()
+    assert all(timing.end >= timing.start > 0 for timing in statick.get_timings())
+
+
+def test_plan_package_invalid_level(init_statick_ws):
+    """Test planning a workspace package whose level is not in the config.
+
+    Expected result: no job is planned
+    """
+    statick = init_statick_ws[0]
+    args = init_statick_ws[1]
+    sys.argv = init_statick_ws[2]
+    sys.argv.extend(["--level", "not_a_level"])
+
+    parsed_args = args.get_args(sys.argv)
+    statick.get_config(parsed_args)
+    package = Package(
+        "test_package", os.path.join(os.path.dirname(__file__), "test_package")
+    )
+
+    assert statick.plan_package(parsed_args, 1, package) is None
+
+
+def test_run_workspace_fail_fast(init_statick_ws):
+    """Test that a workspace scan stops at the first package with issues.
+
+    Expected results: issues of only one package are found and success is False
+    """
+    if not DiscoveryPlugin.file_command_exists():
+        pytest.skip("File command does not exist. Skipping test that requires it.")
+    statick = init_statick_ws[0]
+    args = init_statick_ws[1]
+    sys.argv = init_statick_ws[2]
+    sys.argv.extend(
+        [
+            "--profile",
+            os.path.join(os.path.dirname(__file__), "rsc", "profile-custom.yaml"),
+            "--config",
+            os.path.join(os.path.dirname(__file__), "rsc", "config.yaml"),
+            "--exceptions",
+            os.path.join(os.path.dirname(__file__), "rsc", "exceptions.yaml"),
+            "--max-procs",
+            "1",
+            "--fail-fast",
+        ]
+    )
+
+    parsed_args = args.get_args(sys.argv)
+    statick.get_config(parsed_args)
+    statick.get_exceptions(parsed_args)
+
+    issues, success = statick.run_workspace(parsed_args)
+
+    assert len(issues["pylint"]) == 1
+    assert not success
+
+
+def test_run_workspace_timeout_check(init_statick_ws):
+    """Test that packages skipped after the workspace timeout fail the scan.
+
+    Expected results: no package is scanned and success is False
+    """
+    statick = init_statick_ws[0]
+    args = init_statick_ws[1]
+    sys.argv = init_statick_ws[2]
+    sys.argv.extend(["--workspace-timeout", "0", "--check"])
+
+    parsed_args = args.get_args(sys.argv)
+    statick.get_config(parsed_args)
+    statick.get_exceptions(parsed_args)
+
+    issues, success = statick.run_workspace(parsed_args, time.time() - 1)
+
+    assert not any(issues.values())
+    assert not success
+
+
+def test_get_worker_start_method():
+    """Test picking the start method of workspace worker processes.
+
+    Expected result: forkserver is used where available and spawn otherwise
+    """
+    with mock.patch("multiprocessing.get_all_start_methods") as start_methods:
+        start_methods.return_value = ["fork", "spawn", "forkserver"]
+        assert Statick.get_worker_start_method() == "forkserver"
+        start_methods.return_value = ["spawn"]
+        assert Statick.get_worker_start_method() == "spawn"
+
+
+def test_run_workspace_cache_dir(init_statick_ws, tmp_path):
+    """Test that the packages found in a workspace are kept in the cache directory.
+
+    Expected results: the package index is written and success is True
+    """
+    statick = init_statick_ws[0]
+    args = init_statick_ws[1]
+    sys.argv = init_statick_ws[2]
+    sys.argv.extend(["--cache-dir", str(tmp_path), "--list-packages"])
+
+    parsed_args = args.get_args(sys.argv)
+    statick.get_config(parsed_args)
+    statick.get_exceptions(parsed_args)
+
+    issues, success = statick.run_workspace(parsed_args)
+
+    assert issues is None
+    assert success
+    assert os.path.isfile(os.path.join(str(tmp_path), "package_index.json"))
@@ -1,12 +1,29 @@
 """Unit tests of timing.py."""
 
+import json
 import os
+import subprocess
+import sys
+import threading
+import time
 
+import mock
 import pytest
 
 from statick_tool.args import Args
 from statick_tool.statick import Statick
-from statick_tool.timing import Timing
+from statick_tool.timing import (
+    Timing,
+    TimingStart,
+    TimingSummary,
+    format_timing_summary,
+    format_timings,
+    get_percentile,
+    get_slowest,
+    get_trace_events,
+    summarize_timings,
+    write_trace,
+)
 
 
 @pytest.fixture
@@ -30,3 +47,199 @@ def test_add_timing(init_statick):
     init_statick.add_timing(package, name, test_type, duration)
     timings = init_statick.get_timings()
     assert timing in timings
+
+
+def test_timing_start_stop():
+    """Test measuring a step of a scan.
+
+    Expected result: the timing has the duration, clocks, process and thread of the step
+    """
+    start = TimingStart.now()
+    timing = start.stop("test_package", "pylint", "Tool")
+    assert timing[:3] == ("test_package", "pylint", "Tool")
+    assert float(timing.duration) >= 0
+    assert timing.start == start.counter
+    assert timing.end >= timing.start
+    assert timing.pid == os.getpid()
+    assert timing.thread == threading.get_native_id()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="no CPU time of child processes")
+def test_timing_child_cpu():
+    """Test measuring the CPU time of commands run by a step.
+
+    Expected result: the CPU time of the finished command is counted
+    """
+    start = TimingStart.now()
+    subprocess.check_output(
+        [sys.executable, "-c", "sum(range(3000000))"], stderr=subprocess.STDOUT
+    )
+    timing = start.stop("test_package", "pylint", "Tool")
+    assert timing.child_cpu > 0
+
+
+def test_timing_child_cpu_concurrent():
+    """Test measuring steps of two threads that run at the same time.
+
+    Expected result: the CPU time of commands is left out of both steps, and steps
+    that run alone afterwards measure it again
+    """
+    started = threading.Barrier(2, timeout=5)
+    stopped = threading.Barrier(2, timeout=5)
+    timings = []
+
+    def step():
+        start = TimingStart.now()
+        started.wait()
+        stopped.wait()
+        timings.append(start.stop("test_package", "pylint", "Tool"))
+
+    threads = [threading.Thread(target=step) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert [timing.child_cpu for timing in timings] == [None, None]
+    assert TimingStart.now().stop("test_package", "pylint", "Tool").child_cpu == 0.0
+
+
+def test_timing_child_cpu_abandoned_step():
+    """Test measuring a step after a thread ended without stopping its step.
+
+    Expected result: the abandoned step does not keep the CPU time of commands from
+    being measured
+    """
+    thread = threading.Thread(target=TimingStart.now)
+    thread.start()
+    thread.join()
+    assert TimingStart.now().stop("test_package", "pylint", "Tool").child_cpu == 0.0
+
+
+def test_timing_from_time():
+    """Test measuring a step that started at a time from time.time().
+
+    Expected result: the step started about as long ago as the time says
+    """
+    timing = TimingStart.from_time(time.time() - 2).stop("Overall", "", "")
+    assert 1.5 < float(timing.duration) < 10
+
+
+def test_format_timings():
+    """Test formatting timings as a table.
+
+    Expected result: only the package, name, plugin type and duration are shown
+    """
+    table = format_timings([TimingStart.now().stop("test_package", "pylint", "Tool")])
+    assert "plugin_type" in table
+    assert "pylint" in table
+    assert "child_cpu" not in table
+
+
+def test_write_trace(tmp_path):
+    """Test writing timings as a Chrome trace.
+
+    Expected result: measured timings are complete events relative to the first one,
+    processes are named, timings without clocks are left out and so is the CPU time
+    of commands of steps that ran at the same time as others
+    """
+    timings = [
+        Timing("package", "find files", "Discovery", "1.0", 10.0, 11.0, 1, 1, 0.0),
+        Timing("package", "pylint", "Tool", "2.5", 11.0, 13.5, 2, 5, 2.25),
+        Timing("package", "unmeasured", "Tool", "1.0"),
+        Timing("package", "mypy", "Tool", "2.0", 11.0, 13.0, 2, 6, None),
+        Timing("Overall", "", "", "4.0", 9.5, 13.5, 1, 1, 0.0),
+    ]
+    filename = tmp_path / "trace.json"
+    with mock.patch("os.getpid", return_value=1):
+        write_trace(timings, str(filename))
+    with open(filename, encoding="utf8") as fid:
+        trace = json.load(fid)
+
+    events = trace["traceEvents"]
+    assert [event["args"]["name"] for event in events if event["ph"] == "M"] == [
+        "statick",
+        "statick worker",
+    ]
+    complete = [event for event in events if event["ph"] == "X"]
+    assert [event["name"] for event in complete] == [
+        "find files",
+        "pylint",
+        "mypy",
+        "Overall",
+    ]
+    assert complete[0]["ts"] == 500000.0
+    assert complete[1]["dur"] == 2500000.0
+    assert complete[1]["pid"] == 2
+    assert complete[1]["tid"] == 5
+    assert complete[1]["args"] == {"package": "package", "child_cpu_seconds": 2.25}
+    assert complete[2]["args"] == {"package": "package"}
+    assert complete[3]["ts"] == 0
+
+
+def test_get_trace_events_empty():
+    """Test getting trace events when no timing was measured.
+
+    Expected result: there are no events
+    """
+    assert not get_trace_events([Timing("package", "pylint", "Tool", "1.0")])
+
+
+def test_summarize_timings():
+    """Test summarizing the durations of each plugin across packages.
+
+    Expected result: each plugin is summarized, the longest total first, and the
+    overall timing is left out
+    """
+    timings = [Timing(f"package{i}", "pylint", "Tool", str(i)) for i in range(1, 21)]
+    timings += [
+        Timing("package1", "find files", "Discovery", "0.5"),
+        Timing("Overall", "", "", "300"),
+    ]
+
+    summaries = summarize_timings(timings)
+
+    assert summaries == [
+        TimingSummary("Tool", "pylint", 20, 210.0, 10.5, 10.0, 19.0, 20.0),
+        TimingSummary("Discovery", "find files", 1, 0.5, 0.5, 0.5, 0.5, 0.5),
+    ]
+
+
+def test_get_percentile():
+    """Test getting percentiles by the nearest rank.
+
+    Expected result: the duration at the rank is returned
+    """
+    assert get_percentile([1.0], 0.95) == 1.0
+    assert get_percentile([1.0, 2.0, 3.0, 4.0], 0.5) == 2.0
+    assert get_percentile([1.0, 2.0, 3.0, 4.0], 0.95) == 4.0
+
+
+def test_get_slowest():
+    """Test getting the slowest tool timings.
+
+    Expected result: only tools are returned, the slowest first
+    """
+    timings = [
+        Timing("package1", "pylint", "Tool", "2.0"),
+        Timing("package2", "pylint", "Tool", "10.0"),
+        Timing("package1", "mypy", "Tool", "5.0"),
+        Timing("package1", "find files", "Discovery", "50.0"),
+    ]
+    assert get_slowest(timings, 2) == [timings[1], timings[2]]
+
+
+def test_format_timing_summary():
+    """Test formatting the summary of each plugin and the slowest tools.
+
+    Expected result: both tables are shown
+    """
+    timings = [
+        Timing("package1", "pylint", "Tool", "2.0"),
+        Timing("package2", "pylint", "Tool", "10.0"),
+    ]
+    text = format_timing_summary(timings, 1)
+    assert "p95" in text
+    assert "12.0000" in text
+    assert "Slowest tools:" in text
+    assert "package2" in text.split("Slowest tools:")[1]
+    assert "package1" not in text.split("Slowest tools:")[1]
@@ -3,8 +3,10 @@
 import argparse
 import os
 import stat
+import subprocess
 import sys
 import tempfile
+import time
 from tempfile import TemporaryDirectory
 
 import pytest
@@ -204,6 +206,26 @@ def test_tool_dependencies():
     assert tp.get_tool_dependencies() == []
 
 
+def test_tool_plugin_get_output_path():
+    """Test that files of a plugin are written to the output directory."""
+    arg_parser = argparse.ArgumentParser()
+    resources = Resources([os.path.join(os.path.dirname(__file__), "good_config")])
+    tp = ToolPlugin()
+    assert tp.get_output_path("tool.log") == "tool.log"
+    assert tp.get_working_dir() is None
+
+    tp.set_plugin_context(PluginContext(arg_parser.parse_args([]), resources, None))
+    assert tp.get_output_path("tool.log") == "tool.log"
+    assert tp.get_working_dir() is None
+
+    output_dir = os.path.join("output", "package-level")
+    tp.set_plugin_context(
+        PluginContext(arg_parser.parse_args([]), resources, None, output_dir)
+    )
+    assert tp.get_output_path("tool.log") == os.path.join(output_dir, "tool.log")
+    assert tp.get_working_dir() == output_dir
+
+
 def test_tool_plugin_is_valid_executable_extension_nopathext(monkeypatch):
     """Test that is_valid_executable works correctly with .exe appended, no PATHEXT.
 
@@ -337,3 +359,44 @@ def test_tool_plugin_command_exists_shortpath_invalid(monkeypatch):
             os.chmod(tmp_file.name, st.st_mode | stat.S_IXUSR)
             _, tmp_file_name = os.path.split(tmp_file.name)
             assert not ToolPlugin.command_exists(tmp_file_name)
+
+
+def test_tool_plugin_check_output():
+    """Test that commands run without a deadline work like subprocess.check_output."""
+    tp = ToolPlugin()
+    assert tp.check_output(["echo", "hello"], universal_newlines=True) == "hello\n"
+
+
+@pytest.mark.skipif(sys.platform.startswith("win"), reason="uses a POSIX shell")
+def test_tool_plugin_check_output_deadline():
+    """Test that commands finishing before the deadline return their output.
+
+    Expected result: the output is returned, and a non-zero exit code raises
+    CalledProcessError with the output
+    """
+    tp = ToolPlugin()
+    tp.deadline = time.time() + 30
+    assert tp.check_output(["echo", "hello"], universal_newlines=True) == "hello\n"
+    with pytest.raises(subprocess.CalledProcessError) as ex:
+        tp.check_output(["sh", "-c", "echo failed; exit 3"], universal_newlines=True)
+    assert ex.value.returncode == 3
+    assert ex.value.output == "failed\n"
+
+
+@pytest.mark.skipif(sys.platform.startswith("win"), reason="uses a POSIX shell")
+def test_tool_plugin_check_output_timeout():
+    """Test that commands still running at the deadline are killed.
+
+    Expected result: TimeoutExpired is raised soon after the deadline, and the helper
+    the command started in the background is killed along with it
+    """
+    tp = ToolPlugin()
+    tp.deadline = time.time() + 0.5
+    start_time = time.time()
+    with pytest.raises(subprocess.TimeoutExpired):
+        tp.check_output(["sh", "-c", "sleep 30 & sleep 30"])
+    assert time.time() - start_time < 10
+
+    tp.deadline = time.time() - 1
+    with pytest.raises(subprocess.TimeoutExpired):
+        tp.check_output(["echo", "hello"])
@@ -0,0 +1,213 @@
+"""Unit tests of tool_version_cache.py."""
+
+import json
+import os
+import pickle
+import stat
+import threading
+import time
+
+import mock
+
+from statick_tool.tool_plugin import ToolPlugin
+from statick_tool.tool_version_cache import ToolVersionCache
+
+
+class CountingToolPlugin(ToolPlugin):
+    """Tool plugin that counts how many times its version is probed."""
+
+    def __init__(self, name="counting", binary="counting", version="1.2.3"):
+        """Initialize the plugin.
+
+        Args:
+            name: Name of the tool.
+            binary: Tool binary name.
+            version: Version to report.
+        """
+        self.name = name
+        self.binary = binary
+        self.version = version
+        self.probes = 0
+
+    def get_name(self):
+        """Get name of tool."""
+        return self.name
+
+    def get_binary(self, level=None, package=None):
+        """Get tool binary name."""
+        return self.binary
+
+    def get_version(self):
+        """Get version of tool."""
+        self.probes += 1
+        time.sleep(0.01)
+        return self.version
+
+
+def make_binary(tmp_path, name="counting"):
+    """Create an executable file to stand in for a tool binary."""
+    binary = tmp_path / name
+    binary.write_text("#!/bin/sh\n")
+    binary.chmod(binary.stat().st_mode | stat.S_IEXEC)
+    return str(binary)
+
+
+def test_get_version_cached():
+    """Test that a tool is probed once per run.
+
+    Expected result: the second lookup does not probe the tool again
+    """
+    cache = ToolVersionCache()
+    plugin = CountingToolPlugin()
+    assert cache.get_version(plugin) == "1.2.3"
+    assert cache.get_version(plugin) == "1.2.3"
+    assert plugin.probes == 1
+
+
+def test_get_version_missing_remembered():
+    """Test that a tool which is not installed is remembered.
+
+    Expected result: the missing tool is only probed once
+    """
+    cache = ToolVersionCache()
+    plugin = CountingToolPlugin(
+        binary="not-a-real-binary", version=ToolPlugin.TOOL_MISSING_STR
+    )
+    assert cache.get_version(plugin) == ToolPlugin.TOOL_MISSING_STR
+    assert cache.get_version(plugin) == ToolPlugin.TOOL_MISSING_STR
+    assert plugin.probes == 1
+
+
+def test_get_version_concurrent():
+    """Test that threads asking for the same tool at once share a single probe.
+
+    Expected result: the tool is probed once
+    """
+    cache = ToolVersionCache()
+    plugin = CountingToolPlugin()
+    threads = [
+        threading.Thread(target=cache.get_version, args=(plugin,)) for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert plugin.probes == 1
+
+
+def test_get_version_disk(tmp_path):
+    """Test that versions are kept on disk between runs.
+
+    Expected result: a new cache reads the version from disk without probing
+    """
+    binary = make_binary(tmp_path)
+    cache_file = str(tmp_path / "cache" / "tool_versions.json")
+    cache = ToolVersionCache(cache_file)
+    plugin = CountingToolPlugin(binary=binary)
+    assert cache.get_version(plugin) == "1.2.3"
+    cache.save()
+    assert os.path.isfile(cache_file)
+
+    plugin = CountingToolPlugin(binary=binary, version="4.5.6")
+    cache = ToolVersionCache(cache_file)
+    assert cache.get_version(plugin) == "1.2.3"
+    assert plugin.probes == 0
+
+
+def test_get_version_disk_binary_changed(tmp_path):
+    """Test that versions on disk are not used once the binary changes.
+
+    Expected result: the tool is probed again
+    """
+    binary = make_binary(tmp_path)
+    cache_file = str(tmp_path / "tool_versions.json")
+    cache = ToolVersionCache(cache_file)
+    cache.get_version(CountingToolPlugin(binary=binary))
+    cache.save()
+
+    mtime = os.stat(binary).st_mtime + 10
+    os.utime(binary, (mtime, mtime))
+    plugin = CountingToolPlugin(binary=binary, version="4.5.6")
+    cache = ToolVersionCache(cache_file)
+    assert cache.get_version(plugin) == "4.5.6"
+    assert plugin.probes == 1
+
+
+def test_save_merges(tmp_path):
+    """Test that saving keeps entries written by other processes.
+
+    Expected result: entries from both caches are in the file
+    """
+    cache_file = str(tmp_path / "tool_versions.json")
+    first = ToolVersionCache(cache_file)
+    second = ToolVersionCache(cache_file)
+    first.get_version(CountingToolPlugin("first", make_binary(tmp_path, "first")))
+    second.get_version(CountingToolPlugin("second", make_binary(tmp_path, "second")))
+    first.save()
+    second.save()
+
+    with open(cache_file, encoding="utf8") as fid:
+        versions = json.load(fid)
+    assert len(versions) == 2
+
+
+def test_save_not_dirty(tmp_path):
+    """Test that nothing is written if no tool was probed.
+
+    Expected result: no cache file is created
+    """
+    cache_file = str(tmp_path / "tool_versions.json")
+    cache = ToolVersionCache(cache_file)
+    cache.save()
+    assert not os.path.exists(cache_file)
+
+
+def test_load_invalid(tmp_path):
+    """Test loading a cache file that is not valid JSON.
+
+    Expected result: the file is ignored and the tool is probed
+    """
+    cache_file = tmp_path / "tool_versions.json"
+    cache_file.write_text("{not json")
+    cache = ToolVersionCache(str(cache_file))
+    plugin = CountingToolPlugin(binary=make_binary(tmp_path))
+    assert cache.get_version(plugin) == "1.2.3"
+    assert plugin.probes == 1
+
+
+@mock.patch("statick_tool.tool_version_cache.os.replace")
+def test_save_oserror(mock_replace, tmp_path):
+    """Test that failing to write the cache file is not fatal.
+
+    Expected result: no exception is raised
+    """
+    mock_replace.side_effect = OSError("error")
+    cache = ToolVersionCache(str(tmp_path / "tool_versions.json"))
+    cache.get_version(CountingToolPlugin(binary=make_binary(tmp_path)))
+    cache.save()
+    assert cache.dirty
+
+
+def test_pickle():
+    """Test that the cache can be sent to worker processes.
+
+    Expected result: versions are kept and the copy can still be used
+    """
+    cache = ToolVersionCache()
+    plugin = CountingToolPlugin()
+    cache.get_version(plugin)
+    copied = pickle.loads(pickle.dumps(cache))
+    assert copied.get_version(plugin) == "1.2.3"
+    assert plugin.probes == 1
+
+
+def test_set_version():
+    """Test remembering a version found by another process.
+
+    Expected result: the tool is not probed
+    """
+    cache = ToolVersionCache()
+    plugin = CountingToolPlugin()
+    cache.set_version(plugin, "4.5.6")
+    assert cache.get_version(plugin) == "4.5.6"
+    assert plugin.probes == 0
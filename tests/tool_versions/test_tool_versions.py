@@ -32,6 +32,16 @@ def test_add_version(init_statick):
     assert version in versions
 
 
+def test_add_version_duplicate(init_statick):
+    """Test adding the same ToolVersion instance twice.
+
+    Expected result: ToolVersion instance is only returned once
+    """
+    init_statick.add_tool_version("test_tool", "1.2.3")
+    init_statick.add_tool_version("test_tool", "1.2.3")
+    assert init_statick.get_tool_versions() == [ToolVersion("test_tool", "1.2.3")]
+
+
 def test_collect_versions(init_statick):
     """Test collecting all tool versions."""
     args = Args("Statick tool")
@@ -129,3 +139,29 @@ def test_collect_versions_missing_level(init_statick):
         shutil.rmtree(os.path.join(os.path.dirname(__file__), "statick_tool-default"))
     except OSError as ex:
         print(f"Error: {ex}")
+
+
+def test_collect_versions_cache_dir(tmp_path):
+    """Test collecting all tool versions with a cache directory."""
+    args = Args("Statick tool")
+    args.parser.add_argument(
+        "--path", help="Path of package to scan", default=os.path.dirname(__file__)
+    )
+
+    statick = Statick(args.get_user_paths())
+    statick.gather_args(args.parser)
+    sys.argv = [
+        "--path",
+        os.path.dirname(__file__),
+        "--cache-dir",
+        str(tmp_path),
+    ]
+    parsed_args = args.get_args(sys.argv)
+    statick.get_config(parsed_args)
+
+    assert statick.collect_tool_versions(args=parsed_args)
+    versions = statick.get_tool_versions()
+    assert [version.tool for version in versions] == list(statick.tool_plugins)
+    assert statick.tool_version_cache.cache_file == os.path.join(
+        str(tmp_path), "tool_versions.json"
+    )
@@ -0,0 +1,154 @@
+"""Unit tests of watch.py."""
+
+import mock
+import pytest
+
+from statick_tool.args import Args
+from statick_tool.statick_tool import Statick
+from statick_tool.timing import Timing
+from statick_tool.tool_result import ToolResult
+from statick_tool.watch import PackageWatch
+
+
+@pytest.fixture
+def watch(tmp_path):
+    """Fixture to get a watch of a package with python and yaml files."""
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text(
+        "levels:\n"
+        "  watch:\n"
+        "    discovery:\n"
+        "      - python\n"
+        "      - yaml\n"
+        "    reporting:\n"
+        "      - print_to_console\n"
+        "    tool:\n"
+        "      pylint:\n"
+        "        flags: ''\n"
+        "      yamllint:\n"
+        "        flags: ''\n"
+    )
+    package_dir = tmp_path / "package"
+    package_dir.mkdir()
+    (package_dir / "a.py").write_text("import os\n")
+    (package_dir / "b.yaml").write_text("a: 1\n")
+    (package_dir / "sub").mkdir()
+    (package_dir / "sub" / "notes.txt").write_text("notes\n")
+
+    args = Args("Statick tool")
+    statick = Statick(args.get_user_paths())
+    statick.gather_args(args.parser)
+    parsed_args = args.get_args(["--config", str(config_file), "--level", "watch"])
+    statick.get_config(parsed_args)
+    statick.get_exceptions(parsed_args)
+    return PackageWatch(statick, parsed_args, str(package_dir))
+
+
+def test_start(watch):
+    """Test scanning the whole package.
+
+    Expected result: all tools run and the issues are kept
+    """
+    assert not watch.start()
+    assert watch.tools == ["pylint", "yamllint"]
+    assert watch.issues["pylint"]
+
+
+def test_rescan_changed_file(watch):
+    """Test scanning again after a python file changed.
+
+    Expected result: only the python tool runs again and its new issues are kept
+    """
+    watch.start()
+    path = watch.package.path + "/a.py"
+    with open(path, "w", encoding="utf8") as fid:
+        fid.write('"""Module."""\n')
+    with mock.patch.object(
+        watch.statick, "run_tool_plugin", wraps=watch.statick.run_tool_plugin
+    ) as mocked:
+        watch.rescan({path})
+    assert [call[0][0] for call in mocked.call_args_list] == ["pylint"]
+    assert not watch.issues["pylint"]
+    assert "yamllint" in watch.issues
+
+
+def test_rescan_new_file(watch):
+    """Test scanning again after a yaml file was added.
+
+    Expected result: only the yaml tool runs again
+    """
+    watch.start()
+    path = watch.package.path + "/c.yaml"
+    with open(path, "w", encoding="utf8") as fid:
+        fid.write("c: 1\n")
+    with mock.patch.object(watch.statick, "run_tool_plugin") as mocked:
+        mocked.return_value = ToolResult(
+            [], Timing("package", "yamllint", "Tool", "0"), "1"
+        )
+        watch.rescan({path})
+    assert [call[0][0] for call in mocked.call_args_list] == ["yamllint"]
+    assert path in watch.package["yaml"]
+
+
+def test_rescan_unscanned_files(watch):
+    """Test scanning again after files that no tool scans changed.
+
+    Expected result: files at the top of the package run every tool again, files below
+    it run no tools
+    """
+    watch.start()
+    with mock.patch.object(watch.statick, "run_tool_plugin") as mocked:
+        mocked.return_value = ToolResult(
+            [], Timing("package", "yamllint", "Tool", "0"), "1"
+        )
+        with open(watch.package.path + "/sub/notes.txt", "w", encoding="utf8") as fid:
+            fid.write("more notes\n")
+        watch.rescan({watch.package.path + "/sub/notes.txt"})
+        assert not mocked.called
+
+        with open(watch.package.path + "/setup.cfg", "w", encoding="utf8") as fid:
+            fid.write("[pylint]\n")
+        watch.rescan({watch.package.path + "/setup.cfg"})
+    assert [call[0][0] for call in mocked.call_args_list] == ["pylint", "yamllint"]
+
+
+def test_rescan_nothing_changed(watch):
+    """Test scanning again when no file changed.
+
+    Expected result: no tools run
+    """
+    watch.start()
+    with mock.patch.object(watch.statick, "run_tool_plugin") as mocked:
+        watch.rescan({watch.package.path + "/missing.py"})
+    assert not mocked.called
+
+
+def test_get_affected_tools_dependencies(watch):
+    """Test that tools depending on a tool that runs again also run again.
+
+    Expected result: the dependent tool runs again
+    """
+    watch.start()
+    changed = {watch.package.path + "/a.py"}
+    before = {
+        plugin_name: watch.get_scanned_files(plugin_name) for plugin_name in watch.tools
+    }
+    with mock.patch.object(
+        watch.statick,
+        "get_tool_dependencies",
+        return_value={"pylint": [], "yamllint": ["pylint"]},
+    ):
+        assert watch.get_affected_tools(changed, before) == ["pylint", "yamllint"]
+
+
+def test_get_paths():
+    """Test getting the paths of files found by discovery.
+
+    Expected result: paths of lists of files and of sources of make targets are found
+    """
+    assert PackageWatch.get_paths(["/a.c", {"name": "target", "src": ["/b.c"]}, 3]) == {
+        "/a.c",
+        "/b.c",
+    }
+    assert PackageWatch.get_paths("/CMakeLists.txt") == {"/CMakeLists.txt"}
+    assert not PackageWatch.get_paths(None)
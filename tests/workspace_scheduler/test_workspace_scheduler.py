@@ -0,0 +1,338 @@
+"""Unit tests of workspace_scheduler.py."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from statick_tool.issue import Issue
+from statick_tool.package import Package
+from statick_tool.workspace_scheduler import (
+    PackageState,
+    WorkspaceJob,
+    WorkspaceResults,
+    WorkspaceScheduler,
+)
+
+
+def make_job(number, tools, dependencies=None):
+    """Make a job for a package named after its number."""
+    package = Package(f"package{number}", f"/tmp/package{number}")
+    return WorkspaceJob(number, package, "default", tools, dependencies or {})
+
+
+def discover(number, package, level):
+    """Pretend to discover the files in a package."""
+    package["discovered"] = True
+    return package, [level]
+
+
+def test_run():
+    """Test scanning packages with tools that depend on each other.
+
+    Expected result: every package is finished with the results of all its tools in
+    the planned order and dependencies run first
+    """
+    finished = {}
+    started = []
+    lock = threading.Lock()
+
+    def scan(number, package, level, tool):
+        if package is None:
+            return None
+        assert package["discovered"]
+        with lock:
+            started.append((package.name, tool))
+        if tool == "make":
+            time.sleep(0.05)
+        return tool.upper()
+
+    def finish(job, package, timings, results):
+        finished[job.number] = (package, timings, results)
+
+    jobs = [
+        make_job(1, ["make", "clang-tidy", "pylint"], {"clang-tidy": ["make"]}),
+        make_job(2, ["pylint"]),
+    ]
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        WorkspaceScheduler(executor, 3).run(jobs, discover, scan, finish)
+
+    assert sorted(finished) == [1, 2]
+    package, timings, results = finished[1]
+    assert package.name == "package1"
+    assert timings == ["default"]
+    assert list(results) == ["make", "clang-tidy", "pylint"]
+    assert results["clang-tidy"] == "CLANG-TIDY"
+    assert started.index(("package1", "make")) < started.index(
+        ("package1", "clang-tidy")
+    )
+
+
+def test_run_kept_package():
+    """Test that tools are sent the package only if the worker does not have it.
+
+    Expected result: tools of the package kept by the worker run without it, other
+    tools are sent again with the discovered package
+    """
+    kept = {}
+    calls = []
+    lock = threading.Lock()
+
+    def keep(number, package, level):
+        package, timings = discover(number, package, level)
+        kept[number] = package
+        return package, timings
+
+    def scan(number, package, level, tool):
+        with lock:
+            calls.append((number, package is not None, tool))
+        if package is None:
+            package = kept.get(number)
+            if package is None:
+                return None
+        assert package["discovered"]
+        return tool.upper()
+
+    finished = {}
+    jobs = [make_job(1, ["pylint", "mypy"]), make_job(2, ["pylint"])]
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        WorkspaceScheduler(executor).run(
+            jobs,
+            lambda number, package, level: (
+                keep(number, package, level)
+                if number == 1
+                else discover(number, package, level)
+            ),
+            scan,
+            lambda job, package, timings, results: finished.update(
+                {job.number: results}
+            ),
+        )
+
+    assert finished == {
+        1: {"pylint": "PYLINT", "mypy": "MYPY"},
+        2: {"pylint": "PYLINT"},
+    }
+    assert sorted(calls) == [
+        (1, False, "mypy"),
+        (1, False, "pylint"),
+        (2, False, "pylint"),
+        (2, True, "pylint"),
+    ]
+
+
+def test_run_tools_across_packages():
+    """Test that tools of different packages run at the same time.
+
+    Expected result: the only tool of each package is running before either finishes
+    """
+    barrier = threading.Barrier(2, timeout=5)
+    finished = []
+    jobs = [make_job(1, ["pylint"]), make_job(2, ["pylint"])]
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        WorkspaceScheduler(executor, 2).run(
+            jobs,
+            discover,
+            lambda number, package, level, tool: barrier.wait(),
+            lambda job, package, timings, results: finished.append(job.number),
+        )
+    assert sorted(finished) == [1, 2]
+
+
+def test_run_discovery_failed():
+    """Test that a package whose discovery fails is finished without running tools.
+
+    Expected result: finish is called with no package and no tool results
+    """
+    finished = []
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        WorkspaceScheduler(executor).run(
+            [make_job(1, ["pylint"])],
+            lambda number, package, level: (None, []),
+            lambda number, package, level, tool: pytest.fail("tool should not run"),
+            lambda job, package, timings, results: finished.append((package, results)),
+        )
+    assert finished == [(None, {})]
+
+
+def test_run_no_tools():
+    """Test a package with no tools to run.
+
+    Expected result: the package is finished once discovered
+    """
+    finished = []
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        WorkspaceScheduler(executor).run(
+            [make_job(1, [])],
+            discover,
+            lambda number, package, level, tool: pytest.fail("tool should not run"),
+            lambda job, package, timings, results: finished.append(results),
+        )
+    assert finished == [{}]
+
+
+def test_run_cycle():
+    """Test that circular dependencies between tools are reported.
+
+    Expected result: ValueError is raised
+    """
+    jobs = [make_job(1, ["a", "b"], {"a": ["b"], "b": ["a"]})]
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        with pytest.raises(ValueError):
+            WorkspaceScheduler(executor, 2).run(
+                jobs,
+                discover,
+                lambda number, package, level, tool: tool,
+                lambda job, package, timings, results: None,
+            )
+
+
+def test_run_stop():
+    """Test stopping once a package is finished.
+
+    Expected result: the remaining packages are not scanned
+    """
+    finished = []
+    jobs = [make_job(1, ["pylint"]), make_job(2, ["pylint"]), make_job(3, ["pylint"])]
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        scheduler = WorkspaceScheduler(executor)
+
+        def finish(job, package, timings, results):
+            finished.append(job.number)
+            scheduler.stop()
+
+        scheduler.run(jobs, discover, lambda number, package, level, tool: tool, finish)
+    assert finished == [1]
+
+
+def test_run_deadline():
+    """Test scanning packages once the workspace deadline has passed.
+
+    Expected result: packages are finished without being discovered or scanned
+    """
+    finished = []
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        WorkspaceScheduler(executor, 1, time.time() - 1).run(
+            [make_job(1, ["pylint"]), make_job(2, ["pylint"])],
+            lambda number, package, level: pytest.fail(
+                "package should not be discovered"
+            ),
+            lambda number, package, level, tool: pytest.fail("tool should not run"),
+            lambda job, package, timings, results: finished.append(
+                (job.number, package, results)
+            ),
+        )
+    assert finished == [(1, None, {}), (2, None, {})]
+
+
+def test_get_ready():
+    """Test the order in which ready tasks are started.
+
+    Expected result: ready tools of discovered packages come before discovery of the
+    next package
+    """
+    first = make_job(1, ["pylint"])
+    second = make_job(2, ["pylint"])
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        scheduler = WorkspaceScheduler(executor)
+        assert scheduler.get_ready([first, second], {}) == [
+            (first, None),
+            (second, None),
+        ]
+        states = {1: PackageState(first, first.package, [])}
+        assert scheduler.get_ready([second], states) == [
+            (first, "pylint"),
+            (second, None),
+        ]
+
+
+def test_max_workers_minimum():
+    """Test that the number of workers is at least one.
+
+    Expected result: max_workers is 1
+    """
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        assert WorkspaceScheduler(executor, 0).max_workers == 1
+
+
+def make_issue(filename):
+    """Make an issue found in a file."""
+    return Issue(filename, 1, "pylint", "C0114", 1, "Missing docstring", None)
+
+
+def test_results_package_order():
+    """Test that issues are merged in package order.
+
+    Expected result: issues of later packages wait for earlier packages
+    """
+    results = WorkspaceResults()
+    assert results.add(2, {"pylint": [make_issue("second.py")]})
+    assert results.num_finished == 1
+    assert not results.issues
+    assert not results.add(1, {"pylint": []})
+    assert [issue.filename for issue in results.issues["pylint"]] == ["second.py"]
+    assert results.add(3, {"pylint": [make_issue("third.py")]})
+    assert [issue.filename for issue in results.issues["pylint"]] == [
+        "second.py",
+        "third.py",
+    ]
+    assert not results.success
+    assert not results.waiting
+
+
+def test_results_failed_package():
+    """Test adding a package that could not be scanned.
+
+    Expected result: the package has no issues and does not hold up later packages, but
+    the workspace fails
+    """
+    results = WorkspaceResults()
+    assert not results.add(1, None)
+    assert not results.add(2, {"pylint": []})
+    assert results.issues == {"pylint": []}
+    assert results.failed == [1]
+    assert not results.success
+
+
+def test_results_timed_out_package():
+    """Test adding a package where a tool timed out.
+
+    Expected result: the issues found are merged, and the workspace fails
+    """
+    results = WorkspaceResults()
+    assert not results.add(1, {"pylint": []}, timed_out=True)
+    assert results.issues == {"pylint": []}
+    assert results.timed_out == [1]
+    assert not results.failed
+    assert not results.success
+
+
+def test_results_skipped_package():
+    """Test adding a package that was skipped.
+
+    Expected result: the package is skipped rather than failed, and the workspace fails
+    """
+    results = WorkspaceResults()
+    assert not results.add(1, {"pylint": []})
+    results.skip(2)
+    assert results.skipped == [2]
+    assert not results.failed
+    assert results.num_finished == 2
+    assert not results.success
+
+
+def test_results_flush():
+    """Test merging packages that finished after an earlier package was skipped.
+
+    Expected result: waiting packages are merged in package order
+    """
+    results = WorkspaceResults()
+    results.add(3, {"pylint": [make_issue("third.py")]})
+    results.add(2, {"pylint": [make_issue("second.py")]})
+    results.flush()
+    assert [issue.filename for issue in results.issues["pylint"]] == [
+        "second.py",
+        "third.py",
+    ]
+    assert not results.waiting
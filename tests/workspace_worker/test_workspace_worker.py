@@ -0,0 +1,130 @@
+"""Unit tests of workspace_worker.py."""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from statick_tool.args import Args
+from statick_tool.package import Package
+from statick_tool.statick_tool import Statick
+from statick_tool.workspace_worker import WorkspaceWorker
+
+WORKSPACE = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "statick_tool", "test_workspace"
+)
+RSC = os.path.join(os.path.dirname(os.path.dirname(__file__)), "statick_tool", "rsc")
+
+
+@pytest.fixture
+def parsed_args(tmp_path):
+    """Fixture to get parsed arguments for scanning the test workspace."""
+    args = Args("Statick tool")
+    args.parser.add_argument("--path", help="Path of package to scan")
+    statick = Statick(args.get_user_paths())
+    statick.gather_args(args.parser)
+    return args.get_args(
+        [
+            "--output-directory",
+            str(tmp_path),
+            "--path",
+            WORKSPACE,
+            "--config",
+            os.path.join(RSC, "config.yaml"),
+            "--exceptions",
+            os.path.join(RSC, "exceptions.yaml"),
+            "--level",
+            "custom",
+        ]
+    )
+
+
+@pytest.fixture
+def package(parsed_args):
+    """Fixture to get a workspace package with its output directory created."""
+    package = Package("test_package", os.path.join(WORKSPACE, "test_package"))
+    os.mkdir(os.path.join(parsed_args.output_directory, "test_package-custom"))
+    return package
+
+
+def test_not_initialized():
+    """Test using a worker that has not been initialized.
+
+    Expected result: RuntimeError is raised
+    """
+    WorkspaceWorker.statick = None
+    with pytest.raises(RuntimeError):
+        WorkspaceWorker.discover_package(1, Package("test", "/tmp"), "default")
+
+
+def test_discover_and_scan(parsed_args, package):
+    """Test discovering and scanning a package in this process.
+
+    Expected result: python files are found and pylint runs on them
+    """
+    WorkspaceWorker.initialize([], parsed_args)
+    discovered, timings = WorkspaceWorker.discover_package(1, package, "custom")
+    assert discovered["python_src"]
+    assert [timing.name for timing in timings] == ["find files", "python"]
+    assert not WorkspaceWorker.statick.get_timings()
+
+    cwd = os.getcwd()
+    result = WorkspaceWorker.scan_package_tool(1, None, "custom", "pylint")
+    assert result.issues is not None
+    assert float(result.timing.duration) >= 0
+    assert not result.timed_out
+    assert os.getcwd() == cwd
+    assert os.path.isfile(
+        os.path.join(parsed_args.output_directory, "test_package-custom", "pylint.log")
+    )
+
+
+def test_scan_package_not_kept(parsed_args, package):
+    """Test scanning a package the worker does not have.
+
+    Expected result: the tool is not run without the package, and runs once the package
+    is sent, which the worker then keeps
+    """
+    WorkspaceWorker.initialize([], parsed_args)
+    assert WorkspaceWorker.scan_package_tool(2, None, "custom", "pylint") is None
+
+    package["python_src"] = []
+    result = WorkspaceWorker.scan_package_tool(2, package, "custom", "pylint")
+    assert result.issues is not None
+    assert WorkspaceWorker.packages[2] is package
+
+
+def test_keep_package(parsed_args):
+    """Test that workers only keep as many packages as there are workers.
+
+    Expected result: the least recently used package is dropped
+    """
+    parsed_args.max_procs = 2
+    WorkspaceWorker.initialize([], parsed_args)
+    packages = [Package(f"package{number}", "/tmp") for number in range(3)]
+    for number, package in enumerate(packages):
+        WorkspaceWorker.keep_package(number, package)
+    assert list(WorkspaceWorker.packages) == [1, 2]
+
+    WorkspaceWorker.keep_package(1, packages[1])
+    WorkspaceWorker.keep_package(0, packages[0])
+    assert list(WorkspaceWorker.packages) == [1, 0]
+
+
+def test_spawn(parsed_args, package):
+    """Test discovering a package in a worker started without forking.
+
+    Expected result: the worker builds its own Statick instance and finds the files
+    """
+    with ProcessPoolExecutor(
+        max_workers=1,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=WorkspaceWorker.initialize,
+        initargs=([], parsed_args),
+    ) as executor:
+        discovered, timings = executor.submit(
+            WorkspaceWorker.discover_package, 1, package, "custom"
+        ).result()
+    assert discovered["python_src"]
+    assert timings